@@ -0,0 +1,101 @@
+"""Bounded cache of verified JWT claims.
+
+System callers (serx-mcp, the OPEX scheduler) reuse one M2M token for
+minutes across thousands of requests; verifying its signature against the
+JWKS on every call is pure repeat work. ``ClaimsCache`` remembers the claims
+of tokens that verified successfully, keyed by the SHA-256 of the raw token
+(the token itself is never stored).
+
+Revocation semantics are unchanged:
+
+* an entry never outlives the token's ``exp`` (tokens without ``exp`` are not
+  cached) nor ``max_ttl`` seconds;
+* the whole cache is flushed when a token signed with a key id (``kid``) not
+  seen before verifies — that is how a JWKS key rotation shows up — so every
+  cached token is re-verified against the current key set;
+* failed verifications are never cached.
+"""
+
+import base64
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+def token_key_id(token: str) -> str | None:
+    """Read ``kid`` from the (unverified) JOSE header, if present."""
+    try:
+        header_segment = token.split(".", 1)[0]
+        padded = header_segment + "=" * (-len(header_segment) % 4)
+        header = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, UnicodeDecodeError):
+        return None
+    kid = header.get("kid") if isinstance(header, dict) else None
+    return str(kid) if kid is not None else None
+
+
+class ClaimsCache:
+    """Thread-safe LRU of verified claims with per-entry expiry."""
+
+    def __init__(self, *, maxsize: int, max_ttl: float) -> None:
+        self.maxsize = maxsize
+        self.max_ttl = max_ttl
+        self._entries: OrderedDict[bytes, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._known_kids: set[str] = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> dict[str, Any] | None:
+        """Cached claims for ``token`` if still valid, else ``None``."""
+        if self.maxsize <= 0:
+            return None
+        key = self._key(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, claims = entry
+            if expires_at <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return dict(claims)
+
+    def put(self, token: str, claims: dict[str, Any]) -> None:
+        """Remember freshly verified ``claims`` for ``token``."""
+        if self.maxsize <= 0:
+            return
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)):
+            return
+        now = time.time()
+        expires_at = min(float(exp), now + self.max_ttl)
+        if expires_at <= now:
+            return
+
+        kid = token_key_id(token)
+        key = self._key(token)
+        with self._lock:
+            if kid is not None and kid not in self._known_kids:
+                if self._known_kids:
+                    self._entries.clear()  # new signing key: re-verify everything
+                self._known_kids.add(kid)
+            self._entries[key] = (expires_at, dict(claims))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._known_kids.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
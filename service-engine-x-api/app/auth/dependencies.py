@@ -35,6 +35,11 @@ from aux_m2m_server import get_verifier, is_m2m, is_session
 from aux_m2m_server.errors import TokenVerificationError
 from fastapi import Header, HTTPException, Query, status
 
+from app.auth.claims_cache import ClaimsCache
+from app.config import settings
+from app.observability import current_query_stats
+from app.observability.metrics import record_cache_lookup
+
 
 # ── identity contexts ───────────────────────────────────────────────────
 
@@ -70,12 +75,30 @@ def _extract_bearer_token(authorization: str | None) -> str | None:
     return parts[1]
 
 
+# Verified claims keyed by token hash; see ``app.auth.claims_cache``.
+_claims_cache = ClaimsCache(
+    maxsize=settings.AUTH_CLAIMS_CACHE_SIZE,
+    max_ttl=settings.AUTH_CLAIMS_CACHE_MAX_TTL_SECONDS,
+)
+
+
 def _verify(token: str) -> dict[str, Any] | None:
-    """Verify a JWT via the shared JWKS verifier. Returns claims or ``None``."""
+    """Verify a JWT via the shared JWKS verifier. Returns claims or ``None``.
+
+    Tokens that verified recently are served from ``_claims_cache`` until
+    their ``exp`` (or the cache TTL, or a signing-key rotation).
+    """
+    cached = _claims_cache.get(token)
+    record_cache_lookup("jwt_claims", hit=cached is not None)
+    if cached is not None:
+        return cached
     try:
-        return get_verifier().verify(token)
+        claims = get_verifier().verify(token)
     except TokenVerificationError:
         return None
+    if claims is not None:
+        _claims_cache.put(token, claims)
+    return claims
 
 
 def _verify_session_or_system_m2m(authorization: str | None) -> dict[str, Any]:
@@ -97,14 +120,18 @@ def _verify_session_or_system_m2m(authorization: str | None) -> dict[str, Any]:
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="invalid_or_expired_token",
         )
-    if is_session(claims):
-        return claims
-    if is_m2m(claims) and str(claims.get("actor_type", "")) == "system_service":
-        return claims
-    raise HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="session_or_system_m2m_token_required",
-    )
+    if not is_session(claims) and not (
+        is_m2m(claims) and str(claims.get("actor_type", "")) == "system_service"
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="session_or_system_m2m_token_required",
+        )
+    # Lets ServerTimingMiddleware trust this request without re-verifying.
+    stats = current_query_stats()
+    if stats is not None:
+        stats.authenticated = True
+    return claims
 
 
 # ── deps ────────────────────────────────────────────────────────────────
@@ -0,0 +1,14 @@
+"""Shared caching substrate.
+
+One backend per process (``CACHE_BACKEND``): ``memory`` keeps a bounded
+LRU/TTL map per worker; ``redis`` shares entries across workers and replicas
+through any Redis-protocol server at ``CACHE_REDIS_URL``. Routers create
+named ``Cache`` objects over it; lookups are counted in
+``serx_cache_lookups_total{cache=<name>}``.
+"""
+
+from app.cache.backend import CacheBackend
+from app.cache.cache import Cache, get_cache_backend
+from app.cache.memory import MemoryBackend
+
+__all__ = ["Cache", "CacheBackend", "MemoryBackend", "get_cache_backend"]
@@ -0,0 +1,46 @@
+"""Cache backend interface.
+
+Backends store opaque bytes under string keys with a per-key TTL. They know
+nothing about serialization, namespaces or metrics; ``Cache`` adds those.
+"""
+
+from abc import ABC, abstractmethod
+
+
+class CacheBackend(ABC):
+    """Async key/value store shared by every ``Cache``."""
+
+    #: Whether other processes see this backend's entries (and its deletes).
+    shared: bool = False
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        """The stored value, or ``None`` if missing or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store ``value`` for ``ttl`` seconds."""
+
+    @abstractmethod
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        """Store ``value`` only if ``key`` is absent; ``True`` if stored."""
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """Remove ``keys`` (missing keys are ignored)."""
+
+    @abstractmethod
+    async def delete_prefix(self, prefix: str) -> int:
+        """Remove every key starting with ``prefix``; returns how many."""
+
+    async def get_many(self, keys: list[str]) -> list[bytes | None]:
+        """``get`` for each of ``keys``, in order (one round trip where supported)."""
+        return [await self.get(key) for key in keys]
+
+    async def set_many(self, items: dict[str, bytes], ttl: float) -> None:
+        """``set`` every item (one round trip where supported)."""
+        for key, value in items.items():
+            await self.set(key, value, ttl)
+
+    async def close(self) -> None:
+        """Release connections (no-op by default)."""
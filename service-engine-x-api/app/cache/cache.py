@@ -0,0 +1,250 @@
+"""Named caches over the shared backend.
+
+``Cache`` is what routers use: a name (the metrics label and key prefix), a
+default TTL, JSON serialization (``app.utils.json_codec``), namespaced keys
+and ``get_or_load`` with stampede protection.
+
+Keys are laid out as ``{CACHE_KEY_PREFIX}:{name}:{namespace}:{key}``. A
+namespace is usually an org id, so ``invalidate_namespace(org_id)`` drops
+everything cached for that org in one call, and ``invalidate_all()`` clears
+the whole cache.
+
+A TTL only holds when other processes' writes reach this cache: through a
+shared Redis backend (this API's own write-through invalidations) or the
+LISTEN/NOTIFY bus (``app.cache.invalidation``; every writer). Without
+either, each worker's memory cache would serve its copy until expiry, so
+TTLs are capped at ``CACHE_LOCAL_MAX_TTL_SECONDS``.
+
+Stampede protection works at two levels. Within a process, concurrent
+misses for the same key share one in-flight load. Across processes, the
+first loader takes a short lock key with ``add``. Other processes wait up
+to ``lock_timeout`` for the value to appear, then load it themselves, so a
+crashed lock holder costs one timeout and not an outage.
+
+An invalidation can land while a load is running, and the loaded value may
+predate the write. Each namespace therefore has a generation that every
+invalidation in this process bumps. ``get_or_load`` does not store a value
+whose namespace moved on during the load, and callers arriving after the
+invalidation start a new load rather than joining the old one. Callers that
+load by hand pass ``generation(namespace)``, read before loading, to
+``set``/``set_many``.
+"""
+
+import asyncio
+import os
+from collections.abc import Awaitable, Callable
+from functools import lru_cache
+from typing import Any, TypeVar
+
+from app.cache.backend import CacheBackend
+from app.cache.memory import MemoryBackend
+from app.config import settings
+from app.observability.metrics import record_cache_lookup
+from app.utils.json_codec import dumps, loads
+
+T = TypeVar("T")
+
+_LOCK_POLL_INTERVAL = 0.05
+
+
+@lru_cache
+def get_cache_backend() -> CacheBackend:
+    """The process-wide backend selected by ``CACHE_BACKEND``."""
+    if settings.CACHE_BACKEND == "redis":
+        from app.cache.redis_backend import RedisBackend
+
+        return RedisBackend(settings.CACHE_REDIS_URL)
+    if settings.CACHE_BACKEND != "memory":
+        raise ValueError(f"unknown CACHE_BACKEND {settings.CACHE_BACKEND!r}")
+    return MemoryBackend(max_entries=settings.CACHE_MEMORY_MAX_ENTRIES)
+
+
+# Redis connections are bound to the process that opened them.
+os.register_at_fork(after_in_child=get_cache_backend.cache_clear)
+
+
+def invalidation_is_coordinated() -> bool:
+    """Whether writes made by other processes invalidate this process's cache."""
+    return settings.CACHE_BACKEND == "redis" or bool(settings.SERVICE_ENGINE_X_DATABASE_URL)
+
+
+class Cache:
+    """A named, namespaced JSON cache with single-flight loading."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        ttl: float,
+        backend: CacheBackend | None = None,
+        lock_timeout: float = 2.0,
+    ) -> None:
+        self.name = name
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+        self._backend = backend
+        self._inflight: dict[str, asyncio.Future[Any]] = {}
+        self._epoch = 0
+        self._generations: dict[str, int] = {}
+
+    @property
+    def backend(self) -> CacheBackend:
+        return self._backend if self._backend is not None else get_cache_backend()
+
+    def _prefix(self, namespace: str = "") -> str:
+        base = f"{settings.CACHE_KEY_PREFIX}:{self.name}:"
+        return f"{base}{namespace}:" if namespace else base
+
+    def _ttl(self, ttl: float | None) -> float:
+        ttl = self.ttl if ttl is None else ttl
+        if invalidation_is_coordinated():
+            return ttl
+        return min(ttl, settings.CACHE_LOCAL_MAX_TTL_SECONDS)
+
+    def key(self, key: str, namespace: str = "_") -> str:
+        return f"{self._prefix(namespace)}{key}"
+
+    def generation(self, namespace: str = "_") -> tuple[int, int]:
+        """A token that changes whenever ``namespace`` is invalidated in this process."""
+        return self._epoch, self._generations.get(namespace, 0)
+
+    def mark_invalidated(self, namespace: str | None = None) -> None:
+        """Move ``namespace`` (``None``: every namespace) to a new generation.
+
+        The ``invalidate*`` methods call this. Call it directly when another
+        process already removed the entries from a shared backend.
+        """
+        if namespace is None:
+            self._epoch += 1
+        else:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+        prefix = self._prefix(namespace or "")
+        for full_key in [k for k in self._inflight if k.startswith(prefix)]:
+            del self._inflight[full_key]
+
+    async def get(self, key: str, *, namespace: str = "_", default: Any = None) -> Any:
+        raw = await self.backend.get(self.key(key, namespace))
+        record_cache_lookup(self.name, raw is not None)
+        return default if raw is None else loads(raw)
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        *,
+        namespace: str = "_",
+        ttl: float | None = None,
+        generation: tuple[int, int] | None = None,
+    ) -> None:
+        """Store ``value``; skipped if ``generation`` is given and no longer current."""
+        if generation is not None and generation != self.generation(namespace):
+            return
+        await self.backend.set(self.key(key, namespace), dumps(value), self._ttl(ttl))
+
+    async def get_many(self, keys: list[str], *, namespace: str = "_") -> dict[str, Any]:
+        """``{key: value}`` for the ``keys`` that are cached; misses are left out."""
+        raws = await self.backend.get_many([self.key(key, namespace) for key in keys])
+        found: dict[str, Any] = {}
+        for key, raw in zip(keys, raws):
+            record_cache_lookup(self.name, raw is not None)
+            if raw is not None:
+                found[key] = loads(raw)
+        return found
+
+    async def set_many(
+        self,
+        values: dict[str, Any],
+        *,
+        namespace: str = "_",
+        ttl: float | None = None,
+        generation: tuple[int, int] | None = None,
+    ) -> None:
+        """Store ``values``; skipped if ``generation`` is given and no longer current."""
+        if generation is not None and generation != self.generation(namespace):
+            return
+        items = {self.key(key, namespace): dumps(value) for key, value in values.items()}
+        await self.backend.set_many(items, self._ttl(ttl))
+
+    async def invalidate(self, key: str, *, namespace: str = "_") -> None:
+        self.mark_invalidated(namespace)
+        await self.backend.delete(self.key(key, namespace))
+
+    async def invalidate_namespace(self, namespace: str) -> int:
+        self.mark_invalidated(namespace)
+        return await self.backend.delete_prefix(self._prefix(namespace))
+
+    async def invalidate_all(self) -> int:
+        self.mark_invalidated(None)
+        return await self.backend.delete_prefix(self._prefix())
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[T]],
+        *,
+        namespace: str = "_",
+        ttl: float | None = None,
+    ) -> T:
+        """Cached value for ``key``, loading (once) and storing it on a miss."""
+        full_key = self.key(key, namespace)
+        generation = self.generation(namespace)
+        raw = await self.backend.get(full_key)
+        if raw is not None:
+            record_cache_lookup(self.name, True)
+            return loads(raw)
+        record_cache_lookup(self.name, False)
+
+        inflight = self._inflight.get(full_key)
+        if inflight is not None:
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise  # this caller was cancelled
+                # The loading request went away; load on our own.
+                return await self.get_or_load(key, loader, namespace=namespace, ttl=ttl)
+
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._inflight[full_key] = future
+        try:
+            value = await self._load(full_key, loader, self._ttl(ttl), namespace, generation)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # mark retrieved: waiters re-raise, nobody else must
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            if self._inflight.get(full_key) is future:
+                del self._inflight[full_key]
+
+    async def _load(
+        self,
+        full_key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: float,
+        namespace: str,
+        generation: tuple[int, int],
+    ) -> Any:
+        lock_key = f"{full_key}:lock"
+        owns_lock = await self.backend.add(lock_key, b"1", self.lock_timeout)
+        if not owns_lock:
+            # Another process is loading; give it a moment to publish.
+            deadline = asyncio.get_running_loop().time() + self.lock_timeout
+            while asyncio.get_running_loop().time() < deadline:
+                await asyncio.sleep(_LOCK_POLL_INTERVAL)
+                raw = await self.backend.get(full_key)
+                if raw is not None:
+                    return loads(raw)
+        try:
+            value = await loader()
+            if generation == self.generation(namespace):
+                await self.backend.set(full_key, dumps(value), ttl)
+            return value
+        finally:
+            if owns_lock:
+                await self.backend.delete(lock_key)
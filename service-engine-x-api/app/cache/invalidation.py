@@ -0,0 +1,237 @@
+"""Change-driven cache invalidation.
+
+Rows on cached tables are written by this API, by ``scripts/`` and by other
+services, so TTLs alone cannot keep caches fresh. Triggers from migration
+``025_cache_invalidation_notify.sql`` send ``NOTIFY serx_cache_invalidation``
+with the changed row's keys on commit. Every worker runs an
+``InvalidationListener`` holding one ``LISTEN`` connection, so every
+worker's in-process caches are invalidated, not just the worker that wrote.
+
+Entries in a shared backend (Redis) only need deleting once per change, so
+one listener per deployment, the holder of a session advisory lock, is the
+leader and applies changes to shared caches. The others only retire their
+in-flight loads of the changed namespaces (``Cache.mark_invalidated``) and
+retry the lock on every heartbeat, taking over when the leader goes away.
+
+What a change invalidates is declared next to the cache::
+
+    catalog = Cache("service_catalog", ttl=3600)
+    invalidate_on_change(catalog, "services", namespace=lambda c: c.org_id)
+
+A rule drops the whole ``namespace`` by default. With ``key``, it drops one
+key in that namespace. If the namespace is unknown (``None``), or the table
+was truncated, the whole cache is dropped.
+
+Notifications are not queued while disconnected. After every (re)connect
+the listener therefore flushes each process-local cache that has a rule, and
+a listener that becomes leader flushes the shared ones too: changes made
+while no leader was listening were never applied to them. Worker restarts do
+not wipe a shared cache unless the restarted worker was the leader.
+
+``SERVICE_ENGINE_X_DATABASE_URL`` must be a direct or session-mode
+connection: LISTEN does not work through a transaction pooler.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.cache.cache import Cache
+from app.observability.metrics import record_cache_invalidation
+from app.utils.json_codec import JSONDecodeError, loads
+
+logger = logging.getLogger("cache")
+
+CHANNEL = "serx_cache_invalidation"
+
+# Session advisory lock held by the listener that applies changes to shared caches.
+LEADER_LOCK_SQL = "SELECT pg_try_advisory_lock(hashtext($1))"
+
+
+@dataclass(frozen=True)
+class RowChange:
+    table: str
+    op: str
+    keys: dict[str, str | None] = field(default_factory=dict)
+
+    @property
+    def id(self) -> str | None:
+        return self.keys.get("id")
+
+    @property
+    def org_id(self) -> str | None:
+        return self.keys.get("org_id")
+
+    @classmethod
+    def from_payload(cls, payload: str) -> "RowChange":
+        data = loads(payload)
+        return cls(table=data["table"], op=data["op"], keys=dict(data.get("keys") or {}))
+
+
+KeyFn = Callable[[RowChange], str | None]
+
+
+@dataclass(frozen=True)
+class InvalidationRule:
+    cache: Cache
+    namespace: KeyFn
+    key: KeyFn | None = None
+
+    async def apply(self, change: RowChange, *, shared: bool = True) -> None:
+        namespace = None if change.op == "TRUNCATE" else self.namespace(change)
+        if self.cache.backend.shared and not shared:
+            # The leader deletes the shared entries; only retire local loads.
+            self.cache.mark_invalidated(namespace)
+        elif namespace is None:
+            await self.cache.invalidate_all()
+        elif self.key is None:
+            await self.cache.invalidate_namespace(namespace)
+        elif (key := self.key(change)) is not None:
+            await self.cache.invalidate(key, namespace=namespace)
+        else:
+            await self.cache.invalidate_namespace(namespace)
+
+
+_rules: defaultdict[str, list[InvalidationRule]] = defaultdict(list)
+
+
+def invalidate_on_change(
+    cache: Cache,
+    *tables: str,
+    namespace: KeyFn = lambda change: change.org_id,
+    key: KeyFn | None = None,
+) -> None:
+    """Drop entries of ``cache`` whenever a row of any of ``tables`` changes."""
+    for table in tables:
+        _rules[table].append(InvalidationRule(cache, namespace, key))
+
+
+def _rule_caches() -> list[Cache]:
+    caches = {id(rule.cache): rule.cache for rules in _rules.values() for rule in rules}
+    return list(caches.values())
+
+
+async def apply_change(change: RowChange, *, shared: bool = True) -> None:
+    """Run every rule registered for ``change.table``.
+
+    With ``shared=False`` caches over a shared backend keep their entries
+    (another process deletes them) and only move to a new generation.
+    """
+    rules = _rules.get(change.table)
+    if not rules:
+        return
+    record_cache_invalidation(change.table)
+    for rule in rules:
+        try:
+            await rule.apply(change, shared=shared)
+        except Exception:
+            logger.exception("invalidating %s for %s failed", rule.cache.name, change.table)
+
+
+async def flush_all(*, shared: bool = True) -> None:
+    """Drop every cache that has an invalidation rule (see ``apply_change`` for ``shared``)."""
+    for cache in _rule_caches():
+        if cache.backend.shared and not shared:
+            cache.mark_invalidated()
+        else:
+            await cache.invalidate_all()
+
+
+class InvalidationListener:
+    """Hold a LISTEN connection and apply notifications to local caches."""
+
+    def __init__(
+        self,
+        dsn: str,
+        *,
+        channel: str = CHANNEL,
+        heartbeat: float = 30.0,
+        max_backoff: float = 30.0,
+    ) -> None:
+        self.dsn = dsn
+        self.channel = channel
+        self.heartbeat = heartbeat
+        self.max_backoff = max_backoff
+        self.connected = asyncio.Event()
+        self.leader = False
+        self._task: asyncio.Task[None] | None = None
+        self._pending: set[asyncio.Task[None]] = set()
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        try:
+            change = RowChange.from_payload(payload)
+        except (JSONDecodeError, KeyError, TypeError):
+            logger.warning("ignoring malformed invalidation payload: %r", payload)
+            return
+        task = asyncio.get_running_loop().create_task(apply_change(change, shared=self.leader))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _listen_once(self) -> None:
+        import asyncpg
+
+        connection = await asyncpg.connect(self.dsn)
+        closed = asyncio.Event()
+        connection.add_termination_listener(lambda _: closed.set())
+        try:
+            await connection.add_listener(self.channel, self._on_notify)
+            await flush_all(shared=False)  # anything changed while we were not listening
+            await self._try_lead(connection)
+            self.connected.set()
+            logger.info("listening for cache invalidations on %s", self.channel)
+            while not closed.is_set():
+                try:
+                    await asyncio.wait_for(closed.wait(), self.heartbeat)
+                except TimeoutError:
+                    # An idle connection can die silently (NAT, failover); the
+                    # lock attempt doubles as the heartbeat query.
+                    if self.leader:
+                        await connection.fetchval("SELECT 1", timeout=self.heartbeat)
+                    else:
+                        await self._try_lead(connection)
+        finally:
+            self.leader = False
+            self.connected.clear()
+            if not connection.is_closed():
+                connection.terminate()
+
+    async def _try_lead(self, connection: Any) -> None:
+        if await connection.fetchval(LEADER_LOCK_SQL, self.channel, timeout=self.heartbeat):
+            self.leader = True
+            logger.info("applying cache invalidations to shared caches")
+            await flush_all()  # changes no leader applied while there was none
+
+    async def _run(self) -> None:
+        delay = 1.0
+        while True:
+            try:
+                await self._listen_once()
+                logger.warning("invalidation listener connection closed; reconnecting")
+                delay = 1.0
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("invalidation listener failed: %s; retrying in %.0fs", exc, delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_backoff)
+                continue
+            await asyncio.sleep(delay)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
@@ -0,0 +1,108 @@
+"""Redis-protocol cache backend.
+
+Shared by every worker and replica, so a value loaded once is reused
+everywhere and an invalidation is seen by all of them. Works with anything
+speaking RESP (Redis, Valkey, Dragonfly, Upstash); only GET, MGET,
+SET (PX/NX), UNLINK and SCAN are used.
+
+A cache outage must not become an API outage: connection errors are logged
+and treated as misses (reads) or no-ops (writes).
+"""
+
+import logging
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.cache.backend import CacheBackend
+
+logger = logging.getLogger("cache")
+
+_SCAN_BATCH = 500
+_GLOB_SPECIAL = str.maketrans({c: f"\\{c}" for c in "\\*?[]"})
+
+
+def _glob_escape(text: str) -> str:
+    """``text`` as a literal in a SCAN MATCH pattern (org ids are not trusted to be plain)."""
+    return text.translate(_GLOB_SPECIAL)
+
+
+class RedisBackend(CacheBackend):
+    """``CacheBackend`` over a pooled ``redis.asyncio`` client."""
+
+    shared = True
+
+    def __init__(self, url: str, *, socket_timeout: float = 0.5) -> None:
+        self._client = Redis.from_url(
+            url,
+            socket_timeout=socket_timeout,
+            socket_connect_timeout=socket_timeout,
+            health_check_interval=30,
+        )
+
+    async def get(self, key: str) -> bytes | None:
+        try:
+            return await self._client.get(key)
+        except RedisError as exc:
+            logger.warning("cache get %s failed: %s", key, exc)
+            return None
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        try:
+            await self._client.set(key, value, px=max(1, int(ttl * 1000)))
+        except RedisError as exc:
+            logger.warning("cache set %s failed: %s", key, exc)
+
+    async def get_many(self, keys: list[str]) -> list[bytes | None]:
+        if not keys:
+            return []
+        try:
+            return await self._client.mget(keys)
+        except RedisError as exc:
+            logger.warning("cache mget failed: %s", exc)
+            return [None] * len(keys)
+
+    async def set_many(self, items: dict[str, bytes], ttl: float) -> None:
+        if not items:
+            return
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    pipe.set(key, value, px=max(1, int(ttl * 1000)))
+                await pipe.execute()
+        except RedisError as exc:
+            logger.warning("cache set_many failed: %s", exc)
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        try:
+            return bool(await self._client.set(key, value, px=max(1, int(ttl * 1000)), nx=True))
+        except RedisError as exc:
+            logger.warning("cache add %s failed: %s", key, exc)
+            return True  # behave as if we own the lock; the caller just loads
+
+    async def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        try:
+            await self._client.unlink(*keys)
+        except RedisError as exc:
+            logger.warning("cache delete failed: %s", exc)
+
+    async def delete_prefix(self, prefix: str) -> int:
+        deleted = 0
+        batch: list[bytes] = []
+        pattern = f"{_glob_escape(prefix)}*"
+        try:
+            async for key in self._client.scan_iter(match=pattern, count=_SCAN_BATCH):
+                batch.append(key)
+                if len(batch) >= _SCAN_BATCH:
+                    deleted += await self._client.unlink(*batch)
+                    batch.clear()
+            if batch:
+                deleted += await self._client.unlink(*batch)
+        except RedisError as exc:
+            logger.warning("cache delete_prefix %s failed: %s", prefix, exc)
+        return deleted
+
+    async def close(self) -> None:
+        await self._client.aclose()
@@ -15,6 +15,41 @@ class Settings(BaseAuthSettings):
     SERVICE_ENGINE_X_SUPABASE_URL: str
     SERVICE_ENGINE_X_SUPABASE_SERVICE_ROLE_KEY: str
 
+    # Optional read replica: eligible PostgREST reads go here (see
+    # app/read_routing.py). The key defaults to the service-role key. A
+    # caller that wrote reads from the primary for READ_YOUR_WRITES_SECONDS.
+    SERVICE_ENGINE_X_SUPABASE_READ_URL: str = ""
+    SERVICE_ENGINE_X_SUPABASE_READ_KEY: str = ""
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    # Verified-JWT claims cache (per worker). Entries expire at the token's
+    # exp or after the max TTL, whichever is first; size 0 disables it.
+    AUTH_CLAIMS_CACHE_SIZE: int = 1024
+    AUTH_CLAIMS_CACHE_MAX_TTL_SECONDS: int = 300
+
+    # Shared cache (app/cache): "memory" is per worker; "redis" shares entries
+    # across workers and replicas via any Redis-protocol server.
+    CACHE_BACKEND: str = "memory"
+    CACHE_REDIS_URL: str = ""
+    CACHE_KEY_PREFIX: str = "serx"
+    CACHE_MEMORY_MAX_ENTRIES: int = 10000
+    # TTL cap when neither Redis nor the invalidation listener is configured.
+    CACHE_LOCAL_MAX_TTL_SECONDS: float = 10.0
+    # Per-org service catalog (app/services/service_catalog.py)
+    SERVICE_CATALOG_TTL_SECONDS: int = 3600
+    # Per-org user profile projections (app/services/user_profiles.py)
+    USER_PROFILE_TTL_SECONDS: int = 900
+    # Tag name -> id mapping (app/services/tags.py)
+    TAG_CACHE_TTL_SECONDS: int = 3600
+
+    # Invoice/order numbers reserved per worker per reserve_numbers() call
+    # (app/services/numbering.py)
+    NUMBER_BLOCK_SIZE: int = 20
+
+    # Direct / session-mode Postgres DSN for LISTEN-based cache invalidation
+    # (app/cache/invalidation.py); empty disables the listener.
+    SERVICE_ENGINE_X_DATABASE_URL: str = ""
+
     # CORS
     CORS_ORIGINS: list[str] = ["http://localhost:3000"]
 
@@ -24,6 +59,50 @@ class Settings(BaseAuthSettings):
     APP_NAME: str = "Service Engine X API"
     APP_VERSION: str = "1.0.0"
 
+    # Server-Timing header: always on for authenticated / internal callers,
+    # sampled at this rate for unauthenticated public routes (0 disables).
+    SERVER_TIMING_PUBLIC_SAMPLE_RATE: float = 0.05
+
+    # Slow-request recorder (/api/internal/debug/slow-requests): keep the
+    # slowest N requests per route at or above the threshold.
+    SLOW_REQUEST_THRESHOLD_MS: float = 1000.0
+    SLOW_REQUEST_PER_ROUTE: int = 10
+    SLOW_REQUEST_MAX_ROUTES: int = 200
+    SLOW_REQUEST_SAMPLE_RATE: float = 1.0
+
+    # On-demand sampling profiler (/api/internal/debug/profile)
+    PROFILER_MAX_SECONDS: int = 30
+    PROFILER_COOLDOWN_SECONDS: int = 60
+
+    # Event-loop watchdog: heartbeat interval, and how long the loop must be
+    # blocked before the stall's stack is captured. LOOP_FORBID_BLOCKING_IO
+    # makes blocking socket I/O on the loop raise (local debugging only).
+    LOOP_WATCHDOG_ENABLED: bool = True
+    LOOP_WATCHDOG_INTERVAL_MS: int = 100
+    LOOP_STALL_THRESHOLD_MS: int = 250
+    LOOP_FORBID_BLOCKING_IO: bool = False
+
+    # Startup: warm JWKS / PostgREST / the OPEX token in the lifespan, and
+    # serve the OpenAPI document rendered at build time (scripts/save_openapi.py).
+    STARTUP_WARMUP_ENABLED: bool = True
+    STARTUP_WARMUP_TIMEOUT_SECONDS: float = 10.0
+    OPENAPI_ARTIFACT_PATH: str = ""
+
+    # Production server (python -m app.serve). SERVE_WORKERS=0 sizes the
+    # worker count to the CPUs available to the container; workers are
+    # recycled after SERVE_MAX_REQUESTS (+ jitter) requests to bound memory.
+    PORT: int = 8000
+    SERVE_HOST: str = "0.0.0.0"
+    SERVE_WORKERS: int = 0
+    SERVE_LOOP: str = "uvloop"
+    SERVE_HTTP: str = "httptools"
+    SERVE_BACKLOG: int = 2048
+    SERVE_KEEPALIVE_SECONDS: int = 30
+    SERVE_GRACEFUL_TIMEOUT_SECONDS: int = 30
+    SERVE_MAX_REQUESTS: int = 10000
+    SERVE_MAX_REQUESTS_JITTER: int = 1000
+    SERVE_LIMIT_CONCURRENCY: int | None = None
+
     # Managed agents dispatch (used by scheduler endpoint).
     # Outbound auth to OPEX is handled by ``aux_m2m_client.AsyncM2MAuth`` —
     # there is no longer a static ``OPEX_AUTH_TOKEN`` in this config.
@@ -36,6 +115,15 @@ class Settings(BaseAuthSettings):
     SCHEDULER_MAX_DISPATCH_ATTEMPTS: int = 5
     SCHEDULER_DISPATCH_TIMEOUT_SECONDS: float = 15.0
 
+    # Leased consumption of cal_raw_events (claim / ack / fail)
+    CAL_RAW_EVENT_LEASE_SECONDS: int = 300
+    CAL_RAW_EVENT_MAX_LEASE_SECONDS: int = 3600
+    CAL_RAW_EVENT_MAX_ATTEMPTS: int = 5
+
+    # Bulk normalization of cal_raw_events (internal endpoint / backfill script)
+    CAL_NORMALIZE_PAGE_SIZE: int = 500
+    CAL_NORMALIZE_MAX_EVENTS_PER_REQUEST: int = 5000
+
     # Third-party
     RESEND_API_KEY: str = ""
     DOCRAPTOR_API_KEY: str = ""
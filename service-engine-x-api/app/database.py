@@ -1,20 +1,65 @@
 """Supabase client initialization."""
 
+import asyncio
+import os
 from functools import lru_cache
+from typing import Any
 
 from supabase import Client, create_client
 
 from app.config import settings
+from app.observability import instrument_http_client
+from app.read_routing import route_reads_to_replica
 
 
 @lru_cache
 def get_supabase() -> Client:
-    """Get cached Supabase client instance."""
-    return create_client(
+    """Get cached Supabase client instance.
+
+    The PostgREST and Storage sessions are instrumented so every round trip is
+    counted against the request that made it (see ``app.observability.query_stats``).
+    With a read replica configured, eligible PostgREST reads are sent to it
+    (see ``app.read_routing``); writes always go to the primary.
+    """
+    client = create_client(
         settings.SERVICE_ENGINE_X_SUPABASE_URL,
         settings.SERVICE_ENGINE_X_SUPABASE_SERVICE_ROLE_KEY,
     )
+    instrument_http_client(client.postgrest.session)
+    instrument_http_client(client.storage.session)
+    if settings.SERVICE_ENGINE_X_SUPABASE_READ_URL:
+        route_reads_to_replica(
+            client.postgrest.session,
+            url=settings.SERVICE_ENGINE_X_SUPABASE_READ_URL,
+            primary_url=settings.SERVICE_ENGINE_X_SUPABASE_URL,
+            key=(
+                settings.SERVICE_ENGINE_X_SUPABASE_READ_KEY
+                or settings.SERVICE_ENGINE_X_SUPABASE_SERVICE_ROLE_KEY
+            ),
+        )
+    return client
 
 
 # Convenience alias for direct imports
 supabase = get_supabase
+
+# A client built before a fork would share its pooled sockets with the
+# parent; each worker process builds its own on first use.
+os.register_at_fork(after_in_child=get_supabase.cache_clear)
+
+
+async def execute_concurrently(*queries: Any) -> list[Any]:
+    """Execute independent PostgREST queries in parallel.
+
+    The Supabase client is synchronous, so each ``execute()`` runs in a worker
+    thread; the event loop stays free while the round trips overlap. Results
+    come back in argument order. ``None`` placeholders are passed through as
+    ``None`` so callers can keep positional unpacking for conditional queries.
+    """
+
+    async def _run(query: Any) -> Any:
+        if query is None:
+            return None
+        return await asyncio.to_thread(query.execute)
+
+    return list(await asyncio.gather(*(_run(query) for query in queries)))
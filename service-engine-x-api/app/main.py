@@ -1,15 +1,27 @@
 """FastAPI application entry point."""
 
 import traceback
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from functools import lru_cache
 
 from aux_m2m_server import JWKSVerifier, build_health_router, set_verifier
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
+from app.cache.invalidation import InvalidationListener
 from app.config import settings
+from app.observability import QueryStatsMiddleware, ServerTimingMiddleware
+from app.observability.loop_watchdog import install_blocking_guard, start_loop_watchdog
+from app.observability.metrics import install_metrics
+from app.observability.slow_requests import install_slow_request_recorder
+from app.openapi_artifact import load_openapi_artifact
+from app.read_routing import ReadRoutingMiddleware
+from app.utils.json_codec import FastJSONResponse, loads
+from app.warmup import warm_up
 
 # Wire the shared AUX JWKS verifier. Must run before any FastAPI dep that
 # calls ``get_verifier()``; module import time is fine.
@@ -25,7 +37,9 @@ from app.routers import (
     conversations_router,
     engagements_router,
     internal_cal_events_router,
+    internal_debug_router,
     internal_meetings_deals_router,
+    internal_metrics_router,
     internal_router,
     internal_scheduler_router,
     internal_webhook_events_router,
@@ -45,12 +59,40 @@ from app.routers import (
 )
 from app.routers.internal_scheduler import get_opex_token_client
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Start the watchdog and cache invalidation listener, then warm dependencies."""
+    if settings.LOOP_FORBID_BLOCKING_IO:
+        install_blocking_guard()
+    watchdog = None
+    if settings.LOOP_WATCHDOG_ENABLED:
+        watchdog = start_loop_watchdog(
+            interval=settings.LOOP_WATCHDOG_INTERVAL_MS / 1000,
+            stall_threshold=settings.LOOP_STALL_THRESHOLD_MS / 1000,
+        )
+    invalidation_listener = None
+    if settings.SERVICE_ENGINE_X_DATABASE_URL:
+        invalidation_listener = InvalidationListener(settings.SERVICE_ENGINE_X_DATABASE_URL)
+        invalidation_listener.start()
+    _openapi_artifact()
+    if settings.STARTUP_WARMUP_ENABLED:
+        await warm_up(timeout=settings.STARTUP_WARMUP_TIMEOUT_SECONDS)
+    yield
+    if invalidation_listener is not None:
+        await invalidation_listener.stop()
+    if watchdog is not None:
+        await watchdog.stop()
+
+
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     description="Service Engine X REST API",
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -60,6 +102,25 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Server-Timing reads the stats QueryStatsMiddleware opens, so it is added
+# first (middleware added later wraps the ones added before it).
+app.add_middleware(
+    ServerTimingMiddleware,
+    public_sample_rate=settings.SERVER_TIMING_PUBLIC_SAMPLE_RATE,
+)
+app.add_middleware(QueryStatsMiddleware)  # Per-request Supabase round-trip accounting
+if settings.SERVICE_ENGINE_X_SUPABASE_READ_URL:
+    app.add_middleware(  # Replica reads for read requests; read-your-writes window
+        ReadRoutingMiddleware,
+        read_your_writes_seconds=settings.READ_YOUR_WRITES_SECONDS,
+    )
+install_metrics()  # Feed Prometheus histograms from the per-request stats
+install_slow_request_recorder(
+    threshold_ms=settings.SLOW_REQUEST_THRESHOLD_MS,
+    per_route=settings.SLOW_REQUEST_PER_ROUTE,
+    max_routes=settings.SLOW_REQUEST_MAX_ROUTES,
+    sample_rate=settings.SLOW_REQUEST_SAMPLE_RATE,
+)
 
 
 @app.exception_handler(RequestValidationError)
@@ -167,15 +228,30 @@ app.include_router(internal_cal_events_router)  # Internal Cal.com normalization
 app.include_router(internal_meetings_deals_router)  # Internal meetings/deals + org resolution
 app.include_router(internal_webhook_events_router)  # Internal read of serx-webhooks webhook_events_raw
 app.include_router(internal_scheduler_router)  # Time-based event dispatcher (Trigger.dev ticker → MAG)
+app.include_router(internal_metrics_router)  # Prometheus scrape endpoint
+app.include_router(internal_debug_router)  # Slow requests, loop stalls, sampling profiler
 app.include_router(orgs_router)  # Public orgs list (for frontend org picker)
 app.include_router(users_router)  # Public users list (for frontend user picker)
 
 
+@lru_cache
+def _openapi_artifact() -> bytes | None:
+    """The build-time OpenAPI document, if configured and matching these routes."""
+    return load_openapi_artifact(
+        settings.OPENAPI_ARTIFACT_PATH, app.routes, settings.APP_VERSION
+    )
+
+
 def custom_openapi() -> dict:
     """Generate custom OpenAPI schema with security definitions."""
     if app.openapi_schema:
         return app.openapi_schema
 
+    artifact = _openapi_artifact()
+    if artifact is not None:
+        app.openapi_schema = loads(artifact)
+        return app.openapi_schema
+
     openapi_schema = get_openapi(
         title=settings.APP_NAME,
         version=settings.APP_VERSION,
@@ -235,9 +311,12 @@ app.openapi = custom_openapi
 
 
 @app.get("/api/openapi.json", tags=["OpenAPI"], include_in_schema=False)
-async def get_openapi_spec() -> dict:
-    """Return the OpenAPI specification as JSON."""
-    return app.openapi()
+async def get_openapi_spec() -> Response:
+    """Return the OpenAPI specification as JSON (the prebuilt file when available)."""
+    artifact = _openapi_artifact()
+    if artifact is not None:
+        return Response(content=artifact, media_type="application/json")
+    return FastJSONResponse(app.openapi())
 
 
 @app.get("/api", tags=["Index"])
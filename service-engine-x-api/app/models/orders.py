@@ -2,7 +2,7 @@
 
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 from app.models.services import MetadataItem
 
@@ -47,6 +47,13 @@ class OrderCreate(BaseModel):
     date_completed: str | None = None
     date_due: str | None = None
 
+    @field_validator("number")
+    @classmethod
+    def validate_number(cls, v: str | None) -> str | None:
+        if v is not None and v.upper().startswith("ORD-"):
+            raise ValueError("Order numbers starting with ORD- are reserved for generated numbers")
+        return v
+
 
 class OrderUpdate(BaseModel):
     """Request body for updating an order."""
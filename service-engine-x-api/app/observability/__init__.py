@@ -0,0 +1,34 @@
+"""Request-level instrumentation: Supabase round trips, outbound calls, Server-Timing."""
+
+from app.observability.query_stats import (
+    OutboundCall,
+    QueryRecord,
+    QueryStats,
+    QueryStatsMiddleware,
+    add_query_observer,
+    current_query_stats,
+    endpoint_name,
+    instrument_http_client,
+    outbound_span,
+    remove_query_observer,
+    timed_outbound,
+    track_queries,
+)
+from app.observability.server_timing import ServerTimingMiddleware, render_server_timing
+
+__all__ = [
+    "OutboundCall",
+    "QueryRecord",
+    "QueryStats",
+    "QueryStatsMiddleware",
+    "ServerTimingMiddleware",
+    "add_query_observer",
+    "current_query_stats",
+    "endpoint_name",
+    "instrument_http_client",
+    "outbound_span",
+    "remove_query_observer",
+    "render_server_timing",
+    "timed_outbound",
+    "track_queries",
+]
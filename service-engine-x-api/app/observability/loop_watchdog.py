@@ -0,0 +1,214 @@
+"""Event-loop lag watchdog and blocking-call guard.
+
+Many handlers are ``async def`` but call blocking clients (Supabase
+``execute()``, Stripe, Resend, DocRaptor); while they wait on the network
+the event loop serves nobody. Two tools make that visible:
+
+``LoopWatchdog``
+    A heartbeat coroutine wakes every ``interval`` and records how late it
+    was (``serx_event_loop_lag_seconds``). A monitor thread notices when the
+    heartbeat has been silent for longer than ``stall_threshold``, captures
+    the loop thread's stack once per stall, logs it and keeps the most recent
+    stalls for ``/api/internal/debug/loop-stalls``.
+
+``forbid_blocking_io``
+    Patches blocking socket operations to raise ``BlockingCallError`` when
+    they run on a thread with a running event loop. Sockets in non-blocking
+    mode (asyncio's own transports) are unaffected, and ``asyncio.to_thread``
+    work runs on other threads, so only genuinely blocking calls fail. Meant
+    for tests and local debugging (``LOOP_FORBID_BLOCKING_IO``).
+"""
+
+import asyncio
+import functools
+import logging
+import socket
+import ssl
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from prometheus_client import Counter, Histogram
+
+logger = logging.getLogger("loop_watchdog")
+
+LOOP_LAG = Histogram(
+    "serx_event_loop_lag_seconds",
+    "How late the event-loop heartbeat woke up.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+LOOP_STALLS = Counter(
+    "serx_event_loop_stalls_total",
+    "Times the event loop was blocked for longer than the stall threshold.",
+)
+
+
+class BlockingCallError(RuntimeError):
+    """A blocking socket operation ran on the event-loop thread."""
+
+
+@dataclass
+class LoopStall:
+    detected_at: str
+    blocked_ms: float
+    stack: list[str]
+
+
+class LoopWatchdog:
+    """Measure loop lag continuously and capture the stack of long stalls."""
+
+    def __init__(
+        self, *, interval: float = 0.1, stall_threshold: float = 0.25, keep: int = 20
+    ) -> None:
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self.stalls: deque[LoopStall] = deque(maxlen=keep)
+        self._last_beat = time.perf_counter()
+        self._loop_thread_id: int | None = None
+        self._heartbeat: asyncio.Task[None] | None = None
+        self._monitor: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    async def _beat(self) -> None:
+        self._loop_thread_id = threading.get_ident()
+        while True:
+            start = time.perf_counter()
+            self._last_beat = start
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            self._last_beat = now
+            LOOP_LAG.observe(max(0.0, now - start - self.interval))
+
+    def _watch(self) -> None:
+        reported_beat: float | None = None
+        while not self._stop.wait(self.interval):
+            beat = self._last_beat
+            blocked = time.perf_counter() - beat - self.interval
+            if blocked < self.stall_threshold or beat == reported_beat:
+                continue
+            reported_beat = beat
+            frame = sys._current_frames().get(self._loop_thread_id or -1)
+            stack = traceback.format_stack(frame) if frame is not None else []
+            stall = LoopStall(
+                detected_at=datetime.now(UTC).isoformat(),
+                blocked_ms=round(blocked * 1000, 1),
+                stack=[line.rstrip() for line in stack],
+            )
+            self.stalls.append(stall)
+            LOOP_STALLS.inc()
+            logger.warning(
+                "event loop blocked for %.0fms:\n%s", stall.blocked_ms, "".join(stack[-15:])
+            )
+
+    def start(self) -> None:
+        """Start the heartbeat on the running loop and the monitor thread."""
+        if self._heartbeat is not None:
+            return
+        self._stop.clear()
+        self._last_beat = time.perf_counter()
+        self._heartbeat = asyncio.get_running_loop().create_task(self._beat())
+        self._monitor = threading.Thread(target=self._watch, name="serx-loop-watchdog", daemon=True)
+        self._monitor.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            try:
+                await self._heartbeat
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat = None
+        if self._monitor is not None:
+            await asyncio.to_thread(self._monitor.join)
+            self._monitor = None
+
+
+_watchdog: LoopWatchdog | None = None
+
+
+def get_loop_watchdog() -> LoopWatchdog | None:
+    return _watchdog
+
+
+def start_loop_watchdog(*, interval: float, stall_threshold: float) -> LoopWatchdog:
+    """Create (once) and start the process-wide watchdog on the running loop."""
+    global _watchdog
+    if _watchdog is None:
+        _watchdog = LoopWatchdog(interval=interval, stall_threshold=stall_threshold)
+    _watchdog.start()
+    return _watchdog
+
+
+# ── blocking-call guard ─────────────────────────────────────────────────
+
+# socket.socket inherits these from the C base class; SSLSocket overrides them.
+_GUARDED_CLASSES = (socket.socket, ssl.SSLSocket)
+_GUARDED_NAMES = ("connect", "send", "sendall", "recv", "recv_into")
+_guard_lock = threading.Lock()
+_guard_depth = 0
+_originals: dict[tuple[type, str], Callable[..., Any] | None] = {}
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _guarded(method: Callable[..., Any], name: str) -> Callable[..., Any]:
+    @functools.wraps(method)
+    def wrapper(self: socket.socket, *args: Any, **kwargs: Any) -> Any:
+        if self.gettimeout() != 0.0 and _on_event_loop():
+            raise BlockingCallError(
+                f"blocking socket.{name}() on the event loop thread; "
+                "run it with asyncio.to_thread() or use an async client"
+            )
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+@contextmanager
+def forbid_blocking_io() -> Iterator[None]:
+    """Raise ``BlockingCallError`` for blocking socket I/O on an event loop."""
+    install_blocking_guard()
+    try:
+        yield
+    finally:
+        uninstall_blocking_guard()
+
+
+def install_blocking_guard() -> None:
+    global _guard_depth
+    with _guard_lock:
+        _guard_depth += 1
+        if _guard_depth > 1:
+            return
+        for cls in _GUARDED_CLASSES:
+            for name in _GUARDED_NAMES:
+                _originals[(cls, name)] = vars(cls).get(name)
+                setattr(cls, name, _guarded(getattr(cls, name), name))
+
+
+def uninstall_blocking_guard() -> None:
+    global _guard_depth
+    with _guard_lock:
+        _guard_depth -= 1
+        if _guard_depth > 0:
+            return
+        for (cls, name), original in _originals.items():
+            if original is None:
+                delattr(cls, name)
+            else:
+                setattr(cls, name, original)
+        _originals.clear()
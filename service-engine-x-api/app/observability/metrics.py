@@ -0,0 +1,145 @@
+"""Prometheus metrics.
+
+Request, PostgREST and outbound latencies are fed from the per-request
+``QueryStats`` by a query observer (``install_metrics``), so handlers need no
+extra calls. Domain counters — webhook ingest, scheduler outcomes, cache
+lookups — are recorded explicitly with the ``record_*`` helpers.
+
+Multiprocess: when ``PROMETHEUS_MULTIPROC_DIR`` is set (it must be, and be an
+empty directory, before the workers start), ``prometheus_client`` writes every
+sample to per-process files and ``render_metrics`` aggregates them, so a
+scrape sees the sum over all uvicorn workers rather than whichever worker
+answered. Without it, metrics are per process.
+"""
+
+import os
+
+from prometheus_client import REGISTRY as DEFAULT_REGISTRY
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from app.observability.query_stats import QueryStats, add_query_observer
+from app.services.cal_normalization import BOOKING_EVENT_TYPES, RECORDING_EVENT_TYPES
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "serx_http_request_duration_seconds",
+    "HTTP request latency by route template and status code.",
+    ["method", "route", "status"],
+    buckets=_LATENCY_BUCKETS,
+)
+POSTGREST_CALL_DURATION = Histogram(
+    "serx_postgrest_call_duration_seconds",
+    "Supabase PostgREST / Storage round-trip latency by table and operation.",
+    ["table", "operation"],
+    buckets=_LATENCY_BUCKETS,
+)
+OUTBOUND_CALL_DURATION = Histogram(
+    "serx_outbound_call_duration_seconds",
+    "Third-party call latency by upstream (stripe, docraptor, resend, calcom, opex).",
+    ["upstream"],
+    buckets=_LATENCY_BUCKETS,
+)
+WEBHOOK_EVENTS = Counter(
+    "serx_webhook_events_total",
+    "Webhook deliveries ingested, by source and trigger / event type.",
+    ["source", "trigger"],
+)
+SCHEDULER_OUTCOMES = Counter(
+    "serx_scheduler_dispatch_total",
+    "Scheduler dispatch outcomes per event name.",
+    ["event_name", "outcome"],
+)
+CACHE_LOOKUPS = Counter(
+    "serx_cache_lookups_total",
+    "Cache lookups by cache and result (hit / miss); hit ratio = hit / total.",
+    ["cache", "result"],
+)
+CACHE_INVALIDATIONS = Counter(
+    "serx_cache_invalidations_total",
+    "Database change notifications applied to caches, by table.",
+    ["table"],
+)
+
+_OPERATIONS = {
+    "GET": "select",
+    "HEAD": "count",
+    "POST": "insert",
+    "PATCH": "update",
+    "PUT": "upsert",
+    "DELETE": "delete",
+}
+
+
+def _operation(method: str, table: str) -> str:
+    if table.startswith("rpc/"):
+        return "rpc"
+    if table.startswith("storage/"):
+        return {"POST": "upload", "PUT": "upload", "DELETE": "remove"}.get(method, "read")
+    return _OPERATIONS.get(method, method.lower())
+
+
+def _observe_request(endpoint: str, stats: QueryStats) -> None:
+    method = endpoint.partition(" ")[0]
+    # Unrouted paths (404s, scanners) would otherwise make one series per URL.
+    route = stats.route or "unmatched"
+    HTTP_REQUEST_DURATION.labels(method, route, str(stats.status_code)).observe(
+        stats.duration_ms / 1000
+    )
+    for record in stats.records:
+        operation = _operation(record.method, record.table)
+        POSTGREST_CALL_DURATION.labels(record.table, operation).observe(record.elapsed_ms / 1000)
+    for call in stats.outbound:
+        OUTBOUND_CALL_DURATION.labels(call.service).observe(call.elapsed_ms / 1000)
+
+
+def install_metrics() -> None:
+    """Start feeding request / PostgREST / outbound histograms from ``QueryStats``."""
+    add_query_observer(_observe_request)
+
+
+_CAL_TRIGGERS = frozenset(BOOKING_EVENT_TYPES | RECORDING_EVENT_TYPES)
+
+# Label values per source. Triggers come from the request body, so anything
+# outside these sets is counted as "other" to keep the series bounded.
+WEBHOOK_TRIGGERS: dict[str, frozenset[str]] = {
+    "cal": _CAL_TRIGGERS,
+    "calcom_legacy": _CAL_TRIGGERS,
+    "stripe": frozenset({"checkout.session.completed", "payment_intent.succeeded"}),
+}
+
+
+def record_webhook(source: str, trigger: str | None) -> None:
+    """Count a delivery; call only once the delivery has been authenticated."""
+    known = WEBHOOK_TRIGGERS.get(source, frozenset())
+    WEBHOOK_EVENTS.labels(source, trigger if trigger in known else "other").inc()
+
+
+def record_scheduler_outcomes(event_name: str, **counts: int) -> None:
+    """E.g. ``record_scheduler_outcomes("meeting_preframe_due", dispatched=3, failed=1)``."""
+    for outcome, count in counts.items():
+        if count:
+            SCHEDULER_OUTCOMES.labels(event_name, outcome).inc(count)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_LOOKUPS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def record_cache_invalidation(table: str) -> None:
+    CACHE_INVALIDATIONS.labels(table).inc()
+
+
+def render_metrics() -> bytes:
+    """Prometheus text exposition, aggregated across workers in multiprocess mode."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(DEFAULT_REGISTRY)
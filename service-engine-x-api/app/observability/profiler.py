@@ -0,0 +1,163 @@
+"""In-process sampling profiler.
+
+A daemon thread wakes every ``interval`` seconds, walks
+``sys._current_frames()`` and counts each thread's stack. The result is
+collapsed-stack text (``frame;frame;frame count`` per line), the input format
+of ``flamegraph.pl`` and speedscope. No native tooling or ptrace access is
+needed, so it works inside the container.
+
+While sampling, a coroutine on the event loop measures loop lag: it sleeps
+``interval`` and records how late it woke up. Lag means something held the
+loop (blocking I/O or CPU in an ``async def`` handler).
+
+Only one profile runs per process at a time; ``ProfilerBusyError`` is raised
+for concurrent requests and ``ProfilerRateLimitedError`` when a new profile
+is started within ``cooldown`` seconds of the previous one.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from types import FrameType
+
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class ProfilerBusyError(Exception):
+    """A profile is already running in this process."""
+
+
+class ProfilerRateLimitedError(Exception):
+    """The previous profile finished too recently."""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(f"retry after {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+@dataclass
+class ProfileResult:
+    duration_s: float
+    interval_ms: float
+    samples: int
+    stacks: Counter[str] = field(default_factory=Counter)
+    loop_lag_ms: list[float] = field(default_factory=list)
+
+    def collapsed(self) -> str:
+        """Collapsed-stack text, heaviest stacks first."""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+    def loop_lag_summary(self) -> dict[str, float]:
+        if not self.loop_lag_ms:
+            return {"samples": 0, "max_ms": 0.0, "p50_ms": 0.0, "p99_ms": 0.0}
+        lags = sorted(self.loop_lag_ms)
+        return {
+            "samples": len(lags),
+            "max_ms": round(lags[-1], 2),
+            "p50_ms": round(lags[len(lags) // 2], 2),
+            "p99_ms": round(lags[min(len(lags) - 1, int(len(lags) * 0.99))], 2),
+        }
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    if filename.startswith(_APP_ROOT):
+        filename = "app" + filename[len(_APP_ROOT):]
+    else:
+        filename = os.path.basename(filename)
+    return f"{code.co_name} ({filename}:{frame.f_lineno})"
+
+
+def _collapse(frame: FrameType | None, thread_name: str) -> str:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append(thread_name)
+    return ";".join(reversed(labels))
+
+
+def _sample_loop(
+    result: ProfileResult, stop: threading.Event, interval: float, include_idle: bool
+) -> None:
+    own_id = threading.get_ident()
+    while not stop.wait(interval):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            if not include_idle and _is_idle(frame):
+                continue
+            result.stacks[_collapse(frame, names.get(thread_id, f"thread-{thread_id}"))] += 1
+        result.samples += 1
+
+
+_IDLE_FUNCTIONS = frozenset({"select", "poll", "wait", "_worker"})
+
+
+def _is_idle(frame: FrameType) -> bool:
+    """Threads parked in a selector, condition or executor queue are noise."""
+    return frame.f_code.co_name in _IDLE_FUNCTIONS
+
+
+async def _measure_loop_lag(result: ProfileResult, stop: threading.Event, interval: float) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        result.loop_lag_ms.append(max(0.0, (time.perf_counter() - start - interval) * 1000))
+
+
+class SamplingProfiler:
+    """One-at-a-time, rate-limited stack sampler for the current process."""
+
+    def __init__(self, *, cooldown: float) -> None:
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._running = False
+        self._finished_at: float | None = None
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self._running:
+                raise ProfilerBusyError("a profile is already running")
+            if self._finished_at is not None:
+                wait = self.cooldown - (time.monotonic() - self._finished_at)
+                if wait > 0:
+                    raise ProfilerRateLimitedError(wait)
+            self._running = True
+
+    def _release(self) -> None:
+        with self._lock:
+            self._running = False
+            self._finished_at = time.monotonic()
+
+    async def profile(
+        self, duration: float, *, interval: float = 0.01, include_idle: bool = False
+    ) -> ProfileResult:
+        """Sample every thread for ``duration`` seconds without blocking the loop."""
+        self._acquire()
+        try:
+            result = ProfileResult(duration_s=duration, interval_ms=interval * 1000, samples=0)
+            stop = threading.Event()
+            sampler = threading.Thread(
+                target=_sample_loop,
+                args=(result, stop, interval, include_idle),
+                name="serx-profiler",
+                daemon=True,
+            )
+            sampler.start()
+            lag_task = asyncio.create_task(_measure_loop_lag(result, stop, interval))
+            try:
+                await asyncio.sleep(duration)
+            finally:
+                stop.set()
+                await lag_task
+                await asyncio.to_thread(sampler.join)
+            return result
+        finally:
+            self._release()
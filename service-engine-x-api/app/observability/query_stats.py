@@ -0,0 +1,289 @@
+"""Per-request accounting of Supabase round trips.
+
+Every PostgREST and Storage call goes through the Supabase client's httpx
+session. ``instrument_http_client`` wraps that session's transport so each
+round trip is recorded (method, table, status, elapsed) into the
+``QueryStats`` of the request being served. A round trip ends when its
+response body has been read and closed, not when the headers arrive, so the
+transfer of a large page counts towards it. ``QueryStatsMiddleware`` opens one ``QueryStats`` per
+HTTP request and, once the response is finished, hands it to any registered
+observers together with the matched route.
+
+The current ``QueryStats`` lives in a context variable, so queries issued from
+worker threads (sync endpoints, ``execute_concurrently``) are attributed to the
+request that spawned them. Calls made outside a request are not recorded.
+
+Third-party calls (Stripe, DocRaptor, Resend, Cal.com, OPEX) are not made
+through the Supabase session; wrap them with ``outbound_span`` or
+``timed_outbound`` so they land in the same ``QueryStats`` as ``outbound``.
+"""
+
+import functools
+import inspect
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+from urllib.parse import parse_qsl
+
+import httpx
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+@dataclass(slots=True)
+class QueryRecord:
+    """One Supabase round trip."""
+
+    method: str
+    table: str
+    status: int
+    elapsed_ms: float
+    started_at: float = 0.0  # time.perf_counter() when the call was sent
+
+
+@dataclass(slots=True)
+class OutboundCall:
+    """One call to a third-party service."""
+
+    service: str
+    elapsed_ms: float
+    started_at: float = 0.0
+
+
+@dataclass
+class QueryStats:
+    """Round trips recorded while serving one request.
+
+    ``route``, ``params``, ``status_code`` and ``duration_ms`` describe the
+    HTTP request itself and are filled in by ``QueryStatsMiddleware`` before
+    observers run (``route`` stays ``None`` when no route matched; ``params``
+    holds path and query parameters, unredacted). ``authenticated`` is set by
+    the auth dependencies once the caller's token has been verified.
+    """
+
+    records: list[QueryRecord] = field(default_factory=list)
+    outbound: list[OutboundCall] = field(default_factory=list)
+    started_at: float = field(default_factory=time.perf_counter)
+    route: str | None = None
+    params: dict[str, str] = field(default_factory=dict)
+    status_code: int = 500
+    duration_ms: float = 0.0
+    authenticated: bool = False
+
+    @property
+    def count(self) -> int:
+        return len(self.records)
+
+    @property
+    def elapsed_ms(self) -> float:
+        """Sum of round-trip times (overlapping calls are counted in full)."""
+        return sum(record.elapsed_ms for record in self.records)
+
+    def by_table(self) -> Counter[str]:
+        return Counter(record.table for record in self.records)
+
+    def outbound_by_service(self) -> dict[str, tuple[int, float]]:
+        """``{service: (calls, total elapsed ms)}`` in first-call order."""
+        totals: dict[str, tuple[int, float]] = {}
+        for call in self.outbound:
+            count, elapsed_ms = totals.get(call.service, (0, 0.0))
+            totals[call.service] = (count + 1, elapsed_ms + call.elapsed_ms)
+        return totals
+
+
+QueryObserver = Callable[[str, QueryStats], None]
+FuncT = TypeVar("FuncT", bound=Callable[..., Any])
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+_observers: list[QueryObserver] = []
+
+def current_query_stats() -> QueryStats | None:
+    """Return the stats of the request being served, if any."""
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Record every round trip made inside the block into a fresh ``QueryStats``."""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@contextmanager
+def outbound_span(service: str) -> Iterator[None]:
+    """Time the block as one call to ``service`` (e.g. ``"stripe"``)."""
+    stats = _current_stats.get()
+    if stats is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.outbound.append(
+            OutboundCall(service, (time.perf_counter() - start) * 1000, started_at=start)
+        )
+
+
+def timed_outbound(service: str) -> Callable[[FuncT], FuncT]:
+    """Decorator form of ``outbound_span`` for sync and async functions."""
+
+    def decorate(func: FuncT) -> FuncT:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with outbound_span(service):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with outbound_span(service):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def add_query_observer(observer: QueryObserver) -> None:
+    """Call ``observer(endpoint, stats)`` after every HTTP request (idempotent)."""
+    if observer not in _observers:
+        _observers.append(observer)
+
+
+def remove_query_observer(observer: QueryObserver) -> None:
+    if observer in _observers:
+        _observers.remove(observer)
+
+
+def _table_for(url: httpx.URL) -> str:
+    """Map a Supabase URL to a short label: ``orders``, ``rpc/fn``, ``storage/bucket``."""
+    path = url.path
+    for prefix, label in (("/rest/v1/", ""), ("/storage/v1/object/", "storage/")):
+        if prefix in path:
+            rest = path.split(prefix, 1)[1].strip("/")
+            parts = rest.split("/")
+            if parts[0] in ("rpc", "public", "sign") and len(parts) > 1:
+                return f"{label}{parts[0]}/{parts[1]}"
+            return f"{label}{parts[0]}"
+    return path
+
+
+class _TimedStream(httpx.SyncByteStream):
+    """A response body that calls ``on_close`` once it has been read and closed."""
+
+    def __init__(self, stream: httpx.SyncByteStream, on_close: Callable[[], None]) -> None:
+        self._stream = stream
+        self._on_close: Callable[[], None] | None = on_close
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield from self._stream
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            on_close, self._on_close = self._on_close, None
+            if on_close is not None:
+                on_close()
+
+
+class _TimedTransport(httpx.BaseTransport):
+    """Record every round trip through ``transport`` into the current ``QueryStats``."""
+
+    def __init__(self, transport: httpx.BaseTransport) -> None:
+        self.transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        stats = _current_stats.get()
+        start = time.perf_counter()
+        response = self.transport.handle_request(request)
+        if stats is None:
+            return response
+
+        def record() -> None:
+            stats.records.append(
+                QueryRecord(
+                    method=request.method,
+                    table=_table_for(request.url),
+                    status=response.status_code,
+                    elapsed_ms=(time.perf_counter() - start) * 1000,
+                    started_at=start,
+                )
+            )
+
+        response.stream = _TimedStream(response.stream, record)  # type: ignore[arg-type]
+        return response
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+def instrument_http_client(client: httpx.Client) -> None:
+    """Time every round trip of a Supabase httpx session (idempotent)."""
+    if not isinstance(client._transport, _TimedTransport):
+        client._transport = _TimedTransport(client._transport)
+    client._mounts = {
+        pattern: transport
+        if transport is None or isinstance(transport, _TimedTransport)
+        else _TimedTransport(transport)
+        for pattern, transport in client._mounts.items()
+    }
+
+
+def route_template(scope: Scope) -> str | None:
+    """The matched route's path template (``/api/orders/{order_id}``), if routed."""
+    return getattr(scope.get("route"), "path", None)
+
+
+def endpoint_name(scope: Scope) -> str:
+    """``"GET /api/orders/{order_id}"`` once routed, else the raw path."""
+    path = route_template(scope) or scope.get("path", "")
+    return f"{scope.get('method', '')} {path}"
+
+
+def _request_params(scope: Scope) -> dict[str, str]:
+    params = {key: str(value) for key, value in scope.get("path_params", {}).items()}
+    for key, value in parse_qsl(scope.get("query_string", b"").decode("latin-1")):
+        params.setdefault(key, value)
+    return params
+
+
+class QueryStatsMiddleware:
+    """Open a ``QueryStats`` per HTTP request and report it to observers."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_status(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                stats.status_code = message["status"]
+            await send(message)
+
+        with track_queries() as stats:
+            scope.setdefault("state", {})["query_stats"] = stats
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                stats.duration_ms = (time.perf_counter() - stats.started_at) * 1000
+                stats.route = route_template(scope)
+                stats.params = _request_params(scope)
+                if _observers:
+                    endpoint = endpoint_name(scope)
+                    for observer in list(_observers):
+                        observer(endpoint, stats)
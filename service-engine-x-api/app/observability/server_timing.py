@@ -0,0 +1,106 @@
+"""``Server-Timing`` header and access-log breakdown per request.
+
+Reads the ``QueryStats`` that ``QueryStatsMiddleware`` opened for the request
+and reports where the time went::
+
+    Server-Timing: db;dur=48.2;desc="12 calls", docraptor;dur=812.0,
+                   app;dur=35.1, total;dur=895.3
+
+``db`` is the summed PostgREST/Storage time, one entry per third-party
+service follows, ``app`` is what is left for Python (summed durations of
+overlapping calls can exceed wall time, so it is floored at zero) and
+``total`` is the time until the response headers were sent.
+
+The header is always set once the auth dependency has verified the caller's
+token (it flags the request's ``QueryStats.authenticated``); every other
+request, including ones with an invalid ``Authorization`` header, gets it for
+a sampled fraction, ``SERVER_TIMING_PUBLIC_SAMPLE_RATE``. Every request is written to the
+``access`` logger with the same numbers as structured ``extra`` fields.
+"""
+
+import logging
+import random
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.observability.query_stats import QueryStats, endpoint_name
+
+logger = logging.getLogger("access")
+
+
+def render_server_timing(stats: QueryStats, total_ms: float) -> str:
+    """Format ``stats`` as a ``Server-Timing`` header value."""
+    parts = [f'db;dur={stats.elapsed_ms:.1f};desc="{stats.count} calls"']
+    outbound_ms = 0.0
+    for service, (count, elapsed_ms) in stats.outbound_by_service().items():
+        outbound_ms += elapsed_ms
+        desc = f';desc="{count} calls"' if count > 1 else ""
+        parts.append(f"{service};dur={elapsed_ms:.1f}{desc}")
+    app_ms = max(0.0, total_ms - stats.elapsed_ms - outbound_ms)
+    parts.append(f"app;dur={app_ms:.1f}")
+    parts.append(f"total;dur={total_ms:.1f}")
+    return ", ".join(parts)
+
+
+class ServerTimingMiddleware:
+    """Add ``Server-Timing`` to responses and log a per-request breakdown.
+
+    Must sit inside ``QueryStatsMiddleware`` (add it first).
+    """
+
+    def __init__(self, app: ASGIApp, public_sample_rate: float = 0.0) -> None:
+        self.app = app
+        self.public_sample_rate = public_sample_rate
+
+    def _emit_header(self, stats: QueryStats) -> bool:
+        return stats.authenticated or random.random() < self.public_sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        stats: QueryStats | None = scope.get("state", {}).get("query_stats")
+        if scope["type"] != "http" or stats is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Decided here: authentication has run by the time headers go out.
+                if self._emit_header(stats):
+                    total_ms = (time.perf_counter() - start) * 1000
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", render_server_timing(stats, total_ms))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            total_ms = (time.perf_counter() - start) * 1000
+            fields = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "endpoint": endpoint_name(scope),
+                "status": status_code,
+                "duration_ms": round(total_ms, 1),
+                "db_calls": stats.count,
+                "db_ms": round(stats.elapsed_ms, 1),
+                "outbound_ms": {
+                    service: round(elapsed_ms, 1)
+                    for service, (_, elapsed_ms) in stats.outbound_by_service().items()
+                },
+            }
+            logger.info(
+                "%s %s %s %.1fms db=%d/%.1fms",
+                scope["method"],
+                scope["path"],
+                status_code,
+                total_ms,
+                stats.count,
+                stats.elapsed_ms,
+                extra={"http": fields},
+            )
@@ -0,0 +1,169 @@
+"""Slowest-requests recorder.
+
+Keeps, per route template, the ``per_route`` slowest requests that took at
+least ``threshold_ms``, each with its ordered call graph: every PostgREST /
+Storage round trip and third-party call with its offset from the start of
+the request and its duration. Parameters whose name looks like a credential
+are redacted before an entry is stored.
+
+Entries are fed from ``QueryStats`` by a query observer, so recording costs
+nothing below the threshold. Memory is bounded: ``per_route`` entries for at
+most ``max_routes`` routes (the least recently slow route is dropped first).
+"""
+
+import heapq
+import itertools
+import random
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+from app.observability.query_stats import QueryStats, add_query_observer
+
+REDACTED = "[redacted]"
+_SECRET_PARAM = re.compile(
+    r"token|secret|password|passwd|api[_-]?key|signature|authorization|session|code",
+    re.IGNORECASE,
+)
+
+
+def redact_params(params: dict[str, str]) -> dict[str, str]:
+    """Replace values of credential-looking parameters with ``[redacted]``."""
+    return {
+        key: REDACTED if _SECRET_PARAM.search(key) else value for key, value in params.items()
+    }
+
+
+def call_graph(stats: QueryStats) -> list[dict[str, Any]]:
+    """Data-layer and outbound calls in the order they were made."""
+    calls: list[tuple[float, float, dict[str, Any]]] = [
+        (
+            record.started_at,
+            record.elapsed_ms,
+            {
+                "kind": "db",
+                "target": record.table,
+                "method": record.method,
+                "status": record.status,
+            },
+        )
+        for record in stats.records
+    ]
+    calls.extend(
+        (call.started_at, call.elapsed_ms, {"kind": "outbound", "target": call.service})
+        for call in stats.outbound
+    )
+    calls.sort(key=lambda call: call[0])
+    return [
+        {
+            **entry,
+            "offset_ms": round(max(0.0, (started_at - stats.started_at) * 1000), 1),
+            "duration_ms": round(elapsed_ms, 1),
+        }
+        for started_at, elapsed_ms, entry in calls
+    ]
+
+
+@dataclass(order=True)
+class _Entry:
+    duration_ms: float
+    seq: int
+    data: dict[str, Any] = field(compare=False)
+
+
+class SlowRequestRecorder:
+    """Thread-safe per-route top-N of slow requests."""
+
+    def __init__(
+        self,
+        *,
+        threshold_ms: float,
+        per_route: int = 10,
+        max_routes: int = 200,
+        sample_rate: float = 1.0,
+    ) -> None:
+        self.threshold_ms = threshold_ms
+        self.per_route = per_route
+        self.max_routes = max_routes
+        self.sample_rate = sample_rate
+        self._routes: OrderedDict[str, list[_Entry]] = OrderedDict()
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def observe(self, endpoint: str, stats: QueryStats) -> None:
+        """Query observer: keep ``stats`` if it is slow enough."""
+        if stats.duration_ms < self.threshold_ms or self.per_route <= 0:
+            return
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+
+        key = endpoint if stats.route else f"{endpoint.partition(' ')[0]} unmatched"
+        with self._lock:
+            heap = self._routes.get(key)
+            if (
+                heap is not None
+                and len(heap) >= self.per_route
+                and stats.duration_ms <= heap[0].duration_ms
+            ):
+                return
+            entry = _Entry(stats.duration_ms, next(self._seq), self._snapshot(endpoint, stats))
+            if heap is None:
+                heap = self._routes[key] = []
+                while len(self._routes) > self.max_routes:
+                    self._routes.popitem(last=False)
+            else:
+                self._routes.move_to_end(key)
+            if len(heap) < self.per_route:
+                heapq.heappush(heap, entry)
+            else:
+                heapq.heapreplace(heap, entry)
+
+    @staticmethod
+    def _snapshot(endpoint: str, stats: QueryStats) -> dict[str, Any]:
+        return {
+            "endpoint": endpoint,
+            "recorded_at": datetime.now(UTC).isoformat(),
+            "status": stats.status_code,
+            "duration_ms": round(stats.duration_ms, 1),
+            "db_calls": stats.count,
+            "db_ms": round(stats.elapsed_ms, 1),
+            "params": redact_params(stats.params),
+            "calls": call_graph(stats),
+        }
+
+    def entries(self, endpoint: str | None = None) -> list[dict[str, Any]]:
+        """Recorded requests, slowest first, optionally for one endpoint."""
+        with self._lock:
+            heaps = [self._routes.get(endpoint, [])] if endpoint else list(self._routes.values())
+            entries = [entry for heap in heaps for entry in heap]
+        return [entry.data for entry in sorted(entries, reverse=True)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+_recorder: SlowRequestRecorder | None = None
+
+
+def install_slow_request_recorder(
+    *, threshold_ms: float, per_route: int, max_routes: int, sample_rate: float
+) -> SlowRequestRecorder:
+    """Create the process-wide recorder and start feeding it from ``QueryStats``."""
+    global _recorder
+    if _recorder is None:
+        _recorder = SlowRequestRecorder(
+            threshold_ms=threshold_ms,
+            per_route=per_route,
+            max_routes=max_routes,
+            sample_rate=sample_rate,
+        )
+        add_query_observer(_recorder.observe)
+    return _recorder
+
+
+def get_slow_request_recorder() -> SlowRequestRecorder | None:
+    return _recorder
@@ -0,0 +1,55 @@
+"""Prebuilt OpenAPI document.
+
+Generating the schema walks every route and model; on a cold worker that
+made the first ``/api/openapi.json`` request slow. ``scripts/save_openapi.py``
+renders it at image build time, stamping ``info.x-route-fingerprint``; the
+app serves that file verbatim when ``OPENAPI_ARTIFACT_PATH`` points at it.
+
+The fingerprint covers the app version and every schema-visible route
+(methods + path), so an artifact from a different build is ignored and the
+schema is generated on demand as before.
+"""
+
+import hashlib
+import logging
+from pathlib import Path
+from typing import Any
+
+from fastapi.routing import APIRoute
+
+from app.utils.json_codec import JSONDecodeError, loads
+
+logger = logging.getLogger("openapi_artifact")
+
+FINGERPRINT_KEY = "x-route-fingerprint"
+
+
+def route_fingerprint(routes: list[Any], version: str) -> str:
+    """Stable hash of the schema-visible routes (no schema generation needed)."""
+    entries = sorted(
+        f"{','.join(sorted(route.methods))} {route.path}"
+        for route in routes
+        if isinstance(route, APIRoute) and route.include_in_schema
+    )
+    digest = hashlib.sha256(version.encode())
+    for entry in entries:
+        digest.update(b"\n" + entry.encode())
+    return digest.hexdigest()[:16]
+
+
+def load_openapi_artifact(path: str, routes: list[Any], version: str) -> bytes | None:
+    """Return the artifact's bytes if it exists and matches these routes."""
+    if not path:
+        return None
+    try:
+        content = Path(path).read_bytes()
+        spec = loads(content)
+    except (OSError, JSONDecodeError) as exc:
+        logger.warning("OpenAPI artifact %s unusable: %s", path, exc)
+        return None
+
+    expected = route_fingerprint(routes, version)
+    if spec.get("info", {}).get(FINGERPRINT_KEY) != expected:
+        logger.warning("OpenAPI artifact %s is from a different build; ignoring it", path)
+        return None
+    return content
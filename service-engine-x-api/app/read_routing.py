@@ -0,0 +1,154 @@
+"""Read-replica routing for PostgREST reads.
+
+When ``SERVICE_ENGINE_X_SUPABASE_READ_URL`` is set, ``get_supabase()``'s
+PostgREST session sends eligible reads to that replica, with its own key.
+The replica URL takes the same form as ``SERVICE_ENGINE_X_SUPABASE_URL``
+(the API root that ``/rest/v1`` hangs off); a path in it replaces the
+primary's. ``app.main`` installs ``ReadRoutingMiddleware`` only when a
+replica is configured, so without one requests pay nothing for it.
+Everything else goes to the primary. Routing is decided per round trip, at
+the HTTP layer, so the 140-odd ``get_supabase()`` call sites are unchanged
+and a handler can never write to the replica:
+
+* Only ``GET``/``HEAD`` PostgREST calls (selects, counts) are eligible.
+  Inserts, updates, deletes, upserts and RPCs always hit the primary.
+* Reads are eligible only while serving a ``GET``/``HEAD`` request (list and
+  detail endpoints, public proposal views, internal lookups); requests
+  that mutate read from the primary throughout.
+* Once a request has written, its later reads go to the primary.
+* Read-your-writes: after a request from a caller writes, that caller's
+  requests read from the primary for ``READ_YOUR_WRITES_SECONDS``. The
+  caller is identified by a hash of the ``Authorization`` header, else by
+  client address. The window lives in the shared cache backend, so with
+  ``CACHE_BACKEND=redis`` it holds whichever worker serves the next request
+  (with ``memory`` it is per worker).
+
+Storage calls and background work outside a request always use the primary.
+"""
+
+import hashlib
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import httpx
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+if TYPE_CHECKING:
+    from app.cache import Cache
+
+_READ_METHODS = frozenset({"GET", "HEAD"})
+
+
+@dataclass
+class ReadRouting:
+    """Per-request routing state (mutable, so worker threads share it)."""
+
+    replica_allowed: bool = False
+    wrote: bool = False
+
+
+_routing: ContextVar[ReadRouting | None] = ContextVar("read_routing", default=None)
+
+
+@contextmanager
+def read_routing(*, replica_allowed: bool) -> Iterator[ReadRouting]:
+    """Scope in which PostgREST reads may (or may not) use the replica."""
+    state = ReadRouting(replica_allowed=replica_allowed)
+    token = _routing.set(state)
+    try:
+        yield state
+    finally:
+        _routing.reset(token)
+
+
+class RecentWriters:
+    """Callers that wrote within the last ``window`` seconds."""
+
+    def __init__(self, *, window: float, cache: "Cache | None" = None) -> None:
+        # app.database imports this module, and app.cache (via app.utils) imports it.
+        from app.cache import Cache
+
+        self.window = window
+        self.cache = cache or Cache("recent_writers", ttl=window)
+
+    async def mark(self, caller: bytes) -> None:
+        if self.window > 0:
+            await self.cache.set(caller.hex(), True)
+
+    async def is_recent(self, caller: bytes) -> bool:
+        if self.window <= 0:
+            return False
+        return await self.cache.get(caller.hex()) is not None
+
+
+def caller_key(scope: Scope) -> bytes:
+    """Stable identity of the caller: its credentials, else its address."""
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            return hashlib.sha256(value).digest()
+    client = scope.get("client")
+    return hashlib.sha256(str(client[0] if client else "").encode()).digest()
+
+
+class ReadRoutingMiddleware:
+    """Allow replica reads for read requests and track who recently wrote."""
+
+    def __init__(self, app: ASGIApp, *, read_your_writes_seconds: float) -> None:
+        self.app = app
+        self.recent_writers = RecentWriters(window=read_your_writes_seconds)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        caller = caller_key(scope)
+        allowed = scope["method"] in _READ_METHODS and not await self.recent_writers.is_recent(
+            caller
+        )
+        with read_routing(replica_allowed=allowed) as state:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                if state.wrote:
+                    await self.recent_writers.mark(caller)
+
+
+def route_reads_to_replica(
+    session: httpx.Client, *, url: str, key: str, primary_url: str
+) -> None:
+    """Send eligible reads on this PostgREST session to the replica at ``url``.
+
+    ``primary_url`` is the URL the session was built from; its path prefix
+    is swapped for the replica's.
+    """
+    replica = httpx.URL(url)
+    primary_prefix = httpx.URL(primary_url).path.rstrip("/")
+    replica_prefix = replica.path.rstrip("/")
+    auth_headers = {"apikey": key, "Authorization": f"Bearer {key}"}
+
+    def _route(request: httpx.Request) -> None:
+        state = _routing.get()
+        if state is None:
+            return
+        if request.method not in _READ_METHODS:
+            state.wrote = True
+            state.replica_allowed = False
+            return
+        if not state.replica_allowed:
+            return
+        path = request.url.path
+        if path.startswith(primary_prefix):
+            path = replica_prefix + path[len(primary_prefix):]
+        request.url = request.url.copy_with(
+            scheme=replica.scheme, host=replica.host, port=replica.port, path=path
+        )
+        request.headers["Host"] = request.url.netloc.decode("ascii")
+        request.headers.update(auth_headers)
+
+    hooks = session.event_hooks
+    hooks["request"].insert(0, _route)
+    session.event_hooks = hooks
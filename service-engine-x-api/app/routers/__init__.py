@@ -10,7 +10,9 @@ from app.routers.conversations import router as conversations_router
 from app.routers.engagements import router as engagements_router
 from app.routers.internal import router as internal_router
 from app.routers.internal_cal_events import router as internal_cal_events_router
+from app.routers.internal_debug import router as internal_debug_router
 from app.routers.internal_meetings_deals import router as internal_meetings_deals_router
+from app.routers.internal_metrics import router as internal_metrics_router
 from app.routers.internal_scheduler import router as internal_scheduler_router
 from app.routers.internal_webhook_events import router as internal_webhook_events_router
 from app.routers.invoices import router as invoices_router
@@ -48,7 +50,9 @@ __all__ = [
     "cal_webhooks_router",
     "calcom_webhooks_router",
     "internal_cal_events_router",
+    "internal_debug_router",
     "internal_meetings_deals_router",
+    "internal_metrics_router",
     "internal_scheduler_router",
     "internal_webhook_events_router",
     "meetings_router",
@@ -21,6 +21,8 @@ from app.models.accounts import (
     ContactBrief,
 )
 from app.utils import build_pagination_response, format_currency, is_valid_uuid
+from app.utils.mutations import soft_delete_owned
+from app.utils.serialization import trusted_page_response
 
 router = APIRouter(prefix="/api/accounts", tags=["Accounts"])
 
@@ -67,8 +69,8 @@ def serialize_account(
 
 
 def serialize_account_list(account: dict[str, Any]) -> AccountListResponse:
-    """Serialize account for list response."""
-    return AccountListResponse(
+    """Serialize account for list response (trusted DB row, no validation)."""
+    return AccountListResponse.model_construct(
         id=account["id"],
         org_id=account["org_id"],
         name=account["name"],
@@ -153,10 +155,14 @@ async def list_accounts(
     accounts = result.data or []
 
     # Serialize
-    serialized = [serialize_account_list(a).model_dump() for a in accounts]
+    serialized = [serialize_account_list(a) for a in accounts]
 
     path = f"{settings.SERX_API_BASE_URL}/api/accounts"
-    return build_pagination_response(serialized, total, page, limit, path)
+    return trusted_page_response(
+        AccountListResponse,
+        serialized,
+        build_pagination_response([], total, page, limit, path),
+    )
 
 
 @router.post("", status_code=status.HTTP_201_CREATED)
@@ -401,24 +407,12 @@ async def delete_account(
 
     supabase = get_supabase()
 
-    # Verify account exists
-    existing = (
-        supabase.table("accounts")
-        .select("id")
-        .eq("id", account_id)
-        .eq("org_id", auth.org_id)
-        .is_("deleted_at", "null")
-        .execute()
-    )
-
-    if not existing.data:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
-
     # Check for active engagements
     engagements = (
         supabase.table("engagements")
         .select("id")
         .eq("account_id", account_id)
+        .eq("org_id", auth.org_id)
         .neq("status", 3)  # Not closed
         .limit(1)
         .execute()
@@ -429,11 +423,7 @@ async def delete_account(
             detail="Cannot delete account with active engagements",
         )
 
-    # Soft delete
-    now = datetime.now(timezone.utc).isoformat()
-    supabase.table("accounts").update(
-        {"deleted_at": now, "updated_at": now}
-    ).eq("id", account_id).execute()
+    soft_delete_owned(supabase, "accounts", account_id, auth.org_id)
 
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
@@ -8,7 +8,6 @@ See: api-reference-docs-new/cal.com/CALCOM-WEBHOOKS.md for payload specs.
 
 import hashlib
 import hmac
-import json
 import logging
 from typing import Any
 
@@ -17,7 +16,9 @@ from fastapi.responses import JSONResponse
 
 from app.config import settings
 from app.database import get_supabase
+from app.observability.metrics import record_webhook
 from app.services.cal_event_handlers import route_cal_event
+from app.utils.json_codec import JSONDecodeError, loads
 
 logger = logging.getLogger("cal_webhooks")
 
@@ -104,11 +105,12 @@ async def cal_webhook(request: Request) -> JSONResponse:
 
     # --- Parse ---
     try:
-        payload = json.loads(raw_body)
-    except json.JSONDecodeError:
+        payload = loads(raw_body)
+    except JSONDecodeError:
         return JSONResponse(status_code=400, content={"error": "invalid JSON"})
 
     fields = _extract_fields(payload)
+    record_webhook("cal", fields["trigger_event"])
 
     # --- Store in cal_raw_events ---
     supabase = get_supabase()
@@ -1,12 +1,13 @@
 """Cal.com webhook sink — captures immutable raw events for downstream processing."""
 
-import json
 from typing import Any
 
 from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
 
 from app.database import get_supabase
+from app.observability.metrics import record_webhook
+from app.utils.json_codec import loads
 
 router = APIRouter(prefix="/api/webhooks/calcom", tags=["Cal.com Webhooks"])
 
@@ -27,9 +28,11 @@ def _extract_booking_uid(payload: dict[str, Any]) -> str | None:
 async def calcom_webhook_sink(request: Request) -> JSONResponse:
     """Catch any Cal.com webhook event and store the raw payload."""
     body = await request.body()
-    payload = json.loads(body)
+    payload = loads(body)
 
     event_type = payload.get("triggerEvent", payload.get("type", "unknown"))
+    # Unsigned sink: record_webhook folds unknown triggers into "other".
+    record_webhook("calcom_legacy", event_type)
 
     supabase = get_supabase()
     supabase.table("cal_webhook_events_raw").insert(
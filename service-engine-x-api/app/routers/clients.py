@@ -18,6 +18,7 @@ from app.models.clients import (
     ClientUpdate,
     RoleResponse,
 )
+from app.services.user_profiles import invalidate_user_profiles
 from app.utils import build_pagination_response, format_currency, is_valid_uuid
 
 router = APIRouter(prefix="/api/clients", tags=["Clients"])
@@ -522,6 +523,7 @@ async def update_client(
         .eq("id", client_id)
         .execute()
     )
+    await invalidate_user_profiles(auth.org_id, client_id)
 
     if not result.data:
         raise HTTPException(
@@ -606,5 +608,6 @@ async def delete_client(
 
     # Hard delete
     supabase.table("users").delete().eq("id", client_id).execute()
+    await invalidate_user_profiles(auth.org_id, client_id)
 
     return Response(status_code=status.HTTP_204_NO_CONTENT)
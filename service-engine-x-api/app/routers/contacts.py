@@ -20,7 +20,10 @@ from app.models.contacts import (
     GrantPortalAccessRequest,
     UserBrief,
 )
+from app.services.user_profiles import get_user_profile, invalidate_user_profiles
 from app.utils import build_pagination_response, is_valid_uuid
+from app.utils.mutations import soft_delete_owned
+from app.utils.serialization import trusted_page_response
 
 router = APIRouter(prefix="/api/contacts", tags=["Contacts"])
 
@@ -76,8 +79,8 @@ def serialize_contact(
 
 
 def serialize_contact_list(contact: dict[str, Any]) -> ContactListResponse:
-    """Serialize contact for list response."""
-    return ContactListResponse(
+    """Serialize contact for list response (trusted DB row, no validation)."""
+    return ContactListResponse.model_construct(
         id=contact["id"],
         org_id=contact["org_id"],
         account_id=contact.get("account_id"),
@@ -168,10 +171,14 @@ async def list_contacts(
     contacts = result.data or []
 
     # Serialize
-    serialized = [serialize_contact_list(c).model_dump() for c in contacts]
+    serialized = [serialize_contact_list(c) for c in contacts]
 
     path = f"{settings.SERX_API_BASE_URL}/api/contacts"
-    return build_pagination_response(serialized, total, page, limit, path)
+    return trusted_page_response(
+        ContactListResponse,
+        serialized,
+        build_pagination_response([], total, page, limit, path),
+    )
 
 
 @router.post("", status_code=status.HTTP_201_CREATED)
@@ -298,14 +305,7 @@ async def retrieve_contact(
     # Get user if linked
     user_data = None
     if contact.get("user_id"):
-        user_result = (
-            supabase.table("users")
-            .select("id, email")
-            .eq("id", contact["user_id"])
-            .execute()
-        )
-        if user_result.data:
-            user_data = user_result.data[0]
+        user_data = await get_user_profile(auth.org_id, contact["user_id"])
 
     return serialize_contact(contact, account=account_data, user=user_data)
 
@@ -432,6 +432,7 @@ async def update_contact(
         )
 
     updated = result.data[0]
+    await invalidate_user_profiles(auth.org_id, existing.get("user_id"), updated.get("user_id"))
 
     # Fetch account for response
     account_data = None
@@ -448,14 +449,7 @@ async def update_contact(
     # Fetch user for response
     user_data = None
     if updated.get("user_id"):
-        user_result = (
-            supabase.table("users")
-            .select("id, email")
-            .eq("id", updated["user_id"])
-            .execute()
-        )
-        if user_result.data:
-            user_data = user_result.data[0]
+        user_data = await get_user_profile(auth.org_id, updated["user_id"])
 
     return serialize_contact(updated, account=account_data, user=user_data)
 
@@ -469,26 +463,7 @@ async def delete_contact(
     if not is_valid_uuid(contact_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
 
-    supabase = get_supabase()
-
-    # Verify contact exists
-    existing = (
-        supabase.table("contacts")
-        .select("id")
-        .eq("id", contact_id)
-        .eq("org_id", auth.org_id)
-        .is_("deleted_at", "null")
-        .execute()
-    )
-
-    if not existing.data:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
-
-    # Soft delete
-    now = datetime.now(timezone.utc).isoformat()
-    supabase.table("contacts").update(
-        {"deleted_at": now, "updated_at": now}
-    ).eq("id", contact_id).execute()
+    soft_delete_owned(get_supabase(), "contacts", contact_id, auth.org_id)
 
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
@@ -560,6 +535,7 @@ async def grant_portal_access(
         supabase.table("contacts").update({"user_id": user_id}).eq(
             "id", contact_id
         ).execute()
+        await invalidate_user_profiles(auth.org_id, user_id)
 
         return {
             "success": True,
@@ -23,7 +23,9 @@ from app.models.conversations import (
     CONVERSATION_STATUS_CLOSED,
     CONVERSATION_STATUS_MAP,
 )
+from app.services.user_profiles import get_user_profile, get_user_profiles
 from app.utils import build_pagination_response, is_valid_uuid
+from app.utils.mutations import update_owned
 
 router = APIRouter(prefix="/api/projects", tags=["Conversations"])
 
@@ -319,17 +321,7 @@ async def retrieve_conversation(
 
     # Get sender info for all messages
     sender_ids = list(set(m["sender_id"] for m in messages_raw))
-    senders: dict[str, dict[str, Any]] = {}
-
-    if sender_ids:
-        senders_result = (
-            supabase.table("users")
-            .select("id, name_f, name_l, email")
-            .in_("id", sender_ids)
-            .execute()
-        )
-        for s in (senders_result.data or []):
-            senders[s["id"]] = s
+    senders = await get_user_profiles(auth.org_id, sender_ids)
 
     # Serialize messages
     messages = [
@@ -419,16 +411,7 @@ async def update_conversation(
     messages_raw = messages_result.data or []
 
     sender_ids = list(set(m["sender_id"] for m in messages_raw))
-    senders: dict[str, dict[str, Any]] = {}
-    if sender_ids:
-        senders_result = (
-            supabase.table("users")
-            .select("id, name_f, name_l, email")
-            .in_("id", sender_ids)
-            .execute()
-        )
-        for s in (senders_result.data or []):
-            senders[s["id"]] = s
+    senders = await get_user_profiles(auth.org_id, sender_ids)
 
     messages = [
         serialize_message(m, sender=senders.get(m["sender_id"]))
@@ -457,27 +440,14 @@ async def delete_conversation(
     if not is_valid_uuid(project_id) or not is_valid_uuid(conversation_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
 
-    supabase = get_supabase()
-
-    # Verify exists
-    existing = (
-        supabase.table("conversations")
-        .select("id")
-        .eq("id", conversation_id)
-        .eq("project_id", project_id)
-        .eq("org_id", auth.org_id)
-        .execute()
-    )
-
-    if not existing.data:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
-
     # Close the conversation
     now = datetime.now(timezone.utc).isoformat()
-    supabase.table("conversations").update({
-        "status": CONVERSATION_STATUS_CLOSED,
-        "updated_at": now,
-    }).eq("id", conversation_id).execute()
+    update_owned(
+        get_supabase(), "conversations", conversation_id, auth.org_id,
+        {"status": CONVERSATION_STATUS_CLOSED, "updated_at": now},
+        scope={"project_id": project_id},
+        live_only=False,
+    )
 
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
@@ -548,16 +518,7 @@ async def list_messages(
 
     # Get senders
     sender_ids = list(set(m["sender_id"] for m in messages_raw))
-    senders: dict[str, dict[str, Any]] = {}
-    if sender_ids:
-        senders_result = (
-            supabase.table("users")
-            .select("id, name_f, name_l, email")
-            .in_("id", sender_ids)
-            .execute()
-        )
-        for s in (senders_result.data or []):
-            senders[s["id"]] = s
+    senders = await get_user_profiles(auth.org_id, sender_ids)
 
     serialized = [
         serialize_message(m, sender=senders.get(m["sender_id"])).model_dump()
@@ -595,13 +556,7 @@ async def create_message(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
 
     # Get sender info
-    sender_result = (
-        supabase.table("users")
-        .select("id, name_f, name_l, email")
-        .eq("id", auth.user_id)
-        .execute()
-    )
-    sender_data = sender_result.data[0] if sender_result.data else None
+    sender_data = await get_user_profile(auth.org_id, auth.user_id)
 
     # Create message
     now = datetime.now(timezone.utc).isoformat()
@@ -23,6 +23,7 @@ from app.models.engagements import (
     ENGAGEMENT_STATUS_MAP,
 )
 from app.utils import build_pagination_response, is_valid_uuid
+from app.utils.mutations import update_owned
 
 router = APIRouter(prefix="/api/engagements", tags=["Engagements"])
 
@@ -504,26 +505,12 @@ async def delete_engagement(
     if not is_valid_uuid(engagement_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
 
-    supabase = get_supabase()
-
-    # Verify exists
-    existing = (
-        supabase.table("engagements")
-        .select("id, status")
-        .eq("id", engagement_id)
-        .eq("org_id", auth.org_id)
-        .execute()
-    )
-
-    if not existing.data:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
-
     # Close the engagement (soft close via status)
     now = datetime.now(timezone.utc).isoformat()
-    supabase.table("engagements").update({
-        "status": ENGAGEMENT_STATUS_CLOSED,
-        "closed_at": now,
-        "updated_at": now,
-    }).eq("id", engagement_id).execute()
+    update_owned(
+        get_supabase(), "engagements", engagement_id, auth.org_id,
+        {"status": ENGAGEMENT_STATUS_CLOSED, "closed_at": now, "updated_at": now},
+        live_only=False,
+    )
 
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -19,6 +19,11 @@ from app.models.proposals import (
     PROPOSAL_STATUS_MAP,
 )
 from app.services.resend_service import send_proposal_email
+from app.services.service_catalog import (
+    get_service_catalog,
+    invalidate_service_catalog,
+    missing_service_ids,
+)
 
 router = APIRouter(prefix="/api/internal", tags=["Internal"])
 
@@ -73,16 +78,8 @@ async def list_services_for_org(
     limit: int = Query(50, ge=1, le=100),
 ) -> list[ServiceResponse]:
     """List services for a specific organization."""
-    supabase = get_supabase()
-    result = (
-        supabase.table("services")
-        .select("id, org_id, name, description, recurring, price, currency, public, created_at, updated_at")
-        .eq("org_id", org_id)
-        .is_("deleted_at", "null")
-        .limit(limit)
-        .execute()
-    )
-    return [ServiceResponse(**svc) for svc in result.data]
+    catalog = await get_service_catalog(org_id)
+    return [ServiceResponse(**svc) for svc in list(catalog.values())[:limit]]
 
 
 @router.post("/services", status_code=status.HTTP_201_CREATED, dependencies=[Depends(verify_token)])
@@ -116,6 +113,7 @@ async def create_service(body: InternalServiceCreate) -> ServiceResponse:
             detail="Failed to create service",
         )
 
+    await invalidate_service_catalog(body.org_id)
     return ServiceResponse(**result.data[0])
 
 
@@ -180,22 +178,12 @@ async def create_proposal_internal(body: AdminCreateProposalRequest) -> Proposal
 
     # Validate service_ids if provided
     service_ids = [item.service_id for item in body.items if item.service_id]
-    if service_ids:
-        services_result = (
-            supabase.table("services")
-            .select("id")
-            .eq("org_id", body.org_id)
-            .is_("deleted_at", "null")
-            .in_("id", service_ids)
-            .execute()
+    missing_services = await missing_service_ids(body.org_id, service_ids)
+    if missing_services:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Service with ID {missing_services[0]} does not exist.",
         )
-        found_service_ids = {s["id"] for s in (services_result.data or [])}
-        missing_services = [sid for sid in service_ids if sid not in found_service_ids]
-        if missing_services:
-            raise HTTPException(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                detail=f"Service with ID {missing_services[0]} does not exist.",
-            )
 
     # Calculate total
     total = sum(item.price for item in body.items)
@@ -8,213 +8,24 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field, field_validator
 
 from app.auth import verify_token
+from app.config import settings
 from app.database import get_supabase
+from app.services.cal_backfill import load_checkpoint, normalize_raw_event_ids, run_backfill
+from app.services.cal_normalization import (
+    BOOKING_EVENT_TYPES,
+    CalNormalizationError,
+    normalize_attendees_from_payload,
+    normalize_booking_event_from_payload,
+    normalize_recording_from_payload,
+)
 
 router = APIRouter(prefix="/api/internal/cal", tags=["Internal Cal.com"])
 
 
-BOOKING_EVENT_TYPES = {
-    "BOOKING_CREATED",
-    "BOOKING_REQUESTED",
-    "BOOKING_RESCHEDULED",
-    "BOOKING_CANCELLED",
-    "BOOKING_REJECTED",
-    "BOOKING_NO_SHOW_UPDATED",
-    "BOOKING_PAYMENT_INITIATED",
-    "BOOKING_PAID",
-    "INSTANT_MEETING",
-    "MEETING_STARTED",
-    "MEETING_ENDED",
-}
-
-
 def _now_iso() -> str:
     return datetime.now(UTC).isoformat()
 
 
-def _parse_dt(value: Any) -> str | None:
-    if not value or not isinstance(value, str):
-        return None
-    try:
-        return datetime.fromisoformat(value.replace("Z", "+00:00")).isoformat()
-    except ValueError:
-        return None
-
-
-def _as_list_strings(value: Any) -> list[str]:
-    if not isinstance(value, list):
-        return []
-    out: list[str] = []
-    for item in value:
-        if isinstance(item, str) and item.strip():
-            out.append(item.strip())
-    return out
-
-
-def _extract_trigger_event(payload: dict[str, Any]) -> str:
-    trigger_event = payload.get("triggerEvent") or payload.get("type")
-    return str(trigger_event) if trigger_event else "UNKNOWN"
-
-
-def _extract_booking_uid(payload: dict[str, Any]) -> str | None:
-    nested = payload.get("payload")
-    if isinstance(nested, dict):
-        uid = nested.get("uid")
-        if isinstance(uid, str) and uid.strip():
-            return uid.strip()
-    top_uid = payload.get("uid")
-    if isinstance(top_uid, str) and top_uid.strip():
-        return top_uid.strip()
-    return None
-
-
-def _extract_booking_id(payload: dict[str, Any]) -> int | None:
-    # MEETING_STARTED/MEETING_ENDED are flat payloads with bookingId at top-level.
-    for candidate in (payload.get("bookingId"), payload.get("booking_id")):
-        if isinstance(candidate, int):
-            return candidate
-        if isinstance(candidate, str) and candidate.isdigit():
-            return int(candidate)
-    nested = payload.get("payload")
-    if isinstance(nested, dict):
-        for key in ("bookingId", "booking_id", "id"):
-            candidate = nested.get(key)
-            if isinstance(candidate, int):
-                return candidate
-            if isinstance(candidate, str) and candidate.isdigit():
-                return int(candidate)
-    return None
-
-
-def _extract_payload_obj(payload: dict[str, Any]) -> dict[str, Any]:
-    nested = payload.get("payload")
-    if isinstance(nested, dict):
-        return nested
-    return payload
-
-
-def _extract_location(value: Any) -> str | None:
-    if isinstance(value, str):
-        return value
-    if isinstance(value, dict):
-        return value.get("type") or value.get("value")
-    return None
-
-
-def _extract_meeting_url(payload_obj: dict[str, Any], root_payload: dict[str, Any]) -> str | None:
-    for candidate in (
-        payload_obj.get("meetingUrl"),
-        payload_obj.get("meeting_url"),
-        payload_obj.get("rescheduleUrl"),
-        root_payload.get("meetingUrl"),
-        root_payload.get("meeting_url"),
-    ):
-        if isinstance(candidate, str) and candidate:
-            return candidate
-    return None
-
-
-def _normalize_booking_event_from_payload(raw_payload: dict[str, Any]) -> dict[str, Any]:
-    payload_obj = _extract_payload_obj(raw_payload)
-    organizer_obj = payload_obj.get("organizer")
-    organizer = organizer_obj if isinstance(organizer_obj, dict) else {}
-    guests = _as_list_strings(payload_obj.get("guests"))
-    trigger_event = _extract_trigger_event(raw_payload)
-
-    return {
-        "trigger_event": trigger_event,
-        "cal_booking_uid": _extract_booking_uid(raw_payload),
-        "cal_booking_id": _extract_booking_id(raw_payload),
-        "cal_event_type_id": payload_obj.get("eventTypeId") or payload_obj.get("eventType"),
-        "title": payload_obj.get("title") or raw_payload.get("title"),
-        "start_time": _parse_dt(payload_obj.get("startTime") or payload_obj.get("start")),
-        "end_time": _parse_dt(payload_obj.get("endTime") or payload_obj.get("end")),
-        "status": payload_obj.get("status") or raw_payload.get("status"),
-        "location": _extract_location(payload_obj.get("location")),
-        "meeting_url": _extract_meeting_url(payload_obj, raw_payload),
-        "organizer_email": organizer.get("email") or raw_payload.get("organizerEmail"),
-        "organizer_name": organizer.get("name") or raw_payload.get("organizerName"),
-        "organizer_cal_user_id": organizer.get("id") or payload_obj.get("userId"),
-        "guests": guests,
-        "event_occurred_at": _parse_dt(
-            raw_payload.get("createdAt") or payload_obj.get("createdAt")
-        ),
-    }
-
-
-def _normalize_attendees_from_payload(raw_payload: dict[str, Any]) -> list[dict[str, Any]]:
-    payload_obj = _extract_payload_obj(raw_payload)
-    booking_uid = _extract_booking_uid(raw_payload)
-    booking_id = _extract_booking_id(raw_payload)
-
-    attendees: list[dict[str, Any]] = []
-    payload_attendees = payload_obj.get("attendees")
-    if isinstance(payload_attendees, list):
-        for attendee in payload_attendees:
-            if not isinstance(attendee, dict):
-                continue
-            email = attendee.get("email")
-            if not isinstance(email, str) or not email.strip():
-                continue
-            attendees.append(
-                {
-                    "cal_booking_uid": booking_uid,
-                    "cal_booking_id": booking_id,
-                    "role": "attendee",
-                    "name": attendee.get("name"),
-                    "email": email.strip().lower(),
-                    "timezone": attendee.get("timeZone") or attendee.get("timezone"),
-                    "language": attendee.get("language"),
-                    "phone_number": attendee.get("phoneNumber") or attendee.get("phone"),
-                    "absent": attendee.get("absent"),
-                }
-            )
-
-    payload_hosts = payload_obj.get("hosts")
-    if isinstance(payload_hosts, list):
-        for host in payload_hosts:
-            if not isinstance(host, dict):
-                continue
-            email = host.get("email")
-            if not isinstance(email, str) or not email.strip():
-                continue
-            attendees.append(
-                {
-                    "cal_booking_uid": booking_uid,
-                    "cal_booking_id": booking_id,
-                    "role": "host",
-                    "name": host.get("name"),
-                    "email": email.strip().lower(),
-                    "timezone": host.get("timeZone") or host.get("timezone"),
-                    "language": host.get("language"),
-                    "phone_number": host.get("phoneNumber") or host.get("phone"),
-                    "absent": host.get("absent"),
-                }
-            )
-    return attendees
-
-
-def _normalize_recording_from_payload(raw_payload: dict[str, Any]) -> dict[str, Any]:
-    payload_obj = _extract_payload_obj(raw_payload)
-    recording_id = payload_obj.get("id") or raw_payload.get("id")
-    if recording_id is None:
-        raise HTTPException(status_code=422, detail="Recording payload missing id")
-
-    return {
-        "cal_booking_uid": _extract_booking_uid(raw_payload),
-        "cal_booking_id": _extract_booking_id(raw_payload),
-        "cal_recording_id": str(recording_id),
-        "room_name": payload_obj.get("roomName") or payload_obj.get("room_name"),
-        "start_ts": _parse_dt(payload_obj.get("startTs") or payload_obj.get("start_ts")),
-        "status": payload_obj.get("status"),
-        "duration_seconds": payload_obj.get("duration"),
-        "share_token": payload_obj.get("shareToken") or payload_obj.get("share_token"),
-        "max_participants": payload_obj.get("maxParticipants")
-        or payload_obj.get("max_participants"),
-        "download_link": payload_obj.get("downloadLink") or payload_obj.get("download_link"),
-    }
-
-
 class RawEventCreateRequest(BaseModel):
     trigger_event: str
     payload: dict[str, Any]
@@ -228,6 +39,32 @@ class RawEventProcessedRequest(BaseModel):
     processed_by: str | None = None
 
 
+class RawEventClaimRequest(BaseModel):
+    consumer: str = Field(min_length=1, max_length=200)
+    limit: int = Field(default=25, ge=1, le=500)
+    visibility_timeout_seconds: int | None = Field(default=None, ge=1)
+    trigger_events: list[str] | None = None
+
+
+class RawEventLeaseExtendRequest(BaseModel):
+    consumer: str = Field(min_length=1, max_length=200)
+    event_ids: list[UUID] = Field(min_length=1, max_length=500)
+    visibility_timeout_seconds: int | None = Field(default=None, ge=1)
+
+
+class RawEventAckRequest(BaseModel):
+    consumer: str = Field(min_length=1, max_length=200)
+    event_ids: list[UUID] = Field(min_length=1, max_length=500)
+    processed_by: str | None = None
+
+
+class RawEventFailRequest(BaseModel):
+    consumer: str = Field(min_length=1, max_length=200)
+    event_ids: list[UUID] = Field(min_length=1, max_length=500)
+    error: str = Field(min_length=1)
+    retry_delay_seconds: int = Field(default=0, ge=0)
+
+
 class BookingEventCreateRequest(BaseModel):
     raw_event_id: UUID | None = None
     org_id: UUID | None = None
@@ -295,6 +132,16 @@ class RecordingCreateRequest(BaseModel):
     raw_payload: dict[str, Any] | None = None
 
 
+class NormalizeBatchRequest(BaseModel):
+    """Either an explicit batch (``event_ids``) or a created_at range."""
+
+    event_ids: list[UUID] | None = Field(default=None, max_length=500)
+    checkpoint: str | None = Field(default=None, min_length=1, max_length=200)
+    created_from: datetime | None = None
+    created_before: datetime | None = None
+    limit: int = Field(default=500, ge=1)
+
+
 class RecordingUpdateRequest(BaseModel):
     status: str | None = None
     transcript_url: str | None = None
@@ -356,6 +203,152 @@ async def mark_raw_event_processed(
     return result.data[0]
 
 
+def _lease_seconds(requested: int | None) -> int:
+    if requested is None:
+        return settings.CAL_RAW_EVENT_LEASE_SECONDS
+    return min(requested, settings.CAL_RAW_EVENT_MAX_LEASE_SECONDS)
+
+
+def _event_ids(ids: list[UUID]) -> list[str]:
+    return [str(event_id) for event_id in dict.fromkeys(ids)]
+
+
+@router.post("/events/raw/claim", dependencies=[Depends(verify_token)])
+async def claim_raw_events(body: RawEventClaimRequest) -> list[dict[str, Any]]:
+    """Lease up to ``limit`` unprocessed raw events to ``consumer``.
+
+    Rows are locked with ``FOR UPDATE SKIP LOCKED`` so concurrent consumers
+    always receive disjoint batches. A claimed row stays invisible to other
+    consumers until its lease lapses, it is acked, or it is failed.
+    """
+    supabase = get_supabase()
+    result = supabase.rpc(
+        "claim_cal_raw_events",
+        {
+            "p_consumer": body.consumer,
+            "p_limit": body.limit,
+            "p_lease_seconds": _lease_seconds(body.visibility_timeout_seconds),
+            "p_max_attempts": settings.CAL_RAW_EVENT_MAX_ATTEMPTS,
+            "p_trigger_events": body.trigger_events or None,
+        },
+    ).execute()
+    return result.data or []
+
+
+@router.post("/events/raw/extend", dependencies=[Depends(verify_token)])
+async def extend_raw_event_leases(body: RawEventLeaseExtendRequest) -> dict[str, Any]:
+    """Extend live leases held by ``consumer``. Lapsed leases are not revived."""
+    requested = _event_ids(body.event_ids)
+    supabase = get_supabase()
+    result = supabase.rpc(
+        "extend_cal_raw_event_leases",
+        {
+            "p_consumer": body.consumer,
+            "p_ids": requested,
+            "p_lease_seconds": _lease_seconds(body.visibility_timeout_seconds),
+        },
+    ).execute()
+    extended = result.data or []
+    extended_ids = {row["id"] for row in extended}
+    return {
+        "extended": extended,
+        "lost": [event_id for event_id in requested if event_id not in extended_ids],
+    }
+
+
+@router.post("/events/raw/ack", dependencies=[Depends(verify_token)])
+async def ack_raw_events(body: RawEventAckRequest) -> dict[str, Any]:
+    """Mark a batch of leased events processed in one call.
+
+    Only rows still leased by ``consumer`` are acknowledged; anything else is
+    returned under ``lost`` (lease lapsed and was reclaimed, or already done).
+    """
+    requested = _event_ids(body.event_ids)
+    supabase = get_supabase()
+    result = supabase.rpc(
+        "ack_cal_raw_events",
+        {
+            "p_consumer": body.consumer,
+            "p_ids": requested,
+            "p_processed_by": body.processed_by,
+        },
+    ).execute()
+    acked_ids = [row["id"] for row in result.data or []]
+    acked = set(acked_ids)
+    return {
+        "acked": acked_ids,
+        "lost": [event_id for event_id in requested if event_id not in acked],
+    }
+
+
+@router.post("/events/raw/fail", dependencies=[Depends(verify_token)])
+async def fail_raw_events(body: RawEventFailRequest) -> dict[str, Any]:
+    """Release leased events after a processing failure.
+
+    Events that have used up ``CAL_RAW_EVENT_MAX_ATTEMPTS`` are dead-lettered;
+    the rest become claimable again after ``retry_delay_seconds``.
+    """
+    requested = _event_ids(body.event_ids)
+    supabase = get_supabase()
+    result = supabase.rpc(
+        "fail_cal_raw_events",
+        {
+            "p_consumer": body.consumer,
+            "p_ids": requested,
+            "p_error": body.error,
+            "p_max_attempts": settings.CAL_RAW_EVENT_MAX_ATTEMPTS,
+            "p_retry_delay_seconds": body.retry_delay_seconds,
+        },
+    ).execute()
+    rows = result.data or []
+    released = {row["id"] for row in rows}
+    return {
+        "retrying": [row["id"] for row in rows if not row.get("dead_lettered_at")],
+        "dead_lettered": [row["id"] for row in rows if row.get("dead_lettered_at")],
+        "lost": [event_id for event_id in requested if event_id not in released],
+    }
+
+
+@router.get("/events/raw/dead-lettered", dependencies=[Depends(verify_token)])
+async def list_dead_lettered_raw_events(limit: int = 100) -> list[dict[str, Any]]:
+    bounded_limit = max(1, min(limit, 500))
+    supabase = get_supabase()
+    result = (
+        supabase.table("cal_raw_events")
+        .select("*")
+        .eq("processed", False)
+        .not_.is_("dead_lettered_at", "null")
+        .order("dead_lettered_at", desc=True)
+        .limit(bounded_limit)
+        .execute()
+    )
+    return result.data or []
+
+
+@router.post("/events/raw/{event_id}/requeue", dependencies=[Depends(verify_token)])
+async def requeue_dead_lettered_raw_event(event_id: UUID) -> dict[str, Any]:
+    """Return a dead-lettered event to the queue with a fresh attempt budget."""
+    supabase = get_supabase()
+    result = (
+        supabase.table("cal_raw_events")
+        .update(
+            {
+                "dead_lettered_at": None,
+                "attempts": 0,
+                "lease_owner": None,
+                "leased_until": None,
+            }
+        )
+        .eq("id", str(event_id))
+        .eq("processed", False)
+        .not_.is_("dead_lettered_at", "null")
+        .execute()
+    )
+    if not result.data:
+        raise HTTPException(status_code=404, detail="Dead-lettered raw event not found")
+    return result.data[0]
+
+
 @router.get("/raw-events/{event_id}", dependencies=[Depends(verify_token)])
 async def get_cal_raw_event(event_id: UUID) -> dict[str, Any]:
     """Retrieve a single stored raw event from cal_raw_events by ID."""
@@ -379,7 +372,7 @@ async def create_booking_event(body: BookingEventCreateRequest) -> dict[str, Any
     derived: dict[str, Any] = {}
 
     if raw_payload:
-        derived = _normalize_booking_event_from_payload(raw_payload)
+        derived = normalize_booking_event_from_payload(raw_payload)
 
     trigger_event = merged.get("trigger_event") or derived.get("trigger_event")
     if not trigger_event:
@@ -496,7 +489,7 @@ async def get_latest_booking_event_by_uid(cal_booking_uid: str) -> dict[str, Any
 async def bulk_upsert_booking_attendees(body: BookingAttendeesBulkRequest) -> dict[str, Any]:
     attendees = [item.model_dump() for item in body.attendees]
     if body.raw_payload and not attendees:
-        attendees = _normalize_attendees_from_payload(body.raw_payload)
+        attendees = normalize_attendees_from_payload(body.raw_payload)
 
     if not attendees:
         raise HTTPException(status_code=422, detail="No attendees provided")
@@ -555,7 +548,10 @@ async def create_recording(body: RecordingCreateRequest) -> dict[str, Any]:
     raw_payload = merged.pop("raw_payload")
     derived: dict[str, Any] = {}
     if raw_payload:
-        derived = _normalize_recording_from_payload(raw_payload)
+        try:
+            derived = normalize_recording_from_payload(raw_payload)
+        except CalNormalizationError as exc:
+            raise HTTPException(status_code=422, detail=str(exc)) from exc
 
     cal_recording_id = merged.get("cal_recording_id") or derived.get("cal_recording_id")
     if not cal_recording_id:
@@ -619,3 +615,42 @@ async def update_recording(recording_id: UUID, body: RecordingUpdateRequest) ->
     if not result.data:
         raise HTTPException(status_code=404, detail="Recording not found")
     return result.data[0]
+
+
+@router.post("/normalize/batch", dependencies=[Depends(verify_token)])
+def normalize_raw_events_batch(body: NormalizeBatchRequest) -> dict[str, Any]:
+    """Normalize raw events into booking events, attendees and recordings.
+
+    With ``event_ids`` the listed events are normalized together. Otherwise
+    raw events are streamed in created_at order, at most ``limit`` per call;
+    passing ``checkpoint`` resumes from (and advances) a named cursor so
+    repeated calls walk the whole table. Large historical backfills should use
+    ``scripts/backfill_cal_normalization.py``, which adds a process pool.
+
+    A batch makes many sequential round trips, so this is a sync endpoint:
+    FastAPI runs it in the threadpool instead of on the event loop.
+    """
+    supabase = get_supabase()
+    if body.event_ids:
+        summary = normalize_raw_event_ids(
+            supabase, [str(event_id) for event_id in dict.fromkeys(body.event_ids)]
+        )
+        return summary.as_dict()
+
+    summary = run_backfill(
+        supabase,
+        checkpoint_name=body.checkpoint,
+        created_from=body.created_from.isoformat() if body.created_from else None,
+        created_before=body.created_before.isoformat() if body.created_before else None,
+        page_size=settings.CAL_NORMALIZE_PAGE_SIZE,
+        limit=min(body.limit, settings.CAL_NORMALIZE_MAX_EVENTS_PER_REQUEST),
+    )
+    return summary.as_dict()
+
+
+@router.get("/normalize/checkpoints/{name}", dependencies=[Depends(verify_token)])
+async def get_normalization_checkpoint(name: str) -> dict[str, Any]:
+    checkpoint = load_checkpoint(get_supabase(), name)
+    if not checkpoint:
+        raise HTTPException(status_code=404, detail="Checkpoint not found")
+    return checkpoint
@@ -0,0 +1,98 @@
+"""Internal debugging endpoints: slow requests, loop stalls and the sampling profiler."""
+
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from app.auth import verify_token
+from app.config import settings
+from app.observability.loop_watchdog import get_loop_watchdog
+from app.observability.profiler import (
+    ProfilerBusyError,
+    ProfilerRateLimitedError,
+    SamplingProfiler,
+)
+from app.observability.slow_requests import get_slow_request_recorder
+
+router = APIRouter(
+    prefix="/api/internal/debug",
+    tags=["Internal Debug"],
+    dependencies=[Depends(verify_token)],
+)
+
+profiler = SamplingProfiler(cooldown=settings.PROFILER_COOLDOWN_SECONDS)
+
+
+@router.get("/slow-requests")
+async def list_slow_requests(
+    endpoint: str | None = Query(
+        None, description='Only this endpoint, e.g. "POST /api/public/proposals/{proposal_id}/sign"'
+    ),
+    limit: int = Query(50, ge=1, le=1000),
+) -> dict[str, Any]:
+    """Slowest recorded requests (this worker), slowest first, with their call graphs."""
+    recorder = get_slow_request_recorder()
+    entries = recorder.entries(endpoint) if recorder else []
+    return {
+        "threshold_ms": settings.SLOW_REQUEST_THRESHOLD_MS,
+        "per_route": settings.SLOW_REQUEST_PER_ROUTE,
+        "sample_rate": settings.SLOW_REQUEST_SAMPLE_RATE,
+        "data": entries[:limit],
+    }
+
+
+@router.delete("/slow-requests", status_code=204)
+async def clear_slow_requests() -> None:
+    """Drop everything recorded so far (this worker)."""
+    recorder = get_slow_request_recorder()
+    if recorder:
+        recorder.clear()
+
+
+@router.get("/loop-stalls")
+async def list_loop_stalls() -> dict[str, Any]:
+    """Recent event-loop stalls on this worker with the blocking stack, newest first."""
+    watchdog = get_loop_watchdog()
+    stalls = list(reversed(watchdog.stalls)) if watchdog else []
+    return {
+        "enabled": watchdog is not None,
+        "stall_threshold_ms": settings.LOOP_STALL_THRESHOLD_MS,
+        "data": [vars(stall) for stall in stalls],
+    }
+
+
+@router.post("/profile", response_model=None)
+async def profile_worker(
+    seconds: float = Query(10, gt=0, le=settings.PROFILER_MAX_SECONDS),
+    interval_ms: float = Query(10, ge=1, le=1000),
+    include_idle: bool = Query(False, description="Keep threads parked in select/wait"),
+    format: str = Query("json", pattern="^(json|collapsed)$"),
+) -> dict[str, Any] | PlainTextResponse:
+    """Sample this worker's thread stacks for ``seconds`` and measure event-loop lag.
+
+    ``format=collapsed`` returns only the collapsed stacks (``flamegraph.pl`` /
+    speedscope input). One profile per worker at a time, then a cooldown.
+    """
+    try:
+        result = await profiler.profile(
+            seconds, interval=interval_ms / 1000, include_idle=include_idle
+        )
+    except ProfilerBusyError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
+    except ProfilerRateLimitedError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Profiler cooling down, {exc}",
+            headers={"Retry-After": str(int(exc.retry_after) + 1)},
+        )
+
+    if format == "collapsed":
+        return PlainTextResponse(result.collapsed())
+    return {
+        "duration_s": result.duration_s,
+        "interval_ms": result.interval_ms,
+        "samples": result.samples,
+        "loop_lag": result.loop_lag_summary(),
+        "collapsed": result.collapsed(),
+    }
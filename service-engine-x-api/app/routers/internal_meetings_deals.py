@@ -8,7 +8,8 @@ from pydantic import BaseModel, Field
 
 from app.auth import verify_token
 from app.config import settings
-from app.database import get_supabase
+from app.database import execute_concurrently, get_supabase
+from app.observability.metrics import record_cache_lookup
 from app.services.calcom_client import CalcomClient, CalcomClientError, CalcomNotFoundError
 
 router = APIRouter(prefix="/api/internal", tags=["Internal Meetings & Deals"])
@@ -26,6 +27,17 @@ MEETING_STATUSES = {
 
 DEAL_STATUSES = {"qualified", "proposal_sent", "negotiating", "won", "lost"}
 
+# Meeting history in deal context: newest first, bounded, without the large
+# free-form columns (notes, custom_fields). Full rows stay available through
+# the meeting lookup endpoints.
+MEETING_HISTORY_COLUMNS = (
+    "id, account_id, contact_id, deal_id, cal_event_uid, cal_booking_id, title, "
+    "start_time, end_time, status, organizer_email, attendee_emails, recording_url, "
+    "transcript_url, host_no_show, guest_no_show, cancellation_reason, created_at, updated_at"
+)
+DEFAULT_MEETING_HISTORY_LIMIT = 25
+MAX_MEETING_HISTORY_LIMIT = 100
+
 
 class CalAttendee(BaseModel):
     """Attendee payload from Cal.com event context."""
@@ -114,6 +126,13 @@ def _email_domain(email: str) -> str | None:
     return parts[1]
 
 
+def _first_row(result: Any) -> dict[str, Any] | None:
+    """First row of an optional query result (``None`` when skipped or empty)."""
+    if result is None or not result.data:
+        return None
+    return result.data[0]
+
+
 def _extract_cal_team_id(event_type_payload: dict[str, Any]) -> int | None:
     """Extract team ID from variable Cal.com event type response shapes."""
     data = event_type_payload.get("data", {})
@@ -134,70 +153,56 @@ def _extract_cal_team_id(event_type_payload: dict[str, Any]) -> int | None:
     return None
 
 
-def _get_existing_meeting_context(
+async def _get_existing_meeting_context(
     supabase: Any,
     org_id: str,
     meeting: dict[str, Any],
 ) -> dict[str, Any]:
     """Build agent-friendly context payload for an existing meeting."""
-    account = None
-    contacts: list[dict[str, Any]] = []
-    existing_deals: list[dict[str, Any]] = []
-    linked_deal = None
-
-    if meeting.get("account_id"):
-        account_result = (
+    account_id = meeting.get("account_id")
+    attendee_emails = meeting.get("attendee_emails") or []
+    account_result, deals_result, contacts_result, linked_deal_result = (
+        await execute_concurrently(
             supabase.table("accounts")
             .select("*")
-            .eq("id", meeting["account_id"])
+            .eq("id", account_id)
             .eq("org_id", org_id)
             .is_("deleted_at", "null")
             .limit(1)
-            .execute()
-        )
-        account = account_result.data[0] if account_result.data else None
-
-        deals_result = (
+            if account_id
+            else None,
             supabase.table("deals")
             .select("*")
             .eq("org_id", org_id)
-            .eq("account_id", meeting["account_id"])
+            .eq("account_id", account_id)
             .is_("deleted_at", "null")
             .order("created_at", desc=True)
-            .execute()
-        )
-        existing_deals = deals_result.data or []
-
-    attendee_emails = meeting.get("attendee_emails") or []
-    if attendee_emails:
-        contacts_result = (
+            if account_id
+            else None,
             supabase.table("contacts")
             .select("*")
             .eq("org_id", org_id)
             .is_("deleted_at", "null")
             .in_("email", attendee_emails)
-            .execute()
-        )
-        contacts = contacts_result.data or []
-
-    if meeting.get("deal_id"):
-        linked_deal_result = (
+            if attendee_emails
+            else None,
             supabase.table("deals")
             .select("*")
             .eq("id", meeting["deal_id"])
             .eq("org_id", org_id)
             .is_("deleted_at", "null")
             .limit(1)
-            .execute()
+            if meeting.get("deal_id")
+            else None,
         )
-        linked_deal = linked_deal_result.data[0] if linked_deal_result.data else None
+    )
 
     return {
         "meeting": meeting,
-        "account": account,
-        "contacts": contacts,
-        "existing_deals": existing_deals,
-        "linked_deal": linked_deal,
+        "account": _first_row(account_result),
+        "contacts": (contacts_result.data or []) if contacts_result else [],
+        "existing_deals": (deals_result.data or []) if deals_result else [],
+        "linked_deal": _first_row(linked_deal_result),
         "created": False,
         "warnings": [],
     }
@@ -233,6 +238,7 @@ async def resolve_org_from_event_type(event_type_id: int = Query(..., ge=1)) ->
                 .execute()
             )
             if org_result.data:
+                record_cache_lookup("cal_event_type", hit=True)
                 return {
                     "event_type_id": event_type_id,
                     "cal_team_id": cached["cal_team_id"],
@@ -241,6 +247,7 @@ async def resolve_org_from_event_type(event_type_id: int = Query(..., ge=1)) ->
                     "cache_refreshed_at": cached["refreshed_at"],
                 }
 
+    record_cache_lookup("cal_event_type", hit=False)
     client = CalcomClient(
         api_key=settings.CAL_API_KEY,
         base_url=settings.CALCOM_BASE_URL,
@@ -345,167 +352,158 @@ async def resolve_org_from_team(cal_team_id: int = Query(..., ge=1)) -> dict[str
 
 @router.post("/orgs/{org_id}/meetings/from-cal-event", dependencies=[Depends(verify_token)])
 async def create_meeting_from_cal_event(org_id: str, body: MeetingFromCalEventRequest) -> dict[str, Any]:
-    """Create (or de-duplicate) a meeting from Cal.com booking payload data."""
+    """Create (or de-duplicate) a meeting from Cal.com booking payload data.
+
+    Attendees are resolved as a set, so the number of round trips does not
+    grow with the number of attendees: one lookup of accounts for every
+    attendee domain, at most one bulk insert of missing accounts, and one
+    upsert of all contacts (``upsert_cal_attendee_contacts``).
+    """
     if body.status not in MEETING_STATUSES:
         raise HTTPException(status_code=422, detail="Invalid meeting status")
 
     supabase = get_supabase()
     warnings: list[str] = []
 
-    org_result = supabase.table("organizations").select("id").eq("id", org_id).limit(1).execute()
+    org_result, existing_uid, existing_booking = await execute_concurrently(
+        supabase.table("organizations").select("id").eq("id", org_id).limit(1),
+        supabase.table("meetings")
+        .select("*")
+        .eq("org_id", org_id)
+        .eq("cal_event_uid", body.cal_event_uid)
+        .limit(1)
+        if body.cal_event_uid
+        else None,
+        supabase.table("meetings")
+        .select("*")
+        .eq("org_id", org_id)
+        .eq("cal_booking_id", body.cal_booking_id)
+        .limit(1)
+        if body.cal_booking_id is not None
+        else None,
+    )
     if not org_result.data:
         raise HTTPException(status_code=404, detail="Organization not found")
+    if existing_uid and existing_uid.data:
+        return await _get_existing_meeting_context(supabase, org_id, existing_uid.data[0])
+    if existing_booking and existing_booking.data:
+        return await _get_existing_meeting_context(supabase, org_id, existing_booking.data[0])
+
+    # De-duplicate by email, keeping the first occurrence (and its name).
+    attendees_by_email: dict[str, str] = {}
+    for att in body.attendees:
+        email = att.email.lower().strip()
+        if email and email not in attendees_by_email:
+            attendees_by_email[email] = att.name.strip()
+    attendee_emails = list(attendees_by_email)
+    domains = sorted(
+        {domain for domain in map(_email_domain, attendee_emails) if domain}
+    )
 
-    if body.cal_event_uid:
-        existing_uid = (
-            supabase.table("meetings")
-            .select("*")
-            .eq("org_id", org_id)
-            .eq("cal_event_uid", body.cal_event_uid)
-            .limit(1)
-            .execute()
-        )
-        if existing_uid.data:
-            return _get_existing_meeting_context(supabase, org_id, existing_uid.data[0])
-
-    if body.cal_booking_id is not None:
-        existing_booking = (
-            supabase.table("meetings")
-            .select("*")
-            .eq("org_id", org_id)
-            .eq("cal_booking_id", body.cal_booking_id)
-            .limit(1)
-            .execute()
-        )
-        if existing_booking.data:
-            return _get_existing_meeting_context(supabase, org_id, existing_booking.data[0])
-
-    attendees = [
-        {"name": att.name.strip(), "email": att.email.lower().strip()}
-        for att in body.attendees
-        if att.email.strip()
-    ]
-    attendee_emails = [att["email"] for att in attendees]
+    accounts_result, old_result = await execute_concurrently(
+        supabase.table("accounts")
+        .select("*")
+        .eq("org_id", org_id)
+        .in_("domain", domains)
+        .is_("deleted_at", "null")
+        .order("created_at")
+        if domains
+        else None,
+        supabase.table("meetings")
+        .select("*")
+        .eq("org_id", org_id)
+        .eq("cal_event_uid", body.rescheduled_from_uid)
+        .limit(1)
+        if body.rescheduled_from_uid
+        else None,
+    )
 
-    contacts_by_email: dict[str, dict[str, Any]] = {}
     accounts_by_domain: dict[str, dict[str, Any]] = {}
+    for account in (accounts_result.data if accounts_result else None) or []:
+        accounts_by_domain.setdefault(account["domain"], account)
 
-    for attendee in attendees:
-        domain = _email_domain(attendee["email"])
-        account: dict[str, Any] | None = None
-        if domain:
-            if domain in accounts_by_domain:
-                account = accounts_by_domain[domain]
-            else:
-                account_result = (
-                    supabase.table("accounts")
-                    .select("*")
-                    .eq("org_id", org_id)
-                    .eq("domain", domain)
-                    .is_("deleted_at", "null")
-                    .limit(1)
-                    .execute()
-                )
-                if account_result.data:
-                    account = account_result.data[0]
-                else:
-                    now_iso = _now_iso()
-                    created_account = (
-                        supabase.table("accounts")
-                        .insert(
-                            {
-                                "org_id": org_id,
-                                "name": domain,
-                                "domain": domain,
-                                "lifecycle": "lead",
-                                "source": "cal_com",
-                                "created_at": now_iso,
-                                "updated_at": now_iso,
-                            }
-                        )
-                        .execute()
-                    )
-                    if not created_account.data:
-                        raise HTTPException(status_code=500, detail="Failed to create account")
-                    account = created_account.data[0]
-                accounts_by_domain[domain] = account
-
-        first, last = _split_name(attendee["name"])
-        contact_result = (
-            supabase.table("contacts")
-            .select("*")
-            .eq("org_id", org_id)
-            .eq("email", attendee["email"])
-            .is_("deleted_at", "null")
-            .limit(1)
-            .execute()
-        )
-        if contact_result.data:
-            contact = contact_result.data[0]
-            if not contact.get("account_id") and account:
-                updated = (
-                    supabase.table("contacts")
-                    .update({"account_id": account["id"], "updated_at": _now_iso()})
-                    .eq("id", contact["id"])
-                    .execute()
-                )
-                if updated.data:
-                    contact = updated.data[0]
-        else:
-            now_iso = _now_iso()
-            created_contact = (
-                supabase.table("contacts")
-                .insert(
+    missing_domains = [domain for domain in domains if domain not in accounts_by_domain]
+    if missing_domains:
+        now_iso = _now_iso()
+        created_accounts = (
+            supabase.table("accounts")
+            .insert(
+                [
                     {
                         "org_id": org_id,
-                        "account_id": account["id"] if account else None,
-                        "name_f": first,
-                        "name_l": last,
-                        "email": attendee["email"],
+                        "name": domain,
+                        "domain": domain,
+                        "lifecycle": "lead",
+                        "source": "cal_com",
                         "created_at": now_iso,
                         "updated_at": now_iso,
                     }
-                )
-                .execute()
+                    for domain in missing_domains
+                ]
             )
-            if not created_contact.data:
-                raise HTTPException(status_code=500, detail="Failed to create contact")
-            contact = created_contact.data[0]
-
-        contacts_by_email[attendee["email"]] = contact
-
-    old_meeting = None
-    if body.rescheduled_from_uid:
-        old_result = (
-            supabase.table("meetings")
-            .select("*")
-            .eq("org_id", org_id)
-            .eq("cal_event_uid", body.rescheduled_from_uid)
-            .limit(1)
             .execute()
         )
-        if old_result.data:
-            old_meeting = old_result.data[0]
-            supabase.table("meetings").update(
-                {"status": "rescheduled", "updated_at": _now_iso()}
-            ).eq("id", old_meeting["id"]).execute()
-        else:
-            warnings.append("rescheduled_from_uid did not match any existing meeting")
+        if len(created_accounts.data or []) != len(missing_domains):
+            raise HTTPException(status_code=500, detail="Failed to create account")
+        for account in created_accounts.data:
+            accounts_by_domain[account["domain"]] = account
+
+    contact_rows: list[dict[str, Any]] = []
+    for email, name in attendees_by_email.items():
+        first, last = _split_name(name)
+        account = accounts_by_domain.get(_email_domain(email) or "")
+        contact_rows.append(
+            {
+                "email": email,
+                "name_f": first,
+                "name_l": last,
+                "account_id": account["id"] if account else None,
+            }
+        )
+
+    old_meeting = old_result.data[0] if old_result and old_result.data else None
+    if body.rescheduled_from_uid and not old_meeting:
+        warnings.append("rescheduled_from_uid did not match any existing meeting")
+
+    contacts_result = (
+        supabase.rpc(
+            "upsert_cal_attendee_contacts",
+            {"p_org_id": org_id, "p_contacts": contact_rows},
+        ).execute()
+        if contact_rows
+        else None
+    )
+    contacts_by_email: dict[str, dict[str, Any]] = {}
+    for contact in (contacts_result.data if contacts_result else None) or []:
+        contacts_by_email[contact["email"]] = contact
+    if len(contacts_by_email) != len(contact_rows):
+        raise HTTPException(status_code=500, detail="Failed to create contact")
 
     primary_contact = contacts_by_email.get(attendee_emails[0]) if attendee_emails else None
     primary_account = None
     if primary_contact and primary_contact.get("account_id"):
-        primary_account_result = (
-            supabase.table("accounts")
-            .select("*")
-            .eq("id", primary_contact["account_id"])
-            .eq("org_id", org_id)
-            .is_("deleted_at", "null")
-            .limit(1)
-            .execute()
+        primary_account = next(
+            (
+                account
+                for account in accounts_by_domain.values()
+                if account["id"] == primary_contact["account_id"]
+            ),
+            None,
         )
-        if primary_account_result.data:
-            primary_account = primary_account_result.data[0]
+        if primary_account is None:
+            # Existing contact already linked to an account outside the
+            # attendee domains.
+            primary_account_result = (
+                supabase.table("accounts")
+                .select("*")
+                .eq("id", primary_contact["account_id"])
+                .eq("org_id", org_id)
+                .is_("deleted_at", "null")
+                .limit(1)
+                .execute()
+            )
+            if primary_account_result.data:
+                primary_account = primary_account_result.data[0]
 
     account_id = old_meeting["account_id"] if old_meeting else (primary_account["id"] if primary_account else None)
     contact_id = old_meeting["contact_id"] if old_meeting else (primary_contact["id"] if primary_contact else None)
@@ -542,49 +540,54 @@ async def create_meeting_from_cal_event(org_id: str, body: MeetingFromCalEventRe
 
     meeting = meeting_result.data[0]
 
-    account = None
-    if meeting.get("account_id"):
-        account_result = (
-            supabase.table("accounts")
-            .select("*")
-            .eq("id", meeting["account_id"])
-            .eq("org_id", org_id)
-            .is_("deleted_at", "null")
-            .limit(1)
-            .execute()
-        )
-        account = account_result.data[0] if account_result.data else None
-
-    existing_deals: list[dict[str, Any]] = []
-    linked_deal = None
-    if account:
-        deals_result = (
-            supabase.table("deals")
-            .select("*")
-            .eq("org_id", org_id)
-            .eq("account_id", account["id"])
-            .is_("deleted_at", "null")
-            .order("created_at", desc=True)
-            .execute()
-        )
-        existing_deals = deals_result.data or []
+    known_account = (
+        primary_account
+        if primary_account and primary_account["id"] == meeting.get("account_id")
+        else None
+    )
+    # The old meeting is only marked once its replacement exists.
+    account_result, deals_result, linked_result, _ = await execute_concurrently(
+        supabase.table("accounts")
+        .select("*")
+        .eq("id", meeting["account_id"])
+        .eq("org_id", org_id)
+        .is_("deleted_at", "null")
+        .limit(1)
+        if meeting.get("account_id") and known_account is None
+        else None,
+        supabase.table("deals")
+        .select("*")
+        .eq("org_id", org_id)
+        .eq("account_id", meeting["account_id"])
+        .is_("deleted_at", "null")
+        .order("created_at", desc=True)
+        if meeting.get("account_id")
+        else None,
+        supabase.table("deals")
+        .select("*")
+        .eq("id", meeting["deal_id"])
+        .eq("org_id", org_id)
+        .is_("deleted_at", "null")
+        .limit(1)
+        if meeting.get("deal_id")
+        else None,
+        supabase.table("meetings")
+        .update({"status": "rescheduled", "updated_at": _now_iso()})
+        .eq("id", old_meeting["id"])
+        if old_meeting
+        else None,
+    )
 
-    if meeting.get("deal_id"):
-        linked_result = (
-            supabase.table("deals")
-            .select("*")
-            .eq("id", meeting["deal_id"])
-            .eq("org_id", org_id)
-            .is_("deleted_at", "null")
-            .limit(1)
-            .execute()
-        )
-        linked_deal = linked_result.data[0] if linked_result.data else None
+    account = known_account
+    if account_result is not None:
+        account = account_result.data[0] if account_result.data else None
+    existing_deals = (deals_result.data or []) if account and deals_result else []
+    linked_deal = linked_result.data[0] if linked_result and linked_result.data else None
 
     return {
         "meeting": meeting,
         "account": account,
-        "contacts": list(contacts_by_email.values()),
+        "contacts": [contacts_by_email[email] for email in attendee_emails],
         "existing_deals": existing_deals,
         "linked_deal": linked_deal,
         "rescheduled_from": old_meeting,
@@ -757,83 +760,84 @@ async def create_deal_from_meeting(org_id: str, body: DealCreateRequest) -> dict
     }
 
 
-def _build_deal_context(supabase: Any, org_id: str, deal: dict[str, Any]) -> dict[str, Any]:
-    """Build full, agent-ready deal context payload."""
-    account = None
-    contact = None
-    proposal = None
-    meetings: list[dict[str, Any]] = []
-    account_meetings: list[dict[str, Any]] = []
-
-    if deal.get("account_id"):
-        account_result = (
+async def _build_deal_context(
+    supabase: Any,
+    org_id: str,
+    deal: dict[str, Any],
+    meetings_limit: int = DEFAULT_MEETING_HISTORY_LIMIT,
+) -> dict[str, Any]:
+    """Build full, agent-ready deal context payload.
+
+    All related reads run concurrently. Meeting history (for the deal and for
+    its account) is newest-first, capped at ``meetings_limit`` rows and trimmed
+    to ``MEETING_HISTORY_COLUMNS``; ``*_has_more`` flags signal truncation.
+    """
+    account_result, contact_result, proposal_result, meetings_result, account_meetings_result = (
+        await execute_concurrently(
             supabase.table("accounts")
             .select("*")
             .eq("id", deal["account_id"])
             .eq("org_id", org_id)
             .is_("deleted_at", "null")
             .limit(1)
-            .execute()
-        )
-        account = account_result.data[0] if account_result.data else None
-
-    if deal.get("contact_id"):
-        contact_result = (
+            if deal.get("account_id")
+            else None,
             supabase.table("contacts")
             .select("*")
             .eq("id", deal["contact_id"])
             .eq("org_id", org_id)
             .is_("deleted_at", "null")
             .limit(1)
-            .execute()
-        )
-        contact = contact_result.data[0] if contact_result.data else None
-
-    if deal.get("proposal_id"):
-        proposal_result = (
+            if deal.get("contact_id")
+            else None,
             supabase.table("proposals")
             .select("*")
             .eq("id", deal["proposal_id"])
             .eq("org_id", org_id)
             .is_("deleted_at", "null")
             .limit(1)
-            .execute()
-        )
-        proposal = proposal_result.data[0] if proposal_result.data else None
-
-    meetings_result = (
-        supabase.table("meetings")
-        .select("*")
-        .eq("org_id", org_id)
-        .eq("deal_id", deal["id"])
-        .order("start_time", desc=True)
-        .execute()
-    )
-    meetings = meetings_result.data or []
-
-    if deal.get("account_id"):
-        all_account_meetings = (
+            if deal.get("proposal_id")
+            else None,
             supabase.table("meetings")
-            .select("*")
+            .select(MEETING_HISTORY_COLUMNS)
+            .eq("org_id", org_id)
+            .eq("deal_id", deal["id"])
+            .order("start_time", desc=True)
+            .limit(meetings_limit + 1),
+            supabase.table("meetings")
+            .select(MEETING_HISTORY_COLUMNS)
             .eq("org_id", org_id)
             .eq("account_id", deal["account_id"])
             .order("start_time", desc=True)
-            .execute()
+            .limit(meetings_limit + 1)
+            if deal.get("account_id")
+            else None,
         )
-        account_meetings = all_account_meetings.data or []
+    )
+
+    meetings = meetings_result.data or []
+    account_meetings = (account_meetings_result.data or []) if account_meetings_result else []
 
     return {
         "deal": deal,
-        "account": account,
-        "contact": contact,
-        "proposal": proposal,
-        "meetings": meetings,
-        "account_meetings": account_meetings,
+        "account": _first_row(account_result),
+        "contact": _first_row(contact_result),
+        "proposal": _first_row(proposal_result),
+        "meetings": meetings[:meetings_limit],
+        "meetings_has_more": len(meetings) > meetings_limit,
+        "account_meetings": account_meetings[:meetings_limit],
+        "account_meetings_has_more": len(account_meetings) > meetings_limit,
     }
 
 
 @router.get("/orgs/{org_id}/deals/{deal_id}", dependencies=[Depends(verify_token)])
-async def get_deal(org_id: str, deal_id: str) -> dict[str, Any]:
+async def get_deal(
+    org_id: str,
+    deal_id: str,
+    meetings_limit: int = Query(
+        DEFAULT_MEETING_HISTORY_LIMIT, ge=1, le=MAX_MEETING_HISTORY_LIMIT
+    ),
+) -> dict[str, Any]:
     """Get deal with rich related context for downstream agents."""
     supabase = get_supabase()
     deal_result = (
@@ -847,7 +851,7 @@ async def get_deal(org_id: str, deal_id: str) -> dict[str, Any]:
     )
     if not deal_result.data:
         raise HTTPException(status_code=404, detail="Deal not found")
-    return _build_deal_context(supabase, org_id, deal_result.data[0])
+    return await _build_deal_context(supabase, org_id, deal_result.data[0], meetings_limit)
 
 
 @router.put("/orgs/{org_id}/deals/{deal_id}", dependencies=[Depends(verify_token)])
@@ -897,7 +901,7 @@ async def update_deal(org_id: str, deal_id: str, body: DealUpdateRequest) -> dic
             {"lifecycle": "active", "updated_at": _now_iso()}
         ).eq("id", updated_deal["account_id"]).eq("org_id", org_id).execute()
 
-    return _build_deal_context(supabase, org_id, updated_deal)
+    return await _build_deal_context(supabase, org_id, updated_deal)
 
 
 @router.put(
@@ -951,4 +955,4 @@ async def link_proposal_to_deal(
     if not updated_result.data:
         raise HTTPException(status_code=500, detail="Failed to link proposal")
 
-    return _build_deal_context(supabase, org_id, updated_result.data[0])
+    return await _build_deal_context(supabase, org_id, updated_result.data[0])
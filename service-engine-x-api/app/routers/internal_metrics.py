@@ -0,0 +1,22 @@
+"""Internal Prometheus scrape endpoint.
+
+Exposes the metrics defined in ``app.observability.metrics`` — per-route
+latency, PostgREST latency by table and operation, outbound latency by
+upstream, webhook ingest counts, scheduler outcomes and cache lookups — in
+the Prometheus text format, aggregated across uvicorn workers when
+``PROMETHEUS_MULTIPROC_DIR`` is set.
+"""
+
+from fastapi import APIRouter, Depends, Response
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from app.auth import verify_token
+from app.observability.metrics import render_metrics
+
+router = APIRouter(prefix="/api/internal", tags=["Internal Metrics"])
+
+
+@router.get("/metrics", dependencies=[Depends(verify_token)])
+async def metrics() -> Response:
+    """Prometheus exposition of request, database, upstream and domain metrics."""
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
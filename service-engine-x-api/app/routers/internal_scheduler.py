@@ -25,6 +25,8 @@ from pydantic import BaseModel
 from app.auth import verify_token
 from app.config import settings
 from app.database import get_supabase
+from app.observability import timed_outbound
+from app.observability.metrics import record_scheduler_outcomes
 
 # Outbound M2M auth to OPEX. Lazily constructed so import-time failures in
 # token-client setup surface as request-time 5xx rather than startup crashes
@@ -178,6 +180,7 @@ def _update_dispatch_outcome(
     supabase.table("webhook_events_raw").update(patch).eq("id", event_id).execute()
 
 
+@timed_outbound("opex")
 async def _dispatch_to_managed_agents(
     client: httpx.AsyncClient, cfg: EventConfig, event_id: str
 ) -> tuple[int, dict[str, Any] | None]:
@@ -293,6 +296,14 @@ async def _run_event_dispatch(cfg: EventConfig) -> DispatchSummary:
                         )
                     )
 
+    record_scheduler_outcomes(
+        cfg.event_name,
+        dispatched=dispatched,
+        no_route=no_route,
+        failed=failed,
+        skipped_existing=skipped_existing,
+    )
+
     return DispatchSummary(
         ok=failed == 0,
         event_name=cfg.event_name,
@@ -1,7 +1,6 @@
 """Invoices API router."""
 
 import secrets
-import string
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
@@ -10,7 +9,10 @@ from fastapi.responses import Response
 
 from app.auth.dependencies import AuthContext, get_current_org
 from app.database import get_supabase
-from app.utils import format_currency, format_currency_optional
+from app.services.numbering import next_invoice_number
+from app.utils import format_currency, format_currency_optional, is_valid_uuid
+from app.utils.mutations import RejectedWrite, call_write_rpc
+from app.utils.serialization import model_factory, trusted_page_response
 from app.models.invoices import (
     INVOICE_STATUS_MAP,
     INVOICE_STATUS_TRANSITIONS,
@@ -18,6 +20,7 @@ from app.models.invoices import (
     ChargeInvoiceRequest,
     CreateInvoiceRequest,
     InvoiceClientResponse,
+    InvoiceItemInput,
     InvoiceItemResponse,
     InvoiceListItem,
     InvoiceListLinks,
@@ -30,9 +33,11 @@ from app.models.invoices import (
 router = APIRouter(prefix="/api/invoices", tags=["Invoices"])
 
 
-def serialize_invoice_item(item: dict[str, Any]) -> InvoiceItemResponse:
+def serialize_invoice_item(
+    item: dict[str, Any], *, trusted: bool = False
+) -> InvoiceItemResponse:
     """Serialize an invoice item."""
-    return InvoiceItemResponse(
+    return model_factory(InvoiceItemResponse, trusted=trusted)(
         id=item["id"],
         invoice_id=item["invoice_id"],
         name=item["name"],
@@ -50,7 +55,9 @@ def serialize_invoice_item(item: dict[str, Any]) -> InvoiceItemResponse:
     )
 
 
-def serialize_invoice_client(client: dict[str, Any]) -> InvoiceClientResponse:
+def serialize_invoice_client(
+    client: dict[str, Any], *, trusted: bool = False
+) -> InvoiceClientResponse:
     """Serialize a client for invoice response."""
     # Handle Supabase join returning array for addresses
     addresses = client.get("addresses")
@@ -70,7 +77,7 @@ def serialize_invoice_client(client: dict[str, Any]) -> InvoiceClientResponse:
     else:
         role = None
 
-    return InvoiceClientResponse(
+    return model_factory(InvoiceClientResponse, trusted=trusted)(
         id=client["id"],
         name=f"{client.get('name_f', '') or ''} {client.get('name_l', '') or ''}".strip(),
         name_f=client.get("name_f"),
@@ -139,20 +146,20 @@ def serialize_invoice(invoice: dict[str, Any]) -> InvoiceResponse:
 
 
 def serialize_invoice_list_item(invoice: dict[str, Any]) -> InvoiceListItem:
-    """Serialize an invoice for list response."""
+    """Serialize an invoice for list response (trusted DB row, no validation)."""
     status_id = invoice.get("status", 0)
 
     # Handle client
     client_data = invoice.get("users")
-    client = serialize_invoice_client(client_data) if client_data else None
+    client = serialize_invoice_client(client_data, trusted=True) if client_data else None
 
     # Handle items
     items_data = invoice.get("invoice_items") or []
-    items = [serialize_invoice_item(item) for item in items_data]
+    items = [serialize_invoice_item(item, trusted=True) for item in items_data]
 
     recurring = invoice.get("recurring")
 
-    return InvoiceListItem(
+    return InvoiceListItem.model_construct(
         id=invoice["id"],
         number=invoice["number"],
         number_prefix=invoice.get("number_prefix"),
@@ -186,13 +193,23 @@ def serialize_invoice_list_item(invoice: dict[str, Any]) -> InvoiceListItem:
     )
 
 
-async def generate_invoice_number(supabase: Any) -> str:
-    """Generate a unique invoice number."""
-    count_result = supabase.table("invoices").select(
-        "*", count="exact", head=True
-    ).execute()
-    count = count_result.count or 0
-    return f"INV-{str(count + 1).zfill(5)}"
+def invoice_item_rows(items: list[InvoiceItemInput]) -> list[dict[str, Any]]:
+    """``invoice_items`` rows (without ``invoice_id``) for request items."""
+    return [
+        {
+            "name": item.name,
+            "description": item.description,
+            "quantity": item.quantity,
+            "amount": item.amount,
+            "discount": item.discount,
+            "discount2": 0,
+            "total": item.quantity * item.amount - item.discount,
+            "service_id": item.service_id,
+            "order_id": None,
+            "options": item.options or {},
+        }
+        for item in items
+    ]
 
 
 @router.get("", response_model=InvoiceListResponse)
@@ -247,30 +264,33 @@ async def list_invoices(
                 elif operator == "$gt":
                     query = query.gt(field, value)
 
-    result = await query.execute()
+    result = query.execute()
     invoices = result.data or []
 
     # Build response
     last_page = max(1, (total + limit - 1) // limit)
     base_url = str(request.url).split("?")[0]
 
-    return InvoiceListResponse(
-        data=[serialize_invoice_list_item(inv) for inv in invoices],
-        links=InvoiceListLinks(
-            first=f"{base_url}?page=1&limit={limit}",
-            last=f"{base_url}?page={last_page}&limit={limit}",
-            prev=f"{base_url}?page={page - 1}&limit={limit}" if page > 1 else None,
-            next=f"{base_url}?page={page + 1}&limit={limit}" if page < last_page else None,
-        ),
-        meta=InvoiceListMeta(
-            current_page=page,
-            from_=offset + 1 if total > 0 else 0,
-            to=min(offset + limit, total),
-            last_page=last_page,
-            per_page=limit,
-            total=total,
-            path=base_url,
-        ),
+    links = InvoiceListLinks(
+        first=f"{base_url}?page=1&limit={limit}",
+        last=f"{base_url}?page={last_page}&limit={limit}",
+        prev=f"{base_url}?page={page - 1}&limit={limit}" if page > 1 else None,
+        next=f"{base_url}?page={page + 1}&limit={limit}" if page < last_page else None,
+    )
+    meta = InvoiceListMeta(
+        current_page=page,
+        from_=offset + 1 if total > 0 else 0,
+        to=min(offset + limit, total),
+        last_page=last_page,
+        per_page=limit,
+        total=total,
+        path=base_url,
+    )
+
+    return trusted_page_response(
+        InvoiceListItem,
+        [serialize_invoice_list_item(inv) for inv in invoices],
+        {"data": [], "links": links.model_dump(), "meta": meta.model_dump(by_alias=True)},
     )
 
 
@@ -327,12 +347,8 @@ async def create_invoice(
                 raise HTTPException(status_code=500, detail="Failed to create client.")
             client_id = new_user_result.data[0]["id"]
 
-    # Validate client exists
-    client_result = supabase.table("users").select(
-        "id, name_f, name_l, company, address_id, addresses:address_id (*)"
-    ).eq("id", client_id).eq("org_id", auth.org_id).execute()
-
-    if not client_result.data:
+    # Malformed ids cannot exist; real ones are checked in the write itself
+    if not is_valid_uuid(client_id):
         raise HTTPException(
             status_code=422,
             detail={
@@ -340,23 +356,14 @@ async def create_invoice(
                 "errors": {"user_id": ["The specified client does not exist."]},
             },
         )
-
-    client = client_result.data[0]
-
-    # Validate coupon if provided
-    if body.coupon_id:
-        coupon_result = supabase.table("coupons").select("id").eq(
-            "id", body.coupon_id
-        ).execute()
-
-        if not coupon_result.data:
-            raise HTTPException(
-                status_code=422,
-                detail={
-                    "message": "The given data was invalid.",
-                    "errors": {"coupon_id": ["The specified coupon does not exist."]},
-                },
-            )
+    if body.coupon_id and not is_valid_uuid(body.coupon_id):
+        raise HTTPException(
+            status_code=422,
+            detail={
+                "message": "The given data was invalid.",
+                "errors": {"coupon_id": ["The specified coupon does not exist."]},
+            },
+        )
 
     # Calculate totals
     subtotal = 0.0
@@ -368,44 +375,18 @@ async def create_invoice(
     total = subtotal + tax
 
     # Generate invoice number
-    invoice_number = await generate_invoice_number(supabase)
-
-    # Snapshot billing address
-    addresses = client.get("addresses")
-    if isinstance(addresses, list) and len(addresses) > 0:
-        client_address = addresses[0]
-    elif isinstance(addresses, dict):
-        client_address = addresses
-    else:
-        client_address = None
-
-    billing_address = None
-    if client_address:
-        billing_address = {
-            "line_1": client_address.get("line_1"),
-            "line_2": client_address.get("line_2"),
-            "city": client_address.get("city"),
-            "state": client_address.get("state"),
-            "postcode": client_address.get("postcode"),
-            "country": client_address.get("country"),
-            "name_f": client.get("name_f"),
-            "name_l": client.get("name_l"),
-            "company_name": client.get("company"),
-            "company_vat": None,
-            "tax_id": None,
-        }
+    invoice_number = await next_invoice_number()
 
     # Calculate due date (14 days default)
     now = datetime.now(timezone.utc)
     due_date = now + timedelta(days=14)
 
-    # Create invoice
+    # Create the invoice and its items in one transaction; the client and
+    # coupon are validated and the billing address snapshotted there.
     invoice_data = {
-        "org_id": auth.org_id,
         "number": invoice_number,
         "number_prefix": "INV-",
         "user_id": client_id,
-        "billing_address": billing_address,
         "status": body.status if body.status is not None else 1,
         "created_at": now.isoformat(),
         "date_due": due_date.isoformat(),
@@ -428,42 +409,16 @@ async def create_invoice(
         "employee_id": None,
     }
 
-    invoice_result = supabase.table("invoices").insert(invoice_data).execute()
-
-    if not invoice_result.data:
-        raise HTTPException(status_code=500, detail="Failed to create invoice")
-
-    invoice = invoice_result.data[0]
-
-    # Create invoice items
-    item_rows = [
-        {
-            "invoice_id": invoice["id"],
-            "name": item.name,
-            "description": item.description,
-            "quantity": item.quantity,
-            "amount": item.amount,
-            "discount": item.discount,
-            "discount2": 0,
-            "total": item.quantity * item.amount - item.discount,
-            "service_id": item.service_id,
-            "order_id": None,
-            "options": item.options or {},
-        }
-        for item in body.items
-    ]
-
-    items_result = supabase.table("invoice_items").insert(item_rows).execute()
-
-    # Fetch full invoice with relations
-    full_invoice = supabase.table("invoices").select(
-        "*, users:user_id (id, name_f, name_l, email, company, phone, tax_id, addresses:address_id (*), roles:role_id (*)), invoice_items (*)"
-    ).eq("id", invoice["id"]).execute()
-
-    if not full_invoice.data:
-        raise HTTPException(status_code=500, detail="Failed to fetch created invoice")
+    try:
+        invoice = call_write_rpc(supabase, "create_invoice_graph", {
+            "p_org_id": auth.org_id,
+            "p_invoice": invoice_data,
+            "p_items": invoice_item_rows(body.items),
+        })
+    except RejectedWrite as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.body()) from exc
 
-    return serialize_invoice(full_invoice.data[0])
+    return serialize_invoice(invoice)
 
 
 @router.get("/{invoice_id}", response_model=InvoiceResponse)
@@ -491,19 +446,14 @@ async def update_invoice(
     auth: AuthContext = Depends(get_current_org),
 ) -> InvoiceResponse:
     """Update an invoice."""
-    supabase = get_supabase()
-
-    # Fetch existing invoice
-    existing_result = supabase.table("invoices").select(
-        "*, users:user_id (*)"
-    ).eq("id", invoice_id).eq("org_id", auth.org_id).is_("deleted_at", "null").execute()
-
-    if not existing_result.data:
+    if not is_valid_uuid(invoice_id):
         raise HTTPException(status_code=404, detail="Not Found")
 
-    existing = existing_result.data[0]
+    supabase = get_supabase()
 
-    # Validate status transition
+    # Validate status; the transition from the current status is checked
+    # in the write, against the statuses the new one may be reached from
+    status_from = None
     if body.status is not None:
         if body.status not in VALID_INVOICE_STATUSES:
             raise HTTPException(
@@ -513,119 +463,74 @@ async def update_invoice(
                     "errors": {"status": ["The selected status is invalid."]},
                 },
             )
+        status_from = [
+            current for current, allowed in INVOICE_STATUS_TRANSITIONS.items()
+            if body.status in allowed
+        ]
 
-        current_status = existing["status"]
-        if body.status != current_status:
-            allowed = INVOICE_STATUS_TRANSITIONS.get(current_status, [])
-            if body.status not in allowed:
-                current_name = INVOICE_STATUS_MAP.get(current_status, "Unknown")
-                new_name = INVOICE_STATUS_MAP.get(body.status, "Unknown")
-                raise HTTPException(
-                    status_code=400,
-                    detail={
-                        "message": "The given data was invalid.",
-                        "errors": {"status": [f"Cannot transition from {current_name} to {new_name}."]},
-                    },
-                )
-
-    # Validate user_id if changing
-    client_id = existing["user_id"]
-    if body.user_id and body.user_id != existing["user_id"]:
-        client_result = supabase.table("users").select("id").eq(
-            "id", body.user_id
-        ).eq("org_id", auth.org_id).execute()
-
-        if not client_result.data:
-            raise HTTPException(
-                status_code=422,
-                detail={
-                    "message": "The given data was invalid.",
-                    "errors": {"user_id": ["The specified client does not exist."]},
-                },
-            )
-        client_id = body.user_id
-
-    # Validate coupon if provided
-    if body.coupon_id:
-        coupon_result = supabase.table("coupons").select("id").eq(
-            "id", body.coupon_id
-        ).execute()
-
-        if not coupon_result.data:
-            raise HTTPException(
-                status_code=422,
-                detail={
-                    "message": "The given data was invalid.",
-                    "errors": {"coupon_id": ["The specified coupon does not exist."]},
-                },
-            )
+    # Malformed ids cannot exist; real ones are checked in the write itself
+    if body.user_id and not is_valid_uuid(body.user_id):
+        raise HTTPException(
+            status_code=422,
+            detail={
+                "message": "The given data was invalid.",
+                "errors": {"user_id": ["The specified client does not exist."]},
+            },
+        )
+    if body.coupon_id and not is_valid_uuid(body.coupon_id):
+        raise HTTPException(
+            status_code=422,
+            detail={
+                "message": "The given data was invalid.",
+                "errors": {"coupon_id": ["The specified coupon does not exist."]},
+            },
+        )
 
-    # Calculate new totals
+    # Calculate new subtotal (the total adds the new or current tax)
     subtotal = 0.0
     for item in body.items:
         item_total = item.quantity * item.amount - item.discount
         subtotal += item_total
 
-    tax = body.tax if body.tax is not None else existing["tax"]
-    total = subtotal + tax
-
-    # Update invoice
-    now = datetime.now(timezone.utc).isoformat()
-    update_data: dict[str, Any] = {
-        "user_id": client_id,
-        "subtotal": subtotal,
-        "total": total,
-        "updated_at": now,
-    }
+    changes: dict[str, Any] = {"subtotal": subtotal}
 
+    if body.user_id:
+        changes["user_id"] = body.user_id
     if body.status is not None:
-        update_data["status"] = body.status
+        changes["status"] = body.status
     if body.tax is not None:
-        update_data["tax"] = body.tax
+        changes["tax"] = body.tax
     if body.tax_type is not None:
-        update_data["tax_type"] = body.tax_type
+        changes["tax_type"] = body.tax_type
     if body.recurring is not None:
-        update_data["recurring"] = body.recurring.model_dump()
+        changes["recurring"] = body.recurring.model_dump()
     elif body.recurring is None and "recurring" in body.model_fields_set:
-        update_data["recurring"] = None
+        changes["recurring"] = None
     if body.coupon_id is not None:
-        update_data["coupon_id"] = body.coupon_id
+        changes["coupon_id"] = body.coupon_id
     if body.note is not None:
-        update_data["note"] = body.note
-
-    supabase.table("invoices").update(update_data).eq("id", invoice_id).execute()
-
-    # Full replacement of items - delete old, insert new
-    supabase.table("invoice_items").delete().eq("invoice_id", invoice_id).execute()
-
-    item_rows = [
-        {
-            "invoice_id": invoice_id,
-            "name": item.name,
-            "description": item.description,
-            "quantity": item.quantity,
-            "amount": item.amount,
-            "discount": item.discount,
-            "discount2": 0,
-            "total": item.quantity * item.amount - item.discount,
-            "service_id": item.service_id,
-            "order_id": None,
-            "options": item.options or {},
-        }
-        for item in body.items
-    ]
-
-    supabase.table("invoice_items").insert(item_rows).execute()
-
-    # Fetch updated invoice
-    updated_result = supabase.table("invoices").select(
-        "*, users:user_id (id, name_f, name_l, email, company, phone, tax_id, addresses:address_id (*), roles:role_id (*)), invoice_items (*)"
-    ).eq("id", invoice_id).execute()
-
-    if not updated_result.data:
-        raise HTTPException(status_code=500, detail="Failed to fetch updated invoice")
-
-    return serialize_invoice(updated_result.data[0])
+        changes["note"] = body.note
+
+    # Update the invoice and fully replace its items in one transaction
+    try:
+        invoice = call_write_rpc(supabase, "update_invoice_graph", {
+            "p_org_id": auth.org_id,
+            "p_invoice_id": invoice_id,
+            "p_changes": changes,
+            "p_items": invoice_item_rows(body.items),
+            "p_status_from": status_from,
+        })
+    except RejectedWrite as exc:
+        if exc.status_code == 404:
+            raise HTTPException(status_code=404, detail="Not Found") from exc
+        message = None
+        if exc.field == "status" and exc.detail is not None:
+            current_name = INVOICE_STATUS_MAP.get(int(exc.detail), "Unknown")
+            new_name = INVOICE_STATUS_MAP.get(body.status, "Unknown")
+            message = f"Cannot transition from {current_name} to {new_name}."
+        raise HTTPException(status_code=exc.status_code, detail=exc.body(message)) from exc
+
+    return serialize_invoice(invoice)
 
 
 @router.delete("/{invoice_id}", status_code=204)
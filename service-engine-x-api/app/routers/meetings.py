@@ -19,6 +19,7 @@ from app.models.meetings import (
     MeetingResponse,
 )
 from app.utils import build_pagination_response, format_currency_optional, is_valid_uuid
+from app.utils.serialization import model_factory, trusted_page_response
 
 router = APIRouter(prefix="/api/meetings", tags=["Meetings"])
 
@@ -26,29 +27,35 @@ router = APIRouter(prefix="/api/meetings", tags=["Meetings"])
 VALID_SORT_FIELDS = {"start_time", "created_at", "updated_at", "status"}
 
 
-def _serialize_account(account: dict[str, Any] | None) -> AccountSummary | None:
+def _serialize_account(
+    account: dict[str, Any] | None, *, trusted: bool = False
+) -> AccountSummary | None:
     if not account:
         return None
-    return AccountSummary(
+    return model_factory(AccountSummary, trusted=trusted)(
         id=account["id"],
         name=account["name"],
         lifecycle=account.get("lifecycle"),
     )
 
 
-def _serialize_contact(contact: dict[str, Any] | None) -> ContactSummary | None:
+def _serialize_contact(
+    contact: dict[str, Any] | None, *, trusted: bool = False
+) -> ContactSummary | None:
     if not contact:
         return None
     first = contact.get("name_f") or ""
     last = contact.get("name_l") or ""
     full = f"{first} {last}".strip() or contact.get("email") or contact["id"]
-    return ContactSummary(id=contact["id"], name=full, email=contact.get("email"))
+    return model_factory(ContactSummary, trusted=trusted)(
+        id=contact["id"], name=full, email=contact.get("email")
+    )
 
 
-def _serialize_deal(deal: dict[str, Any] | None) -> DealSummary | None:
+def _serialize_deal(deal: dict[str, Any] | None, *, trusted: bool = False) -> DealSummary | None:
     if not deal:
         return None
-    return DealSummary(
+    return model_factory(DealSummary, trusted=trusted)(
         id=deal["id"],
         name=deal.get("title"),
         stage=deal.get("status"),
@@ -56,7 +63,7 @@ def _serialize_deal(deal: dict[str, Any] | None) -> DealSummary | None:
     )
 
 
-def _base_meeting_dict(row: dict[str, Any]) -> dict[str, Any]:
+def _base_meeting_dict(row: dict[str, Any], *, trusted: bool = False) -> dict[str, Any]:
     account = row.get("account")
     if isinstance(account, list):
         account = account[0] if account else None
@@ -87,16 +94,17 @@ def _base_meeting_dict(row: dict[str, Any]) -> dict[str, Any]:
         "attendee_emails": attendee_emails,
         "host_no_show": bool(row.get("host_no_show", False)),
         "guest_no_show": bool(row.get("guest_no_show", False)),
-        "account": _serialize_account(account),
-        "contact": _serialize_contact(contact),
-        "deal": _serialize_deal(deal),
+        "account": _serialize_account(account, trusted=trusted),
+        "contact": _serialize_contact(contact, trusted=trusted),
+        "deal": _serialize_deal(deal, trusted=trusted),
         "created_at": row["created_at"],
         "updated_at": row["updated_at"],
     }
 
 
 def serialize_meeting_list(row: dict[str, Any]) -> MeetingListResponse:
-    return MeetingListResponse(**_base_meeting_dict(row))
+    """Build a list item from a trusted DB row (no validation)."""
+    return MeetingListResponse.model_construct(**_base_meeting_dict(row, trusted=True))
 
 
 def serialize_meeting(row: dict[str, Any]) -> MeetingResponse:
@@ -242,9 +250,13 @@ async def list_meetings(
     result = data_query.execute()
     rows = result.data or []
 
-    serialized = [serialize_meeting_list(row).model_dump() for row in rows]
+    serialized = [serialize_meeting_list(row) for row in rows]
     path = f"{settings.SERX_API_BASE_URL}/api/meetings"
-    return build_pagination_response(serialized, total, page, limit, path)
+    return trusted_page_response(
+        MeetingListResponse,
+        serialized,
+        build_pagination_response([], total, page, limit, path),
+    )
 
 
 @router.get("/upcoming")
@@ -318,15 +330,18 @@ async def list_upcoming_meetings(
     result = query.execute()
     rows = result.data or []
 
-    return {
-        "window": {
-            "from": now.isoformat(),
-            "to": window_end.isoformat(),
-            "label": window_label,
+    return trusted_page_response(
+        MeetingListResponse,
+        [serialize_meeting_list(row) for row in rows],
+        {
+            "window": {
+                "from": now.isoformat(),
+                "to": window_end.isoformat(),
+                "label": window_label,
+            },
+            "count": len(rows),
         },
-        "count": len(rows),
-        "data": [serialize_meeting_list(row).model_dump() for row in rows],
-    }
+    )
 
 
 @router.get("/{meeting_id}")
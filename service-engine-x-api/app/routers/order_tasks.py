@@ -9,12 +9,13 @@ from fastapi.responses import JSONResponse, Response
 from app.auth import AuthContext, get_current_org
 from app.database import get_supabase
 from app.models.order_tasks import OrderTaskResponse, OrderTaskUpdate, TaskEmployeeResponse
+from app.services.user_profiles import get_user_profiles
 from app.utils import is_valid_uuid
 
 router = APIRouter(prefix="/api/order-tasks", tags=["Order Tasks"])
 
 
-async def fetch_task_employees(supabase, task_id: str) -> list[TaskEmployeeResponse]:
+async def fetch_task_employees(supabase, task_id: str, org_id: str) -> list[TaskEmployeeResponse]:
     """Fetch employees assigned to a task."""
     assignments = (
         supabase.table("order_task_employees")
@@ -27,12 +28,7 @@ async def fetch_task_employees(supabase, task_id: str) -> list[TaskEmployeeRespo
         return []
 
     emp_ids = [a["employee_id"] for a in assignments.data]
-    employees = (
-        supabase.table("users")
-        .select("id, name_f, name_l")
-        .in_("id", emp_ids)
-        .execute()
-    )
+    profiles = await get_user_profiles(org_id, emp_ids)
 
     return [
         TaskEmployeeResponse(
@@ -40,13 +36,13 @@ async def fetch_task_employees(supabase, task_id: str) -> list[TaskEmployeeRespo
             name_f=e.get("name_f"),
             name_l=e.get("name_l"),
         )
-        for e in (employees.data or [])
+        for e in (profiles[emp_id] for emp_id in emp_ids if emp_id in profiles)
     ]
 
 
-async def serialize_task(supabase, task: dict[str, Any]) -> OrderTaskResponse:
+async def serialize_task(supabase, task: dict[str, Any], org_id: str) -> OrderTaskResponse:
     """Serialize a task with employees."""
-    employees = await fetch_task_employees(supabase, task["id"])
+    employees = await fetch_task_employees(supabase, task["id"], org_id)
 
     return OrderTaskResponse(
         id=task["id"],
@@ -184,7 +180,7 @@ async def update_order_task(
 
     # Refetch task for response
     updated = supabase.table("order_tasks").select("*").eq("id", task_id).execute()
-    return await serialize_task(supabase, updated.data[0])
+    return await serialize_task(supabase, updated.data[0], auth.org_id)
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -246,7 +242,7 @@ async def mark_task_complete(
             detail="Failed to mark task complete",
         )
 
-    return await serialize_task(supabase, result.data[0])
+    return await serialize_task(supabase, result.data[0], auth.org_id)
 
 
 @router.delete("/{task_id}/complete", status_code=status.HTTP_200_OK)
@@ -283,4 +279,4 @@ async def mark_task_incomplete(
             detail="Failed to mark task incomplete",
         )
 
-    return await serialize_task(supabase, result.data[0])
+    return await serialize_task(supabase, result.data[0], auth.org_id)
@@ -1,11 +1,9 @@
 """Orders API router."""
 
-import random
-import string
 from datetime import datetime, timezone
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
 from fastapi.responses import JSONResponse, Response
 
 from app.auth import AuthContext, get_current_org
@@ -21,7 +19,17 @@ from app.models.orders import (
 from app.models.order_tasks import OrderTaskCreate, OrderTaskResponse, TaskEmployeeResponse
 from app.models.order_messages import OrderMessageCreate, OrderMessageResponse
 from app.models.services import MetadataItem
+from app.services.numbering import next_order_number
+from app.services.service_catalog import get_catalog_service
+from app.services.tags import ORDER_TAGS, tag_names_by_owner
+from app.services.user_profiles import get_user_profiles
 from app.utils import build_pagination_response, is_valid_uuid
+from app.utils.mutations import (
+    RejectedWrite,
+    call_write_rpc,
+    expected_version,
+    soft_delete_owned,
+)
 
 router = APIRouter(prefix="/api/orders", tags=["Orders"])
 
@@ -34,12 +42,6 @@ STATUS_MAP = {
 }
 
 
-def generate_order_number() -> str:
-    """Generate a random 8-character order number."""
-    chars = string.ascii_uppercase + string.digits
-    return "".join(random.choice(chars) for _ in range(8))
-
-
 def transform_metadata(metadata: list[MetadataItem] | None) -> dict[str, str]:
     """Transform metadata array to key-value object."""
     if not metadata:
@@ -47,13 +49,17 @@ def transform_metadata(metadata: list[MetadataItem] | None) -> dict[str, str]:
     return {item.title: item.value for item in metadata if item.title}
 
 
+CLIENT_ADDRESS_COLUMNS = ("id", "line_1", "line_2", "city", "state", "postcode", "country")
+CLIENT_ROLE_COLUMNS = ("id", "name")
+
+
 async def fetch_client(supabase, user_id: str) -> OrderClientResponse | None:
     """Fetch client data for an order."""
     result = (
         supabase.table("users")
         .select("id, name_f, name_l, email, company, phone, address_id, role_id, "
-                "addresses(id, line_1, line_2, city, state, postcode, country), "
-                "roles(id, name)")
+                f"addresses({', '.join(CLIENT_ADDRESS_COLUMNS)}), "
+                f"roles({', '.join(CLIENT_ROLE_COLUMNS)})")
         .eq("id", user_id)
         .execute()
     )
@@ -61,7 +67,11 @@ async def fetch_client(supabase, user_id: str) -> OrderClientResponse | None:
     if not result.data or len(result.data) == 0:
         return None
 
-    user = result.data[0]
+    return serialize_client(result.data[0])
+
+
+def serialize_client(user: dict[str, Any]) -> OrderClientResponse:
+    """Serialize a client row with its embedded address and role."""
     addr = user.get("addresses")
     if isinstance(addr, list):
         addr = addr[0] if addr else None
@@ -82,7 +92,7 @@ async def fetch_client(supabase, user_id: str) -> OrderClientResponse | None:
     )
 
 
-async def fetch_order_employees(supabase, order_id: str) -> list[OrderEmployeeResponse]:
+async def fetch_order_employees(supabase, order_id: str, org_id: str) -> list[OrderEmployeeResponse]:
     """Fetch employees assigned to an order."""
     assignments = (
         supabase.table("order_employees")
@@ -95,24 +105,23 @@ async def fetch_order_employees(supabase, order_id: str) -> list[OrderEmployeeRe
         return []
 
     emp_ids = [a["employee_id"] for a in assignments.data]
-    employees = (
-        supabase.table("users")
-        .select("id, name_f, name_l, role_id")
-        .in_("id", emp_ids)
-        .execute()
-    )
+    profiles = await get_user_profiles(org_id, emp_ids)
 
     return [
-        OrderEmployeeResponse(
-            id=e["id"],
-            name_f=e.get("name_f"),
-            name_l=e.get("name_l"),
-            role_id=e.get("role_id"),
-        )
-        for e in (employees.data or [])
+        serialize_employee(profiles[emp_id]) for emp_id in emp_ids if emp_id in profiles
     ]
 
 
+def serialize_employee(employee: dict[str, Any]) -> OrderEmployeeResponse:
+    """Serialize an assigned employee."""
+    return OrderEmployeeResponse(
+        id=employee["id"],
+        name_f=employee.get("name_f"),
+        name_l=employee.get("name_l"),
+        role_id=employee.get("role_id"),
+    )
+
+
 async def fetch_order_tags(supabase, order_id: str) -> list[str]:
     """Fetch tags for an order."""
     tag_links = (
@@ -134,9 +143,81 @@ async def fetch_order_tags(supabase, order_id: str) -> list[str]:
 async def serialize_order(supabase, order: dict[str, Any]) -> OrderResponse:
     """Serialize order with related data."""
     client = await fetch_client(supabase, order["user_id"])
-    employees = await fetch_order_employees(supabase, order["id"])
+    employees = await fetch_order_employees(supabase, order["id"], order["org_id"])
     tags = await fetch_order_tags(supabase, order["id"])
 
+    return build_order_response(order, client, employees, tags)
+
+
+async def serialize_orders(
+    supabase, orders: list[dict[str, Any]], org_id: str
+) -> list[OrderResponse]:
+    """Serialize a page of orders, loading each relation once for the whole page."""
+    if not orders:
+        return []
+    order_ids = [o["id"] for o in orders]
+    user_ids = sorted({o["user_id"] for o in orders if o.get("user_id")})
+
+    clients_result = (
+        supabase.table("users")
+        .select("id, name_f, name_l, email, company, phone, address_id, role_id, "
+                f"addresses({', '.join(CLIENT_ADDRESS_COLUMNS)}), "
+                f"roles({', '.join(CLIENT_ROLE_COLUMNS)})")
+        .in_("id", user_ids)
+        .execute()
+    ) if user_ids else None
+    client_rows = clients_result.data if clients_result else []
+    clients = {u["id"]: serialize_client(u) for u in client_rows or []}
+
+    assignments = (
+        supabase.table("order_employees")
+        .select("order_id, employee_id")
+        .in_("order_id", order_ids)
+        .execute()
+    ).data or []
+    profiles = await get_user_profiles(org_id, [a["employee_id"] for a in assignments])
+    employees: dict[str, list[OrderEmployeeResponse]] = {}
+    for a in assignments:
+        if a["employee_id"] in profiles:
+            employees.setdefault(a["order_id"], []).append(
+                serialize_employee(profiles[a["employee_id"]])
+            )
+
+    tags = await tag_names_by_owner(supabase, ORDER_TAGS, order_ids)
+
+    return [
+        build_order_response(
+            o, clients.get(o["user_id"]), employees.get(o["id"], []), tags.get(o["id"], [])
+        )
+        for o in orders
+    ]
+
+
+def serialize_order_graph(graph: dict[str, Any]) -> OrderResponse:
+    """Serialize the graph returned by ``create_order_graph`` / ``update_order_graph``."""
+    client = graph.get("client")
+    if client:
+        address, role = client.get("addresses"), client.get("roles")
+        client = serialize_client({
+            **client,
+            "addresses": {k: address.get(k) for k in CLIENT_ADDRESS_COLUMNS} if address else None,
+            "roles": {k: role.get(k) for k in CLIENT_ROLE_COLUMNS} if role else None,
+        })
+    return build_order_response(
+        graph["order"],
+        client or None,
+        [serialize_employee(e) for e in graph.get("employees") or []],
+        graph.get("tags") or [],
+    )
+
+
+def build_order_response(
+    order: dict[str, Any],
+    client: OrderClientResponse | None,
+    employees: list[OrderEmployeeResponse],
+    tags: list[str],
+) -> OrderResponse:
+    """Assemble an order response from the row and its loaded relations."""
     return OrderResponse(
         id=order["id"],
         number=order["number"],
@@ -163,56 +244,6 @@ async def serialize_order(supabase, order: dict[str, Any]) -> OrderResponse:
     )
 
 
-async def validate_employees(supabase, employee_ids: list[str]) -> str | None:
-    """Validate employee IDs. Returns error message or None."""
-    for emp_id in employee_ids:
-        if not is_valid_uuid(emp_id):
-            return f"Employee with ID {emp_id} does not exist."
-
-        result = (
-            supabase.table("users")
-            .select("id, role:roles(dashboard_access)")
-            .eq("id", emp_id)
-            .execute()
-        )
-
-        if not result.data or len(result.data) == 0:
-            return f"Employee with ID {emp_id} does not exist."
-
-        emp = result.data[0]
-        role = emp.get("role")
-        if isinstance(role, list):
-            role = role[0] if role else None
-
-        if not role or role.get("dashboard_access") == 0:
-            return f"Employee with ID {emp_id} does not exist."
-
-    return None
-
-
-async def assign_tags(supabase, order_id: str, tag_names: list[str]) -> None:
-    """Assign tags to an order (find or create)."""
-    for tag_name in tag_names:
-        # Find existing tag
-        existing = supabase.table("tags").select("id").eq("name", tag_name).execute()
-
-        if existing.data and len(existing.data) > 0:
-            tag_id = existing.data[0]["id"]
-        else:
-            # Create new tag
-            new_tag = supabase.table("tags").insert({"name": tag_name}).execute()
-            if new_tag.data:
-                tag_id = new_tag.data[0]["id"]
-            else:
-                continue
-
-        # Link to order
-        supabase.table("order_tags").insert({
-            "order_id": order_id,
-            "tag_id": tag_id,
-        }).execute()
-
-
 @router.get("")
 async def list_orders(
     request: Request,
@@ -259,11 +290,7 @@ async def list_orders(
     result = query.execute()
     orders = result.data or []
 
-    # Serialize orders
-    serialized = []
-    for o in orders:
-        order_resp = await serialize_order(supabase, o)
-        serialized.append(order_resp.model_dump())
+    serialized = [o.model_dump() for o in await serialize_orders(supabase, orders, auth.org_id)]
 
     path = f"{settings.SERX_API_BASE_URL}/api/orders"
     return build_pagination_response(serialized, total, page, limit, path)
@@ -287,17 +314,6 @@ async def create_order(
             },
         )
 
-    # Check user exists
-    user_check = supabase.table("users").select("id").eq("id", body.user_id).execute()
-    if not user_check.data or len(user_check.data) == 0:
-        return JSONResponse(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            content={
-                "message": "The given data was invalid.",
-                "errors": {"user_id": ["The specified client does not exist."]},
-            },
-        )
-
     # Require service_id or service
     if not body.service_id and not body.service:
         return JSONResponse(
@@ -323,15 +339,8 @@ async def create_order(
                 },
             )
 
-        svc = (
-            supabase.table("services")
-            .select("id, name, price, currency")
-            .eq("id", body.service_id)
-            .is_("deleted_at", "null")
-            .execute()
-        )
-
-        if not svc.data or len(svc.data) == 0:
+        svc = await get_catalog_service(auth.org_id, body.service_id)
+        if svc is None:
             return JSONResponse(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                 content={
@@ -340,39 +349,26 @@ async def create_order(
                 },
             )
 
-        service_name = body.service or svc.data[0]["name"]
-        price = svc.data[0].get("price") or "0.00"
-        currency = svc.data[0].get("currency") or "USD"
+        service_name = body.service or svc["name"]
+        price = svc.get("price") or "0.00"
+        currency = svc.get("currency") or "USD"
 
-    # Validate employees
-    if body.employees:
-        error = await validate_employees(supabase, body.employees)
-        if error:
-            return JSONResponse(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                content={
-                    "message": "The given data was invalid.",
-                    "errors": {"employees": [error]},
-                },
-            )
-
-    # Check unique number
-    order_number = body.number or generate_order_number()
-    if body.number:
-        existing = supabase.table("orders").select("id").eq("number", body.number).execute()
-        if existing.data and len(existing.data) > 0:
-            return JSONResponse(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                content={
-                    "message": "The given data was invalid.",
-                    "errors": {"number": ["The order number has already been taken."]},
-                },
-            )
+    # Employee ids are checked against the org in the write itself
+    employees = body.employees or []
+    bad_employee = next((e for e in employees if not is_valid_uuid(e)), None)
+    if bad_employee is not None:
+        return JSONResponse(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            content={
+                "message": "The given data was invalid.",
+                "errors": {"employees": [f"Employee with ID {bad_employee} does not exist."]},
+            },
+        )
 
-    # Create order
+    # Create the order with its employees and tags in one transaction; the
+    # client, service, employees and number are validated there.
     order_data = {
-        "org_id": auth.org_id,
-        "number": order_number,
+        "number": body.number or await next_order_number(),
         "user_id": body.user_id,
         "service_id": body.service_id,
         "service_name": service_name,
@@ -389,26 +385,17 @@ async def create_order(
         "date_due": body.date_due,
     }
 
-    result = supabase.table("orders").insert(order_data).execute()
-
-    if not result.data:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to create order",
-        )
-
-    new_order = result.data[0]
-
-    # Assign employees
-    if body.employees:
-        emp_rows = [{"order_id": new_order["id"], "employee_id": e} for e in body.employees]
-        supabase.table("order_employees").insert(emp_rows).execute()
-
-    # Assign tags
-    if body.tags:
-        await assign_tags(supabase, new_order["id"], body.tags)
+    try:
+        graph = call_write_rpc(supabase, "create_order_graph", {
+            "p_org_id": auth.org_id,
+            "p_order": order_data,
+            "p_employee_ids": employees,
+            "p_tags": body.tags or [],
+        })
+    except RejectedWrite as exc:
+        return JSONResponse(status_code=exc.status_code, content=exc.body())
 
-    return await serialize_order(supabase, new_order)
+    return serialize_order_graph(graph)
 
 
 @router.get("/{order_id}")
@@ -442,6 +429,7 @@ async def update_order(
     order_id: str,
     body: OrderUpdate,
     auth: AuthContext = Depends(get_current_org),
+    if_match: str | None = Header(None),
 ) -> OrderResponse:
     """Update an existing order."""
     if not is_valid_uuid(order_id):
@@ -449,19 +437,6 @@ async def update_order(
 
     supabase = get_supabase()
 
-    # Get existing
-    existing = (
-        supabase.table("orders")
-        .select("*")
-        .eq("id", order_id)
-        .eq("org_id", auth.org_id)
-        .is_("deleted_at", "null")
-        .execute()
-    )
-
-    if not existing.data or len(existing.data) == 0:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
-
     # Validate service_id if provided
     if body.service_id is not None:
         if body.service_id and not is_valid_uuid(body.service_id):
@@ -474,14 +449,7 @@ async def update_order(
             )
 
         if body.service_id:
-            svc = (
-                supabase.table("services")
-                .select("id")
-                .eq("id", body.service_id)
-                .is_("deleted_at", "null")
-                .execute()
-            )
-            if not svc.data or len(svc.data) == 0:
+            if await get_catalog_service(auth.org_id, body.service_id) is None:
                 return JSONResponse(
                     status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                     content={
@@ -490,63 +458,54 @@ async def update_order(
                     },
                 )
 
-    # Validate employees
-    if body.employees is not None:
-        error = await validate_employees(supabase, body.employees)
-        if error:
-            return JSONResponse(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                content={
-                    "message": "The given data was invalid.",
-                    "errors": {"employees": [error]},
-                },
-            )
+    # Employee ids are checked against the org in the write itself
+    bad_employee = next((e for e in body.employees or [] if not is_valid_uuid(e)), None)
+    if bad_employee is not None:
+        return JSONResponse(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            content={
+                "message": "The given data was invalid.",
+                "errors": {"employees": [f"Employee with ID {bad_employee} does not exist."]},
+            },
+        )
 
-    # Build update payload
-    update_payload: dict[str, Any] = {
-        "updated_at": datetime.now(timezone.utc).isoformat(),
-    }
+    # Build the changes (updated_at is set by the write)
+    changes: dict[str, Any] = {}
 
     if body.service_id is not None:
-        update_payload["service_id"] = body.service_id if body.service_id else None
+        changes["service_id"] = body.service_id if body.service_id else None
     if body.service is not None:
-        update_payload["service_name"] = body.service
+        changes["service_name"] = body.service
     if body.status is not None:
-        update_payload["status"] = body.status
+        changes["status"] = body.status
     if body.note is not None:
-        update_payload["note"] = body.note
+        changes["note"] = body.note
     if body.metadata is not None:
-        update_payload["metadata"] = transform_metadata(body.metadata)
+        changes["metadata"] = transform_metadata(body.metadata)
     if body.date_started is not None:
-        update_payload["date_started"] = body.date_started
+        changes["date_started"] = body.date_started
     if body.date_completed is not None:
-        update_payload["date_completed"] = body.date_completed
+        changes["date_completed"] = body.date_completed
     if body.date_due is not None:
-        update_payload["date_due"] = body.date_due
-
-    # Update order
-    result = supabase.table("orders").update(update_payload).eq("id", order_id).execute()
-
-    if not result.data:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to update order",
-        )
-
-    # Replace employees if provided
-    if body.employees is not None:
-        supabase.table("order_employees").delete().eq("order_id", order_id).execute()
-        if body.employees:
-            emp_rows = [{"order_id": order_id, "employee_id": e} for e in body.employees]
-            supabase.table("order_employees").insert(emp_rows).execute()
-
-    # Replace tags if provided
-    if body.tags is not None:
-        supabase.table("order_tags").delete().eq("order_id", order_id).execute()
-        if body.tags:
-            await assign_tags(supabase, order_id, body.tags)
-
-    return await serialize_order(supabase, result.data[0])
+        changes["date_due"] = body.date_due
+
+    # Update the order and replace its employees and tags in one transaction
+    # (404 if missing, 412 if changed since If-Match)
+    try:
+        graph = call_write_rpc(supabase, "update_order_graph", {
+            "p_org_id": auth.org_id,
+            "p_order_id": order_id,
+            "p_changes": changes,
+            "p_employee_ids": body.employees,
+            "p_tags": body.tags,
+            "p_expected_updated_at": expected_version(if_match),
+        })
+    except RejectedWrite as exc:
+        if exc.status_code in (404, 412):
+            raise HTTPException(status_code=exc.status_code, detail=exc.message) from exc
+        return JSONResponse(status_code=exc.status_code, content=exc.body())
+
+    return serialize_order_graph(graph)
 
 
 @router.delete("/{order_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -558,23 +517,7 @@ async def delete_order(
     if not is_valid_uuid(order_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
 
-    supabase = get_supabase()
-
-    existing = (
-        supabase.table("orders")
-        .select("id")
-        .eq("id", order_id)
-        .eq("org_id", auth.org_id)
-        .is_("deleted_at", "null")
-        .execute()
-    )
-
-    if not existing.data or len(existing.data) == 0:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
-
-    supabase.table("orders").update(
-        {"deleted_at": datetime.now(timezone.utc).isoformat()}
-    ).eq("id", order_id).execute()
+    soft_delete_owned(get_supabase(), "orders", order_id, auth.org_id)
 
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
@@ -583,7 +526,7 @@ async def delete_order(
 # Nested: Order Tasks
 # =============================================================================
 
-async def fetch_task_employees(supabase, task_id: str) -> list[TaskEmployeeResponse]:
+async def fetch_task_employees(supabase, task_id: str, org_id: str) -> list[TaskEmployeeResponse]:
     """Fetch employees assigned to a task."""
     assignments = (
         supabase.table("order_task_employees")
@@ -596,12 +539,7 @@ async def fetch_task_employees(supabase, task_id: str) -> list[TaskEmployeeRespo
         return []
 
     emp_ids = [a["employee_id"] for a in assignments.data]
-    employees = (
-        supabase.table("users")
-        .select("id, name_f, name_l")
-        .in_("id", emp_ids)
-        .execute()
-    )
+    profiles = await get_user_profiles(org_id, emp_ids)
 
     return [
         TaskEmployeeResponse(
@@ -609,13 +547,13 @@ async def fetch_task_employees(supabase, task_id: str) -> list[TaskEmployeeRespo
             name_f=e.get("name_f"),
             name_l=e.get("name_l"),
         )
-        for e in (employees.data or [])
+        for e in (profiles[emp_id] for emp_id in emp_ids if emp_id in profiles)
     ]
 
 
-async def serialize_task(supabase, task: dict[str, Any]) -> OrderTaskResponse:
+async def serialize_task(supabase, task: dict[str, Any], org_id: str) -> OrderTaskResponse:
     """Serialize a task with employees."""
-    employees = await fetch_task_employees(supabase, task["id"])
+    employees = await fetch_task_employees(supabase, task["id"], org_id)
 
     return OrderTaskResponse(
         id=task["id"],
@@ -669,7 +607,7 @@ async def list_order_tasks(
 
     result = []
     for t in (tasks.data or []):
-        result.append(await serialize_task(supabase, t))
+        result.append(await serialize_task(supabase, t, auth.org_id))
 
     return result
 
@@ -758,7 +696,7 @@ async def create_order_task(
         emp_rows = [{"task_id": new_task["id"], "employee_id": e} for e in body.employee_ids]
         supabase.table("order_task_employees").insert(emp_rows).execute()
 
-    return await serialize_task(supabase, new_task)
+    return await serialize_task(supabase, new_task, auth.org_id)
 
 
 # =============================================================================
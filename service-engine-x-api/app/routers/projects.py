@@ -25,6 +25,7 @@ from app.models.projects import (
     VALID_PHASE_TRANSITIONS,
 )
 from app.utils import build_pagination_response, is_valid_uuid
+from app.utils.mutations import soft_delete_owned, update_owned
 
 router = APIRouter(prefix="/api/projects", tags=["Projects"])
 
@@ -416,27 +417,7 @@ async def delete_project(
     if not is_valid_uuid(project_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
 
-    supabase = get_supabase()
-
-    # Verify exists
-    existing = (
-        supabase.table("projects")
-        .select("id")
-        .eq("id", project_id)
-        .eq("org_id", auth.org_id)
-        .is_("deleted_at", "null")
-        .execute()
-    )
-
-    if not existing.data:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
-
-    # Soft delete
-    now = datetime.now(timezone.utc).isoformat()
-    supabase.table("projects").update({
-        "deleted_at": now,
-        "updated_at": now,
-    }).eq("id", project_id).execute()
+    soft_delete_owned(get_supabase(), "projects", project_id, auth.org_id)
 
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
@@ -479,21 +460,14 @@ async def advance_project_phase(
     next_phase = current_phase + 1
     now = datetime.now(timezone.utc).isoformat()
 
-    result = (
-        supabase.table("projects")
-        .update({"phase": next_phase, "updated_at": now})
-        .eq("id", project_id)
-        .execute()
+    # Only applies if the phase is still the one read above (409 otherwise),
+    # so concurrent advances cannot skip a phase.
+    updated = update_owned(
+        supabase, "projects", project_id, auth.org_id,
+        {"phase": next_phase, "updated_at": now},
+        match={"phase": current_phase},
     )
 
-    if not result.data:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to advance project phase",
-        )
-
-    updated = result.data[0]
-
     # Fetch relations
     engagement_result = (
         supabase.table("engagements")
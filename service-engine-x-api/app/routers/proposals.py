@@ -1,9 +1,6 @@
 """Proposals API router."""
 
 import hashlib
-import json
-import secrets
-import string
 from datetime import datetime, timezone
 from typing import Any
 from uuid import UUID
@@ -14,7 +11,11 @@ from fastapi.responses import RedirectResponse
 from app.auth.dependencies import AuthContext, get_current_org
 from app.config import settings
 from app.database import get_supabase
+from app.observability import timed_outbound
+from app.observability.metrics import record_webhook
 from app.utils import format_currency
+from app.utils.json_codec import loads
+from app.utils.serialization import trusted_page_response
 from app.utils.storage import upload_proposal_pdf
 from app.services.stripe_service import (
     build_line_items_from_proposal,
@@ -22,6 +23,8 @@ from app.services.stripe_service import (
     verify_webhook_signature,
 )
 from app.services.resend_service import send_proposal_signed_email, send_proposal_email
+from app.services.numbering import next_order_number
+from app.services.service_catalog import missing_service_ids
 from app.models.proposals import (
     PROPOSAL_STATUS_MAP,
     CreateProposalRequest,
@@ -46,12 +49,6 @@ ORDER_STATUS_MAP: dict[int, str] = {
     4: "On Hold",
 }
 
-def generate_order_number() -> str:
-    """Generate an 8-character alphanumeric order number."""
-    chars = string.ascii_uppercase + string.digits
-    return "".join(secrets.choice(chars) for _ in range(8))
-
-
 def generate_proposal_html(
     proposal: dict[str, Any],
     items: list[dict[str, Any]],
@@ -646,6 +643,7 @@ def wrap_signed_html_for_pdf(
 </html>"""
 
 
+@timed_outbound("docraptor")
 def generate_pdf_docraptor(html_content: str, filename: str) -> bytes:
     """Convert HTML to PDF using DocRaptor API."""
     import docraptor
@@ -663,9 +661,9 @@ def generate_pdf_docraptor(html_content: str, filename: str) -> bytes:
 
 
 def serialize_proposal_list_item(proposal: dict[str, Any]) -> ProposalListItem:
-    """Serialize a proposal for list response (without items)."""
+    """Serialize a proposal for list response (without items, trusted DB row)."""
     status_id = proposal.get("status", 0)
-    return ProposalListItem(
+    return ProposalListItem.model_construct(
         id=proposal["id"],
         account_name=proposal.get("client_company"),
         contact_email=proposal["client_email"],
@@ -817,31 +815,34 @@ async def list_proposals(
                 elif operator == "$gt":
                     query = query.gt(field, value)
 
-    result = await query.execute()
+    result = query.execute()
     proposals = result.data or []
 
     # Build response
     last_page = max(1, (total + limit - 1) // limit)
     base_url = str(request.url).split("?")[0]
 
-    return ProposalListResponse(
-        data=[serialize_proposal_list_item(p) for p in proposals],
-        links=ProposalListLinks(
-            first=f"{base_url}?page=1&limit={limit}",
-            last=f"{base_url}?page={last_page}&limit={limit}",
-            prev=f"{base_url}?page={page - 1}&limit={limit}" if page > 1 else None,
-            next=f"{base_url}?page={page + 1}&limit={limit}" if page < last_page else None,
-        ),
-        meta=ProposalListMeta(
-            current_page=page,
-            from_=offset + 1 if total > 0 else 0,
-            to=min(offset + limit, total),
-            last_page=last_page,
-            per_page=limit,
-            total=total,
-            path=base_url,
-            links=build_pagination_links(page, last_page, base_url, limit),
-        ),
+    links = ProposalListLinks(
+        first=f"{base_url}?page=1&limit={limit}",
+        last=f"{base_url}?page={last_page}&limit={limit}",
+        prev=f"{base_url}?page={page - 1}&limit={limit}" if page > 1 else None,
+        next=f"{base_url}?page={page + 1}&limit={limit}" if page < last_page else None,
+    )
+    meta = ProposalListMeta(
+        current_page=page,
+        from_=offset + 1 if total > 0 else 0,
+        to=min(offset + limit, total),
+        last_page=last_page,
+        per_page=limit,
+        total=total,
+        path=base_url,
+        links=build_pagination_links(page, last_page, base_url, limit),
+    )
+
+    return trusted_page_response(
+        ProposalListItem,
+        [serialize_proposal_list_item(p) for p in proposals],
+        {"data": [], "links": links.model_dump(), "meta": meta.model_dump(by_alias=True)},
     )
 
 
@@ -855,22 +856,15 @@ async def create_proposal(
 
     # Validate service_ids if provided (optional template references)
     service_ids = [item.service_id for item in body.items if item.service_id]
-    if service_ids:
-        services_result = supabase.table("services").select("id").eq(
-            "org_id", auth.org_id
-        ).is_("deleted_at", "null").in_("id", service_ids).execute()
-
-        found_service_ids = {s["id"] for s in (services_result.data or [])}
-        missing_services = [sid for sid in service_ids if sid not in found_service_ids]
-
-        if missing_services:
-            raise HTTPException(
-                status_code=422,
-                detail={
-                    "message": "The given data was invalid.",
-                    "errors": {"items": [f"Service with ID {missing_services[0]} does not exist."]},
-                },
-            )
+    missing_services = await missing_service_ids(auth.org_id, service_ids)
+    if missing_services:
+        raise HTTPException(
+            status_code=422,
+            detail={
+                "message": "The given data was invalid.",
+                "errors": {"items": [f"Service with ID {missing_services[0]} does not exist."]},
+            },
+        )
 
     # Calculate total from item prices
     total = sum(item.price for item in body.items)
@@ -1303,7 +1297,7 @@ async def sign_proposal(
 
     order_data = {
         "org_id": auth.org_id,
-        "number": generate_order_number(),
+        "number": await next_order_number(),
         "user_id": client_id,
         "service_id": primary_item.get("service_id") if primary_item else None,
         "service_name": order_name,
@@ -1706,7 +1700,7 @@ async def public_sign_proposal(proposal_id: str, request: Request) -> dict[str,
 
     # Parse request body
     try:
-        body = await request.json()
+        body = loads(await request.body())
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid request body")
 
@@ -1925,7 +1919,7 @@ async def public_sign_proposal(proposal_id: str, request: Request) -> dict[str,
 
     order_result = supabase.table("orders").insert({
         "org_id": org_id,
-        "number": generate_order_number(),
+        "number": await next_order_number(),
         "user_id": client_id,
         "account_id": account_id,  # NEW: Link to account
         "service_id": primary_item.get("service_id") if primary_item else None,
@@ -2149,7 +2143,7 @@ async def stripe_webhook(request: Request) -> dict[str, str]:
 
     # Parse payload to get metadata
     try:
-        event_data = json.loads(payload)
+        event_data = loads(payload)
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid JSON payload")
 
@@ -2189,6 +2183,8 @@ async def _handle_checkout_completed(
             if verified_event is None:
                 raise HTTPException(status_code=400, detail="Invalid signature")
 
+    record_webhook("stripe", "checkout.session.completed")
+
     payment_intent_id = session.get("payment_intent")
     now = datetime.now(timezone.utc).isoformat()
 
@@ -2233,6 +2229,8 @@ async def _handle_payment_intent_succeeded(
             if verified_event is None:
                 raise HTTPException(status_code=400, detail="Invalid signature")
 
+    record_webhook("stripe", "payment_intent.succeeded")
+
     payment_intent_id = intent.get("id")
     amount = intent.get("amount_received", 0)
     now = datetime.now(timezone.utc).isoformat()
@@ -15,7 +15,20 @@ from app.models.services import (
     ServiceResponse,
     ServiceUpdate,
 )
-from app.utils import build_pagination_response, format_currency, is_valid_uuid
+from app.services.service_catalog import (
+    get_catalog_service,
+    get_service_catalog,
+    invalidate_service_catalog,
+)
+from app.services.user_profiles import validate_employees
+from app.utils import (
+    build_pagination_response,
+    format_currency,
+    format_currency_optional,
+    is_valid_uuid,
+)
+from app.utils.mutations import soft_delete_owned
+from app.utils.serialization import model_factory, trusted_page_response
 
 router = APIRouter(prefix="/api/services", tags=["Services"])
 
@@ -42,21 +55,25 @@ def transform_metadata(metadata: list[MetadataItem] | None) -> dict[str, str]:
     return {item.title: item.value for item in metadata if item.title}
 
 
-def serialize_service(service: dict[str, Any]) -> ServiceResponse:
-    """Serialize service data to response model."""
-    return ServiceResponse(
+def serialize_service(service: dict[str, Any], *, trusted: bool = False) -> ServiceResponse:
+    """Serialize service data to response model.
+
+    Pass ``trusted=True`` for rows read straight from the database on list
+    endpoints to skip validation.
+    """
+    return model_factory(ServiceResponse, trusted=trusted)(
         id=service["id"],
         name=service["name"],
         description=service.get("description"),
         image=service.get("image"),
         recurring=service["recurring"],
-        price=service.get("price"),
+        price=format_currency_optional(service.get("price")),
         pretty_price=format_pretty_price(service.get("price"), service["currency"]),
         currency=service["currency"],
-        f_price=service.get("f_price"),
+        f_price=format_currency_optional(service.get("f_price")),
         f_period_l=service.get("f_period_l"),
         f_period_t=service.get("f_period_t"),
-        r_price=service.get("r_price"),
+        r_price=format_currency_optional(service.get("r_price")),
         r_period_l=service.get("r_period_l"),
         r_period_t=service.get("r_period_t"),
         recurring_action=service.get("recurring_action"),
@@ -79,31 +96,8 @@ def serialize_service(service: dict[str, Any]) -> ServiceResponse:
     )
 
 
-async def validate_employees(supabase, employee_ids: list[str]) -> str | None:
-    """Validate employee IDs exist and have dashboard access. Returns error message or None."""
-    for emp_id in employee_ids:
-        if not is_valid_uuid(emp_id):
-            return f"Employee with ID {emp_id} does not exist."
-
-        result = (
-            supabase.table("users")
-            .select("id, role:roles(dashboard_access)")
-            .eq("id", emp_id)
-            .execute()
-        )
-
-        if not result.data or len(result.data) == 0:
-            return f"Employee with ID {emp_id} does not exist."
-
-        emp = result.data[0]
-        role = emp.get("role")
-        if isinstance(role, list):
-            role = role[0] if role else None
-
-        if not role or role.get("dashboard_access") == 0:
-            return f"Employee with ID {emp_id} does not exist."
-
-    return None
+def _sort_key(value: Any) -> tuple[bool, Any]:
+    return (value is None, 0 if value is None else value)
 
 
 @router.get("")
@@ -117,7 +111,8 @@ async def list_services(
     """
     List all services for the authenticated organization.
 
-    Supports pagination, sorting, and filtering.
+    Supports pagination, sorting, and filtering. Unfiltered listings are
+    served from the cached service catalog.
     """
     supabase = get_supabase()
 
@@ -132,6 +127,18 @@ async def list_services(
         sort_field = "created_at"
     ascending = sort_dir == "asc"
 
+    path = f"{settings.SERX_API_BASE_URL}/api/services"
+    if not any(key.startswith("filters[") for key in request.query_params):
+        catalog = list((await get_service_catalog(auth.org_id)).values())
+        # Postgres order: NULLs last ascending, first descending.
+        catalog.sort(key=lambda s: _sort_key(s.get(sort_field)), reverse=not ascending)
+        offset = (page - 1) * limit
+        return trusted_page_response(
+            ServiceResponse,
+            [serialize_service(s, trusted=True) for s in catalog[offset : offset + limit]],
+            build_pagination_response([], len(catalog), page, limit, path),
+        )
+
     # Build base query for count
     query = (
         supabase.table("services")
@@ -185,11 +192,14 @@ async def list_services(
     services = result.data or []
 
     # Serialize services
-    serialized = [serialize_service(s).model_dump() for s in services]
+    serialized = [serialize_service(s, trusted=True) for s in services]
 
     # Build pagination response
-    path = f"{settings.SERX_API_BASE_URL}/api/services"
-    return build_pagination_response(serialized, total, page, limit, path)
+    return trusted_page_response(
+        ServiceResponse,
+        serialized,
+        build_pagination_response([], total, page, limit, path),
+    )
 
 
 @router.post("", status_code=status.HTTP_201_CREATED)
@@ -228,7 +238,7 @@ async def create_service(
 
     # Validate employees if provided
     if body.employees:
-        error = await validate_employees(supabase, body.employees)
+        error = await validate_employees(auth.org_id, body.employees)
         if error:
             return JSONResponse(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -292,11 +302,13 @@ async def create_service(
         if not emp_result.data:
             # Cleanup service on failure
             supabase.table("services").delete().eq("id", new_service["id"]).execute()
+            await invalidate_service_catalog(auth.org_id)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to assign employees",
             )
 
+    await invalidate_service_catalog(auth.org_id)
     return serialize_service(new_service)
 
 
@@ -309,21 +321,11 @@ async def retrieve_service(
     if not is_valid_uuid(service_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
 
-    supabase = get_supabase()
-
-    result = (
-        supabase.table("services")
-        .select("*")
-        .eq("id", service_id)
-        .eq("org_id", auth.org_id)
-        .is_("deleted_at", "null")
-        .execute()
-    )
-
-    if not result.data or len(result.data) == 0:
+    service = await get_catalog_service(auth.org_id, service_id)
+    if service is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
 
-    return serialize_service(result.data[0])
+    return serialize_service(service)
 
 
 @router.put("/{service_id}")
@@ -379,7 +381,7 @@ async def update_service(
 
     # Validate employees if provided
     if body.employees is not None:
-        error = await validate_employees(supabase, body.employees)
+        error = await validate_employees(auth.org_id, body.employees)
         if error:
             return JSONResponse(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -456,6 +458,7 @@ async def update_service(
         .execute()
     )
 
+    await invalidate_service_catalog(auth.org_id)
     if not result.data:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -487,24 +490,7 @@ async def delete_service(
     if not is_valid_uuid(service_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
 
-    supabase = get_supabase()
-
-    # Verify service exists and belongs to org
-    existing = (
-        supabase.table("services")
-        .select("id")
-        .eq("id", service_id)
-        .eq("org_id", auth.org_id)
-        .is_("deleted_at", "null")
-        .execute()
-    )
-
-    if not existing.data or len(existing.data) == 0:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
-
-    # Soft delete
-    supabase.table("services").update(
-        {"deleted_at": datetime.now(timezone.utc).isoformat()}
-    ).eq("id", service_id).execute()
+    soft_delete_owned(get_supabase(), "services", service_id, auth.org_id)
+    await invalidate_service_catalog(auth.org_id)
 
     return Response(status_code=status.HTTP_204_NO_CONTENT)
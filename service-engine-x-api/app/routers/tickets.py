@@ -8,7 +8,10 @@ from fastapi.responses import Response
 
 from app.auth.dependencies import AuthContext, get_current_org
 from app.database import get_supabase
-from app.utils import format_currency, format_currency_optional
+from app.services.tags import TICKET_TAGS, replace_tags, tag_names_by_owner
+from app.services.user_profiles import get_user_profiles, invalid_employee_id
+from app.utils import format_currency, format_currency_optional, is_valid_uuid
+from app.utils.mutations import RejectedWrite, call_write_rpc, soft_delete_owned
 from app.models.tickets import (
     TICKET_STATUS_MAP,
     VALID_TICKET_STATUSES,
@@ -45,8 +48,11 @@ async def fetch_client(supabase: Any, user_id: str, org_id: str) -> TicketClient
     if not result.data:
         return None
 
-    user = result.data[0]
+    return serialize_client(result.data[0])
 
+
+def serialize_client(user: dict[str, Any]) -> TicketClientResponse:
+    """Serialize a client row with its embedded address and role."""
     # Handle Supabase join returning array
     addresses = user.get("addresses")
     if isinstance(addresses, list) and len(addresses) > 0:
@@ -78,7 +84,9 @@ async def fetch_client(supabase: Any, user_id: str, org_id: str) -> TicketClient
     )
 
 
-async def fetch_ticket_employees(supabase: Any, ticket_id: str) -> list[TicketEmployeeResponse]:
+async def fetch_ticket_employees(
+    supabase: Any, ticket_id: str, org_id: str
+) -> list[TicketEmployeeResponse]:
     """Fetch employees assigned to a ticket."""
     assignments_result = supabase.table("ticket_employees").select(
         "employee_id"
@@ -89,21 +97,23 @@ async def fetch_ticket_employees(supabase: Any, ticket_id: str) -> list[TicketEm
 
     employee_ids = [a["employee_id"] for a in assignments_result.data]
 
-    employees_result = supabase.table("users").select(
-        "id, name_f, name_l, role_id"
-    ).in_("id", employee_ids).execute()
+    profiles = await get_user_profiles(org_id, employee_ids)
 
     return [
-        TicketEmployeeResponse(
-            id=emp["id"],
-            name_f=emp.get("name_f"),
-            name_l=emp.get("name_l"),
-            role_id=emp.get("role_id"),
-        )
-        for emp in (employees_result.data or [])
+        serialize_employee(profiles[emp_id]) for emp_id in employee_ids if emp_id in profiles
     ]
 
 
+def serialize_employee(employee: dict[str, Any]) -> TicketEmployeeResponse:
+    """Serialize an assigned employee."""
+    return TicketEmployeeResponse(
+        id=employee["id"],
+        name_f=employee.get("name_f"),
+        name_l=employee.get("name_l"),
+        role_id=employee.get("role_id"),
+    )
+
+
 async def fetch_ticket_tags(supabase: Any, ticket_id: str) -> list[str]:
     """Fetch tags for a ticket."""
     tag_links_result = supabase.table("ticket_tags").select(
@@ -151,7 +161,11 @@ async def fetch_ticket_order(supabase: Any, order_id: str | None, org_id: str) -
     if not result.data:
         return None
 
-    order = result.data[0]
+    return serialize_ticket_order(result.data[0])
+
+
+def serialize_ticket_order(order: dict[str, Any]) -> TicketOrderResponse:
+    """Serialize a linked order summary."""
     return TicketOrderResponse(
         id=order["id"],
         status=ORDER_STATUS_MAP.get(order["status"], "Unknown"),
@@ -162,14 +176,13 @@ async def fetch_ticket_order(supabase: Any, order_id: str | None, org_id: str) -
     )
 
 
-async def serialize_ticket_list_item(
-    supabase: Any, ticket: dict[str, Any], org_id: str
+def build_ticket_list_item(
+    ticket: dict[str, Any],
+    client: TicketClientResponse | None,
+    employees: list[TicketEmployeeResponse],
+    tags: list[str],
 ) -> TicketListItem:
-    """Serialize a ticket for list response (without messages)."""
-    client, employees, tags = await fetch_client(supabase, ticket["user_id"], org_id), \
-        await fetch_ticket_employees(supabase, ticket["id"]), \
-        await fetch_ticket_tags(supabase, ticket["id"])
-
+    """Assemble a ticket list item (no messages) from the row and its loaded relations."""
     status_id = ticket.get("status", 1)
     return TicketListItem(
         id=ticket["id"],
@@ -192,16 +205,77 @@ async def serialize_ticket_list_item(
     )
 
 
+async def serialize_ticket_list(
+    supabase: Any, tickets: list[dict[str, Any]], org_id: str
+) -> list[TicketListItem]:
+    """Serialize a page of tickets, loading each relation once for the whole page."""
+    if not tickets:
+        return []
+    ticket_ids = [t["id"] for t in tickets]
+    user_ids = sorted({t["user_id"] for t in tickets if t.get("user_id")})
+
+    clients_result = supabase.table("users").select(
+        "id, name_f, name_l, email, company, phone, balance, "
+        "addresses:address_id (*), roles:role_id (*)"
+    ).in_("id", user_ids).eq("org_id", org_id).execute() if user_ids else None
+    client_rows = clients_result.data if clients_result else []
+    clients = {u["id"]: serialize_client(u) for u in client_rows or []}
+
+    assignments = supabase.table("ticket_employees").select(
+        "ticket_id, employee_id"
+    ).in_("ticket_id", ticket_ids).execute().data or []
+    profiles = await get_user_profiles(org_id, [a["employee_id"] for a in assignments])
+    employees: dict[str, list[TicketEmployeeResponse]] = {}
+    for a in assignments:
+        if a["employee_id"] in profiles:
+            employees.setdefault(a["ticket_id"], []).append(
+                serialize_employee(profiles[a["employee_id"]])
+            )
+
+    tags = await tag_names_by_owner(supabase, TICKET_TAGS, ticket_ids)
+
+    return [
+        build_ticket_list_item(
+            t, clients.get(t["user_id"]), employees.get(t["id"], []), tags.get(t["id"], [])
+        )
+        for t in tickets
+    ]
+
+
 async def serialize_ticket_full(
     supabase: Any, ticket: dict[str, Any], org_id: str
 ) -> TicketResponse:
     """Serialize a ticket with all relations including messages."""
     client = await fetch_client(supabase, ticket["user_id"], org_id)
-    employees = await fetch_ticket_employees(supabase, ticket["id"])
+    employees = await fetch_ticket_employees(supabase, ticket["id"], org_id)
     tags = await fetch_ticket_tags(supabase, ticket["id"])
     messages = await fetch_ticket_messages(supabase, ticket["id"])
     order = await fetch_ticket_order(supabase, ticket.get("order_id"), org_id)
 
+    return build_ticket_response(ticket, client, employees, tags, messages, order)
+
+
+def serialize_ticket_graph(graph: dict[str, Any]) -> TicketResponse:
+    """Serialize the graph returned by ``create_ticket_graph`` (a new ticket has no messages)."""
+    return build_ticket_response(
+        graph["ticket"],
+        serialize_client(graph["client"]) if graph.get("client") else None,
+        [serialize_employee(e) for e in graph.get("employees") or []],
+        graph.get("tags") or [],
+        [],
+        serialize_ticket_order(graph["order"]) if graph.get("order") else None,
+    )
+
+
+def build_ticket_response(
+    ticket: dict[str, Any],
+    client: TicketClientResponse | None,
+    employees: list[TicketEmployeeResponse],
+    tags: list[str],
+    messages: list[TicketMessageResponse],
+    order: TicketOrderResponse | None,
+) -> TicketResponse:
+    """Assemble a full ticket response from the row and its loaded relations."""
     status_id = ticket.get("status", 1)
     return TicketResponse(
         id=ticket["id"],
@@ -226,56 +300,6 @@ async def serialize_ticket_full(
     )
 
 
-async def validate_employees(supabase: Any, employee_ids: list[str], org_id: str) -> str | None:
-    """Validate employee IDs. Returns error message if invalid."""
-    for emp_id in employee_ids:
-        result = supabase.table("users").select(
-            "id, roles:role_id (dashboard_access)"
-        ).eq("id", emp_id).eq("org_id", org_id).execute()
-
-        if not result.data:
-            return "The specified employee does not exist."
-
-        user = result.data[0]
-        roles = user.get("roles")
-
-        # Handle Supabase join returning array
-        if isinstance(roles, list) and len(roles) > 0:
-            dashboard_access = roles[0].get("dashboard_access", 0)
-        elif isinstance(roles, dict):
-            dashboard_access = roles.get("dashboard_access", 0)
-        else:
-            dashboard_access = 0
-
-        if dashboard_access == 0:
-            return "The specified employee does not exist."
-
-    return None
-
-
-async def assign_tags(supabase: Any, ticket_id: str, tag_names: list[str]) -> None:
-    """Assign tags to a ticket (find-or-create)."""
-    for tag_name in tag_names:
-        # Find existing tag
-        tag_result = supabase.table("tags").select("id").eq("name", tag_name).execute()
-
-        if tag_result.data:
-            tag_id = tag_result.data[0]["id"]
-        else:
-            # Create new tag
-            new_tag_result = supabase.table("tags").insert({"name": tag_name}).execute()
-            if new_tag_result.data:
-                tag_id = new_tag_result.data[0]["id"]
-            else:
-                continue
-
-        # Link tag to ticket
-        supabase.table("ticket_tags").insert({
-            "ticket_id": ticket_id,
-            "tag_id": tag_id,
-        }).execute()
-
-
 @router.get("", response_model=TicketListResponse)
 async def list_tickets(
     request: Request,
@@ -335,14 +359,10 @@ async def list_tickets(
                 elif operator == "$gt":
                     query = query.gt(field, value)
 
-    result = await query.execute()
+    result = query.execute()
     tickets = result.data or []
 
-    # Serialize tickets
-    serialized_tickets = []
-    for ticket in tickets:
-        serialized = await serialize_ticket_list_item(supabase, ticket, auth.org_id)
-        serialized_tickets.append(serialized)
+    serialized_tickets = await serialize_ticket_list(supabase, tickets, auth.org_id)
 
     # Build response
     last_page = max(1, (total + limit - 1) // limit)
@@ -376,12 +396,8 @@ async def create_ticket(
     """Create a new ticket."""
     supabase = get_supabase()
 
-    # Validate client exists in org
-    client_result = supabase.table("users").select("id").eq(
-        "id", body.user_id
-    ).eq("org_id", auth.org_id).execute()
-
-    if not client_result.data:
+    # Malformed ids cannot exist; real ones are checked in the write itself
+    if not is_valid_uuid(body.user_id):
         raise HTTPException(
             status_code=422,
             detail={
@@ -400,36 +416,28 @@ async def create_ticket(
             },
         )
 
-    # Validate order_id if provided
-    if body.order_id:
-        order_result = supabase.table("orders").select("id").eq(
-            "id", body.order_id
-        ).eq("org_id", auth.org_id).is_("deleted_at", "null").execute()
-
-        if not order_result.data:
-            raise HTTPException(
-                status_code=422,
-                detail={
-                    "message": "The given data was invalid.",
-                    "errors": {"order_id": ["The specified order does not exist."]},
-                },
-            )
+    if body.order_id and not is_valid_uuid(body.order_id):
+        raise HTTPException(
+            status_code=422,
+            detail={
+                "message": "The given data was invalid.",
+                "errors": {"order_id": ["The specified order does not exist."]},
+            },
+        )
 
-    # Validate employees
-    if body.employees:
-        error = await validate_employees(supabase, body.employees, auth.org_id)
-        if error:
-            raise HTTPException(
-                status_code=422,
-                detail={
-                    "message": "The given data was invalid.",
-                    "errors": {"employees": [error]},
-                },
-            )
+    employees = body.employees or []
+    if not all(is_valid_uuid(e) for e in employees):
+        raise HTTPException(
+            status_code=422,
+            detail={
+                "message": "The given data was invalid.",
+                "errors": {"employees": ["The specified employee does not exist."]},
+            },
+        )
 
-    # Create ticket
+    # Create the ticket with its employees and tags in one transaction; the
+    # client, order and employees are validated there.
     ticket_data = {
-        "org_id": auth.org_id,
         "user_id": body.user_id,
         "subject": body.subject.strip(),
         "status": body.status if body.status is not None else 1,
@@ -440,26 +448,17 @@ async def create_ticket(
         "source": "API",
     }
 
-    ticket_result = supabase.table("tickets").insert(ticket_data).execute()
+    try:
+        graph = call_write_rpc(supabase, "create_ticket_graph", {
+            "p_org_id": auth.org_id,
+            "p_ticket": ticket_data,
+            "p_employee_ids": employees,
+            "p_tags": body.tags or [],
+        })
+    except RejectedWrite as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.body()) from exc
 
-    if not ticket_result.data:
-        raise HTTPException(status_code=500, detail="Failed to create ticket")
-
-    ticket = ticket_result.data[0]
-
-    # Assign employees
-    if body.employees:
-        employee_rows = [
-            {"ticket_id": ticket["id"], "employee_id": emp_id}
-            for emp_id in body.employees
-        ]
-        supabase.table("ticket_employees").insert(employee_rows).execute()
-
-    # Assign tags
-    if body.tags:
-        await assign_tags(supabase, ticket["id"], body.tags)
-
-    return await serialize_ticket_full(supabase, ticket, auth.org_id)
+    return serialize_ticket_graph(graph)
 
 
 @router.get("/{ticket_id}", response_model=TicketResponse)
@@ -526,13 +525,12 @@ async def update_ticket(
 
     # Validate employees
     if body.employees is not None:
-        error = await validate_employees(supabase, body.employees, auth.org_id)
-        if error:
+        if await invalid_employee_id(auth.org_id, body.employees) is not None:
             raise HTTPException(
                 status_code=422,
                 detail={
                     "message": "The given data was invalid.",
-                    "errors": {"employees": [error]},
+                    "errors": {"employees": ["The specified employee does not exist."]},
                 },
             )
 
@@ -576,10 +574,7 @@ async def update_ticket(
 
     # Replace tags if provided
     if body.tags is not None:
-        supabase.table("ticket_tags").delete().eq("ticket_id", ticket_id).execute()
-
-        if body.tags:
-            await assign_tags(supabase, ticket_id, body.tags)
+        await replace_tags(supabase, TICKET_TAGS, auth.org_id, ticket_id, body.tags)
 
     # Fetch updated ticket
     updated_result = supabase.table("tickets").select("*").eq("id", ticket_id).execute()
@@ -596,21 +591,6 @@ async def delete_ticket(
     auth: AuthContext = Depends(get_current_org),
 ) -> Response:
     """Soft delete a ticket."""
-    supabase = get_supabase()
-
-    # Check ticket exists
-    existing_result = supabase.table("tickets").select("id").eq(
-        "id", ticket_id
-    ).eq("org_id", auth.org_id).is_("deleted_at", "null").execute()
-
-    if not existing_result.data:
-        raise HTTPException(status_code=404, detail="Not Found")
-
-    # Soft delete
-    now = datetime.now(timezone.utc).isoformat()
-    supabase.table("tickets").update({
-        "deleted_at": now,
-        "updated_at": now,
-    }).eq("id", ticket_id).execute()
+    soft_delete_owned(get_supabase(), "tickets", ticket_id, auth.org_id)
 
     return Response(status_code=204)
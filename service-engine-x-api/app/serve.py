@@ -0,0 +1,93 @@
+"""Production entrypoint: ``python -m app.serve``.
+
+Runs uvicorn's multi-process supervisor with settings from ``Settings``
+(``SERVE_*``, ``PORT``):
+
+* one worker per CPU available to the container (``SERVE_WORKERS=0``),
+  honouring the cgroup CPU quota rather than the host's core count;
+* uvloop and httptools;
+* listen backlog, keep-alive and graceful-shutdown timeouts;
+* worker recycling after ``SERVE_MAX_REQUESTS`` requests plus a random
+  jitter, so workers do not all restart at once; the supervisor replaces
+  a worker that exits.
+
+Workers are separate interpreters started by the supervisor, and
+``app.main`` is imported only inside them. The Supabase client, the OPEX
+token client and the JWKS cache are therefore built per worker, after the
+process starts (see also ``app.database``). This module must not import
+``app.main``.
+
+With more than one worker, Prometheus runs in multiprocess mode: a fresh
+``PROMETHEUS_MULTIPROC_DIR`` is prepared before the workers start, so a
+scrape reports the sum over all workers.
+"""
+
+import os
+import shutil
+import tempfile
+from typing import Any
+
+import uvicorn
+
+from app.config import settings
+
+_CGROUP_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+
+
+def available_cpus(cpu_max_path: str = _CGROUP_CPU_MAX) -> int:
+    """CPUs this process may use: the cgroup v2 quota, else the affinity mask."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS
+        cpus = os.cpu_count() or 1
+    try:
+        with open(cpu_max_path) as f:
+            quota, period = f.read().split()
+    except (OSError, ValueError):
+        return cpus
+    if quota == "max":
+        return cpus
+    return max(1, min(cpus, int(quota) // int(period)))
+
+
+def worker_count() -> int:
+    return settings.SERVE_WORKERS if settings.SERVE_WORKERS > 0 else available_cpus()
+
+
+def _prepare_multiprocess_metrics(workers: int) -> None:
+    if workers <= 1:
+        return
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        # Samples from a previous run would be summed into this one.
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+    else:
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="serx-prometheus-")
+
+
+def uvicorn_options(workers: int) -> dict[str, Any]:
+    """Keyword arguments for ``uvicorn.run`` built from ``Settings``."""
+    return {
+        "host": settings.SERVE_HOST,
+        "port": settings.PORT,
+        "workers": workers,
+        "loop": settings.SERVE_LOOP,
+        "http": settings.SERVE_HTTP,
+        "backlog": settings.SERVE_BACKLOG,
+        "timeout_keep_alive": settings.SERVE_KEEPALIVE_SECONDS,
+        "timeout_graceful_shutdown": settings.SERVE_GRACEFUL_TIMEOUT_SECONDS,
+        "limit_max_requests": settings.SERVE_MAX_REQUESTS or None,
+        "limit_max_requests_jitter": settings.SERVE_MAX_REQUESTS_JITTER,
+        "limit_concurrency": settings.SERVE_LIMIT_CONCURRENCY,
+    }
+
+
+def main() -> None:
+    workers = worker_count()
+    _prepare_multiprocess_metrics(workers)
+    uvicorn.run("app.main:app", **uvicorn_options(workers))
+
+
+if __name__ == "__main__":
+    main()
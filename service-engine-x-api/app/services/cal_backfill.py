@@ -0,0 +1,386 @@
+"""Bulk normalization pipeline: cal_raw_events → normalized Cal.com tables.
+
+Reads raw events in keyset order (``created_at``, ``id``), normalizes each page
+(optionally across a process pool), and writes the whole page with one upsert
+per target table: ``cal_booking_events``, ``cal_booking_attendees`` and
+``cal_recordings``. A named checkpoint in ``cal_normalization_checkpoints``
+records the cursor after every page so interrupted backfills resume in place.
+
+Re-running over the same range is idempotent: booking events upsert on
+``cal_raw_event_id``, attendees on ``(cal_booking_uid, email, role)`` and
+recordings on ``cal_recording_id``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+from app.services.cal_normalization import (
+    BOOKING_EVENT_TYPES,
+    RECORDING_EVENT_TYPES,
+    CalNormalizationError,
+    normalize_attendees_from_payload,
+    normalize_booking_event_from_payload,
+    normalize_recording_from_payload,
+)
+
+RAW_EVENT_COLUMNS = "id, created_at, trigger_event, payload"
+MAX_REPORTED_ERRORS = 50
+
+
+def _now_iso() -> str:
+    return datetime.now(UTC).isoformat()
+
+
+def _coerce_int(value: Any) -> int | None:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return None
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """Keyset position: the last (created_at, id) already processed."""
+
+    created_at: str
+    id: str
+
+
+@dataclass
+class NormalizedRawEvent:
+    """Rows derived from one cal_raw_events row."""
+
+    raw_event_id: str
+    booking_event: dict[str, Any] | None = None
+    attendees: list[dict[str, Any]] = field(default_factory=list)
+    recording: dict[str, Any] | None = None
+    error: str | None = None
+
+
+@dataclass
+class BackfillSummary:
+    scanned: int = 0
+    booking_events: int = 0
+    attendees: int = 0
+    recordings: int = 0
+    skipped: int = 0
+    error_count: int = 0
+    errors: list[dict[str, str]] = field(default_factory=list)
+    cursor: Cursor | None = None
+    completed: bool = False
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "scanned": self.scanned,
+            "booking_events": self.booking_events,
+            "attendees": self.attendees,
+            "recordings": self.recordings,
+            "skipped": self.skipped,
+            "error_count": self.error_count,
+            "errors": self.errors,
+            "cursor": (
+                {"created_at": self.cursor.created_at, "id": self.cursor.id}
+                if self.cursor
+                else None
+            ),
+            "completed": self.completed,
+        }
+
+
+# ────────────────────────────────────────────────────────────────────────────
+# Normalize (pure — runs in worker processes)
+# ────────────────────────────────────────────────────────────────────────────
+
+
+def normalize_raw_event(row: dict[str, Any]) -> NormalizedRawEvent:
+    """Normalize a single cal_raw_events row. Never raises."""
+    raw_event_id = str(row["id"])
+    result = NormalizedRawEvent(raw_event_id=raw_event_id)
+    payload = row.get("payload")
+    if not isinstance(payload, dict):
+        result.error = "payload is not a JSON object"
+        return result
+
+    trigger_event = row.get("trigger_event") or payload.get("triggerEvent")
+    try:
+        if trigger_event in BOOKING_EVENT_TYPES:
+            booking = normalize_booking_event_from_payload(payload)
+            booking["trigger_event"] = trigger_event
+            for key in ("cal_booking_id", "cal_event_type_id", "organizer_cal_user_id"):
+                booking[key] = _coerce_int(booking.get(key))
+            booking["cal_raw_event_id"] = raw_event_id
+            result.booking_event = booking
+            result.attendees = normalize_attendees_from_payload(payload)
+        elif trigger_event in RECORDING_EVENT_TYPES:
+            recording = normalize_recording_from_payload(payload)
+            recording["cal_booking_id"] = _coerce_int(recording.get("cal_booking_id"))
+            recording["duration_seconds"] = _coerce_int(recording.get("duration_seconds"))
+            recording["max_participants"] = _coerce_int(recording.get("max_participants"))
+            recording["cal_raw_event_id"] = raw_event_id
+            result.recording = recording
+    except CalNormalizationError as exc:
+        result.error = str(exc)
+    return result
+
+
+def normalize_pages(
+    pages: Iterable[list[dict[str, Any]]],
+    executor: Executor | None = None,
+) -> Iterator[tuple[list[dict[str, Any]], list[NormalizedRawEvent]]]:
+    """Yield ``(rows, normalized)`` per page, fanning out to ``executor`` if given."""
+    for rows in pages:
+        if executor is None:
+            yield rows, [normalize_raw_event(row) for row in rows]
+        else:
+            chunksize = max(1, len(rows) // 32)
+            yield rows, list(executor.map(normalize_raw_event, rows, chunksize=chunksize))
+
+
+# ────────────────────────────────────────────────────────────────────────────
+# Read
+# ────────────────────────────────────────────────────────────────────────────
+
+
+def iter_raw_event_pages(
+    supabase: Any,
+    *,
+    cursor: Cursor | None = None,
+    created_from: str | None = None,
+    created_before: str | None = None,
+    page_size: int = 500,
+    limit: int | None = None,
+) -> Iterator[list[dict[str, Any]]]:
+    """Stream cal_raw_events pages in (created_at, id) order after ``cursor``."""
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = page_size if remaining is None else min(page_size, remaining)
+        query = supabase.table("cal_raw_events").select(RAW_EVENT_COLUMNS)
+        if cursor is not None:
+            query = query.or_(
+                f'created_at.gt."{cursor.created_at}",'
+                f'and(created_at.eq."{cursor.created_at}",id.gt.{cursor.id})'
+            )
+        if created_from:
+            query = query.gte("created_at", created_from)
+        if created_before:
+            query = query.lt("created_at", created_before)
+        result = query.order("created_at").order("id").limit(size).execute()
+        rows = result.data or []
+        if not rows:
+            return
+        yield rows
+        cursor = Cursor(created_at=rows[-1]["created_at"], id=rows[-1]["id"])
+        if remaining is not None:
+            remaining -= len(rows)
+        if len(rows) < size:
+            return
+
+
+def fetch_raw_events_by_id(supabase: Any, event_ids: list[str]) -> list[dict[str, Any]]:
+    if not event_ids:
+        return []
+    result = (
+        supabase.table("cal_raw_events")
+        .select(RAW_EVENT_COLUMNS)
+        .in_("id", event_ids)
+        .order("created_at")
+        .order("id")
+        .execute()
+    )
+    return result.data or []
+
+
+# ────────────────────────────────────────────────────────────────────────────
+# Write
+# ────────────────────────────────────────────────────────────────────────────
+
+
+def write_normalized(
+    supabase: Any, batch: list[NormalizedRawEvent]
+) -> tuple[int, int, int]:
+    """Upsert one normalized page. Returns (booking_events, attendees, recordings).
+
+    A single upsert may not touch the same conflict key twice, so attendees
+    and recordings are de-duplicated within the page; the batch is in
+    created_at order, so the latest event for a key wins.
+    """
+    booking_rows = [item.booking_event for item in batch if item.booking_event]
+    booking_ids: dict[str, str] = {}
+    if booking_rows:
+        result = (
+            supabase.table("cal_booking_events")
+            .upsert(booking_rows, on_conflict="cal_raw_event_id")
+            .execute()
+        )
+        booking_ids = {row["cal_raw_event_id"]: row["id"] for row in result.data or []}
+
+    attendee_rows: dict[tuple[Any, str, str], dict[str, Any]] = {}
+    for item in batch:
+        for attendee in item.attendees:
+            key = (attendee["cal_booking_uid"], attendee["email"], attendee["role"])
+            attendee_rows[key] = {
+                **attendee,
+                "booking_event_id": booking_ids.get(item.raw_event_id),
+            }
+    if attendee_rows:
+        supabase.table("cal_booking_attendees").upsert(
+            list(attendee_rows.values()), on_conflict="cal_booking_uid,email,role"
+        ).execute()
+
+    recording_rows: dict[str, dict[str, Any]] = {}
+    now_iso = _now_iso()
+    for item in batch:
+        if item.recording:
+            recording_rows[item.recording["cal_recording_id"]] = {
+                **item.recording,
+                "updated_at": now_iso,
+            }
+    if recording_rows:
+        supabase.table("cal_recordings").upsert(
+            list(recording_rows.values()), on_conflict="cal_recording_id"
+        ).execute()
+
+    return len(booking_rows), len(attendee_rows), len(recording_rows)
+
+
+# ────────────────────────────────────────────────────────────────────────────
+# Checkpoints
+# ────────────────────────────────────────────────────────────────────────────
+
+
+def load_checkpoint(supabase: Any, name: str) -> dict[str, Any] | None:
+    result = (
+        supabase.table("cal_normalization_checkpoints")
+        .select("*")
+        .eq("name", name)
+        .limit(1)
+        .execute()
+    )
+    return result.data[0] if result.data else None
+
+
+def _save_checkpoint(
+    supabase: Any,
+    name: str,
+    cursor: Cursor | None,
+    processed_count: int,
+    error_count: int,
+    completed: bool,
+) -> None:
+    now_iso = _now_iso()
+    supabase.table("cal_normalization_checkpoints").upsert(
+        {
+            "name": name,
+            "last_created_at": cursor.created_at if cursor else None,
+            "last_id": cursor.id if cursor else None,
+            "processed_count": processed_count,
+            "error_count": error_count,
+            "completed_at": now_iso if completed else None,
+            "updated_at": now_iso,
+        },
+        on_conflict="name",
+    ).execute()
+
+
+# ────────────────────────────────────────────────────────────────────────────
+# Driver
+# ────────────────────────────────────────────────────────────────────────────
+
+
+def _apply_page(
+    supabase: Any,
+    summary: BackfillSummary,
+    normalized: list[NormalizedRawEvent],
+) -> None:
+    bookings, attendees, recordings = write_normalized(supabase, normalized)
+    summary.scanned += len(normalized)
+    summary.booking_events += bookings
+    summary.attendees += attendees
+    summary.recordings += recordings
+    for item in normalized:
+        if item.error:
+            summary.error_count += 1
+            if len(summary.errors) < MAX_REPORTED_ERRORS:
+                summary.errors.append({"raw_event_id": item.raw_event_id, "error": item.error})
+        elif not item.booking_event and not item.recording:
+            summary.skipped += 1
+
+
+def normalize_raw_event_ids(supabase: Any, event_ids: list[str]) -> BackfillSummary:
+    """Normalize an explicit batch of raw events in one pass."""
+    summary = BackfillSummary()
+    rows = fetch_raw_events_by_id(supabase, event_ids)
+    for _, normalized in normalize_pages([rows] if rows else []):
+        _apply_page(supabase, summary, normalized)
+    summary.completed = True
+    return summary
+
+
+def run_backfill(
+    supabase: Any,
+    *,
+    checkpoint_name: str | None = None,
+    created_from: str | None = None,
+    created_before: str | None = None,
+    page_size: int = 500,
+    limit: int | None = None,
+    workers: int = 0,
+) -> BackfillSummary:
+    """Normalize a range of raw events, resuming from ``checkpoint_name`` if set.
+
+    ``workers > 1`` normalizes each page in a process pool; reads and writes
+    stay in the calling process so only one set of DB round trips is made
+    per page.
+    """
+    summary = BackfillSummary()
+    processed_total = 0
+    error_total = 0
+    if checkpoint_name:
+        checkpoint = load_checkpoint(supabase, checkpoint_name)
+        if checkpoint and checkpoint.get("last_created_at") and checkpoint.get("last_id"):
+            summary.cursor = Cursor(
+                created_at=checkpoint["last_created_at"], id=checkpoint["last_id"]
+            )
+            processed_total = checkpoint.get("processed_count") or 0
+            error_total = checkpoint.get("error_count") or 0
+
+    pages = iter_raw_event_pages(
+        supabase,
+        cursor=summary.cursor,
+        created_from=created_from,
+        created_before=created_before,
+        page_size=page_size,
+        limit=limit,
+    )
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for rows, normalized in normalize_pages(pages, executor):
+            errors_before = summary.error_count
+            _apply_page(supabase, summary, normalized)
+            summary.cursor = Cursor(created_at=rows[-1]["created_at"], id=rows[-1]["id"])
+            processed_total += len(rows)
+            error_total += summary.error_count - errors_before
+            if checkpoint_name:
+                _save_checkpoint(
+                    supabase, checkpoint_name, summary.cursor,
+                    processed_total, error_total, completed=False,
+                )
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    summary.completed = limit is None or summary.scanned < limit
+    if checkpoint_name and summary.completed:
+        _save_checkpoint(
+            supabase, checkpoint_name, summary.cursor,
+            processed_total, error_total, completed=True,
+        )
+    return summary
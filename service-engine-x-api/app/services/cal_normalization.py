@@ -0,0 +1,213 @@
+"""Pure normalization of raw Cal.com webhook payloads into table rows.
+
+Shared by the internal normalization endpoints (one payload per request) and
+the bulk backfill pipeline in ``app.services.cal_backfill``. Everything here
+is side-effect free and picklable so it can run inside a process pool.
+"""
+
+from datetime import datetime
+from typing import Any
+
+
+class CalNormalizationError(ValueError):
+    """Raised when a raw payload lacks the fields a target table requires."""
+
+
+BOOKING_EVENT_TYPES = {
+    "BOOKING_CREATED",
+    "BOOKING_REQUESTED",
+    "BOOKING_RESCHEDULED",
+    "BOOKING_CANCELLED",
+    "BOOKING_REJECTED",
+    "BOOKING_NO_SHOW_UPDATED",
+    "BOOKING_PAYMENT_INITIATED",
+    "BOOKING_PAID",
+    "INSTANT_MEETING",
+    "MEETING_STARTED",
+    "MEETING_ENDED",
+}
+
+RECORDING_EVENT_TYPES = {"RECORDING_READY"}
+
+
+def _parse_dt(value: Any) -> str | None:
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).isoformat()
+    except ValueError:
+        return None
+
+
+def _as_list_strings(value: Any) -> list[str]:
+    if not isinstance(value, list):
+        return []
+    out: list[str] = []
+    for item in value:
+        if isinstance(item, str) and item.strip():
+            out.append(item.strip())
+    return out
+
+
+def _extract_trigger_event(payload: dict[str, Any]) -> str:
+    trigger_event = payload.get("triggerEvent") or payload.get("type")
+    return str(trigger_event) if trigger_event else "UNKNOWN"
+
+
+def _extract_booking_uid(payload: dict[str, Any]) -> str | None:
+    nested = payload.get("payload")
+    if isinstance(nested, dict):
+        uid = nested.get("uid")
+        if isinstance(uid, str) and uid.strip():
+            return uid.strip()
+    top_uid = payload.get("uid")
+    if isinstance(top_uid, str) and top_uid.strip():
+        return top_uid.strip()
+    return None
+
+
+def _extract_booking_id(payload: dict[str, Any]) -> int | None:
+    # MEETING_STARTED/MEETING_ENDED are flat payloads with bookingId at top-level.
+    for candidate in (payload.get("bookingId"), payload.get("booking_id")):
+        if isinstance(candidate, int):
+            return candidate
+        if isinstance(candidate, str) and candidate.isdigit():
+            return int(candidate)
+    nested = payload.get("payload")
+    if isinstance(nested, dict):
+        for key in ("bookingId", "booking_id", "id"):
+            candidate = nested.get(key)
+            if isinstance(candidate, int):
+                return candidate
+            if isinstance(candidate, str) and candidate.isdigit():
+                return int(candidate)
+    return None
+
+
+def _extract_payload_obj(payload: dict[str, Any]) -> dict[str, Any]:
+    nested = payload.get("payload")
+    if isinstance(nested, dict):
+        return nested
+    return payload
+
+
+def _extract_location(value: Any) -> str | None:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return value.get("type") or value.get("value")
+    return None
+
+
+def _extract_meeting_url(payload_obj: dict[str, Any], root_payload: dict[str, Any]) -> str | None:
+    for candidate in (
+        payload_obj.get("meetingUrl"),
+        payload_obj.get("meeting_url"),
+        payload_obj.get("rescheduleUrl"),
+        root_payload.get("meetingUrl"),
+        root_payload.get("meeting_url"),
+    ):
+        if isinstance(candidate, str) and candidate:
+            return candidate
+    return None
+
+
+def normalize_booking_event_from_payload(raw_payload: dict[str, Any]) -> dict[str, Any]:
+    payload_obj = _extract_payload_obj(raw_payload)
+    organizer_obj = payload_obj.get("organizer")
+    organizer = organizer_obj if isinstance(organizer_obj, dict) else {}
+    guests = _as_list_strings(payload_obj.get("guests"))
+    trigger_event = _extract_trigger_event(raw_payload)
+
+    return {
+        "trigger_event": trigger_event,
+        "cal_booking_uid": _extract_booking_uid(raw_payload),
+        "cal_booking_id": _extract_booking_id(raw_payload),
+        "cal_event_type_id": payload_obj.get("eventTypeId") or payload_obj.get("eventType"),
+        "title": payload_obj.get("title") or raw_payload.get("title"),
+        "start_time": _parse_dt(payload_obj.get("startTime") or payload_obj.get("start")),
+        "end_time": _parse_dt(payload_obj.get("endTime") or payload_obj.get("end")),
+        "status": payload_obj.get("status") or raw_payload.get("status"),
+        "location": _extract_location(payload_obj.get("location")),
+        "meeting_url": _extract_meeting_url(payload_obj, raw_payload),
+        "organizer_email": organizer.get("email") or raw_payload.get("organizerEmail"),
+        "organizer_name": organizer.get("name") or raw_payload.get("organizerName"),
+        "organizer_cal_user_id": organizer.get("id") or payload_obj.get("userId"),
+        "guests": guests,
+        "event_occurred_at": _parse_dt(
+            raw_payload.get("createdAt") or payload_obj.get("createdAt")
+        ),
+    }
+
+
+def normalize_attendees_from_payload(raw_payload: dict[str, Any]) -> list[dict[str, Any]]:
+    payload_obj = _extract_payload_obj(raw_payload)
+    booking_uid = _extract_booking_uid(raw_payload)
+    booking_id = _extract_booking_id(raw_payload)
+
+    attendees: list[dict[str, Any]] = []
+    payload_attendees = payload_obj.get("attendees")
+    if isinstance(payload_attendees, list):
+        for attendee in payload_attendees:
+            if not isinstance(attendee, dict):
+                continue
+            email = attendee.get("email")
+            if not isinstance(email, str) or not email.strip():
+                continue
+            attendees.append(
+                {
+                    "cal_booking_uid": booking_uid,
+                    "cal_booking_id": booking_id,
+                    "role": "attendee",
+                    "name": attendee.get("name"),
+                    "email": email.strip().lower(),
+                    "timezone": attendee.get("timeZone") or attendee.get("timezone"),
+                    "language": attendee.get("language"),
+                    "phone_number": attendee.get("phoneNumber") or attendee.get("phone"),
+                    "absent": attendee.get("absent"),
+                }
+            )
+
+    payload_hosts = payload_obj.get("hosts")
+    if isinstance(payload_hosts, list):
+        for host in payload_hosts:
+            if not isinstance(host, dict):
+                continue
+            email = host.get("email")
+            if not isinstance(email, str) or not email.strip():
+                continue
+            attendees.append(
+                {
+                    "cal_booking_uid": booking_uid,
+                    "cal_booking_id": booking_id,
+                    "role": "host",
+                    "name": host.get("name"),
+                    "email": email.strip().lower(),
+                    "timezone": host.get("timeZone") or host.get("timezone"),
+                    "language": host.get("language"),
+                    "phone_number": host.get("phoneNumber") or host.get("phone"),
+                    "absent": host.get("absent"),
+                }
+            )
+    return attendees
+
+
+def normalize_recording_from_payload(raw_payload: dict[str, Any]) -> dict[str, Any]:
+    payload_obj = _extract_payload_obj(raw_payload)
+    recording_id = payload_obj.get("id") or raw_payload.get("id")
+    if recording_id is None:
+        raise CalNormalizationError("Recording payload missing id")
+
+    return {
+        "cal_booking_uid": _extract_booking_uid(raw_payload),
+        "cal_booking_id": _extract_booking_id(raw_payload),
+        "cal_recording_id": str(recording_id),
+        "room_name": payload_obj.get("roomName") or payload_obj.get("room_name"),
+        "start_ts": _parse_dt(payload_obj.get("startTs") or payload_obj.get("start_ts")),
+        "status": payload_obj.get("status"),
+        "duration_seconds": payload_obj.get("duration"),
+        "share_token": payload_obj.get("shareToken") or payload_obj.get("share_token"),
+        "max_participants": payload_obj.get("maxParticipants")
+        or payload_obj.get("max_participants"),
+        "download_link": payload_obj.get("downloadLink") or payload_obj.get("download_link"),
+    }
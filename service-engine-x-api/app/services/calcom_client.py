@@ -5,6 +5,8 @@ from typing import Any
 
 import httpx
 
+from app.observability import timed_outbound
+
 
 class CalcomClientError(Exception):
     """Base Cal.com API client error."""
@@ -29,6 +31,7 @@ class CalcomClient:
         self._api_version = api_version
         self._max_retries = max_retries
 
+    @timed_outbound("calcom")
     async def get_event_type(self, event_type_id: int) -> dict[str, Any]:
         """Fetch a Cal.com event type by ID."""
         url = f"{self._base_url}/v2/event-types/{event_type_id}"
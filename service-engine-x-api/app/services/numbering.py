@@ -0,0 +1,86 @@
+"""Invoice and order number allocation.
+
+Numbers come from Postgres sequences (migration ``027_number_sequences.sql``)
+through the ``reserve_numbers`` RPC. Each worker reserves a block of
+``NUMBER_BLOCK_SIZE`` numbers at a time and hands them out from memory, so
+most creates cost no database call for their number, and no two callers,
+in any worker, ever get the same one.
+
+Numbers are unique and increase within a worker, but are not gapless or
+globally ordered: workers interleave, and a block reserved by a worker that
+exits is skipped. ``NUMBER_BLOCK_SIZE=1`` makes every allocation one
+``nextval`` (ordered, still not gapless).
+"""
+
+import asyncio
+import os
+import threading
+from collections import deque
+
+from app.config import settings
+from app.database import get_supabase
+
+
+class NumberAllocator:
+    """Hands out numbers of one sequence from locally reserved blocks."""
+
+    def __init__(self, sequence: str, block_size: int) -> None:
+        self.sequence = sequence
+        self.block_size = block_size
+        self._reserved: deque[int] = deque()
+        self._refill_lock = threading.Lock()
+
+    def _reserve(self) -> list[int]:
+        result = get_supabase().rpc(
+            "reserve_numbers", {"p_name": self.sequence, "p_count": self.block_size}
+        ).execute()
+        numbers = [int(n) for n in result.data or []]
+        if not numbers:
+            raise RuntimeError(f"reserve_numbers returned no {self.sequence} numbers")
+        return numbers
+
+    def _next_blocking(self) -> int:
+        with self._refill_lock:
+            while True:
+                try:
+                    return self._reserved.popleft()
+                except IndexError:
+                    self._reserved.extend(self._reserve())
+
+    async def next(self) -> int:
+        """The next reserved number, reserving a new block when empty."""
+        try:
+            return self._reserved.popleft()
+        except IndexError:
+            return await asyncio.to_thread(self._next_blocking)
+
+    def reset(self) -> None:
+        """Forget reserved numbers (a forked child must not reuse the parent's)."""
+        self._reserved.clear()
+
+
+_invoices = NumberAllocator("invoice", settings.NUMBER_BLOCK_SIZE)
+_orders = NumberAllocator("order", settings.NUMBER_BLOCK_SIZE)
+
+
+def reset_allocators() -> None:
+    """Drop every reserved block (after fork, or when the database changes)."""
+    _invoices.reset()
+    _orders.reset()
+
+
+os.register_at_fork(after_in_child=reset_allocators)
+
+
+async def next_invoice_number() -> str:
+    """A new invoice number, e.g. ``INV-00042``."""
+    return f"INV-{await _invoices.next():05d}"
+
+
+async def next_order_number() -> str:
+    """A new order number, e.g. ``ORD-00000042``.
+
+    The prefix is reserved for generated numbers (``OrderCreate`` rejects it
+    in caller-supplied ones), so the two can never collide.
+    """
+    return f"ORD-{await _orders.next():08d}"
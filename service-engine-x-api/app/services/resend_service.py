@@ -3,8 +3,10 @@
 from typing import Any
 
 from app.config import settings
+from app.observability import timed_outbound
 
 
+@timed_outbound("resend")
 def send_proposal_email(
     to_email: str,
     from_email: str,
@@ -80,6 +82,7 @@ Sign when ready."""
         return None
 
 
+@timed_outbound("resend")
 def send_proposal_signed_email(
     to_emails: list[str],
     from_email: str,
@@ -0,0 +1,74 @@
+"""Per-org service catalog cache.
+
+Service catalogs change rarely but are read constantly: list/retrieve
+endpoints, and order/proposal creation validating service ids. The catalog
+of an org (every non-deleted ``services`` row, keyed by id) is loaded with
+one query and cached in the ``service_catalog`` cache under the org's
+namespace.
+
+Freshness:
+
+* the services routers call ``invalidate_service_catalog`` after every
+  create, update and delete (write-through);
+* rows changed elsewhere (scripts, other services) arrive through the
+  LISTEN/NOTIFY bus (``invalidate_on_change`` below);
+* catalogs are always loaded from the primary, never a lagging replica,
+  so an invalidation is never followed by a reload of pre-write data;
+* a catalog whose load overlapped an invalidation is returned to its
+  caller but not cached (``Cache`` namespace generations).
+"""
+
+import asyncio
+from typing import Any
+
+from app.cache import Cache
+from app.cache.invalidation import invalidate_on_change
+from app.config import settings
+from app.database import get_supabase
+from app.read_routing import read_routing
+
+CATALOG_KEY = "services"
+
+_catalog = Cache("service_catalog", ttl=settings.SERVICE_CATALOG_TTL_SECONDS)
+invalidate_on_change(_catalog, "services")
+
+
+def _load(org_id: str) -> dict[str, dict[str, Any]]:
+    with read_routing(replica_allowed=False):
+        result = (
+            get_supabase()
+            .table("services")
+            .select("*")
+            .eq("org_id", org_id)
+            .is_("deleted_at", "null")
+            .order("created_at", desc=True)
+            .execute()
+        )
+    return {row["id"]: row for row in result.data or []}
+
+
+async def get_service_catalog(org_id: str) -> dict[str, dict[str, Any]]:
+    """Non-deleted services of ``org_id`` keyed by id, newest first."""
+
+    async def load() -> dict[str, dict[str, Any]]:
+        return await asyncio.to_thread(_load, org_id)
+
+    return await _catalog.get_or_load(CATALOG_KEY, load, namespace=org_id)
+
+
+async def get_catalog_service(org_id: str, service_id: str) -> dict[str, Any] | None:
+    """One service of ``org_id``, or ``None`` if it does not exist or is deleted."""
+    return (await get_service_catalog(org_id)).get(service_id)
+
+
+async def missing_service_ids(org_id: str, service_ids: list[str]) -> list[str]:
+    """The ids in ``service_ids`` that are not live services of ``org_id``, in order."""
+    if not service_ids:
+        return []
+    catalog = await get_service_catalog(org_id)
+    return [service_id for service_id in service_ids if service_id not in catalog]
+
+
+async def invalidate_service_catalog(org_id: str) -> None:
+    """Drop the cached catalog of ``org_id`` after a write."""
+    await _catalog.invalidate_namespace(org_id)
@@ -1,10 +1,15 @@
-"""Stripe payment integration service."""
+"""Stripe payment integration service.
+
+``stripe`` is imported inside the functions that use it: the SDK is heavy
+and only the checkout / webhook paths need it, so app startup skips it.
+"""
 
 from typing import Any
 
-import stripe
+from app.observability import timed_outbound
 
 
+@timed_outbound("stripe")
 def create_checkout_session(
     api_key: str,
     line_items: list[dict[str, Any]],
@@ -27,6 +32,8 @@ def create_checkout_session(
     Returns:
         Dict with checkout_url and session_id
     """
+    import stripe
+
     stripe.api_key = api_key
 
     session_params: dict[str, Any] = {
@@ -101,6 +108,8 @@ def verify_webhook_signature(
     Returns:
         Parsed event dict if signature is valid, None otherwise
     """
+    import stripe
+
     try:
         event = stripe.Webhook.construct_event(payload, signature, secret)
         return event
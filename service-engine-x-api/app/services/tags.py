@@ -0,0 +1,111 @@
+"""Bulk find-or-create for tags and their link tables.
+
+Each org has its own tag taxonomy: tags are unique by ``(org_id, name)``
+(migration 026b); orders and tickets link to them through ``order_tags`` /
+``ticket_tags``. Assigning
+tags costs the same few round trips however many names there are:
+
+* one ``upsert(on_conflict="org_id,name")`` resolves every uncached name to an id.
+  It is race-free: two requests creating the same new tag both get the one
+  row back instead of inserting duplicates;
+* on replace, one select of the owner's current links, so only links that
+  change are deleted or inserted;
+* one bulk insert of the new links (and one delete of the stale ones).
+
+A tag's id never changes once created (this API never renames or deletes
+tags), so the name to id mapping is cached in the ``tag_ids`` cache, one
+namespace per org.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from app.cache import Cache
+from app.config import settings
+
+_tag_ids = Cache("tag_ids", ttl=settings.TAG_CACHE_TTL_SECONDS)
+
+
+@dataclass(frozen=True)
+class TagLinks:
+    """A tag link table and the column naming its owner row."""
+
+    table: str
+    owner_column: str
+
+
+ORDER_TAGS = TagLinks("order_tags", "order_id")
+TICKET_TAGS = TagLinks("ticket_tags", "ticket_id")
+
+
+async def resolve_tag_ids(supabase: Any, org_id: str, names: list[str]) -> dict[str, str]:
+    """Map each of the org's tag names to its id, creating missing tags in one upsert."""
+    names = list(dict.fromkeys(names))
+    if not names:
+        return {}
+    ids = await _tag_ids.get_many(names, namespace=org_id)
+    missing = [name for name in names if name not in ids]
+    if missing:
+        result = (
+            supabase.table("tags")
+            .upsert(
+                [{"org_id": org_id, "name": name} for name in missing],
+                on_conflict="org_id,name",
+            )
+            .execute()
+        )
+        created = {row["name"]: row["id"] for row in (result.data or [])}
+        await _tag_ids.set_many(created, namespace=org_id)
+        ids.update(created)
+    return ids
+
+
+async def tag_names_by_owner(
+    supabase: Any, links: TagLinks, owner_ids: list[str]
+) -> dict[str, list[str]]:
+    """Tag names of each owner row, in two round trips however many owners."""
+    if not owner_ids:
+        return {}
+    link_result = (
+        supabase.table(links.table)
+        .select(f"{links.owner_column}, tag_id")
+        .in_(links.owner_column, owner_ids)
+        .execute()
+    )
+    link_rows = link_result.data or []
+    if not link_rows:
+        return {}
+    tag_ids = sorted({row["tag_id"] for row in link_rows})
+    names_result = supabase.table("tags").select("id, name").in_("id", tag_ids).execute()
+    names = {row["id"]: row["name"] for row in (names_result.data or [])}
+
+    by_owner: dict[str, list[str]] = {}
+    for row in link_rows:
+        if row["tag_id"] in names:
+            by_owner.setdefault(row[links.owner_column], []).append(names[row["tag_id"]])
+    return by_owner
+
+
+async def replace_tags(
+    supabase: Any, links: TagLinks, org_id: str, owner_id: str, names: list[str]
+) -> None:
+    """Make the owner's tags exactly the org's ``names``, touching only links that change."""
+    wanted = set((await resolve_tag_ids(supabase, org_id, names)).values())
+    current_result = (
+        supabase.table(links.table)
+        .select("tag_id")
+        .eq(links.owner_column, owner_id)
+        .execute()
+    )
+    current = {row["tag_id"] for row in (current_result.data or [])}
+
+    stale = current - wanted
+    if stale:
+        supabase.table(links.table).delete().eq(links.owner_column, owner_id).in_(
+            "tag_id", sorted(stale)
+        ).execute()
+    new = wanted - current
+    if new:
+        supabase.table(links.table).insert(
+            [{links.owner_column: owner_id, "tag_id": tag_id} for tag_id in sorted(new)]
+        ).execute()
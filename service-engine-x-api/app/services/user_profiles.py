@@ -0,0 +1,117 @@
+"""Per-org user profile cache and employee validation.
+
+Orders, services, tickets, tasks and conversations all need the same few
+columns of ``users``: a name for a sender or assignee, an email, and whether
+the user's role has dashboard access (employees must). Profiles are cached
+one key per user in the ``user_profiles`` cache under the org's namespace,
+so a lookup of any set of ids costs one cache round trip plus, for the
+misses, one ``users`` query.
+
+Lookups are org-scoped: a user id from another org is treated as unknown.
+
+Freshness:
+
+* the clients and contacts routers call ``invalidate_user_profiles`` after
+  updating or deleting a user;
+* other writes to ``users`` (and any change to ``roles``) arrive through the
+  LISTEN/NOTIFY bus;
+* profiles are loaded from the primary so an invalidation is never followed
+  by a reload of pre-write data;
+* profiles whose load overlapped an invalidation are returned but not
+  cached (``Cache`` namespace generations).
+"""
+
+import asyncio
+from collections.abc import Iterable
+from typing import Any
+
+from app.cache import Cache
+from app.cache.invalidation import invalidate_on_change
+from app.config import settings
+from app.database import get_supabase
+from app.read_routing import read_routing
+from app.utils import is_valid_uuid
+
+PROFILE_COLUMNS = "id, org_id, name_f, name_l, email, role_id, role:roles(dashboard_access)"
+
+_profiles = Cache("user_profiles", ttl=settings.USER_PROFILE_TTL_SECONDS)
+invalidate_on_change(_profiles, "users", key=lambda change: change.id)
+# Roles are shared by every org; a role change can affect any cached profile.
+invalidate_on_change(_profiles, "roles", namespace=lambda change: None)
+
+
+def _project(row: dict[str, Any]) -> dict[str, Any]:
+    role = row.get("role")
+    if isinstance(role, list):
+        role = role[0] if role else None
+    return {
+        "id": row["id"],
+        "org_id": row.get("org_id"),
+        "name_f": row.get("name_f"),
+        "name_l": row.get("name_l"),
+        "email": row.get("email"),
+        "role_id": row.get("role_id"),
+        "dashboard_access": (role or {}).get("dashboard_access") or 0,
+    }
+
+
+def _load(org_id: str, user_ids: list[str]) -> dict[str, dict[str, Any]]:
+    with read_routing(replica_allowed=False):
+        result = (
+            get_supabase()
+            .table("users")
+            .select(PROFILE_COLUMNS)
+            .eq("org_id", org_id)
+            .in_("id", user_ids)
+            .execute()
+        )
+    return {row["id"]: _project(row) for row in result.data or []}
+
+
+async def get_user_profiles(org_id: str, user_ids: Iterable[str]) -> dict[str, dict[str, Any]]:
+    """Profiles of the ``user_ids`` that belong to ``org_id``, keyed by id.
+
+    Each profile has ``id``, ``org_id``, ``name_f``, ``name_l``, ``email``,
+    ``role_id`` and ``dashboard_access``. Unknown ids are left out.
+    """
+    ids = list(dict.fromkeys(user_id for user_id in user_ids if is_valid_uuid(user_id)))
+    if not ids:
+        return {}
+    generation = _profiles.generation(org_id)
+    profiles = await _profiles.get_many(ids, namespace=org_id)
+    missing = [user_id for user_id in ids if user_id not in profiles]
+    if missing:
+        loaded = await asyncio.to_thread(_load, org_id, missing)
+        await _profiles.set_many(loaded, namespace=org_id, generation=generation)
+        profiles.update(loaded)
+    return profiles
+
+
+async def get_user_profile(org_id: str, user_id: str) -> dict[str, Any] | None:
+    """One profile, or ``None`` if ``user_id`` is not a user of ``org_id``."""
+    return (await get_user_profiles(org_id, [user_id])).get(user_id)
+
+
+async def invalid_employee_id(org_id: str, employee_ids: list[str]) -> str | None:
+    """The first id that is not a user of ``org_id`` with dashboard access, if any."""
+    profiles = await get_user_profiles(org_id, employee_ids)
+    for employee_id in employee_ids:
+        profile = profiles.get(employee_id)
+        if profile is None or not profile["dashboard_access"]:
+            return employee_id
+    return None
+
+
+async def validate_employees(org_id: str, employee_ids: list[str]) -> str | None:
+    """Validate employee IDs exist and have dashboard access. Returns error message or None."""
+    employee_id = await invalid_employee_id(org_id, employee_ids)
+    if employee_id is not None:
+        return f"Employee with ID {employee_id} does not exist."
+    return None
+
+
+async def invalidate_user_profiles(org_id: str, *user_ids: str | None) -> None:
+    """Drop cached profiles after the users were updated or deleted."""
+    for user_id in user_ids:
+        if user_id:
+            await _profiles.invalidate(user_id, namespace=org_id)
@@ -0,0 +1,51 @@
+"""Fast JSON encoding/decoding backed by orjson.
+
+Used as the app-wide default response class and for parsing raw webhook and
+public-form bodies. Output matches what FastAPI's ``jsonable_encoder`` +
+stdlib ``json`` would produce for the types we return: datetimes/dates as
+ISO 8601, UUIDs as strings, Decimals as int/float, pydantic models via
+``model_dump(mode="json")``.
+"""
+
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+JSONDecodeError = orjson.JSONDecodeError  # subclass of json.JSONDecodeError
+
+_DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        # Same rule as fastapi.encoders.decimal_encoder.
+        if value.as_tuple().exponent >= 0:  # type: ignore[operator]
+            return int(value)
+        return float(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, bytes):
+        return value.decode()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    """Serialize ``value`` to UTF-8 JSON bytes."""
+    return orjson.dumps(value, default=_default, option=_DUMPS_OPTIONS)
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON bytes/str. Raises ``JSONDecodeError`` on invalid input."""
+    return orjson.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """``JSONResponse`` rendered with orjson (app-wide default response class)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,129 @@
+"""Conditional single-round-trip writes.
+
+Handlers used to select a row to check that it exists and belongs to the
+caller's org, then update it by id: two round trips, with a window between
+them. ``update_owned`` puts every check in the UPDATE's WHERE clause:
+
+    UPDATE table SET ... WHERE id = ? AND org_id = ? AND deleted_at IS NULL
+    RETURNING *
+
+An empty result means 404. The extra lookup that tells 404 apart from a
+lost race (409/412) only runs on that failure path.
+
+Optimistic concurrency: clients send the ``updated_at`` they last read in an
+``If-Match`` header; the update then only applies if the row is unchanged
+since, and otherwise fails with 412 Precondition Failed.
+
+Multi-row writes (a parent with its children) go through transactional
+Postgres functions instead (migrations ``028_write_graph_rpcs.sql`` and
+``029_update_order_graph.sql``), called with ``call_write_rpc``.
+"""
+
+from datetime import UTC, datetime
+from typing import Any
+
+from fastapi import HTTPException, status
+from postgrest.exceptions import APIError
+
+
+def expected_version(if_match: str | None) -> str | None:
+    """The ``updated_at`` a client expects, from an ``If-Match`` header value."""
+    if not if_match:
+        return None
+    value = if_match.strip()
+    if value.startswith("W/"):
+        value = value[2:]
+    value = value.strip('"')
+    return None if value in ("", "*") else value
+
+
+def update_owned(
+    supabase: Any,
+    table: str,
+    row_id: str,
+    org_id: str,
+    values: dict[str, Any],
+    *,
+    scope: dict[str, Any] | None = None,
+    expected_updated_at: str | None = None,
+    match: dict[str, Any] | None = None,
+    live_only: bool = True,
+) -> dict[str, Any]:
+    """Update one org-owned row in one round trip and return it.
+
+    ``scope`` adds ownership conditions (e.g. the parent ``project_id``);
+    ``match`` adds compare-and-set conditions on columns read earlier.
+    ``live_only=False`` is for tables without ``deleted_at``.
+
+    Raises 404 if the row does not exist for the org, 412 if it changed
+    since ``expected_updated_at``, 409 if a ``match`` condition failed.
+    """
+
+    def owned(query: Any) -> Any:
+        query = query.eq("id", row_id).eq("org_id", org_id)
+        for column, value in (scope or {}).items():
+            query = query.eq(column, value)
+        return query.is_("deleted_at", "null") if live_only else query
+
+    query = owned(supabase.table(table).update(values))
+    for column, value in (match or {}).items():
+        query = query.eq(column, value)
+    if expected_updated_at is not None:
+        query = query.eq("updated_at", expected_updated_at)
+    result = query.execute()
+    if result.data:
+        return result.data[0]
+
+    if expected_updated_at is not None or match:
+        if owned(supabase.table(table).select("id")).execute().data:
+            if expected_updated_at is not None:
+                raise HTTPException(
+                    status_code=status.HTTP_412_PRECONDITION_FAILED,
+                    detail="The resource was modified since it was read.",
+                )
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="The resource was modified concurrently.",
+            )
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+
+def soft_delete_owned(supabase: Any, table: str, row_id: str, org_id: str) -> dict[str, Any]:
+    """Set ``deleted_at`` (and ``updated_at``) on a live org-owned row; 404 if none."""
+    now = datetime.now(UTC).isoformat()
+    return update_owned(supabase, table, row_id, org_id, {"deleted_at": now, "updated_at": now})
+
+
+class RejectedWrite(Exception):
+    """A write function refused its input (``RAISE ... ERRCODE 'PT4xx'``)."""
+
+    def __init__(
+        self, status_code: int, field: str | None, message: str, detail: str | None = None
+    ) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.field = field
+        self.message = message
+        self.detail = detail
+
+    def body(self, message: str | None = None) -> dict[str, Any]:
+        """The API's validation error body for this rejection."""
+        return {
+            "message": "The given data was invalid.",
+            "errors": {self.field or "root": [message or self.message]},
+        }
+
+
+def call_write_rpc(supabase: Any, function: str, params: dict[str, Any]) -> Any:
+    """Run one transactional write function and return its result.
+
+    Raises ``RejectedWrite`` for input the function rejected; the write was
+    rolled back as a whole. Other database errors propagate unchanged.
+    """
+    try:
+        return supabase.rpc(function, params).execute().data
+    except APIError as exc:
+        code = exc.code or ""
+        if code.startswith("PT") and code[2:].isdigit():
+            raise RejectedWrite(int(code[2:]), exc.hint, exc.message or "", exc.details) from exc
+        raise
@@ -0,0 +1,59 @@
+"""Trusted-row serialization for list endpoints.
+
+List handlers used to validate one response model per database row, dump it
+back to a dict, and then let FastAPI walk the whole page again with
+``jsonable_encoder`` (or re-validate it against ``response_model``). Rows that
+come straight from PostgREST are already JSON-typed, so list endpoints build
+their models with ``model_construct`` (no validation) and render the page in a
+single pass through a cached ``TypeAdapter``.
+
+Values are emitted as stored: timestamps keep PostgREST's ISO 8601 text rather
+than being re-parsed and re-formatted. Single-object endpoints keep full
+validation.
+"""
+
+from collections.abc import Callable
+from functools import cache
+from typing import Any
+
+import orjson
+from pydantic import BaseModel, TypeAdapter
+
+from app.utils.json_codec import FastJSONResponse
+
+
+def model_factory[ModelT: BaseModel](
+    model: type[ModelT], *, trusted: bool
+) -> Callable[..., ModelT]:
+    """Return ``model.model_construct`` for trusted rows, else the validating constructor."""
+    return model.model_construct if trusted else model
+
+
+@cache
+def _list_adapter(model: type[BaseModel]) -> TypeAdapter[Any]:
+    return TypeAdapter(list[model])  # type: ignore[valid-type]
+
+
+def dump_trusted_list[ModelT: BaseModel](
+    model: type[ModelT], items: list[ModelT]
+) -> orjson.Fragment:
+    """Serialize constructed ``model`` instances to a pre-rendered JSON array.
+
+    The result can be embedded anywhere in a ``FastJSONResponse`` payload.
+    Serializer type warnings are silenced: trusted rows carry DB text for
+    typed fields (e.g. timestamps), which is passed through unchanged.
+    """
+    return orjson.Fragment(_list_adapter(model).dump_json(items, warnings=False))
+
+
+def trusted_page_response[ModelT: BaseModel](
+    model: type[ModelT],
+    items: list[ModelT],
+    envelope: dict[str, Any],
+) -> FastJSONResponse:
+    """Render ``envelope`` with ``items`` as its ``data`` key.
+
+    Returning a response object skips FastAPI's ``response_model`` validation
+    and ``jsonable_encoder`` walk; ``response_model`` still drives OpenAPI.
+    """
+    return FastJSONResponse({**envelope, "data": dump_trusted_list(model, items)})
@@ -0,0 +1,88 @@
+"""Startup warmup.
+
+The first request after a deploy or scale-out used to pay for the JWKS
+fetch, the OPEX M2M token exchange and the TLS handshake to PostgREST.
+``warm_up`` does that work in the lifespan, before the worker reports ready.
+
+Every step is best effort: a failure is logged and the request path falls
+back to doing the work lazily, exactly as before. Steps run concurrently and
+the whole warmup is bounded by ``timeout`` so a slow dependency cannot hold
+a deploy hostage.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable
+
+import httpx
+from aux_m2m_server import get_verifier
+
+from app.config import settings
+from app.database import get_supabase
+
+logger = logging.getLogger("warmup")
+
+
+def _unsigned_token(kid: str) -> str:
+    """A well-formed JWT whose ``kid`` is not in any key set."""
+
+    def segment(data: dict[str, str]) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+
+    return f"{segment({'alg': 'RS256', 'typ': 'JWT', 'kid': kid})}.{segment({})}.c2ln"
+
+
+def _warm_jwks() -> None:
+    # Verifying a token with an unknown kid makes the verifier fetch the key
+    # set; the verification itself is expected to fail.
+    try:
+        get_verifier().verify(_unsigned_token("serx-warmup"))
+    except Exception:
+        pass
+
+
+def _warm_supabase() -> None:
+    # Opens the pooled HTTP/TLS connection to PostgREST.
+    get_supabase().table("organizations").select("id").limit(1).execute()
+
+
+async def _warm_m2m_token() -> None:
+    # Runs the standard httpx auth flow once so the token is fetched and cached.
+    from aux_m2m_client import AsyncM2MAuth
+
+    from app.routers.internal_scheduler import get_opex_token_client
+
+    flow = AsyncM2MAuth(get_opex_token_client()).async_auth_flow(
+        httpx.Request("GET", settings.OPEX_API_URL)
+    )
+    try:
+        await flow.__anext__()
+    finally:
+        await flow.aclose()
+
+
+async def _step(name: str, run: Callable[[], Awaitable[None]]) -> None:
+    start = time.perf_counter()
+    try:
+        await run()
+    except Exception as exc:
+        logger.warning("warmup %s failed: %s", name, exc)
+        return
+    logger.info("warmup %s done in %.0fms", name, (time.perf_counter() - start) * 1000)
+
+
+async def warm_up(*, timeout: float) -> None:
+    """Warm JWKS, the Supabase connection pool and the OPEX M2M token."""
+    steps = [
+        _step("jwks", lambda: asyncio.to_thread(_warm_jwks)),
+        _step("supabase", lambda: asyncio.to_thread(_warm_supabase)),
+    ]
+    if settings.OPEX_API_URL:
+        steps.append(_step("m2m_token", _warm_m2m_token))
+    try:
+        await asyncio.wait_for(asyncio.gather(*steps), timeout)
+    except TimeoutError:
+        logger.warning("warmup did not finish within %.0fs; continuing startup", timeout)
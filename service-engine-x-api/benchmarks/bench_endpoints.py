@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""Endpoint benchmark: the real FastAPI app against a local Supabase stand-in.
+
+Runs the full app in-process (``httpx.ASGITransport``) while every PostgREST /
+Storage call goes over HTTP to :mod:`benchmarks.fake_supabase`, seeded by
+:mod:`benchmarks.seed_data` and delayed by ``--latency-ms`` per round trip.
+Reports p50/p95/p99 latency, requests/s and DB round trips per request for:
+
+* ``list_orders``        GET  /api/orders
+* ``list_tickets``       GET  /api/tickets
+* ``list_meetings``      GET  /api/meetings
+* ``public_proposal``    GET  /api/public/proposals/{id}
+* ``public_sign``        POST /api/public/proposals/{id}/sign
+* ``cal_webhook``        POST /api/webhooks/cal
+* ``scheduler_dispatch`` POST /api/internal/scheduler/dispatch-due-preframes
+
+Only true third parties are replaced: JWT verification accepts a system-M2M
+caller, DocRaptor sleeps ``--outbound-ms`` and returns a fixed PDF, and the
+OPEX ``/events/receive`` endpoint is served by the stand-in. Stripe and
+Resend are skipped because the seeded orgs have no keys configured.
+
+Usage (from service-engine-x-api/):
+
+    python -m benchmarks.bench_endpoints [--latency-ms 5] [--concurrency 8] \\
+        [--requests 200] [--scale 1.0] [--only list_orders ...] \\
+        [--output benchmarks/results/run.json]
+
+Compare two runs with ``python -m benchmarks.bench_endpoints --compare a.json b.json``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+from unittest.mock import patch
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from benchmarks.fake_supabase import FakeStore, FakeSupabaseServer
+from benchmarks.seed_data import SeededOrg, add_due_meetings, add_sent_proposals, seed_store
+
+CAL_SECRET = "bench-cal-secret"
+SYSTEM_CLAIMS = {"type": "m2m", "actor_type": "system_service", "sub": "bench"}
+
+
+@dataclass
+class Call:
+    method: str
+    url: str
+    body: bytes | None = None
+    headers: dict[str, str] | None = None
+
+
+@dataclass
+class Scenario:
+    name: str
+    build: Callable[[int], Call]
+    expect_status: int = 200
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _opex_receiver(store: FakeStore, outbound_ms: float) -> Route:
+    """Stand-in for OPEX ``/events/receive``: marks the meeting preframed."""
+
+    async def receive(request: Request) -> JSONResponse:
+        if outbound_ms:
+            await asyncio.sleep(outbound_ms / 1000)
+        body = json.loads(await request.body())
+        event_id = body["event_ref"]["id"]
+        with store.lock:
+            events = store.table("webhook_events_raw")
+            event = next((r for r in events if r["id"] == event_id), None)
+            meeting_id = (event or {}).get("payload", {}).get("meeting_id")
+            for meeting in store.table("meetings"):
+                if meeting["id"] == meeting_id:
+                    meeting["preframe_sent_at"] = datetime.now(UTC).isoformat()
+        return JSONResponse({"session_id": f"sess_{event_id[:8]}"}, status_code=202)
+
+    return Route("/events/receive", receive, methods=["POST"])
+
+
+def _cal_body(i: int) -> bytes:
+    return json.dumps(
+        {
+            "triggerEvent": "BOOKING_CREATED",
+            "createdAt": datetime.now(UTC).isoformat(),
+            "payload": {
+                "uid": f"bench-{i}",
+                "title": "Intro call",
+                "eventTypeId": 42,
+                "startTime": "2026-01-01T10:00:00Z",
+                "endTime": "2026-01-01T10:30:00Z",
+                "hosts": [{"email": "host@bench.test", "name": "Host"}],
+                "attendees": [
+                    {
+                        "email": f"guest{i}-{n}@prospect.test",
+                        "name": f"Guest {n}",
+                        "timeZone": "UTC",
+                    }
+                    for n in range(3)
+                ],
+                "responses": {"notes": {"value": "Looking forward to it. " * 20}},
+            },
+        }
+    ).encode()
+
+
+def build_scenarios(
+    store: FakeStore, seeded: SeededOrg, *, requests: int, warmup: int, due_per_tick: int
+) -> list[Scenario]:
+    scope = f"org_id={seeded.org_id}&user_id={seeded.staff_user_id}"
+    view_ids = seeded.sent_proposal_ids[:50]
+
+    # Each sign consumes a Sent proposal; make sure warmup + measured runs have one.
+    shortfall = requests + warmup - (len(seeded.sent_proposal_ids) - len(view_ids))
+    if shortfall > 0:
+        add_sent_proposals(store, seeded, shortfall)
+    sign_ids = iter(seeded.sent_proposal_ids[len(view_ids):])
+
+    def cal_call(i: int) -> Call:
+        body = _cal_body(i)
+        signature = hmac.new(CAL_SECRET.encode(), body, hashlib.sha256).hexdigest()
+        return Call(
+            "POST",
+            "/api/webhooks/cal",
+            body,
+            {"X-Cal-Signature-256": signature, "Content-Type": "application/json"},
+        )
+
+    def sign_call(i: int) -> Call:
+        body = json.dumps(
+            {
+                "signed_html": "<html><body>" + "<p>Scope of work</p>" * 200 + "</body></html>",
+                "signature": "data:image/png;base64," + "A" * 4000,
+                "signer_name": "Pat Prospect",
+                "signer_email": f"pat{i}@prospect.test",
+            }
+        ).encode()
+        return Call(
+            "POST",
+            f"/api/public/proposals/{next(sign_ids)}/sign",
+            body,
+            {"Content-Type": "application/json", "User-Agent": "bench"},
+        )
+
+    def dispatch_call(i: int) -> Call:
+        add_due_meetings(store, seeded, due_per_tick)
+        return Call(
+            "POST",
+            "/api/internal/scheduler/dispatch-due-preframes",
+            headers={"Authorization": "Bearer bench"},
+        )
+
+    auth = {"Authorization": "Bearer bench"}
+    return [
+        Scenario(
+            "list_orders", lambda i: Call("GET", f"/api/orders?{scope}&limit=20", headers=auth)
+        ),
+        Scenario(
+            "list_tickets", lambda i: Call("GET", f"/api/tickets?{scope}&limit=20", headers=auth)
+        ),
+        Scenario(
+            "list_meetings", lambda i: Call("GET", f"/api/meetings?{scope}&limit=100", headers=auth)
+        ),
+        Scenario(
+            "public_proposal",
+            lambda i: Call("GET", f"/api/public/proposals/{view_ids[i % len(view_ids)]}"),
+        ),
+        Scenario("public_sign", sign_call),
+        Scenario("cal_webhook", cal_call),
+        Scenario("scheduler_dispatch", dispatch_call),
+    ]
+
+
+async def run_scenario(
+    client: Any,
+    store: FakeStore,
+    scenario: Scenario,
+    *,
+    requests: int,
+    warmup: int,
+    concurrency: int,
+) -> dict[str, Any]:
+    for i in range(warmup):
+        call = scenario.build(i)
+        await client.request(call.method, call.url, content=call.body, headers=call.headers)
+
+    latencies: list[float] = []
+    statuses: Counter[int] = Counter()
+    next_index = iter(range(warmup, warmup + requests))
+    round_trips_before = store.requests
+
+    async def worker() -> None:
+        for i in next_index:
+            call = scenario.build(i)
+            start = time.perf_counter()
+            response = await client.request(
+                call.method, call.url, content=call.body, headers=call.headers
+            )
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[response.status_code] += 1
+
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - wall_start
+
+    latencies.sort()
+    return {
+        "endpoint": scenario.name,
+        "requests": len(latencies),
+        "errors": sum(n for code, n in statuses.items() if code != scenario.expect_status),
+        "status_codes": {str(code): n for code, n in sorted(statuses.items())},
+        "p50_ms": round(_percentile(latencies, 50), 2),
+        "p95_ms": round(_percentile(latencies, 95), 2),
+        "p99_ms": round(_percentile(latencies, 99), 2),
+        "mean_ms": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+        "rps": round(len(latencies) / wall, 1) if wall else 0.0,
+        "db_round_trips_per_request": round(
+            (store.requests - round_trips_before) / max(1, len(latencies)), 1
+        ),
+    }
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _configure_environment(server_url: str) -> None:
+    """Point Settings at the stand-in. Must run before ``app`` is imported."""
+    os.environ["SERVICE_ENGINE_X_SUPABASE_URL"] = server_url
+    os.environ.setdefault("SERVICE_ENGINE_X_SUPABASE_SERVICE_ROLE_KEY", "bench-service-role-key")
+    os.environ.setdefault("SERX_API_BASE_URL", "http://localhost:8000")
+    os.environ["OPEX_API_URL"] = server_url
+    os.environ["CAL_WEBHOOK_SECRET"] = CAL_SECRET
+    for name, value in (
+        ("AUX_JWKS_URL", f"{server_url}/.well-known/jwks.json"),
+        ("AUX_ISSUER", "bench"),
+        ("AUX_AUDIENCE", "serx"),
+        ("AUX_API_BASE_URL", server_url),
+        ("AUX_M2M_API_KEY", "bench"),
+    ):
+        os.environ.setdefault(name, value)
+
+
+async def _run_all(
+    args: argparse.Namespace, store: FakeStore, seeded: SeededOrg
+) -> list[dict[str, Any]]:
+    import httpx
+
+    from app.main import app
+
+    scenarios = build_scenarios(
+        store, seeded, requests=args.requests, warmup=args.warmup, due_per_tick=args.due_per_tick
+    )
+    if args.only:
+        scenarios = [s for s in scenarios if s.name in args.only]
+
+    def fake_docraptor(html_content: str, filename: str) -> bytes:
+        time.sleep(args.outbound_ms / 1000)
+        return b"%PDF-1.4 bench " + hashlib.sha256(html_content.encode()).digest()
+
+    results = []
+    transport = httpx.ASGITransport(app=app, client=("203.0.113.10", 40000))
+    with (
+        patch("app.auth.dependencies._verify", return_value=SYSTEM_CLAIMS),
+        patch("app.routers.internal_scheduler._get_opex_auth", return_value=None),
+        patch("app.routers.proposals.generate_pdf_docraptor", side_effect=fake_docraptor),
+    ):
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=120
+        ) as client:
+            for scenario in scenarios:
+                result = await run_scenario(
+                    client,
+                    store,
+                    scenario,
+                    requests=args.requests,
+                    warmup=args.warmup,
+                    concurrency=args.concurrency,
+                )
+                results.append(result)
+                _print_row(result)
+    return results
+
+
+def _print_header() -> None:
+    print(
+        f"{'endpoint':<20}{'n':>5}{'err':>5}{'p50 ms':>10}{'p95 ms':>10}"
+        f"{'p99 ms':>10}{'req/s':>9}{'db/req':>8}"
+    )
+
+
+def _print_row(r: dict[str, Any]) -> None:
+    print(
+        f"{r['endpoint']:<20}{r['requests']:>5}{r['errors']:>5}{r['p50_ms']:>10}"
+        f"{r['p95_ms']:>10}{r['p99_ms']:>10}{r['rps']:>9}{r['db_round_trips_per_request']:>8}"
+    )
+
+
+def compare(baseline_path: str, candidate_path: str) -> None:
+    """Print per-endpoint p50/p95/rps deltas between two result files."""
+    with open(baseline_path) as f:
+        baseline = {r["endpoint"]: r for r in json.load(f)["results"]}
+    with open(candidate_path) as f:
+        candidate = {r["endpoint"]: r for r in json.load(f)["results"]}
+
+    print(f"{'endpoint':<20}{'p50':>16}{'p95':>16}{'req/s':>16}{'db/req':>12}")
+    for name, new in candidate.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        print(
+            f"{name:<20}"
+            f"{old['p50_ms']:>7} → {new['p50_ms']:<6}"
+            f"{old['p95_ms']:>7} → {new['p95_ms']:<6}"
+            f"{old['rps']:>7} → {new['rps']:<6}"
+            f"{old['db_round_trips_per_request']:>5} → {new['db_round_trips_per_request']:<4}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Per PostgREST/Storage call")
+    parser.add_argument("--jitter-ms", type=float, default=1.0)
+    parser.add_argument("--outbound-ms", type=float, default=50.0, help="DocRaptor / OPEX calls")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier on seeded volumes")
+    parser.add_argument("--due-per-tick", type=int, default=5, help="Due meetings per dispatch")
+    parser.add_argument("--only", nargs="+", help="Run only these endpoints")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CANDIDATE"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    store = FakeStore()
+    seeded = seed_store(store, scale=args.scale)
+    server = FakeSupabaseServer(
+        store,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        extra_routes=[_opex_receiver(store, args.outbound_ms)],
+    )
+    _configure_environment(server.url)
+
+    with server:
+        _print_header()
+        results = asyncio.run(_run_all(args, store, seeded))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(UTC).isoformat(),
+            "git_revision": _git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "outbound_ms": args.outbound_ms,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+            "scale": args.scale,
+            "seeded": seeded.counts,
+        },
+        "results": results,
+    }
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: stdlib JSON vs the orjson codec on large response pages.
+
+Compares, per page size:
+
+* ``stdlib``      — FastAPI's historical path: ``jsonable_encoder`` + ``JSONResponse``
+* ``orjson``      — ``jsonable_encoder`` + ``FastJSONResponse`` (app default)
+* ``orjson-raw``  — ``FastJSONResponse`` on the content directly (no encoder walk)
+
+and webhook body parsing (``json.loads`` vs ``json_codec.loads``).
+
+Usage (from service-engine-x-api/):
+
+    python -m benchmarks.bench_json [--rows 100 500 2000] [--output result.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import timeit
+import uuid
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from typing import Any
+
+# Importing app modules loads Settings; no network access is needed.
+os.environ.setdefault("SERVICE_ENGINE_X_SUPABASE_URL", "https://placeholder.supabase.co")
+os.environ.setdefault("SERVICE_ENGINE_X_SUPABASE_SERVICE_ROLE_KEY", "placeholder")
+os.environ.setdefault("SERX_API_BASE_URL", "http://localhost:8000")
+
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+from app.utils.json_codec import FastJSONResponse, loads
+
+
+def _meeting(i: int) -> dict[str, Any]:
+    start = datetime(2026, 1, 1, tzinfo=UTC) + timedelta(hours=i)
+    return {
+        "id": str(uuid.uuid4()),
+        "org_id": str(uuid.uuid4()),
+        "account_id": str(uuid.uuid4()),
+        "contact_id": str(uuid.uuid4()),
+        "deal_id": None,
+        "cal_event_uid": f"uid-{i}",
+        "cal_booking_id": 100000 + i,
+        "title": f"Intro call #{i}",
+        "start_time": start,
+        "end_time": start + timedelta(minutes=30),
+        "status": "scheduled",
+        "organizer_email": "host@example.com",
+        "attendee_emails": [f"guest{i}@example.com", f"cc{i}@example.com"],
+        "host_no_show": False,
+        "guest_no_show": False,
+        "account": {"id": str(uuid.uuid4()), "name": "example.com", "lifecycle": "lead"},
+        "contact": {"id": str(uuid.uuid4()), "name": "Sam Guest", "email": f"guest{i}@example.com"},
+        "deal": None,
+        "created_at": start - timedelta(days=2),
+        "updated_at": start - timedelta(days=1),
+    }
+
+
+def _invoice(i: int) -> dict[str, Any]:
+    created = datetime(2026, 1, 1, tzinfo=UTC) + timedelta(days=i)
+    items = [
+        {
+            "id": str(uuid.uuid4()),
+            "invoice_id": str(uuid.uuid4()),
+            "name": f"Line {n}",
+            "description": "Consulting services " * 4,
+            "quantity": 1 + n,
+            "amount": Decimal("1250.00"),
+            "discount": Decimal("0.00"),
+            "total": Decimal("1250.00") * (1 + n),
+            "service_id": str(uuid.uuid4()),
+            "order_id": None,
+            "options": {"tier": "pro", "seats": n},
+            "created_at": created,
+        }
+        for n in range(5)
+    ]
+    return {
+        "id": str(uuid.uuid4()),
+        "number": f"INV-{i:05d}",
+        "client": {"id": str(uuid.uuid4()), "name": "Acme Co", "email": "billing@acme.test"},
+        "items": items,
+        "status": "Unpaid",
+        "status_id": 1,
+        "created_at": created,
+        "date_due": created + timedelta(days=30),
+        "subtotal": sum((item["total"] for item in items), Decimal("0")),
+        "tax": Decimal("0"),
+        "currency": "USD",
+    }
+
+
+def _webhook_body(attendees: int) -> bytes:
+    return json.dumps(
+        {
+            "triggerEvent": "BOOKING_CREATED",
+            "createdAt": "2026-01-01T00:00:00Z",
+            "payload": {
+                "uid": "abc",
+                "title": "Intro",
+                "attendees": [
+                    {"email": f"a{i}@example.com", "name": f"Attendee {i}", "timeZone": "UTC"}
+                    for i in range(attendees)
+                ],
+                "responses": {"notes": {"value": "x" * 4000}},
+            },
+        }
+    ).encode()
+
+
+def _best_of(fn: Any, number: int, repeat: int = 5) -> float:
+    """Best per-call time in milliseconds."""
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1000
+
+
+def run(rows: list[int]) -> dict[str, Any]:
+    results: dict[str, Any] = {"render": [], "parse": []}
+    for kind, factory in (("meetings", _meeting), ("invoices", _invoice)):
+        for size in rows:
+            page = {"data": [factory(i) for i in range(size)], "meta": {"total": size}}
+            number = max(1, 2000 // size)
+            stdlib = _best_of(lambda: JSONResponse(jsonable_encoder(page)).body, number)
+            fast = _best_of(lambda: FastJSONResponse(jsonable_encoder(page)).body, number)
+            raw = _best_of(lambda: FastJSONResponse(page).body, number)
+            results["render"].append(
+                {
+                    "page": kind,
+                    "rows": size,
+                    "stdlib_ms": round(stdlib, 3),
+                    "orjson_ms": round(fast, 3),
+                    "orjson_raw_ms": round(raw, 3),
+                    "speedup_raw": round(stdlib / raw, 1),
+                }
+            )
+
+    for attendees in (5, 50, 500):
+        body = _webhook_body(attendees)
+        stdlib = _best_of(lambda: json.loads(body), 200)
+        fast = _best_of(lambda: loads(body), 200)
+        results["parse"].append(
+            {
+                "attendees": attendees,
+                "bytes": len(body),
+                "stdlib_ms": round(stdlib, 4),
+                "orjson_ms": round(fast, 4),
+                "speedup": round(stdlib / fast, 1),
+            }
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = run(args.rows)
+
+    print(f"{'page':<10}{'rows':>6}{'stdlib ms':>12}{'orjson ms':>12}{'raw ms':>10}{'x':>7}")
+    for row in results["render"]:
+        print(
+            f"{row['page']:<10}{row['rows']:>6}{row['stdlib_ms']:>12}"
+            f"{row['orjson_ms']:>12}{row['orjson_raw_ms']:>10}{row['speedup_raw']:>7}"
+        )
+    print()
+    print(f"{'attendees':<10}{'bytes':>8}{'stdlib ms':>12}{'orjson ms':>12}{'x':>7}")
+    for row in results["parse"]:
+        print(
+            f"{row['attendees']:<10}{row['bytes']:>8}{row['stdlib_ms']:>12}"
+            f"{row['orjson_ms']:>12}{row['speedup']:>7}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
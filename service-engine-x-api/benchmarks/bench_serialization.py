@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: validated vs trusted-row serialization of list pages.
+
+Compares, per list endpoint and page size:
+
+* ``validated`` — previous path: validate a model per row, ``model_dump()``,
+  then FastAPI's ``jsonable_encoder`` / ``response_model`` pass and render
+* ``trusted``   — ``model_construct`` per row, one ``TypeAdapter`` dump for the
+  page, rendered by ``trusted_page_response``
+
+Rows mimic PostgREST output (JSON types only, timestamps as ISO text).
+
+Usage (from service-engine-x-api/):
+
+    python -m benchmarks.bench_serialization [--rows 100 500] [--output result.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import timeit
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+# Importing app modules loads Settings; no network access is needed.
+os.environ.setdefault("SERVICE_ENGINE_X_SUPABASE_URL", "https://placeholder.supabase.co")
+os.environ.setdefault("SERVICE_ENGINE_X_SUPABASE_SERVICE_ROLE_KEY", "placeholder")
+os.environ.setdefault("SERX_API_BASE_URL", "http://localhost:8000")
+
+from fastapi.encoders import jsonable_encoder
+
+from app.models.accounts import AccountListResponse
+from app.models.invoices import InvoiceListItem, InvoiceListResponse
+from app.models.meetings import MeetingListResponse
+from app.models.services import ServiceResponse
+from app.routers.accounts import serialize_account_list
+from app.routers.invoices import serialize_invoice_list_item
+from app.routers.meetings import _base_meeting_dict, serialize_meeting_list
+from app.routers.services import serialize_service
+from app.utils.json_codec import FastJSONResponse
+from app.utils.serialization import trusted_page_response
+
+
+def _ts(i: int) -> str:
+    return (datetime(2026, 1, 1, tzinfo=UTC) + timedelta(hours=i)).isoformat()
+
+
+def _meeting_row(i: int) -> dict[str, Any]:
+    return {
+        "id": str(uuid.uuid4()),
+        "org_id": str(uuid.uuid4()),
+        "account_id": str(uuid.uuid4()),
+        "contact_id": str(uuid.uuid4()),
+        "deal_id": str(uuid.uuid4()),
+        "cal_event_uid": f"uid-{i}",
+        "cal_booking_id": 100000 + i,
+        "title": f"Intro call #{i}",
+        "start_time": _ts(i),
+        "end_time": _ts(i + 1),
+        "status": "scheduled",
+        "organizer_email": "host@example.com",
+        "attendee_emails": [f"guest{i}@example.com", f"cc{i}@example.com"],
+        "host_no_show": False,
+        "guest_no_show": False,
+        "account": {"id": str(uuid.uuid4()), "name": "example.com", "lifecycle": "lead"},
+        "contact": {
+            "id": str(uuid.uuid4()), "name_f": "Sam", "name_l": "Guest", "email": "g@example.com"
+        },
+        "deal": {"id": str(uuid.uuid4()), "title": "Pilot", "status": "open", "value": 1200},
+        "notes": "x" * 500,
+        "custom_fields": {"source": "cal"},
+        "created_at": _ts(i - 48),
+        "updated_at": _ts(i - 24),
+    }
+
+
+def _account_row(i: int) -> dict[str, Any]:
+    return {
+        "id": str(uuid.uuid4()),
+        "org_id": str(uuid.uuid4()),
+        "name": f"Account {i}",
+        "domain": f"account{i}.example.com",
+        "lifecycle": "customer",
+        "balance": 12.5,
+        "total_spent": 1500,
+        "custom_fields": {},
+        "created_at": _ts(i),
+        "updated_at": _ts(i),
+    }
+
+
+def _service_row(i: int) -> dict[str, Any]:
+    return {
+        "id": str(uuid.uuid4()),
+        "name": f"Service {i}",
+        "description": "Managed SEO package " * 5,
+        "image": None,
+        "recurring": 1,
+        "price": 499.0,
+        "currency": "USD",
+        "f_price": None,
+        "r_price": 499.0,
+        "r_period_l": 1,
+        "r_period_t": "M",
+        "multi_order": True,
+        "public": True,
+        "sort_order": i,
+        "metadata": {"tier": "pro"},
+        "created_at": _ts(i),
+        "updated_at": _ts(i),
+    }
+
+
+def _invoice_row(i: int) -> dict[str, Any]:
+    invoice_id = str(uuid.uuid4())
+    return {
+        "id": invoice_id,
+        "number": f"INV-{i:05d}",
+        "status": 1,
+        "created_at": _ts(i),
+        "date_due": _ts(i + 720),
+        "currency": "USD",
+        "subtotal": 6250,
+        "total": 6250,
+        "users": {
+            "id": str(uuid.uuid4()),
+            "name_f": "Acme",
+            "name_l": "Billing",
+            "email": "billing@acme.test",
+            "addresses": [{"line_1": "1 Main St", "city": "Austin"}],
+            "roles": {"id": 1, "name": "Client"},
+        },
+        "invoice_items": [
+            {
+                "id": str(uuid.uuid4()),
+                "invoice_id": invoice_id,
+                "name": f"Line {n}",
+                "description": "Consulting services",
+                "quantity": 1,
+                "amount": 1250,
+                "discount": 0,
+                "total": 1250,
+                "service_id": str(uuid.uuid4()),
+                "order_id": None,
+                "options": {"seats": n},
+                "created_at": _ts(i),
+            }
+            for n in range(5)
+        ],
+    }
+
+
+def _validated_dict_page(
+    serialize: Callable[[dict[str, Any]], Any], rows: list[dict[str, Any]]
+) -> bytes:
+    # Pre-change path for dict-returning handlers: model per row + encoder walk.
+    page = {"data": [serialize(row).model_dump() for row in rows], "meta": {"total": len(rows)}}
+    return FastJSONResponse(jsonable_encoder(page)).body
+
+
+def _validated_meetings(rows: list[dict[str, Any]]) -> bytes:
+    return _validated_dict_page(lambda row: MeetingListResponse(**_base_meeting_dict(row)), rows)
+
+
+def _validated_accounts(rows: list[dict[str, Any]]) -> bytes:
+    return _validated_dict_page(
+        lambda row: AccountListResponse(**vars(serialize_account_list(row))),
+        rows,
+    )
+
+
+def _validated_services(rows: list[dict[str, Any]]) -> bytes:
+    return _validated_dict_page(serialize_service, rows)
+
+
+def _validated_invoices(rows: list[dict[str, Any]]) -> bytes:
+    # Pre-change path for response_model handlers: model per row, then
+    # FastAPI re-validates the page against response_model and dumps it.
+    items = [
+        InvoiceListItem.model_validate(serialize_invoice_list_item(row).model_dump())
+        for row in rows
+    ]
+    page = InvoiceListResponse.model_validate(
+        {
+            "data": items,
+            "links": {"first": "f", "last": "l", "prev": None, "next": None},
+            "meta": {"current_page": 1, "from": 1, "to": len(rows), "last_page": 1,
+                     "per_page": len(rows), "total": len(rows), "path": "p"},
+        }
+    )
+    return FastJSONResponse(page.model_dump(mode="json", by_alias=True)).body
+
+
+def _trusted(
+    model: Any, serialize: Callable[[dict[str, Any]], Any]
+) -> Callable[[list[dict[str, Any]]], bytes]:
+    def run(rows: list[dict[str, Any]]) -> bytes:
+        items = [serialize(row) for row in rows]
+        return trusted_page_response(model, items, {"data": [], "meta": {"total": len(rows)}}).body
+
+    return run
+
+
+Case = tuple[str, Callable[[int], dict[str, Any]], Callable[..., bytes], Callable[..., bytes]]
+
+CASES: list[Case] = [
+    (
+        "meetings",
+        _meeting_row,
+        _validated_meetings,
+        _trusted(MeetingListResponse, serialize_meeting_list),
+    ),
+    (
+        "accounts",
+        _account_row,
+        _validated_accounts,
+        _trusted(AccountListResponse, serialize_account_list),
+    ),
+    (
+        "services",
+        _service_row,
+        _validated_services,
+        _trusted(ServiceResponse, lambda row: serialize_service(row, trusted=True)),
+    ),
+    (
+        "invoices",
+        _invoice_row,
+        _validated_invoices,
+        _trusted(InvoiceListItem, serialize_invoice_list_item),
+    ),
+]
+
+
+def _best_of(fn: Any, number: int, repeat: int = 5) -> float:
+    """Best per-call time in milliseconds."""
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1000
+
+
+def run(rows: list[int]) -> list[dict[str, Any]]:
+    results = []
+    for name, factory, validated, trusted in CASES:
+        for size in rows:
+            page = [factory(i) for i in range(size)]
+            number = max(1, 1000 // size)
+            validated_ms = _best_of(lambda: validated(page), number)
+            trusted_ms = _best_of(lambda: trusted(page), number)
+            results.append(
+                {
+                    "endpoint": name,
+                    "rows": size,
+                    "validated_ms": round(validated_ms, 3),
+                    "trusted_ms": round(trusted_ms, 3),
+                    "speedup": round(validated_ms / trusted_ms, 1),
+                }
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = run(args.rows)
+
+    print(f"{'endpoint':<10}{'rows':>6}{'validated ms':>15}{'trusted ms':>13}{'x':>7}")
+    for row in results:
+        print(
+            f"{row['endpoint']:<10}{row['rows']:>6}{row['validated_ms']:>15}"
+            f"{row['trusted_ms']:>13}{row['speedup']:>7}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Startup budget check: cold ``import app.main`` and time-to-ready.
+
+Each run is a fresh interpreter so nothing is cached in ``sys.modules``:
+
+* ``import_ms`` — ``import app.main`` (routers, models, settings, SDKs)
+* ``ready_ms``  — import plus the lifespan startup (warmup included unless
+  ``STARTUP_WARMUP_ENABLED=false``), i.e. until uvicorn would accept traffic
+
+The median over ``--runs`` is compared to ``--budget-ms``; the exit status
+is 1 when ``ready_ms`` is over budget so CI can gate on it. ``--top`` lists
+the modules with the largest self import time (``python -X importtime``).
+
+Usage (from service-engine-x-api/):
+
+    python -m benchmarks.bench_startup [--runs 5] [--budget-ms 1500] [--output result.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any
+
+_PROBE = """
+import asyncio, json, time
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+
+async def ready():
+    async with app.main.app.router.lifespan_context(app.main.app):
+        return time.perf_counter()
+
+ready_at = asyncio.run(ready())
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "ready_ms": (ready_at - start) * 1000,
+}))
+"""
+
+
+def _env() -> dict[str, str]:
+    env = dict(os.environ)
+    # Importing app modules loads Settings; no network access is needed.
+    env.setdefault("SERVICE_ENGINE_X_SUPABASE_URL", "https://placeholder.supabase.co")
+    env.setdefault("SERVICE_ENGINE_X_SUPABASE_SERVICE_ROLE_KEY", "placeholder")
+    env.setdefault("SERX_API_BASE_URL", "http://localhost:8000")
+    env.setdefault("LOOP_WATCHDOG_ENABLED", "false")
+    return env
+
+
+def measure_once() -> dict[str, float]:
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE], env=_env(), capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def heaviest_imports(top: int) -> list[dict[str, Any]]:
+    """Modules with the largest self import time for ``import app.main``."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        env=_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = (part.strip() for part in line[12:].split("|"))
+        rows.append(
+            {
+                "module": module,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+            }
+        )
+    rows.sort(key=lambda row: row["self_ms"], reverse=True)
+    return rows[:top]
+
+
+def run(runs: int, top: int) -> dict[str, Any]:
+    samples = [measure_once() for _ in range(runs)]
+    return {
+        "runs": runs,
+        "import_ms": round(statistics.median(s["import_ms"] for s in samples), 1),
+        "ready_ms": round(statistics.median(s["ready_ms"] for s in samples), 1),
+        "heaviest_imports": heaviest_imports(top) if top else [],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, help="Fail if median ready_ms exceeds this")
+    parser.add_argument("--top", type=int, default=10, help="List the N heaviest imports")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = run(args.runs, args.top)
+
+    print(f"import app.main: {results['import_ms']:>8} ms (median of {args.runs})")
+    print(f"ready:           {results['ready_ms']:>8} ms")
+    if results["heaviest_imports"]:
+        print()
+        print(f"{'module':<48}{'self ms':>10}{'cum ms':>10}")
+        for row in results["heaviest_imports"]:
+            print(f"{row['module']:<48}{row['self_ms']:>10.1f}{row['cumulative_ms']:>10.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.budget_ms is not None and results["ready_ms"] > args.budget_ms:
+        print(f"\nover budget: {results['ready_ms']} ms > {args.budget_ms} ms", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""In-process Redis-protocol (RESP2) stand-in for tests and benchmarks.
+
+Serves the commands the app's cache backend uses, over a real TCP socket on
+localhost, backed by a dict with per-key expiry:
+
+* ``PING``, ``SELECT``, ``CLIENT ...`` (connection setup; always ``OK``)
+* ``GET``, ``MGET``, ``SET key value [PX ms | EX s] [NX]``, ``DEL``/``UNLINK``,
+  ``EXISTS``, ``INCR``, ``PUBLISH`` (returns 0), ``FLUSHDB``
+* ``SCAN cursor [MATCH pattern] [COUNT n]`` — one pass, cursor ``0``; MATCH
+  takes Redis globs (``*``, ``?``, ``[...]``, ``\\`` escapes)
+
+Unknown commands get a RESP error so an unsupported call fails loudly.
+``latency_ms`` delays every reply, like ``FakeSupabaseServer``.
+
+Usage::
+
+    with FakeRedisServer() as server:
+        backend = RedisBackend(server.url)
+        ...
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import threading
+import time
+from typing import Any
+
+from benchmarks.fake_supabase import _free_port
+
+Reply = bytes | int | None | list[Any] | Exception
+
+
+def _glob_regex(pattern: str) -> re.Pattern[str]:
+    """Compile a Redis glob; unlike ``fnmatch``, a backslash escapes the next character."""
+    out, i = [], 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\" and i + 1 < len(pattern):
+            i += 1
+            out.append(re.escape(pattern[i]))
+        elif ch == "*":
+            out.append(".*")
+        elif ch == "?":
+            out.append(".")
+        elif ch == "[" and (end := pattern.find("]", i + 1)) > i:
+            body = pattern[i + 1:end]
+            out.append("[^" + body[1:] + "]" if body.startswith("^") else "[" + body + "]")
+            i = end
+        else:
+            out.append(re.escape(ch))
+        i += 1
+    return re.compile("".join(out), re.DOTALL)
+
+
+class FakeRedisStore:
+    def __init__(self) -> None:
+        self.data: dict[bytes, tuple[float | None, bytes]] = {}
+        self.commands = 0
+
+    def _live(self, key: bytes) -> bytes | None:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    def execute(self, args: list[bytes]) -> Reply:
+        self.commands += 1
+        name = args[0].upper().decode()
+        handler = getattr(self, f"_cmd_{name.lower()}", None)
+        if handler is None:
+            return ValueError(f"ERR unknown command '{name}'")
+        return handler(*args[1:])
+
+    def _cmd_ping(self, *args: bytes) -> Reply:
+        return args[0] if args else b"+PONG"
+
+    def _cmd_select(self, *args: bytes) -> Reply:
+        return b"+OK"
+
+    def _cmd_client(self, *args: bytes) -> Reply:
+        return b"+OK"
+
+    def _cmd_get(self, key: bytes) -> Reply:
+        return self._live(key)
+
+    def _cmd_mget(self, *keys: bytes) -> Reply:
+        return [self._live(key) for key in keys]
+
+    def _cmd_set(self, key: bytes, value: bytes, *options: bytes) -> Reply:
+        expires_at = None
+        nx = False
+        opts = [option.upper() for option in options]
+        for i, option in enumerate(opts):
+            if option == b"PX":
+                expires_at = time.monotonic() + int(options[i + 1]) / 1000
+            elif option == b"EX":
+                expires_at = time.monotonic() + int(options[i + 1])
+            elif option == b"NX":
+                nx = True
+        if nx and self._live(key) is not None:
+            return None
+        self.data[key] = (expires_at, value)
+        return b"+OK"
+
+    def _cmd_del(self, *keys: bytes) -> Reply:
+        deleted = 0
+        for key in keys:
+            if self._live(key) is not None:
+                del self.data[key]
+                deleted += 1
+        return deleted
+
+    _cmd_unlink = _cmd_del
+
+    def _cmd_exists(self, *keys: bytes) -> Reply:
+        return sum(1 for key in keys if self._live(key) is not None)
+
+    def _cmd_incr(self, key: bytes) -> Reply:
+        value = int(self._live(key) or 0) + 1
+        expires_at = self.data.get(key, (None, b""))[0]
+        self.data[key] = (expires_at, str(value).encode())
+        return value
+
+    def _cmd_publish(self, *args: bytes) -> Reply:
+        return 0
+
+    def _cmd_flushdb(self, *args: bytes) -> Reply:
+        self.data.clear()
+        return b"+OK"
+
+    def _cmd_scan(self, cursor: bytes, *options: bytes) -> Reply:
+        pattern = "*"
+        for i, option in enumerate(options):
+            if option.upper() == b"MATCH":
+                pattern = options[i + 1].decode()
+        keys = [key for key in list(self.data) if self._live(key) is not None]
+        regex = _glob_regex(pattern)
+        return [b"0", [key for key in keys if regex.fullmatch(key.decode())]]
+
+
+def _encode(reply: Reply) -> bytes:
+    if isinstance(reply, Exception):
+        return b"-" + str(reply).encode() + b"\r\n"
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, int):
+        return b":" + str(int(reply)).encode() + b"\r\n"
+    if isinstance(reply, list):
+        return b"*" + str(len(reply)).encode() + b"\r\n" + b"".join(_encode(item) for item in reply)
+    if reply.startswith(b"+"):
+        return reply + b"\r\n"
+    return b"$" + str(len(reply)).encode() + b"\r\n" + reply + b"\r\n"
+
+
+async def _read_command(reader: asyncio.StreamReader) -> list[bytes] | None:
+    header = await reader.readline()
+    if not header:
+        return None
+    if not header.startswith(b"*"):  # inline command
+        return header.strip().split()
+    args = []
+    for _ in range(int(header[1:])):
+        length = int((await reader.readline())[1:])
+        args.append((await reader.readexactly(length + 2))[:-2])
+    return args
+
+
+class FakeRedisServer:
+    """Serve a :class:`FakeRedisStore` on localhost in a background thread."""
+
+    def __init__(self, store: FakeRedisStore | None = None, *, latency_ms: float = 0.0) -> None:
+        self.store = store or FakeRedisStore()
+        self.latency_ms = latency_ms
+        self.port = _free_port()
+        self.url = f"redis://127.0.0.1:{self.port}/0"
+        self._loop = asyncio.new_event_loop()
+        self._started = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._server: asyncio.Server | None = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while (args := await _read_command(reader)) is not None:
+                if self.latency_ms:
+                    await asyncio.sleep(self.latency_ms / 1000)
+                writer.write(_encode(self.store.execute(args)))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle, "127.0.0.1", self.port)
+        )
+        self._started.set()
+        self._loop.run_forever()
+
+    def __enter__(self) -> FakeRedisServer:
+        self._thread.start()
+        if not self._started.wait(10):
+            raise RuntimeError("fake redis server failed to start")
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        def _stop() -> None:
+            assert self._server is not None
+            self._server.close()
+            self._loop.stop()
+
+        self._loop.call_soon_threadsafe(_stop)
+        self._thread.join(timeout=10)
@@ -0,0 +1,626 @@
+"""In-process PostgREST / Supabase Storage stand-in for benchmarks.
+
+Serves the subset of the PostgREST wire protocol the app's supabase-py client
+uses, backed by in-memory tables, over real HTTP on localhost:
+
+* ``GET/HEAD /rest/v1/{table}`` — ``select`` with embedded resources
+  (``alias:table(cols)``, ``alias:fk_col(cols)``), filters (``eq``, ``neq``,
+  ``gt``, ``gte``, ``lt``, ``lte``, ``like``, ``ilike``, ``is``, ``in``,
+  ``cs``, ``not.*``, ``or``/``and``), ``order``, ``limit``/``offset``,
+  ``Prefer: count=exact`` and single-object responses
+* ``POST /rest/v1/{table}`` — insert / upsert (``on_conflict``,
+  ``resolution=merge|ignore-duplicates``) with unique-constraint errors
+* ``PATCH`` / ``DELETE /rest/v1/{table}`` — filtered update / delete
+* ``POST /rest/v1/rpc/{fn}`` — Python handlers registered on the store
+* ``POST|PUT|DELETE /storage/v1/object/...`` — Storage upload / remove
+
+Every request sleeps ``latency_ms`` (± ``jitter_ms``) before it is served so
+round trips cost what they would against a hosted project. Unsupported
+syntax fails loudly with a PostgREST-shaped 400 instead of returning
+misleading data.
+
+Usage::
+
+    store = FakeStore()
+    store.insert("orders", [{...}])
+    with FakeSupabaseServer(store, latency_ms=5) as server:
+        os.environ["SERVICE_ENGINE_X_SUPABASE_URL"] = server.url
+        ...
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import json
+import random
+import re
+import socket
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import BaseRoute, Route
+
+Row = dict[str, Any]
+
+# Foreign-key columns → referenced table, for ``alias:fk_col(...)`` embeds
+# and ``{singular}_id`` inference.
+FK_TARGETS: dict[str, str] = {
+    "org_id": "organizations",
+    "user_id": "users",
+    "client_id": "users",
+    "employee_id": "users",
+    "address_id": "addresses",
+    "role_id": "roles",
+    "account_id": "accounts",
+    "contact_id": "contacts",
+    "deal_id": "deals",
+    "order_id": "orders",
+    "proposal_id": "proposals",
+    "service_id": "services",
+    "engagement_id": "engagements",
+    "invoice_id": "invoices",
+    "ticket_id": "tickets",
+    "tag_id": "tags",
+}
+
+_RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+
+class PostgrestError(Exception):
+    """Raised inside the fake; rendered as a PostgREST error body."""
+
+    def __init__(
+        self,
+        status: int,
+        code: str,
+        message: str,
+        *,
+        details: str | None = None,
+        hint: str | None = None,
+    ) -> None:
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+        self.details = details
+        self.hint = hint
+
+
+@dataclass
+class Relation:
+    target: str
+    local_col: str
+    remote_col: str
+    many: bool
+
+
+@dataclass
+class FakeStore:
+    """In-memory tables plus the schema hints the fake needs."""
+
+    tables: dict[str, list[Row]] = field(default_factory=dict)
+    unique: dict[str, list[tuple[str, tuple[str, ...]]]] = field(default_factory=dict)
+    relations: dict[tuple[str, str], Relation] = field(default_factory=dict)
+    rpcs: dict[str, Callable[[FakeStore, dict[str, Any]], Any]] = field(default_factory=dict)
+    storage: dict[str, bytes] = field(default_factory=dict)
+    lock: threading.RLock = field(default_factory=threading.RLock)
+    requests: int = 0
+
+    def table(self, name: str) -> list[Row]:
+        return self.tables.setdefault(name, [])
+
+    def insert(self, table: str, rows: Iterable[Row]) -> list[Row]:
+        """Seed rows directly (no latency, no constraint checks)."""
+        with self.lock:
+            out = [_with_defaults(dict(row)) for row in rows]
+            self.table(table).extend(out)
+            return out
+
+    def add_unique(self, table: str, name: str, *columns: str) -> None:
+        self.unique.setdefault(table, []).append((name, columns))
+
+    def add_relation(
+        self, parent: str, ref: str, target: str, local_col: str, remote_col: str, many: bool
+    ) -> None:
+        self.relations[(parent, ref)] = Relation(target, local_col, remote_col, many)
+
+    def register_rpc(self, name: str, fn: Callable[[FakeStore, dict[str, Any]], Any]) -> None:
+        self.rpcs[name] = fn
+
+
+def _now() -> str:
+    return datetime.now(UTC).isoformat()
+
+
+def _with_defaults(row: Row) -> Row:
+    row.setdefault("id", str(uuid.uuid4()))
+    now = _now()
+    row.setdefault("created_at", now)
+    row.setdefault("updated_at", now)
+    return row
+
+
+# ── value comparison ────────────────────────────────────────────────────
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+
+def _cmp(value: Any, arg: str) -> int | None:
+    if value is None:
+        return None
+    try:
+        left, right = float(value), float(arg)
+    except (TypeError, ValueError):
+        left, right = _text(value), arg  # type: ignore[assignment]
+    return (left > right) - (left < right)
+
+
+def _like(value: Any, pattern: str, flags: int = 0) -> bool:
+    if value is None:
+        return False
+    regex = "^" + re.escape(pattern).replace(r"\*", ".*").replace("%", ".*").replace("_", ".") + "$"
+    return re.match(regex, _text(value), flags) is not None
+
+
+def _split_list(text: str) -> list[str]:
+    """Split a PostgREST list on top-level commas, honouring quotes/parens."""
+    parts: list[str] = []
+    depth = 0
+    quoted = False
+    current = ""
+    for ch in text:
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        if ch == "," and depth == 0 and not quoted:
+            parts.append(current)
+            current = ""
+            continue
+        current += ch
+    if current:
+        parts.append(current)
+    return parts
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1]
+    return value
+
+
+Condition = Callable[[Row], bool]
+
+
+def _condition(column: str, expr: str) -> Condition:
+    negate = False
+    if expr.startswith("not."):
+        negate = True
+        expr = expr[4:]
+    op, _, arg = expr.partition(".")
+
+    if op == "eq":
+        def test(row: Row) -> bool:
+            return row.get(column) is not None and _text(row.get(column)) == arg
+    elif op == "neq":
+        def test(row: Row) -> bool:
+            return row.get(column) is not None and _text(row.get(column)) != arg
+    elif op in ("gt", "gte", "lt", "lte"):
+        accept = {"gt": (1,), "gte": (0, 1), "lt": (-1,), "lte": (-1, 0)}[op]
+
+        def test(row: Row) -> bool:
+            return _cmp(row.get(column), arg) in accept
+    elif op in ("like", "ilike"):
+        flags = re.IGNORECASE if op == "ilike" else 0
+
+        def test(row: Row) -> bool:
+            return _like(row.get(column), arg, flags)
+    elif op == "is":
+        expected = {"null": None, "true": True, "false": False}.get(arg.lower(), "unknown")
+
+        def test(row: Row) -> bool:
+            return row.get(column) is expected
+    elif op == "in":
+        values = {_unquote(v) for v in _split_list(arg.strip("()"))}
+
+        def test(row: Row) -> bool:
+            return row.get(column) is not None and _text(row.get(column)) in values
+    elif op == "cs":
+        if arg.startswith("{"):
+            wanted = [_unquote(v) for v in _split_list(arg.strip("{}"))]
+        else:
+            wanted = json.loads(arg)
+
+        def test(row: Row) -> bool:
+            return isinstance(row.get(column), list) and all(
+                w in [_text(v) for v in row[column]] for w in map(_text, wanted)
+            )
+    else:
+        raise PostgrestError(400, "PGRST100", f"fake postgrest: unsupported operator {op!r}")
+
+    if negate:
+        return lambda row: not test(row)
+    return test
+
+
+def _logic(expr: str, any_of: bool) -> Condition:
+    conditions: list[Condition] = []
+    for part in _split_list(expr.strip()[1:-1]):
+        part = part.strip()
+        if part.startswith(("or(", "and(", "not.or(", "not.and(")):
+            negate = part.startswith("not.")
+            body = part[4:] if negate else part
+            name, _, rest = body.partition("(")
+            inner = _logic("(" + rest, any_of=name == "or")
+            conditions.append((lambda c: lambda row: not c(row))(inner) if negate else inner)
+        else:
+            column, _, sub = part.partition(".")
+            conditions.append(_condition(column, sub))
+    if any_of:
+        return lambda row: any(c(row) for c in conditions)
+    return lambda row: all(c(row) for c in conditions)
+
+
+def _filters(params: list[tuple[str, str]]) -> list[Condition]:
+    conditions: list[Condition] = []
+    for key, value in params:
+        if key in _RESERVED_PARAMS:
+            continue
+        if key in ("or", "and", "not.or", "not.and"):
+            negate = key.startswith("not.")
+            cond = _logic(value, any_of=key.endswith("or"))
+            conditions.append((lambda c: lambda row: not c(row))(cond) if negate else cond)
+            continue
+        if "." in key:
+            raise PostgrestError(
+                400, "PGRST100", f"fake postgrest: embedded-resource param {key!r} unsupported"
+            )
+        conditions.append(_condition(key, value))
+    return conditions
+
+
+def _order(rows: list[Row], spec: str) -> list[Row]:
+    for term in reversed(_split_list(spec)):
+        parts = term.split(".")
+        column = parts[0]
+        desc = "desc" in parts[1:]
+        nulls_first = "nullsfirst" in parts[1:] or ("nullslast" not in parts[1:] and desc)
+        present = [r for r in rows if r.get(column) is not None]
+        missing = [r for r in rows if r.get(column) is None]
+
+        def key(row: Row, column: str = column) -> Any:
+            value = row[column]
+            return (0, value) if isinstance(value, (int, float)) else (1, _text(value))
+
+        present.sort(key=key, reverse=desc)
+        rows = missing + present if nulls_first else present + missing
+    return rows
+
+
+# ── select / embedding ──────────────────────────────────────────────────
+
+
+def _singular(name: str) -> str:
+    if name.endswith("ies"):
+        return name[:-3] + "y"
+    if name.endswith(("sses", "xes")):
+        return name[:-2]
+    return name[:-1] if name.endswith("s") else name
+
+
+def _relation(store: FakeStore, parent: str, ref: str) -> Relation:
+    explicit = store.relations.get((parent, ref))
+    if explicit:
+        return explicit
+    if ref in FK_TARGETS:
+        return Relation(FK_TARGETS[ref], ref, "id", many=False)
+    fk = f"{_singular(ref)}_id"
+    if FK_TARGETS.get(fk) == ref:
+        parent_rows = store.tables.get(parent) or [{}]
+        if fk in parent_rows[0]:
+            return Relation(ref, fk, "id", many=False)
+    return Relation(ref, "id", f"{_singular(parent)}_id", many=True)
+
+
+def _project(store: FakeStore, table: str, rows: list[Row], select: str) -> list[Row]:
+    items = _split_list(select or "*")
+    columns: list[tuple[str, str]] = []
+    star = False
+    embeds: list[tuple[str, Relation, str]] = []
+    for item in items:
+        item = item.strip()
+        if "(" in item:
+            head, _, rest = item.partition("(")
+            alias, _, ref = head.partition(":")
+            if not ref:
+                ref = alias
+            ref = ref.split("!")[0]
+            embeds.append((alias, _relation(store, table, ref), rest[:-1]))
+        elif item == "*":
+            star = True
+        else:
+            alias, _, name = item.partition(":")
+            name = (name or alias).split("::")[0]
+            columns.append((alias if name != alias else name, name))
+
+    indexes: dict[str, dict[Any, list[Row]]] = {}
+    for alias, rel, _ in embeds:
+        index: dict[Any, list[Row]] = {}
+        for child in store.tables.get(rel.target, []):
+            index.setdefault(child.get(rel.remote_col), []).append(child)
+        indexes[alias] = index
+
+    out = []
+    for row in rows:
+        projected = dict(row) if star else {}
+        for alias, name in columns:
+            projected[alias] = row.get(name)
+        for alias, rel, sub_select in embeds:
+            children = indexes[alias].get(row.get(rel.local_col), []) if row.get(
+                rel.local_col
+            ) is not None else []
+            sub = _project(store, rel.target, children, sub_select)
+            projected[alias] = sub if rel.many else (sub[0] if sub else None)
+        out.append(copy.deepcopy(projected))
+    return out
+
+
+# ── HTTP handlers ───────────────────────────────────────────────────────
+
+
+def _prefer(request: Request) -> set[str]:
+    return {p.strip() for p in request.headers.get("prefer", "").split(",") if p.strip()}
+
+
+def _error(exc: PostgrestError) -> Response:
+    return JSONResponse(
+        {"code": exc.code, "message": exc.message, "details": exc.details, "hint": exc.hint},
+        status_code=exc.status,
+    )
+
+
+def _check_unique(store: FakeStore, table: str, row: Row, ignore: Row | None = None) -> None:
+    for name, cols in store.unique.get(table, []):
+        if any(row.get(c) is None for c in cols):
+            continue
+        for other in store.table(table):
+            if other is ignore:
+                continue
+            if all(other.get(c) == row.get(c) for c in cols):
+                raise PostgrestError(
+                    409, "23505", f'duplicate key value violates unique constraint "{name}"'
+                )
+
+
+def _read(store: FakeStore, table: str, request: Request) -> Response:
+    params = list(request.query_params.multi_items())
+    query = dict(params)
+    rows = store.table(table)
+    conditions = _filters(params)
+    matched = [r for r in rows if all(c(r) for c in conditions)]
+    total = len(matched)
+    if "order" in query:
+        matched = _order(matched, query["order"])
+    offset = int(query.get("offset", 0))
+    limit = int(query["limit"]) if "limit" in query else None
+    page = matched[offset : offset + limit if limit is not None else None]
+
+    headers = {}
+    if any(p.startswith("count=") for p in _prefer(request)):
+        end = offset + len(page) - 1
+        headers["content-range"] = f"{offset}-{end}/{total}" if page else f"*/{total}"
+    if request.method == "HEAD":
+        return Response(status_code=200, headers=headers)
+
+    data: Any = _project(store, table, page, query.get("select", "*"))
+    if "vnd.pgrst.object" in request.headers.get("accept", ""):
+        if len(data) != 1:
+            raise PostgrestError(
+                406, "PGRST116", "JSON object requested, multiple (or no) rows returned"
+            )
+        data = data[0]
+    return Response(json.dumps(data), media_type="application/json", headers=headers)
+
+
+def _write_response(
+    store: FakeStore, table: str, request: Request, rows: list[Row], status_code: int
+) -> Response:
+    if "return=representation" not in _prefer(request):
+        return Response(status_code=204 if status_code == 200 else status_code)
+    data = _project(store, table, rows, request.query_params.get("select", "*"))
+    return Response(json.dumps(data), status_code=status_code, media_type="application/json")
+
+
+async def _insert(store: FakeStore, table: str, request: Request) -> Response:
+    body = json.loads(await request.body() or b"[]")
+    incoming = body if isinstance(body, list) else [body]
+    prefer = _prefer(request)
+    merge = "resolution=merge-duplicates" in prefer
+    ignore = "resolution=ignore-duplicates" in prefer
+    conflict_cols = tuple(
+        c.strip() for c in request.query_params.get("on_conflict", "id").split(",")
+    )
+    written: list[Row] = []
+    with store.lock:
+        rows = store.table(table)
+        for payload in incoming:
+            existing = None
+            if merge or ignore:
+                existing = next(
+                    (
+                        r
+                        for r in rows
+                        if all(payload.get(c) is not None and r.get(c) == payload.get(c)
+                               for c in conflict_cols)
+                    ),
+                    None,
+                )
+            if existing is not None:
+                if merge:
+                    candidate = {**existing, **payload}
+                    _check_unique(store, table, candidate, ignore=existing)
+                    existing.update(payload)
+                    written.append(existing)
+                continue
+            row = _with_defaults(dict(payload))
+            _check_unique(store, table, row)
+            rows.append(row)
+            written.append(row)
+    return _write_response(store, table, request, written, 201)
+
+
+async def _update(store: FakeStore, table: str, request: Request) -> Response:
+    patch = json.loads(await request.body() or b"{}")
+    conditions = _filters(list(request.query_params.multi_items()))
+    with store.lock:
+        matched = [r for r in store.table(table) if all(c(r) for c in conditions)]
+        for row in matched:
+            _check_unique(store, table, {**row, **patch}, ignore=row)
+        for row in matched:
+            row.update(patch)
+    return _write_response(store, table, request, matched, 200)
+
+
+def _delete(store: FakeStore, table: str, request: Request) -> Response:
+    conditions = _filters(list(request.query_params.multi_items()))
+    with store.lock:
+        rows = store.table(table)
+        removed = [r for r in rows if all(c(r) for c in conditions)]
+        store.tables[table] = [r for r in rows if not all(c(r) for c in conditions)]
+    return _write_response(store, table, request, removed, 200)
+
+
+async def _rpc(store: FakeStore, name: str, request: Request) -> Response:
+    fn = store.rpcs.get(name)
+    if fn is None:
+        raise PostgrestError(404, "PGRST202", f"Could not find the function public.{name}")
+    args = json.loads(await request.body() or b"{}")
+    with store.lock:
+        result = fn(store, args)
+    return Response(json.dumps(result), media_type="application/json")
+
+
+def build_app(
+    store: FakeStore,
+    *,
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    extra_routes: Iterable[BaseRoute] = (),
+    seed: int = 0,
+) -> Starlette:
+    """Build the ASGI app serving ``store`` with simulated per-request latency."""
+    rng = random.Random(seed)
+
+    async def _delay() -> None:
+        delay = latency_ms + (rng.uniform(-jitter_ms, jitter_ms) if jitter_ms else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+    async def rest(request: Request) -> Response:
+        await _delay()
+        store.requests += 1
+        table = request.path_params["table"]
+        try:
+            if request.method in ("GET", "HEAD"):
+                with store.lock:
+                    return _read(store, table, request)
+            if request.method == "POST":
+                return await _insert(store, table, request)
+            if request.method == "PATCH":
+                return await _update(store, table, request)
+            return _delete(store, table, request)
+        except PostgrestError as exc:
+            return _error(exc)
+
+    async def rpc(request: Request) -> Response:
+        await _delay()
+        store.requests += 1
+        try:
+            return await _rpc(store, request.path_params["fn"], request)
+        except PostgrestError as exc:
+            return _error(exc)
+
+    async def storage_object(request: Request) -> Response:
+        await _delay()
+        store.requests += 1
+        bucket, path = request.path_params["bucket"], request.path_params.get("path", "")
+        if request.method == "DELETE":
+            prefixes = json.loads(await request.body() or b"{}").get("prefixes", [])
+            removed = []
+            with store.lock:
+                for prefix in prefixes:
+                    if store.storage.pop(f"{bucket}/{prefix}", None) is not None:
+                        removed.append({"name": prefix, "bucket_id": bucket})
+            return JSONResponse(removed)
+        key = f"{bucket}/{path}"
+        with store.lock:
+            store.storage[key] = await request.body()
+        return JSONResponse({"Key": key, "Id": str(uuid.uuid4())})
+
+    routes: list[BaseRoute] = [
+        Route("/rest/v1/rpc/{fn}", rpc, methods=["POST"]),
+        Route("/rest/v1/{table}", rest, methods=["GET", "HEAD", "POST", "PATCH", "DELETE"]),
+        Route("/storage/v1/object/{bucket}", storage_object, methods=["DELETE"]),
+        Route("/storage/v1/object/{bucket}/{path:path}", storage_object, methods=["POST", "PUT"]),
+        *extra_routes,
+    ]
+    return Starlette(routes=routes)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class FakeSupabaseServer:
+    """Run :func:`build_app` on localhost in a background thread."""
+
+    def __init__(self, store: FakeStore, port: int | None = None, **app_options: Any) -> None:
+        self.store = store
+        self.port = port or _free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        config = uvicorn.Config(
+            build_app(store, **app_options),
+            host="127.0.0.1",
+            port=self.port,
+            log_level="warning",
+            lifespan="off",
+        )
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    def __enter__(self) -> FakeSupabaseServer:
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self._server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError("fake supabase server failed to start")
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=10)
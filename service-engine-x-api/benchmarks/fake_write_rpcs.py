@@ -0,0 +1,296 @@
+"""Fake-store versions of the write functions in migrations 028 and 029.
+
+Each handler mirrors its SQL function: the same reference checks (raising
+the same ``PT4xx`` errors), the same rows written and the same graph
+returned. Handlers run under the store lock, so like the database functions
+they apply completely or, on a rejection, not at all.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import Any
+
+from benchmarks.fake_supabase import FakeStore, PostgrestError, Row
+
+ORDER_COLUMNS = (
+    "number", "user_id", "service_id", "service_name", "price", "currency", "quantity",
+    "status", "note", "form_data", "metadata", "created_at", "date_started",
+    "date_completed", "date_due",
+)
+TICKET_COLUMNS = (
+    "user_id", "subject", "status", "order_id", "note", "metadata", "form_data", "source",
+)
+INVOICE_COLUMNS = (
+    "number", "number_prefix", "user_id", "status", "created_at", "date_due", "date_paid",
+    "credit", "tax", "tax_name", "tax_percent", "currency", "reason", "note", "ip_address",
+    "loc_confirm", "recurring", "coupon_id", "transaction_id", "paysys", "subtotal", "total",
+    "employee_id",
+)
+ITEM_COLUMNS = (
+    "name", "description", "quantity", "amount", "discount", "discount2", "total",
+    "service_id", "order_id", "options",
+)
+ORDER_CHANGE_COLUMNS = (
+    "service_id", "service_name", "status", "note", "metadata", "date_started",
+    "date_completed", "date_due",
+)
+INVOICE_CHANGE_COLUMNS = ("user_id", "status", "tax", "tax_type", "recurring", "coupon_id", "note")
+
+
+def _reject(status: int, message: str, field: str | None = None, detail: str | None = None) -> None:
+    raise PostgrestError(status, f"PT{status}", message, details=detail, hint=field)
+
+
+def _find(store: FakeStore, table: str, **match: Any) -> Row | None:
+    return next(
+        (r for r in store.table(table) if all(r.get(k) == v for k, v in match.items())), None
+    )
+
+
+def _client(store: FakeStore, org_id: str, user_id: str) -> dict[str, Any] | None:
+    user = _find(store, "users", id=user_id, org_id=org_id)
+    if user is None:
+        return None
+    client = {
+        k: user.get(k)
+        for k in ("id", "name_f", "name_l", "email", "company", "phone", "tax_id", "balance")
+    }
+    address_id, role_id = user.get("address_id"), user.get("role_id")
+    client["addresses"] = _find(store, "addresses", id=address_id) if address_id else None
+    client["roles"] = _find(store, "roles", id=role_id) if role_id else None
+    return client
+
+
+def _employees(store: FakeStore, org_id: str, ids: list[str]) -> list[dict[str, Any]]:
+    users = (_find(store, "users", id=i, org_id=org_id) for i in ids)
+    return [
+        {k: u.get(k) for k in ("id", "name_f", "name_l", "role_id")} for u in users if u is not None
+    ]
+
+
+def _invalid_employee_id(store: FakeStore, org_id: str, ids: list[str]) -> str | None:
+    for employee_id in ids:
+        user = _find(store, "users", id=employee_id, org_id=org_id)
+        role = _find(store, "roles", id=user.get("role_id")) if user else None
+        if not (role or {}).get("dashboard_access"):
+            return employee_id
+    return None
+
+
+def _ensure_tags(store: FakeStore, org_id: str, names: list[str]) -> list[Row]:
+    existing = {t["name"]: t for t in store.table("tags") if t.get("org_id") == org_id}
+    missing = [n for n in dict.fromkeys(names) if n not in existing]
+    for tag in store.insert("tags", [{"org_id": org_id, "name": n} for n in missing]):
+        existing[tag["name"]] = tag
+    return [existing[n] for n in dict.fromkeys(names)]
+
+
+def _link_tags(
+    store: FakeStore, org_id: str, table: str, owner_column: str, owner_id: str, names: list[str]
+) -> list[str]:
+    tags = _ensure_tags(store, org_id, names)
+    store.insert(table, [{owner_column: owner_id, "tag_id": t["id"]} for t in tags])
+    return sorted(t["name"] for t in tags)
+
+
+def _invoice_graph(store: FakeStore, org_id: str, invoice: Row) -> dict[str, Any]:
+    return {
+        **invoice,
+        "users": _client(store, org_id, invoice["user_id"]),
+        "invoice_items": [
+            i for i in store.table("invoice_items") if i["invoice_id"] == invoice["id"]
+        ],
+    }
+
+
+def _insert_items(store: FakeStore, invoice_id: str, items: list[dict[str, Any]]) -> None:
+    store.insert(
+        "invoice_items",
+        [{"invoice_id": invoice_id, **{k: item.get(k) for k in ITEM_COLUMNS}} for item in items],
+    )
+
+
+def create_order_graph(store: FakeStore, args: dict[str, Any]) -> dict[str, Any]:
+    org_id, values = args["p_org_id"], args["p_order"]
+    employee_ids, tags = args.get("p_employee_ids") or [], args.get("p_tags") or []
+    if _find(store, "users", id=values.get("user_id"), org_id=org_id) is None:
+        _reject(422, "The specified client does not exist.", "user_id")
+    if values.get("service_id"):
+        service = _find(store, "services", id=values["service_id"], org_id=org_id)
+        if service is None or service.get("deleted_at"):
+            _reject(422, "The specified service does not exist.", "service_id")
+    employee_id = _invalid_employee_id(store, org_id, employee_ids)
+    if employee_id is not None:
+        _reject(422, f"Employee with ID {employee_id} does not exist.", "employees")
+    if _find(store, "orders", number=values.get("number")) is not None:
+        _reject(400, "The order number has already been taken.", "number")
+
+    [order] = store.insert("orders", [{
+        "org_id": org_id,
+        **{k: values.get(k) for k in ORDER_COLUMNS},
+        "created_at": values.get("created_at") or datetime.now(UTC).isoformat(),
+        "deleted_at": None,
+    }])
+    store.insert(
+        "order_employees", [{"order_id": order["id"], "employee_id": e} for e in employee_ids]
+    )
+    return {
+        "order": order,
+        "client": _client(store, org_id, order["user_id"]),
+        "employees": _employees(store, org_id, employee_ids),
+        "tags": _link_tags(store, org_id, "order_tags", "order_id", order["id"], tags),
+    }
+
+
+def update_order_graph(store: FakeStore, args: dict[str, Any]) -> dict[str, Any]:
+    org_id, order_id, changes = args["p_org_id"], args["p_order_id"], args["p_changes"]
+    employee_ids, tags = args.get("p_employee_ids"), args.get("p_tags")
+    order = _find(store, "orders", id=order_id, org_id=org_id)
+    if order is None or order.get("deleted_at"):
+        _reject(404, "Not Found")
+    expected = args.get("p_expected_updated_at")
+    if expected is not None and order.get("updated_at") != expected:
+        _reject(412, "The resource was modified since it was read.")
+    if changes.get("service_id"):
+        service = _find(store, "services", id=changes["service_id"], org_id=org_id)
+        if service is None or service.get("deleted_at"):
+            _reject(422, "The specified service does not exist.", "service_id")
+    employee_id = _invalid_employee_id(store, org_id, employee_ids or [])
+    if employee_id is not None:
+        _reject(422, f"Employee with ID {employee_id} does not exist.", "employees")
+
+    order.update({k: changes[k] for k in ORDER_CHANGE_COLUMNS if k in changes})
+    order["updated_at"] = datetime.now(UTC).isoformat()
+    if employee_ids is not None:
+        links = store.table("order_employees")
+        links[:] = [link for link in links if link["order_id"] != order_id]
+        store.insert(
+            "order_employees", [{"order_id": order_id, "employee_id": e} for e in employee_ids]
+        )
+    if tags is not None:
+        wanted = {t["id"] for t in _ensure_tags(store, org_id, tags)}
+        links = store.table("order_tags")
+        links[:] = [
+            link for link in links if link["order_id"] != order_id or link["tag_id"] in wanted
+        ]
+        current = {link["tag_id"] for link in links if link["order_id"] == order_id}
+        store.insert(
+            "order_tags",
+            [{"order_id": order_id, "tag_id": t} for t in sorted(wanted - current)],
+        )
+    if employee_ids is None:
+        employee_ids = [
+            link["employee_id"]
+            for link in store.table("order_employees")
+            if link["order_id"] == order_id
+        ]
+    tag_ids = {link["tag_id"] for link in store.table("order_tags") if link["order_id"] == order_id}
+    return {
+        "order": order,
+        "client": _client(store, org_id, order["user_id"]),
+        "employees": _employees(store, org_id, employee_ids),
+        "tags": sorted(t["name"] for t in store.table("tags") if t["id"] in tag_ids),
+    }
+
+
+def create_ticket_graph(store: FakeStore, args: dict[str, Any]) -> dict[str, Any]:
+    org_id, values = args["p_org_id"], args["p_ticket"]
+    employee_ids, tags = args.get("p_employee_ids") or [], args.get("p_tags") or []
+    if _find(store, "users", id=values.get("user_id"), org_id=org_id) is None:
+        _reject(422, "The specified client does not exist.", "user_id")
+    order = None
+    if values.get("order_id"):
+        order = _find(store, "orders", id=values["order_id"], org_id=org_id)
+        if order is None or order.get("deleted_at"):
+            _reject(422, "The specified order does not exist.", "order_id")
+    if _invalid_employee_id(store, org_id, employee_ids) is not None:
+        _reject(422, "The specified employee does not exist.", "employees")
+
+    [ticket] = store.insert("tickets", [{
+        "org_id": org_id, **{k: values.get(k) for k in TICKET_COLUMNS}, "deleted_at": None,
+    }])
+    store.insert(
+        "ticket_employees", [{"ticket_id": ticket["id"], "employee_id": e} for e in employee_ids]
+    )
+    return {
+        "ticket": ticket,
+        "client": _client(store, org_id, ticket["user_id"]),
+        "employees": _employees(store, org_id, employee_ids),
+        "tags": _link_tags(store, org_id, "ticket_tags", "ticket_id", ticket["id"], tags),
+        "order": {
+            k: order.get(k)
+            for k in ("id", "status", "service_name", "price", "quantity", "created_at")
+        } if order else None,
+    }
+
+
+def create_invoice_graph(store: FakeStore, args: dict[str, Any]) -> dict[str, Any]:
+    org_id, values = args["p_org_id"], args["p_invoice"]
+    user = _find(store, "users", id=values.get("user_id"), org_id=org_id)
+    if user is None:
+        _reject(422, "The specified client does not exist.", "user_id")
+    if values.get("coupon_id") and _find(store, "coupons", id=values["coupon_id"]) is None:
+        _reject(422, "The specified coupon does not exist.", "coupon_id")
+
+    address_id = user.get("address_id")
+    address = _find(store, "addresses", id=address_id) if address_id else None
+    billing = None
+    if address:
+        billing = {
+            **{
+                k: address.get(k)
+                for k in ("line_1", "line_2", "city", "state", "postcode", "country")
+            },
+            "name_f": user.get("name_f"), "name_l": user.get("name_l"),
+            "company_name": user.get("company"), "company_vat": None, "tax_id": None,
+        }
+    [invoice] = store.insert("invoices", [{
+        "org_id": org_id,
+        **{k: values.get(k) for k in INVOICE_COLUMNS},
+        "billing_address": billing,
+        "created_at": values.get("created_at") or datetime.now(UTC).isoformat(),
+        "deleted_at": None,
+    }])
+    _insert_items(store, invoice["id"], args.get("p_items") or [])
+    return _invoice_graph(store, org_id, invoice)
+
+
+def update_invoice_graph(store: FakeStore, args: dict[str, Any]) -> dict[str, Any]:
+    org_id, changes = args["p_org_id"], args["p_changes"]
+    invoice = _find(store, "invoices", id=args["p_invoice_id"], org_id=org_id)
+    if invoice is None or invoice.get("deleted_at"):
+        _reject(404, "Not Found")
+    if (
+        "status" in changes
+        and changes["status"] != invoice["status"]
+        and invoice["status"] not in (args.get("p_status_from") or [])
+    ):
+        status = invoice["status"]
+        _reject(400, f"Cannot transition from status {status}.", "status", str(status))
+    if (
+        "user_id" in changes
+        and changes["user_id"] != invoice["user_id"]
+        and _find(store, "users", id=changes["user_id"], org_id=org_id) is None
+    ):
+        _reject(422, "The specified client does not exist.", "user_id")
+    if changes.get("coupon_id") and _find(store, "coupons", id=changes["coupon_id"]) is None:
+        _reject(422, "The specified coupon does not exist.", "coupon_id")
+
+    invoice.update({k: changes[k] for k in INVOICE_CHANGE_COLUMNS if k in changes})
+    invoice["subtotal"] = changes["subtotal"]
+    invoice["total"] = changes["subtotal"] + (invoice.get("tax") or 0)
+    invoice["updated_at"] = datetime.now(UTC).isoformat()
+    items = store.table("invoice_items")
+    items[:] = [i for i in items if i["invoice_id"] != invoice["id"]]
+    _insert_items(store, invoice["id"], args.get("p_items") or [])
+    return _invoice_graph(store, org_id, invoice)
+
+
+def register_write_rpcs(store: FakeStore) -> None:
+    """Register every write function of migrations 028 and 029 on ``store``."""
+    for fn in (
+        create_order_graph, update_order_graph, create_ticket_graph, create_invoice_graph,
+        update_invoice_graph,
+    ):
+        store.register_rpc(fn.__name__, fn)
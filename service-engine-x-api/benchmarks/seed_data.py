@@ -0,0 +1,301 @@
+"""Deterministic, realistically sized dataset for the fake Supabase store.
+
+Volumes are per benchmark org and scale linearly with ``scale``. Rows carry
+the columns the routers read, with embedded relations resolvable by
+:mod:`benchmarks.fake_supabase`.
+"""
+
+from __future__ import annotations
+
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from benchmarks.fake_supabase import FakeStore
+from benchmarks.fake_write_rpcs import register_write_rpcs
+
+BASE_VOLUMES = {
+    "clients": 300,
+    "staff": 15,
+    "tags": 50,
+    "orders": 5000,
+    "tickets": 2000,
+    "accounts": 500,
+    "contacts": 1500,
+    "deals": 300,
+    "meetings": 5000,
+    "proposals": 200,
+}
+
+
+@dataclass
+class SeededOrg:
+    org_id: str
+    staff_user_id: str
+    counts: dict[str, int]
+    sent_proposal_ids: list[str] = field(default_factory=list)
+
+
+def _uid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _ts(dt: datetime) -> str:
+    return dt.isoformat()
+
+
+def _reserve_numbers(store: FakeStore, args: dict[str, Any]) -> list[int]:
+    """``reserve_numbers()`` (migration 027) over per-store counters."""
+    sequences = store.table("_sequences")
+    sequence = next((s for s in sequences if s["name"] == args["p_name"]), None)
+    if sequence is None:
+        sequence = {"name": args["p_name"], "last_value": 0}
+        sequences.append(sequence)
+    first = sequence["last_value"] + 1
+    sequence["last_value"] += int(args.get("p_count", 1))
+    return list(range(first, sequence["last_value"] + 1))
+
+
+def _upsert_cal_attendee_contacts(store: FakeStore, args: dict[str, Any]) -> list[dict[str, Any]]:
+    """``upsert_cal_attendee_contacts()`` (migration 024) over the live contacts."""
+    org_id, contacts = args["p_org_id"], store.table("contacts")
+    out = []
+    for row in args["p_contacts"]:
+        account_id = row.get("account_id") or None
+        contact = next(
+            (c for c in contacts if c["org_id"] == org_id and c["email"] == row["email"]
+             and c.get("deleted_at") is None),
+            None,
+        )
+        if contact is None:
+            now = datetime.now(UTC).isoformat()
+            [contact] = store.insert("contacts", [{
+                "org_id": org_id, "account_id": account_id, "name_f": row.get("name_f") or "",
+                "name_l": row.get("name_l") or "", "email": row["email"], "user_id": None,
+                "is_primary": False, "is_billing": False, "deleted_at": None,
+                "created_at": now, "updated_at": now,
+            }])
+        elif contact.get("account_id") is None and account_id is not None:
+            contact.update(account_id=account_id, updated_at=datetime.now(UTC).isoformat())
+        out.append(contact)
+    return out
+
+
+def seed_store(store: FakeStore, *, scale: float = 1.0, seed: int = 7) -> SeededOrg:
+    """Populate ``store`` with one busy org (plus a quiet one) and return its ids."""
+    rng = random.Random(seed)
+    now = datetime.now(UTC)
+    counts = {name: max(1, int(n * scale)) for name, n in BASE_VOLUMES.items()}
+
+    store.add_unique(
+        "webhook_events_raw", "uq_webhook_events_raw_serx_scheduler", "source", "event_key"
+    )
+    store.add_unique("tags", "tags_org_id_name_key", "org_id", "name")
+    store.add_unique("orders", "orders_number_key", "number")
+    store.register_rpc("reserve_numbers", _reserve_numbers)
+    store.register_rpc("upsert_cal_attendee_contacts", _upsert_cal_attendee_contacts)
+    register_write_rpcs(store)
+
+    org_id, other_org_id = _uid(rng), _uid(rng)
+    store.insert(
+        "organizations",
+        [
+            {"id": org_id, "name": "Bench Agency", "slug": "bench", "domain": "bench.test",
+             "stripe_publishable_key": None, "stripe_secret_key": None,
+             "notification_email": None},
+            {"id": other_org_id, "name": "Quiet Co", "slug": "quiet", "domain": "quiet.test",
+             "stripe_publishable_key": None, "stripe_secret_key": None,
+             "notification_email": None},
+        ],
+    )
+    store.insert(
+        "organization_bank_details",
+        [{"org_id": org_id, "account_name": "Bench Agency LLC", "account_number": "000123456",
+          "routing_number": "110000000", "bank_name": "First Bench Bank", "bank_country": "US"}],
+    )
+    client_role, staff_role = _uid(rng), _uid(rng)
+    store.insert(
+        "roles",
+        [
+            {"id": staff_role, "name": "Staff", "dashboard_access": 1},
+            {"id": client_role, "name": "Client", "dashboard_access": 0},
+        ],
+    )
+
+    addresses = store.insert(
+        "addresses",
+        [
+            {"line_1": f"{i} Main St", "line_2": None, "city": "Austin", "state": "TX",
+             "postcode": "78701", "country": "US"}
+            for i in range(counts["clients"])
+        ],
+    )
+    clients = store.insert(
+        "users",
+        [
+            {"id": _uid(rng), "org_id": org_id, "name_f": f"Client{i}", "name_l": "Example",
+             "email": f"client{i}@customer{i % 40}.test", "company": f"Customer {i % 40}",
+             "phone": "+15125550100", "balance": 0, "address_id": addresses[i]["id"],
+             "role_id": client_role, "status": 1}
+            for i in range(counts["clients"])
+        ],
+    )
+    staff = store.insert(
+        "users",
+        [
+            {"id": _uid(rng), "org_id": org_id, "name_f": f"Staff{i}", "name_l": "Member",
+             "email": f"staff{i}@bench.test", "address_id": None, "role_id": staff_role,
+             "status": 1}
+            for i in range(counts["staff"])
+        ],
+    )
+    tags = store.insert(
+        "tags",
+        [{"id": _uid(rng), "org_id": org_id, "name": f"tag-{i}"} for i in range(counts["tags"])],
+    )
+
+    orders = store.insert(
+        "orders",
+        [
+            {"id": _uid(rng), "org_id": org_id, "number": f"B{i:07d}",
+             "user_id": rng.choice(clients)["id"], "status": rng.choice([0, 1, 2, 3]),
+             "price": "499.00", "quantity": 1, "service_id": None, "service_name": "Managed SEO",
+             "note": "Monthly retainer", "form_data": {"brief": "x" * 200}, "paysys": None,
+             "invoice_id": None, "deleted_at": None,
+             "created_at": _ts(now - timedelta(minutes=i))}
+            for i in range(counts["orders"])
+        ],
+    )
+    store.insert(
+        "order_employees",
+        [{"order_id": o["id"], "employee_id": rng.choice(staff)["id"]} for o in orders],
+    )
+    store.insert(
+        "order_tags",
+        [
+            {"order_id": o["id"], "tag_id": t["id"]}
+            for o in orders
+            for t in rng.sample(tags, rng.randint(0, min(3, len(tags))))
+        ],
+    )
+
+    tickets = store.insert(
+        "tickets",
+        [
+            {"id": _uid(rng), "org_id": org_id, "subject": f"Question #{i}",
+             "user_id": rng.choice(clients)["id"], "order_id": rng.choice(orders)["id"],
+             "status": rng.choice([1, 2, 3]), "source": "API", "note": None,
+             "form_data": {}, "metadata": {}, "deleted_at": None,
+             "created_at": _ts(now - timedelta(minutes=3 * i))}
+            for i in range(counts["tickets"])
+        ],
+    )
+    store.insert(
+        "ticket_employees",
+        [{"ticket_id": t["id"], "employee_id": rng.choice(staff)["id"]} for t in tickets],
+    )
+    store.insert(
+        "ticket_tags",
+        [
+            {"ticket_id": t["id"], "tag_id": tag["id"]}
+            for t in tickets
+            for tag in rng.sample(tags, rng.randint(0, min(2, len(tags))))
+        ],
+    )
+
+    accounts = store.insert(
+        "accounts",
+        [
+            {"id": _uid(rng), "org_id": org_id, "name": f"Customer {i}",
+             "domain": f"customer{i}.test", "lifecycle": "customer", "balance": 0,
+             "total_spent": 1500, "deleted_at": None}
+            for i in range(counts["accounts"])
+        ],
+    )
+    contacts = store.insert(
+        "contacts",
+        [
+            {"id": _uid(rng), "org_id": org_id, "account_id": rng.choice(accounts)["id"],
+             "name_f": f"Contact{i}", "name_l": "Person", "email": f"contact{i}@customer.test",
+             "user_id": None, "is_primary": False, "is_billing": False, "deleted_at": None}
+            for i in range(counts["contacts"])
+        ],
+    )
+    deals = store.insert(
+        "deals",
+        [
+            {"id": _uid(rng), "org_id": org_id, "account_id": rng.choice(accounts)["id"],
+             "title": f"Deal {i}", "status": "open", "value": 12000, "deleted_at": None}
+            for i in range(counts["deals"])
+        ],
+    )
+    store.insert(
+        "meetings",
+        [
+            {"id": _uid(rng), "org_id": org_id, "account_id": rng.choice(accounts)["id"],
+             "contact_id": rng.choice(contacts)["id"],
+             "deal_id": rng.choice(deals)["id"] if i % 3 == 0 else None,
+             "cal_event_uid": f"uid-{i}", "cal_booking_id": 100000 + i,
+             "title": f"Intro call #{i}",
+             "start_time": _ts(now + timedelta(hours=i - counts["meetings"] // 2)),
+             "end_time": _ts(now + timedelta(hours=i - counts["meetings"] // 2, minutes=30)),
+             "status": "scheduled", "organizer_email": "host@bench.test",
+             "attendee_emails": [f"contact{i}@customer.test"], "host_no_show": False,
+             "guest_no_show": False, "notes": "n" * 300, "custom_fields": {},
+             "preframe_sent_at": _ts(now), "deleted_at": None,
+             "created_at": _ts(now - timedelta(days=3))}
+            for i in range(counts["meetings"])
+        ],
+    )
+
+    seeded = SeededOrg(org_id=org_id, staff_user_id=staff[0]["id"], counts=counts)
+    add_sent_proposals(store, seeded, counts["proposals"], rng=rng)
+    return seeded
+
+
+def add_sent_proposals(
+    store: FakeStore, seeded: SeededOrg, count: int, *, rng: random.Random | None = None
+) -> list[str]:
+    """Add ``count`` proposals in Sent status (signable), each with 3 items."""
+    rng = rng or random.Random()
+    proposals = store.insert(
+        "proposals",
+        [
+            {"id": _uid(rng), "org_id": seeded.org_id, "status": 1,
+             "client_email": f"signer{i}@prospect{i}.test", "client_name_f": "Pat",
+             "client_name_l": f"Prospect{i}", "client_company": f"Prospect {i}",
+             "total": 7500, "notes": "Growth package", "sent_at": datetime.now(UTC).isoformat(),
+             "signed_at": None, "pdf_url": None, "deleted_at": None}
+            for i in range(count)
+        ],
+    )
+    store.insert(
+        "proposal_items",
+        [
+            {"proposal_id": p["id"], "name": f"Phase {n + 1}", "description": "Scope " * 20,
+             "price": 2500, "service_id": None}
+            for p in proposals
+            for n in range(3)
+        ],
+    )
+    ids = [p["id"] for p in proposals]
+    seeded.sent_proposal_ids.extend(ids)
+    return ids
+
+
+def add_due_meetings(store: FakeStore, seeded: SeededOrg, count: int) -> list[dict[str, Any]]:
+    """Add meetings inside the preframe window that the scheduler will pick up."""
+    now = datetime.now(UTC)
+    return store.insert(
+        "meetings",
+        [
+            {"org_id": seeded.org_id, "title": "Due intro", "status": "scheduled",
+             "start_time": _ts(now + timedelta(hours=4, minutes=30)),
+             "end_time": _ts(now + timedelta(hours=5)), "preframe_sent_at": None,
+             "attendee_emails": [], "deleted_at": None,
+             "created_at": _ts(now - timedelta(hours=6))}
+            for _ in range(count)
+        ],
+    )
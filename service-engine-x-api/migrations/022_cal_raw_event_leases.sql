@@ -0,0 +1,149 @@
+-- 022_cal_raw_event_leases.sql
+-- Leased, parallel consumption of cal_raw_events.
+--
+-- Consumers claim batches with claim_cal_raw_events(), which uses
+-- FOR UPDATE SKIP LOCKED so concurrent workers never receive the same row.
+-- A claim holds a visibility-timeout lease (leased_until); if the consumer
+-- neither acks nor extends before it lapses, the row becomes claimable again.
+-- Every claim increments attempts; rows that reach the max attempt count
+-- (via explicit failure or repeatedly expired leases) are dead-lettered and
+-- never handed out again until requeued.
+
+BEGIN;
+
+ALTER TABLE cal_raw_events
+    ADD COLUMN IF NOT EXISTS lease_owner      TEXT,
+    ADD COLUMN IF NOT EXISTS leased_until     TIMESTAMPTZ,
+    ADD COLUMN IF NOT EXISTS attempts         INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS last_error       TEXT,
+    ADD COLUMN IF NOT EXISTS processed_at     TIMESTAMPTZ,
+    ADD COLUMN IF NOT EXISTS dead_lettered_at TIMESTAMPTZ;
+
+CREATE INDEX IF NOT EXISTS idx_cal_raw_events_claimable
+    ON cal_raw_events (created_at)
+    WHERE processed = FALSE AND dead_lettered_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_cal_raw_events_dead_lettered
+    ON cal_raw_events (dead_lettered_at DESC)
+    WHERE dead_lettered_at IS NOT NULL;
+
+COMMENT ON COLUMN cal_raw_events.leased_until IS
+    'Visibility timeout of the current claim. NULL or past means claimable.';
+COMMENT ON COLUMN cal_raw_events.attempts IS
+    'Number of times the row has been claimed. Dead-lettered at max attempts.';
+
+
+CREATE OR REPLACE FUNCTION claim_cal_raw_events(
+    p_consumer       TEXT,
+    p_limit          INTEGER,
+    p_lease_seconds  INTEGER,
+    p_max_attempts   INTEGER,
+    p_trigger_events TEXT[] DEFAULT NULL
+)
+RETURNS SETOF cal_raw_events
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- Leases that lapsed on their final attempt are dead-lettered rather
+    -- than handed out again (the consumer crashed or hung every time).
+    UPDATE cal_raw_events
+       SET dead_lettered_at = NOW(),
+           lease_owner = NULL,
+           leased_until = NULL,
+           last_error = COALESCE(last_error, 'lease_expired')
+     WHERE processed = FALSE
+       AND dead_lettered_at IS NULL
+       AND leased_until < NOW()
+       AND attempts >= p_max_attempts;
+
+    RETURN QUERY
+    WITH candidates AS (
+        SELECT id
+          FROM cal_raw_events
+         WHERE processed = FALSE
+           AND dead_lettered_at IS NULL
+           AND (leased_until IS NULL OR leased_until < NOW())
+           AND (p_trigger_events IS NULL OR trigger_event = ANY (p_trigger_events))
+         ORDER BY created_at
+         LIMIT p_limit
+         FOR UPDATE SKIP LOCKED
+    )
+    UPDATE cal_raw_events e
+       SET lease_owner = p_consumer,
+           leased_until = NOW() + make_interval(secs => p_lease_seconds),
+           attempts = e.attempts + 1
+      FROM candidates c
+     WHERE e.id = c.id
+    RETURNING e.*;
+END;
+$$;
+
+
+CREATE OR REPLACE FUNCTION extend_cal_raw_event_leases(
+    p_consumer      TEXT,
+    p_ids           UUID[],
+    p_lease_seconds INTEGER
+)
+RETURNS SETOF cal_raw_events
+LANGUAGE sql
+AS $$
+    UPDATE cal_raw_events
+       SET leased_until = NOW() + make_interval(secs => p_lease_seconds)
+     WHERE id = ANY (p_ids)
+       AND lease_owner = p_consumer
+       AND processed = FALSE
+       AND leased_until >= NOW()
+    RETURNING *;
+$$;
+
+
+CREATE OR REPLACE FUNCTION ack_cal_raw_events(
+    p_consumer     TEXT,
+    p_ids          UUID[],
+    p_processed_by TEXT DEFAULT NULL
+)
+RETURNS SETOF cal_raw_events
+LANGUAGE sql
+AS $$
+    UPDATE cal_raw_events
+       SET processed = TRUE,
+           processed_by = COALESCE(p_processed_by, p_consumer),
+           processed_at = NOW(),
+           lease_owner = NULL,
+           leased_until = NULL
+     WHERE id = ANY (p_ids)
+       AND lease_owner = p_consumer
+       AND processed = FALSE
+    RETURNING *;
+$$;
+
+
+CREATE OR REPLACE FUNCTION fail_cal_raw_events(
+    p_consumer            TEXT,
+    p_ids                 UUID[],
+    p_error               TEXT,
+    p_max_attempts        INTEGER,
+    p_retry_delay_seconds INTEGER DEFAULT 0
+)
+RETURNS SETOF cal_raw_events
+LANGUAGE sql
+AS $$
+    UPDATE cal_raw_events
+       SET last_error = LEFT(p_error, 2000),
+           lease_owner = NULL,
+           -- A future leased_until with no owner delays the retry.
+           leased_until = CASE
+               WHEN attempts >= p_max_attempts THEN NULL
+               ELSE NOW() + make_interval(secs => GREATEST(p_retry_delay_seconds, 0))
+           END,
+           dead_lettered_at = CASE
+               WHEN attempts >= p_max_attempts THEN NOW()
+               ELSE NULL
+           END
+     WHERE id = ANY (p_ids)
+       AND lease_owner = p_consumer
+       AND processed = FALSE
+    RETURNING *;
+$$;
+
+COMMIT;
@@ -0,0 +1,56 @@
+-- 023_cal_normalization_backfill.sql
+-- Support for the bulk cal_raw_events → normalized tables pipeline.
+--
+-- cal_booking_events.raw_event_id / cal_recordings.raw_event_id point at the
+-- immutable cal_webhook_events_raw log, so rows produced from cal_raw_events
+-- carry their source in a separate cal_raw_event_id column. The unique
+-- constraint on cal_booking_events.cal_raw_event_id makes re-running a
+-- backfill over the same range idempotent (NULLs stay unconstrained, so
+-- rows created through the single-event API are unaffected).
+--
+-- cal_normalization_checkpoints stores the keyset cursor of each named
+-- backfill so an interrupted run resumes where it stopped.
+
+BEGIN;
+
+ALTER TABLE cal_booking_events
+    ADD COLUMN IF NOT EXISTS cal_raw_event_id UUID
+        REFERENCES cal_raw_events(id) ON DELETE SET NULL;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM pg_constraint
+        WHERE conname = 'uq_cal_booking_events_cal_raw_event_id'
+          AND conrelid = 'public.cal_booking_events'::regclass
+    ) THEN
+        ALTER TABLE cal_booking_events
+            ADD CONSTRAINT uq_cal_booking_events_cal_raw_event_id
+            UNIQUE (cal_raw_event_id);
+    END IF;
+END;
+$$;
+
+ALTER TABLE cal_recordings
+    ADD COLUMN IF NOT EXISTS cal_raw_event_id UUID
+        REFERENCES cal_raw_events(id) ON DELETE SET NULL;
+
+CREATE INDEX IF NOT EXISTS idx_cal_raw_events_created_at_id
+    ON cal_raw_events (created_at, id);
+
+CREATE TABLE IF NOT EXISTS cal_normalization_checkpoints (
+    name            TEXT PRIMARY KEY,
+    last_created_at TIMESTAMPTZ,
+    last_id         UUID,
+    processed_count BIGINT NOT NULL DEFAULT 0,
+    error_count     BIGINT NOT NULL DEFAULT 0,
+    completed_at    TIMESTAMPTZ,
+    created_at      TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at      TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+COMMENT ON TABLE cal_normalization_checkpoints IS
+'Resumable keyset cursors (created_at, id) over cal_raw_events for bulk normalization runs.';
+
+COMMIT;
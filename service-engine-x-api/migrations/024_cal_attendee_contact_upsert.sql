@@ -0,0 +1,41 @@
+-- 024_cal_attendee_contact_upsert.sql
+-- Set-based contact resolution for meetings created from Cal.com bookings.
+--
+-- idx_contacts_org_email_unique is a partial index (WHERE deleted_at IS NULL),
+-- which PostgREST's on_conflict cannot target. This function carries the
+-- index predicate so all attendees are upserted in one statement:
+--   * missing contacts are inserted with the resolved account_id;
+--   * existing contacts keep their account, or adopt the resolved one if
+--     they had none.
+-- Every input email is returned (inserted or existing), so the caller gets
+-- the full contact set back in one round trip and concurrent bookings for
+-- the same attendee cannot create duplicates.
+--
+-- p_contacts: [{"email": ..., "name_f": ..., "name_l": ..., "account_id": ...}]
+-- Emails must be unique within one call.
+
+CREATE OR REPLACE FUNCTION upsert_cal_attendee_contacts(
+    p_org_id   UUID,
+    p_contacts JSONB
+)
+RETURNS SETOF contacts
+LANGUAGE sql
+AS $$
+    INSERT INTO contacts AS c (org_id, account_id, name_f, name_l, email, created_at, updated_at)
+    SELECT p_org_id,
+           NULLIF(x ->> 'account_id', '')::UUID,
+           COALESCE(x ->> 'name_f', ''),
+           COALESCE(x ->> 'name_l', ''),
+           x ->> 'email',
+           NOW(),
+           NOW()
+      FROM jsonb_array_elements(p_contacts) AS x
+    ON CONFLICT (org_id, email) WHERE deleted_at IS NULL
+    DO UPDATE SET
+        account_id = COALESCE(c.account_id, EXCLUDED.account_id),
+        updated_at = CASE
+            WHEN c.account_id IS NULL AND EXCLUDED.account_id IS NOT NULL THEN NOW()
+            ELSE c.updated_at
+        END
+    RETURNING c.*;
+$$;
@@ -0,0 +1,88 @@
+-- 025_cache_invalidation_notify.sql
+-- Publish row changes on cached tables for the API's cache invalidation bus.
+--
+-- Every committed INSERT/UPDATE/DELETE (and TRUNCATE) on these tables sends
+-- a NOTIFY on channel 'serx_cache_invalidation' with a small JSON payload:
+--
+--   {"table": "services", "op": "UPDATE",
+--    "keys": {"id": "...", "org_id": "...", ...}}
+--
+-- "keys" always holds id and org_id (null when the table has none) plus any
+-- extra columns named as trigger arguments (e.g. a parent id for a child
+-- table). An UPDATE that moves a row to another key (say, another
+-- org) sends a second notification with the old keys.
+-- Notifications are delivered at commit, so writes from scripts, other
+-- services and this API all invalidate the same way. Listeners
+-- (app/cache/invalidation.py) map them to cache keys.
+--
+-- Only tables that feed a cache get a trigger; add one together with the
+-- invalidate_on_change() rule that consumes it.
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION notify_cache_invalidation()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_new  JSONB;
+    v_old  JSONB;
+    v_keys JSONB;
+    v_old_keys JSONB;
+    v_col  TEXT;
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        PERFORM pg_notify(
+            'serx_cache_invalidation',
+            jsonb_build_object('table', TG_TABLE_NAME, 'op', TG_OP, 'keys', '{}'::jsonb)::text
+        );
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP <> 'INSERT' THEN
+        v_old := to_jsonb(OLD);
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        v_new := to_jsonb(NEW);
+    END IF;
+
+    v_keys := jsonb_build_object(
+        'id', COALESCE(v_new, v_old)->>'id',
+        'org_id', COALESCE(v_new, v_old)->>'org_id'
+    );
+    v_old_keys := jsonb_build_object('id', v_old->>'id', 'org_id', v_old->>'org_id');
+    FOREACH v_col IN ARRAY COALESCE(TG_ARGV, '{}'::TEXT[]) LOOP
+        v_keys := v_keys || jsonb_build_object(v_col, COALESCE(v_new, v_old)->>v_col);
+        v_old_keys := v_old_keys || jsonb_build_object(v_col, v_old->>v_col);
+    END LOOP;
+
+    PERFORM pg_notify(
+        'serx_cache_invalidation',
+        jsonb_build_object('table', TG_TABLE_NAME, 'op', TG_OP, 'keys', v_keys)::text
+    );
+    IF TG_OP = 'UPDATE' AND v_old_keys IS DISTINCT FROM v_keys THEN
+        PERFORM pg_notify(
+            'serx_cache_invalidation',
+            jsonb_build_object('table', TG_TABLE_NAME, 'op', TG_OP, 'keys', v_old_keys)::text
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+COMMENT ON FUNCTION notify_cache_invalidation() IS
+    'AFTER trigger: NOTIFY serx_cache_invalidation with the changed row''s keys.';
+
+
+DROP TRIGGER IF EXISTS services_cache_invalidation ON services;
+CREATE TRIGGER services_cache_invalidation
+    AFTER INSERT OR UPDATE OR DELETE ON services
+    FOR EACH ROW EXECUTE FUNCTION notify_cache_invalidation();
+
+-- TRUNCATE has no rows; listeners drop every cache fed by the table.
+DROP TRIGGER IF EXISTS services_cache_invalidation_truncate ON services;
+CREATE TRIGGER services_cache_invalidation_truncate
+    AFTER TRUNCATE ON services
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_cache_invalidation();
+
+COMMIT;
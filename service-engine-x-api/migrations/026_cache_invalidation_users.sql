@@ -0,0 +1,20 @@
+-- 026_cache_invalidation_users.sql
+-- Publish users and roles changes on the cache invalidation bus (see 025).
+--
+-- The API caches per-org user profile projections (name, email, role
+-- dashboard_access). A users row change drops that user's profile; a roles
+-- change (which has no org) drops every cached profile.
+
+BEGIN;
+
+DROP TRIGGER IF EXISTS users_cache_invalidation ON users;
+CREATE TRIGGER users_cache_invalidation
+    AFTER INSERT OR UPDATE OR DELETE ON users
+    FOR EACH ROW EXECUTE FUNCTION notify_cache_invalidation();
+
+DROP TRIGGER IF EXISTS roles_cache_invalidation ON roles;
+CREATE TRIGGER roles_cache_invalidation
+    AFTER INSERT OR UPDATE OR DELETE ON roles
+    FOR EACH ROW EXECUTE FUNCTION notify_cache_invalidation();
+
+COMMIT;
@@ -0,0 +1,49 @@
+-- 026b_tags_unique_name.sql
+-- Make tag names unique within an org so tags can be found-or-created in one
+-- statement.
+--
+-- Tags are org-scoped (001, step 15): two orgs may each have a "vip" tag.
+-- app.services.tags upserts with on_conflict="org_id,name" and ensure_tags()
+-- (028) uses ON CONFLICT (org_id, name); both need a unique index on
+-- tags(org_id, name). Tags were previously created by a select-then-insert,
+-- so concurrent requests could leave several rows with the same name.
+--
+-- Duplicates within an org are merged into the row with the lowest id:
+-- order_tags and ticket_tags links are moved to that row (skipping links it
+-- already has), then the extra rows are deleted and the index is created.
+-- Legacy rows without an org are merged among themselves.
+
+BEGIN;
+
+CREATE TEMP TABLE tag_merges ON COMMIT DROP AS
+SELECT t.id AS duplicate_id, k.id AS keeper_id
+  FROM tags t
+  JOIN (SELECT DISTINCT ON (org_id, name) id, org_id, name
+          FROM tags
+         ORDER BY org_id, name, id) k
+    ON k.org_id IS NOT DISTINCT FROM t.org_id AND k.name = t.name AND k.id <> t.id;
+
+INSERT INTO order_tags (order_id, tag_id)
+SELECT DISTINCT l.order_id, m.keeper_id
+  FROM order_tags l
+  JOIN tag_merges m ON m.duplicate_id = l.tag_id
+ WHERE NOT EXISTS (
+        SELECT 1 FROM order_tags k WHERE k.order_id = l.order_id AND k.tag_id = m.keeper_id
+       );
+DELETE FROM order_tags WHERE tag_id IN (SELECT duplicate_id FROM tag_merges);
+
+INSERT INTO ticket_tags (ticket_id, tag_id)
+SELECT DISTINCT l.ticket_id, m.keeper_id
+  FROM ticket_tags l
+  JOIN tag_merges m ON m.duplicate_id = l.tag_id
+ WHERE NOT EXISTS (
+        SELECT 1 FROM ticket_tags k WHERE k.ticket_id = l.ticket_id AND k.tag_id = m.keeper_id
+       );
+DELETE FROM ticket_tags WHERE tag_id IN (SELECT duplicate_id FROM tag_merges);
+
+DELETE FROM tags WHERE id IN (SELECT duplicate_id FROM tag_merges);
+
+DROP INDEX IF EXISTS idx_tags_name_unique;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_tags_org_name_unique ON tags (org_id, name);
+
+COMMIT;
@@ -0,0 +1,63 @@
+-- 027_number_sequences.sql
+-- Sequence-backed invoice and order numbers.
+--
+-- Invoice numbers used to be COUNT(*) + 1 over every invoice (a table scan
+-- per create, and two concurrent creates got the same number); order numbers
+-- were random strings. Both now come from sequences: nextval never blocks,
+-- never repeats, and costs the same however large the tables grow.
+--
+-- API workers reserve numbers in blocks with reserve_numbers() and hand them
+-- out locally, so most creates make no database call for their number.
+-- Numbers are unique but not gapless: a block reserved by a worker that
+-- exits is skipped, and concurrent workers interleave.
+
+BEGIN;
+
+CREATE SEQUENCE IF NOT EXISTS invoice_number_seq;
+CREATE SEQUENCE IF NOT EXISTS order_number_seq;
+
+-- Continue after the highest number already issued (INV-00042 -> 43).
+SELECT setval(
+    'invoice_number_seq',
+    COALESCE((SELECT MAX(substring(number FROM '^INV-(\d{1,18})$')::BIGINT) FROM invoices), 0) + 1,
+    false
+);
+-- Generated order numbers are ORD-00000042. Legacy ones are random
+-- alphanumerics without a hyphen and the API rejects caller-supplied numbers
+-- with the ORD- prefix, so only earlier sequence values can collide.
+SELECT setval(
+    'order_number_seq',
+    COALESCE((SELECT MAX(substring(number FROM '^ORD-(\d{1,18})$')::BIGINT) FROM orders), 0) + 1,
+    false
+);
+
+
+CREATE OR REPLACE FUNCTION reserve_numbers(
+    p_name  TEXT,
+    p_count INTEGER DEFAULT 1
+)
+RETURNS BIGINT[]
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_seq REGCLASS;
+BEGIN
+    v_seq := CASE p_name
+        WHEN 'invoice' THEN 'invoice_number_seq'::REGCLASS
+        WHEN 'order' THEN 'order_number_seq'::REGCLASS
+    END;
+    IF v_seq IS NULL THEN
+        RAISE EXCEPTION 'unknown number sequence: %', p_name USING ERRCODE = '22023';
+    END IF;
+    IF p_count < 1 OR p_count > 1000 THEN
+        RAISE EXCEPTION 'p_count must be between 1 and 1000' USING ERRCODE = '22023';
+    END IF;
+
+    RETURN ARRAY(SELECT nextval(v_seq) FROM generate_series(1, p_count));
+END;
+$$;
+
+COMMENT ON FUNCTION reserve_numbers(TEXT, INTEGER) IS
+    'Reserve p_count numbers from the invoice or order sequence.';
+
+COMMIT;
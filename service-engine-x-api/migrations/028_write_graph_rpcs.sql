@@ -0,0 +1,398 @@
+-- 028_write_graph_rpcs.sql
+-- Transactional create/update functions for orders, tickets and invoices.
+--
+-- The API used to create these as a chain of PostgREST calls: reference
+-- checks, the parent insert, child inserts (employees, tags, items), then
+-- re-reads to serialize the response. That cost 6-10 sequential round trips,
+-- and a failure half way left a parent without its children (an invoice with
+-- no items, an order missing its employees).
+--
+-- Each function below does the whole write in one transaction and returns
+-- the graph the API serializes, so a create or update is one round trip and
+-- either fully happens or not at all.
+--
+-- Rejected input raises with SQLSTATE PT<http status> (PostgREST answers with
+-- that status), the field in HINT and the user-facing message in MESSAGE:
+--
+--   {"code": "PT422", "message": "The specified client does not exist.",
+--    "hint": "user_id", "details": null}
+--
+-- app/utils/mutations.py (call_write_rpc) turns these into the routers'
+-- usual validation errors.
+
+BEGIN;
+
+-- Client as embedded in order, ticket and invoice responses.
+CREATE OR REPLACE FUNCTION graph_client(p_org_id UUID, p_user_id UUID)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT jsonb_build_object(
+        'id', u.id,
+        'name_f', u.name_f,
+        'name_l', u.name_l,
+        'email', u.email,
+        'company', u.company,
+        'phone', u.phone,
+        'tax_id', u.tax_id,
+        'balance', u.balance,
+        'addresses', (SELECT to_jsonb(a) FROM addresses a WHERE a.id = u.address_id),
+        'roles', (SELECT to_jsonb(r) FROM roles r WHERE r.id = u.role_id)
+    )
+      FROM users u
+     WHERE u.id = p_user_id
+       AND u.org_id = p_org_id;
+$$;
+
+-- Assigned employees, in the order given.
+CREATE OR REPLACE FUNCTION graph_employees(p_org_id UUID, p_ids UUID[])
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT COALESCE(
+        jsonb_agg(
+            jsonb_build_object('id', u.id, 'name_f', u.name_f, 'name_l', u.name_l, 'role_id', u.role_id)
+            ORDER BY e.ord
+        ),
+        '[]'::jsonb
+    )
+      FROM unnest(p_ids) WITH ORDINALITY AS e(id, ord)
+      JOIN users u ON u.id = e.id AND u.org_id = p_org_id;
+$$;
+
+-- First id that is not a user of the org with dashboard access, if any.
+CREATE OR REPLACE FUNCTION invalid_employee_id(p_org_id UUID, p_ids UUID[])
+RETURNS UUID
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT e.id
+      FROM unnest(p_ids) WITH ORDINALITY AS e(id, ord)
+     WHERE NOT EXISTS (
+               SELECT 1
+                 FROM users u
+                 JOIN roles r ON r.id = u.role_id
+                WHERE u.id = e.id
+                  AND u.org_id = p_org_id
+                  AND COALESCE(r.dashboard_access, 0) <> 0
+           )
+     ORDER BY e.ord
+     LIMIT 1;
+$$;
+
+-- Find-or-create the org's tags by name; concurrent callers share one row
+-- per (org, name).
+CREATE OR REPLACE FUNCTION ensure_tags(p_org_id UUID, p_names TEXT[])
+RETURNS SETOF tags
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO tags (org_id, name)
+    SELECT DISTINCT p_org_id, n FROM unnest(p_names) AS n
+    ON CONFLICT (org_id, name) DO NOTHING;
+
+    RETURN QUERY SELECT * FROM tags WHERE org_id = p_org_id AND name = ANY(p_names);
+END;
+$$;
+
+-- Invoice row with its client (as "users") and items (as "invoice_items").
+CREATE OR REPLACE FUNCTION graph_invoice(p_org_id UUID, p_invoice_id UUID)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT to_jsonb(i) || jsonb_build_object(
+        'users', graph_client(p_org_id, i.user_id),
+        'invoice_items', (
+            SELECT COALESCE(jsonb_agg(to_jsonb(ii)), '[]'::jsonb)
+              FROM invoice_items ii
+             WHERE ii.invoice_id = i.id
+        )
+    )
+      FROM invoices i
+     WHERE i.id = p_invoice_id;
+$$;
+
+
+-- p_order: order columns (as for an insert); service_name/price/currency
+-- are the service snapshot the API resolved.
+-- Returns {"order": row, "client": ..., "employees": [...], "tags": [...]}.
+CREATE OR REPLACE FUNCTION create_order_graph(
+    p_org_id       UUID,
+    p_order        JSONB,
+    p_employee_ids UUID[] DEFAULT '{}',
+    p_tags         TEXT[] DEFAULT '{}'
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_row        orders;
+    v_order      orders;
+    v_employee   UUID;
+BEGIN
+    v_row := jsonb_populate_record(NULL::orders, p_order);
+
+    IF NOT EXISTS (SELECT 1 FROM users WHERE id = v_row.user_id AND org_id = p_org_id) THEN
+        RAISE EXCEPTION USING ERRCODE = 'PT422',
+            MESSAGE = 'The specified client does not exist.', HINT = 'user_id';
+    END IF;
+    IF v_row.service_id IS NOT NULL AND NOT EXISTS (
+        SELECT 1 FROM services
+         WHERE id = v_row.service_id AND org_id = p_org_id AND deleted_at IS NULL
+    ) THEN
+        RAISE EXCEPTION USING ERRCODE = 'PT422',
+            MESSAGE = 'The specified service does not exist.', HINT = 'service_id';
+    END IF;
+    v_employee := invalid_employee_id(p_org_id, p_employee_ids);
+    IF v_employee IS NOT NULL THEN
+        RAISE EXCEPTION USING ERRCODE = 'PT422',
+            MESSAGE = format('Employee with ID %s does not exist.', v_employee), HINT = 'employees';
+    END IF;
+
+    -- orders.number has no unique constraint; serialise callers on the number
+    -- so two concurrent creates cannot both pass the check.
+    PERFORM pg_advisory_xact_lock(hashtext('orders.number'), hashtext(v_row.number));
+    IF EXISTS (SELECT 1 FROM orders WHERE number = v_row.number) THEN
+        RAISE EXCEPTION USING ERRCODE = 'PT400',
+            MESSAGE = 'The order number has already been taken.', HINT = 'number';
+    END IF;
+
+    INSERT INTO orders (
+        org_id, number, user_id, service_id, service_name, price, currency, quantity,
+        status, note, form_data, metadata, created_at, date_started, date_completed, date_due
+    )
+    VALUES (
+        p_org_id, v_row.number, v_row.user_id, v_row.service_id, v_row.service_name,
+        v_row.price, v_row.currency, v_row.quantity, v_row.status, v_row.note,
+        v_row.form_data, v_row.metadata, COALESCE(v_row.created_at, NOW()),
+        v_row.date_started, v_row.date_completed, v_row.date_due
+    )
+    RETURNING * INTO v_order;
+
+    INSERT INTO order_employees (order_id, employee_id)
+    SELECT v_order.id, e FROM unnest(p_employee_ids) AS e;
+
+    INSERT INTO order_tags (order_id, tag_id)
+    SELECT v_order.id, t.id FROM ensure_tags(p_org_id, p_tags) AS t;
+
+    RETURN jsonb_build_object(
+        'order', to_jsonb(v_order),
+        'client', graph_client(p_org_id, v_order.user_id),
+        'employees', graph_employees(p_org_id, p_employee_ids),
+        'tags', (
+            SELECT COALESCE(jsonb_agg(t.name ORDER BY t.name), '[]'::jsonb)
+              FROM order_tags ot JOIN tags t ON t.id = ot.tag_id
+             WHERE ot.order_id = v_order.id
+        )
+    );
+END;
+$$;
+
+
+-- Returns {"ticket": row, "client": ..., "employees": [...], "tags": [...],
+-- "order": summary or null}.
+CREATE OR REPLACE FUNCTION create_ticket_graph(
+    p_org_id       UUID,
+    p_ticket       JSONB,
+    p_employee_ids UUID[] DEFAULT '{}',
+    p_tags         TEXT[] DEFAULT '{}'
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_row    tickets;
+    v_ticket tickets;
+BEGIN
+    v_row := jsonb_populate_record(NULL::tickets, p_ticket);
+
+    IF NOT EXISTS (SELECT 1 FROM users WHERE id = v_row.user_id AND org_id = p_org_id) THEN
+        RAISE EXCEPTION USING ERRCODE = 'PT422',
+            MESSAGE = 'The specified client does not exist.', HINT = 'user_id';
+    END IF;
+    IF v_row.order_id IS NOT NULL AND NOT EXISTS (
+        SELECT 1 FROM orders
+         WHERE id = v_row.order_id AND org_id = p_org_id AND deleted_at IS NULL
+    ) THEN
+        RAISE EXCEPTION USING ERRCODE = 'PT422',
+            MESSAGE = 'The specified order does not exist.', HINT = 'order_id';
+    END IF;
+    IF invalid_employee_id(p_org_id, p_employee_ids) IS NOT NULL THEN
+        RAISE EXCEPTION USING ERRCODE = 'PT422',
+            MESSAGE = 'The specified employee does not exist.', HINT = 'employees';
+    END IF;
+
+    INSERT INTO tickets (org_id, user_id, subject, status, order_id, note, metadata, form_data, source)
+    VALUES (
+        p_org_id, v_row.user_id, v_row.subject, v_row.status, v_row.order_id, v_row.note,
+        v_row.metadata, v_row.form_data, v_row.source
+    )
+    RETURNING * INTO v_ticket;
+
+    INSERT INTO ticket_employees (ticket_id, employee_id)
+    SELECT v_ticket.id, e FROM unnest(p_employee_ids) AS e;
+
+    INSERT INTO ticket_tags (ticket_id, tag_id)
+    SELECT v_ticket.id, t.id FROM ensure_tags(p_org_id, p_tags) AS t;
+
+    RETURN jsonb_build_object(
+        'ticket', to_jsonb(v_ticket),
+        'client', graph_client(p_org_id, v_ticket.user_id),
+        'employees', graph_employees(p_org_id, p_employee_ids),
+        'tags', (
+            SELECT COALESCE(jsonb_agg(t.name ORDER BY t.name), '[]'::jsonb)
+              FROM ticket_tags tt JOIN tags t ON t.id = tt.tag_id
+             WHERE tt.ticket_id = v_ticket.id
+        ),
+        'order', (
+            SELECT jsonb_build_object(
+                       'id', o.id, 'status', o.status, 'service_name', o.service_name,
+                       'price', o.price, 'quantity', o.quantity, 'created_at', o.created_at
+                   )
+              FROM orders o
+             WHERE o.id = v_ticket.order_id
+        )
+    );
+END;
+$$;
+
+
+-- p_invoice: invoice columns (billing_address is snapshotted here from the
+-- client's address); p_items: invoice_items rows without invoice_id.
+-- Returns the invoice with "users" and "invoice_items" embedded.
+CREATE OR REPLACE FUNCTION create_invoice_graph(
+    p_org_id  UUID,
+    p_invoice JSONB,
+    p_items   JSONB DEFAULT '[]'
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_row     invoices;
+    v_invoice invoices;
+    v_billing JSONB;
+BEGIN
+    v_row := jsonb_populate_record(NULL::invoices, p_invoice);
+
+    SELECT CASE WHEN a.id IS NOT NULL THEN jsonb_build_object(
+               'line_1', a.line_1, 'line_2', a.line_2, 'city', a.city, 'state', a.state,
+               'postcode', a.postcode, 'country', a.country, 'name_f', u.name_f,
+               'name_l', u.name_l, 'company_name', u.company, 'company_vat', NULL, 'tax_id', NULL
+           ) END
+      INTO v_billing
+      FROM users u
+      LEFT JOIN addresses a ON a.id = u.address_id
+     WHERE u.id = v_row.user_id AND u.org_id = p_org_id;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION USING ERRCODE = 'PT422',
+            MESSAGE = 'The specified client does not exist.', HINT = 'user_id';
+    END IF;
+    IF v_row.coupon_id IS NOT NULL AND NOT EXISTS (SELECT 1 FROM coupons WHERE id = v_row.coupon_id) THEN
+        RAISE EXCEPTION USING ERRCODE = 'PT422',
+            MESSAGE = 'The specified coupon does not exist.', HINT = 'coupon_id';
+    END IF;
+
+    INSERT INTO invoices (
+        org_id, number, number_prefix, user_id, billing_address, status, created_at, date_due,
+        date_paid, credit, tax, tax_name, tax_percent, currency, reason, note, ip_address,
+        loc_confirm, recurring, coupon_id, transaction_id, paysys, subtotal, total, employee_id
+    )
+    VALUES (
+        p_org_id, v_row.number, v_row.number_prefix, v_row.user_id, v_billing, v_row.status,
+        COALESCE(v_row.created_at, NOW()), v_row.date_due, v_row.date_paid, v_row.credit,
+        v_row.tax, v_row.tax_name, v_row.tax_percent, v_row.currency, v_row.reason, v_row.note,
+        v_row.ip_address, v_row.loc_confirm, v_row.recurring, v_row.coupon_id,
+        v_row.transaction_id, v_row.paysys, v_row.subtotal, v_row.total, v_row.employee_id
+    )
+    RETURNING * INTO v_invoice;
+
+    INSERT INTO invoice_items (
+        invoice_id, name, description, quantity, amount, discount, discount2, total,
+        service_id, order_id, options
+    )
+    SELECT v_invoice.id, i.name, i.description, i.quantity, i.amount, i.discount, i.discount2,
+           i.total, i.service_id, i.order_id, i.options
+      FROM jsonb_populate_recordset(NULL::invoice_items, p_items) AS i;
+
+    RETURN graph_invoice(p_org_id, v_invoice.id);
+END;
+$$;
+
+
+-- p_changes: the invoice columns to change (subtotal always; total is
+-- recomputed from it and the new or current tax). p_items replace all items.
+-- p_status_from: the statuses p_changes.status may be reached from.
+CREATE OR REPLACE FUNCTION update_invoice_graph(
+    p_org_id      UUID,
+    p_invoice_id  UUID,
+    p_changes     JSONB,
+    p_items       JSONB DEFAULT '[]',
+    p_status_from INTEGER[] DEFAULT NULL
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_row     invoices;
+    v_current invoices;
+BEGIN
+    v_row := jsonb_populate_record(NULL::invoices, p_changes);
+
+    SELECT * INTO v_current
+      FROM invoices
+     WHERE id = p_invoice_id AND org_id = p_org_id AND deleted_at IS NULL
+       FOR UPDATE;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION USING ERRCODE = 'PT404', MESSAGE = 'Not Found';
+    END IF;
+
+    IF p_changes ? 'status'
+       AND v_row.status IS DISTINCT FROM v_current.status
+       AND NOT (v_current.status = ANY(COALESCE(p_status_from, '{}'))) THEN
+        RAISE EXCEPTION USING ERRCODE = 'PT400',
+            MESSAGE = format('Cannot transition from status %s.', v_current.status),
+            DETAIL = v_current.status::TEXT, HINT = 'status';
+    END IF;
+    IF p_changes ? 'user_id' AND v_row.user_id IS DISTINCT FROM v_current.user_id AND NOT EXISTS (
+        SELECT 1 FROM users WHERE id = v_row.user_id AND org_id = p_org_id
+    ) THEN
+        RAISE EXCEPTION USING ERRCODE = 'PT422',
+            MESSAGE = 'The specified client does not exist.', HINT = 'user_id';
+    END IF;
+    IF v_row.coupon_id IS NOT NULL AND NOT EXISTS (SELECT 1 FROM coupons WHERE id = v_row.coupon_id) THEN
+        RAISE EXCEPTION USING ERRCODE = 'PT422',
+            MESSAGE = 'The specified coupon does not exist.', HINT = 'coupon_id';
+    END IF;
+
+    UPDATE invoices SET
+        user_id = CASE WHEN p_changes ? 'user_id' THEN v_row.user_id ELSE user_id END,
+        status = CASE WHEN p_changes ? 'status' THEN v_row.status ELSE status END,
+        tax = CASE WHEN p_changes ? 'tax' THEN v_row.tax ELSE tax END,
+        tax_type = CASE WHEN p_changes ? 'tax_type' THEN v_row.tax_type ELSE tax_type END,
+        recurring = CASE WHEN p_changes ? 'recurring' THEN v_row.recurring ELSE recurring END,
+        coupon_id = CASE WHEN p_changes ? 'coupon_id' THEN v_row.coupon_id ELSE coupon_id END,
+        note = CASE WHEN p_changes ? 'note' THEN v_row.note ELSE note END,
+        subtotal = v_row.subtotal,
+        total = v_row.subtotal
+            + COALESCE(CASE WHEN p_changes ? 'tax' THEN v_row.tax ELSE tax END, 0),
+        updated_at = NOW()
+     WHERE id = p_invoice_id;
+
+    DELETE FROM invoice_items WHERE invoice_id = p_invoice_id;
+    INSERT INTO invoice_items (
+        invoice_id, name, description, quantity, amount, discount, discount2, total,
+        service_id, order_id, options
+    )
+    SELECT p_invoice_id, i.name, i.description, i.quantity, i.amount, i.discount, i.discount2,
+           i.total, i.service_id, i.order_id, i.options
+      FROM jsonb_populate_recordset(NULL::invoice_items, p_items) AS i;
+
+    RETURN graph_invoice(p_org_id, p_invoice_id);
+END;
+$$;
+
+COMMIT;
@@ -0,0 +1,114 @@
+-- 029_update_order_graph.sql
+-- Transactional order update, alongside the write functions of 028.
+--
+-- PUT /api/orders/{id} used to update the order row (conditionally, see
+-- app/utils/mutations.py) and then replace its employees and tags with
+-- separate PostgREST calls, so a failure after the first write left an
+-- updated order with its old links. update_order_graph() does the whole
+-- update in one transaction and returns the same graph as
+-- create_order_graph(). Rejections use the PT<http status> convention of 028.
+
+BEGIN;
+
+-- p_changes: the order columns to change; updated_at is always set.
+-- p_employee_ids / p_tags replace the order's employees / tags; NULL leaves
+-- them as they are.
+-- p_expected_updated_at: the If-Match version; the update is refused with
+-- PT412 if the order changed since.
+-- Returns {"order": row, "client": ..., "employees": [...], "tags": [...]}.
+CREATE OR REPLACE FUNCTION update_order_graph(
+    p_org_id              UUID,
+    p_order_id            UUID,
+    p_changes             JSONB,
+    p_employee_ids        UUID[] DEFAULT NULL,
+    p_tags                TEXT[] DEFAULT NULL,
+    p_expected_updated_at TIMESTAMPTZ DEFAULT NULL
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_row      orders;
+    v_current  orders;
+    v_employee UUID;
+    v_tag_ids  UUID[];
+BEGIN
+    v_row := jsonb_populate_record(NULL::orders, p_changes);
+
+    SELECT * INTO v_current
+      FROM orders
+     WHERE id = p_order_id AND org_id = p_org_id AND deleted_at IS NULL
+       FOR UPDATE;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION USING ERRCODE = 'PT404', MESSAGE = 'Not Found';
+    END IF;
+    IF p_expected_updated_at IS NOT NULL
+       AND v_current.updated_at IS DISTINCT FROM p_expected_updated_at THEN
+        RAISE EXCEPTION USING ERRCODE = 'PT412',
+            MESSAGE = 'The resource was modified since it was read.';
+    END IF;
+
+    IF v_row.service_id IS NOT NULL AND NOT EXISTS (
+        SELECT 1 FROM services
+         WHERE id = v_row.service_id AND org_id = p_org_id AND deleted_at IS NULL
+    ) THEN
+        RAISE EXCEPTION USING ERRCODE = 'PT422',
+            MESSAGE = 'The specified service does not exist.', HINT = 'service_id';
+    END IF;
+    v_employee := invalid_employee_id(p_org_id, COALESCE(p_employee_ids, '{}'));
+    IF v_employee IS NOT NULL THEN
+        RAISE EXCEPTION USING ERRCODE = 'PT422',
+            MESSAGE = format('Employee with ID %s does not exist.', v_employee), HINT = 'employees';
+    END IF;
+
+    UPDATE orders SET
+        service_id = CASE WHEN p_changes ? 'service_id' THEN v_row.service_id ELSE service_id END,
+        service_name = CASE WHEN p_changes ? 'service_name' THEN v_row.service_name ELSE service_name END,
+        status = CASE WHEN p_changes ? 'status' THEN v_row.status ELSE status END,
+        note = CASE WHEN p_changes ? 'note' THEN v_row.note ELSE note END,
+        metadata = CASE WHEN p_changes ? 'metadata' THEN v_row.metadata ELSE metadata END,
+        date_started = CASE WHEN p_changes ? 'date_started' THEN v_row.date_started ELSE date_started END,
+        date_completed = CASE WHEN p_changes ? 'date_completed' THEN v_row.date_completed ELSE date_completed END,
+        date_due = CASE WHEN p_changes ? 'date_due' THEN v_row.date_due ELSE date_due END,
+        updated_at = NOW()
+     WHERE id = p_order_id
+    RETURNING * INTO v_current;
+
+    IF p_employee_ids IS NOT NULL THEN
+        DELETE FROM order_employees WHERE order_id = p_order_id;
+        INSERT INTO order_employees (order_id, employee_id)
+        SELECT p_order_id, e FROM unnest(p_employee_ids) AS e;
+    END IF;
+
+    -- Only links that change are deleted or inserted.
+    IF p_tags IS NOT NULL THEN
+        v_tag_ids := ARRAY(SELECT t.id FROM ensure_tags(p_org_id, p_tags) AS t);
+        DELETE FROM order_tags WHERE order_id = p_order_id AND tag_id <> ALL(v_tag_ids);
+        INSERT INTO order_tags (order_id, tag_id)
+        SELECT p_order_id, t
+          FROM unnest(v_tag_ids) AS t
+         WHERE NOT EXISTS (
+                   SELECT 1 FROM order_tags WHERE order_id = p_order_id AND tag_id = t
+               );
+    END IF;
+
+    RETURN jsonb_build_object(
+        'order', to_jsonb(v_current),
+        'client', graph_client(p_org_id, v_current.user_id),
+        'employees', graph_employees(
+            p_org_id,
+            COALESCE(
+                p_employee_ids,
+                ARRAY(SELECT employee_id FROM order_employees WHERE order_id = p_order_id)
+            )
+        ),
+        'tags', (
+            SELECT COALESCE(jsonb_agg(t.name ORDER BY t.name), '[]'::jsonb)
+              FROM order_tags ot JOIN tags t ON t.id = ot.tag_id
+             WHERE ot.order_id = p_order_id
+        )
+    );
+END;
+$$;
+
+COMMIT;
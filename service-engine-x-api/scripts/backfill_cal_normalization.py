@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Backfill cal_booking_events / cal_booking_attendees / cal_recordings from cal_raw_events.
+
+Normalization runs in a process pool; each page is written with one upsert per
+table. Progress is stored under --checkpoint, so re-running the same command
+after an interruption resumes from the last written page.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+from supabase import create_client
+
+from app.services.cal_backfill import run_backfill
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--checkpoint", default="cal-normalization-backfill")
+    parser.add_argument("--from", dest="created_from", help="ISO timestamp (inclusive)")
+    parser.add_argument("--before", dest="created_before", help="ISO timestamp (exclusive)")
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=None, help="Stop after N raw events")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Normalization processes (1 = inline)",
+    )
+    args = parser.parse_args()
+
+    url = os.environ.get("SERVICE_ENGINE_X_SUPABASE_URL")
+    key = os.environ.get("SERVICE_ENGINE_X_SUPABASE_SERVICE_ROLE_KEY")
+    if not url or not key:
+        print(
+            "Missing SERVICE_ENGINE_X_SUPABASE_URL or SERVICE_ENGINE_X_SUPABASE_SERVICE_ROLE_KEY",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+    supabase = create_client(url, key)
+    started = time.monotonic()
+    summary = run_backfill(
+        supabase,
+        checkpoint_name=args.checkpoint,
+        created_from=args.created_from,
+        created_before=args.created_before,
+        page_size=args.page_size,
+        limit=args.limit,
+        workers=args.workers,
+    )
+    elapsed = time.monotonic() - started
+
+    print(
+        f"scanned={summary.scanned} booking_events={summary.booking_events} "
+        f"attendees={summary.attendees} recordings={summary.recordings} "
+        f"skipped={summary.skipped} errors={summary.error_count} "
+        f"completed={summary.completed} elapsed={elapsed:.1f}s"
+    )
+    for error in summary.errors:
+        print(f"  {error['raw_event_id']}: {error['error']}", file=sys.stderr)
+    if summary.cursor:
+        cursor = summary.cursor
+        print(f"checkpoint '{args.checkpoint}' at {cursor.created_at} / {cursor.id}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,41 @@
 #!/usr/bin/env python3
-"""Save OpenAPI specification to openapi.json file."""
+"""Save OpenAPI specification to openapi.json file.
 
+Also used at image build time to render the artifact the app serves from
+``OPENAPI_ARTIFACT_PATH``; the spec is stamped with a route fingerprint so a
+stale file is never served (see ``app/openapi_artifact.py``).
+"""
+
+import argparse
 import json
 import os
+from pathlib import Path
 
 # Set dummy env vars for OpenAPI generation (no DB connection needed)
 os.environ.setdefault("SERVICE_ENGINE_X_SUPABASE_URL", "https://placeholder.supabase.co")
 os.environ.setdefault("SERVICE_ENGINE_X_SUPABASE_SERVICE_ROLE_KEY", "placeholder")
+os.environ.setdefault("SERX_API_BASE_URL", "https://placeholder.invalid")
+os.environ.setdefault("AUX_JWKS_URL", "placeholder")
+os.environ.setdefault("AUX_ISSUER", "placeholder")
+os.environ.setdefault("AUX_AUDIENCE", "placeholder")
+os.environ.setdefault("AUX_API_BASE_URL", "placeholder")
+os.environ.setdefault("AUX_M2M_API_KEY", "placeholder")
+# Always generate from the routes, never from a previous artifact.
+os.environ["OPENAPI_ARTIFACT_PATH"] = ""
 
+from app.config import settings
 from app.main import app
+from app.openapi_artifact import FINGERPRINT_KEY, route_fingerprint
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default="openapi.json", help="where to write the spec")
+    args = parser.parse_args()
+
     spec = app.openapi()
-    with open("openapi.json", "w") as f:
+    spec["info"][FINGERPRINT_KEY] = route_fingerprint(app.routes, settings.APP_VERSION)
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
         json.dump(spec, f, indent=2)
-    print(f"OpenAPI spec saved to openapi.json ({len(json.dumps(spec))} bytes)")
+    print(f"OpenAPI spec saved to {output} ({len(json.dumps(spec))} bytes)")
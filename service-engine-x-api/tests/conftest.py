@@ -1,9 +1,20 @@
 """Pytest fixtures for testing."""
 
+from collections.abc import Iterator
+from unittest.mock import patch
+
 import pytest
 from fastapi.testclient import TestClient
 
+from app.config import settings
+from app.database import get_supabase
 from app.main import app
+from app.observability.loop_watchdog import forbid_blocking_io
+from app.services.numbering import reset_allocators
+from benchmarks.fake_supabase import FakeStore, FakeSupabaseServer
+from benchmarks.seed_data import SeededOrg, seed_store
+
+pytest_plugins = ["tests.query_budget"]
 
 
 @pytest.fixture
@@ -20,3 +31,45 @@ def auth_headers() -> dict[str, str]:
     Note: In real tests, you'd want to create a test token in the database.
     """
     return {"Authorization": "Bearer test-token"}
+
+
+@pytest.fixture
+def system_auth_headers() -> Iterator[dict[str, str]]:
+    """Bearer headers accepted as a system-M2M caller (JWT verification patched)."""
+    claims = {"type": "m2m", "actor_type": "system_service", "sub": "tests"}
+    with patch("app.auth.dependencies._verify", return_value=claims):
+        yield {"Authorization": "Bearer system-test-token"}
+
+
+@pytest.fixture
+def fake_supabase(monkeypatch: pytest.MonkeyPatch) -> Iterator[tuple[FakeStore, SeededOrg]]:
+    """Point the app's Supabase client at a seeded local PostgREST stand-in.
+
+    Unlike MagicMock clients, every query makes a real HTTP round trip, so
+    ``query_budget`` tests see the app's true query count.
+    """
+    store = FakeStore()
+    seeded = seed_store(store, scale=0.05)
+    with FakeSupabaseServer(store) as server:
+        monkeypatch.setattr(settings, "SERVICE_ENGINE_X_SUPABASE_URL", server.url)
+        get_supabase.cache_clear()
+        reset_allocators()
+        try:
+            yield store, seeded
+        finally:
+            get_supabase.cache_clear()
+            reset_allocators()
+
+
+@pytest.fixture
+def org_scope(fake_supabase: tuple[FakeStore, SeededOrg]) -> str:
+    """Query string scoping a system-M2M request to the seeded org's staff user."""
+    _, seeded = fake_supabase
+    return f"org_id={seeded.org_id}&user_id={seeded.staff_user_id}"
+
+
+@pytest.fixture
+def no_blocking_io() -> Iterator[None]:
+    """Make blocking socket I/O on the app's event loop raise ``BlockingCallError``."""
+    with forbid_blocking_io():
+        yield
@@ -0,0 +1,64 @@
+"""Pytest plugin: per-endpoint Supabase round-trip budgets.
+
+Mark a test with ``@pytest.mark.query_budget(n)`` and every request it sends
+through the app must make at most ``n`` PostgREST/Storage round trips. The
+counts come from ``QueryStatsMiddleware``, so the app must talk to a real
+HTTP endpoint (see the ``fake_supabase`` fixture); MagicMock clients make no
+round trips and a budgeted test that records no requests fails.
+
+Tests that need the counts themselves use ``captured_query_stats()``.
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import pytest
+
+from app.observability import QueryStats, add_query_observer, remove_query_observer
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers",
+        "query_budget(max_round_trips): fail if any request in the test makes more "
+        "Supabase round trips than allowed",
+    )
+
+
+@contextmanager
+def captured_query_stats() -> Iterator[list[tuple[str, QueryStats]]]:
+    """Collect ``(endpoint, stats)`` for every request the app finishes inside the block."""
+    seen: list[tuple[str, QueryStats]] = []
+
+    def observer(endpoint: str, stats: QueryStats) -> None:
+        seen.append((endpoint, stats))
+
+    add_query_observer(observer)
+    try:
+        yield seen
+    finally:
+        remove_query_observer(observer)
+
+
+def _describe(endpoint: str, stats: QueryStats) -> str:
+    tables = ", ".join(f"{table}×{n}" for table, n in stats.by_table().most_common())
+    return f"{endpoint}: {stats.count} round trips ({tables})"
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item: pytest.Item) -> Iterator[None]:
+    marker = item.get_closest_marker("query_budget")
+    if marker is None:
+        return (yield)
+
+    budget: int = marker.args[0]
+    with captured_query_stats() as seen:
+        result = yield
+
+    if not seen:
+        raise AssertionError("query_budget test made no requests through the app")
+    over = [(endpoint, stats) for endpoint, stats in seen if stats.count > budget]
+    if over:
+        details = "\n".join(_describe(endpoint, stats) for endpoint, stats in over)
+        raise AssertionError(f"Round-trip budget of {budget} exceeded:\n{details}")
+    return result
@@ -0,0 +1,206 @@
+"""Tests for the shared cache package (memory and Redis-protocol backends)."""
+
+import asyncio
+from collections.abc import Callable, Iterator
+from unittest.mock import patch
+
+import pytest
+
+from app.cache import Cache, CacheBackend, MemoryBackend
+from app.cache.redis_backend import RedisBackend
+from app.observability.metrics import CACHE_LOOKUPS
+from benchmarks.fake_redis import FakeRedisServer
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend_factory(request: pytest.FixtureRequest) -> Iterator[Callable[[], CacheBackend]]:
+    """Build a fresh backend inside the running loop (Redis clients are loop-bound)."""
+    if request.param == "memory":
+        yield lambda: MemoryBackend(max_entries=100)
+        return
+    with FakeRedisServer() as server:
+        yield lambda: RedisBackend(server.url)
+
+
+def _lookups(cache: str, result: str) -> float:
+    return CACHE_LOOKUPS.labels(cache, result)._value.get()
+
+
+def test_backend_roundtrip_and_prefix_delete(backend_factory) -> None:
+    async def scenario() -> None:
+        backend = backend_factory()
+        await backend.set("serx:a:org1:x", b"1", 60)
+        await backend.set("serx:a:org1:y", b"2", 60)
+        await backend.set("serx:a:org2:x", b"3", 60)
+
+        assert await backend.get("serx:a:org1:x") == b"1"
+        assert await backend.add("serx:a:org1:x", b"9", 60) is False
+        assert await backend.add("serx:a:lock", b"1", 60) is True
+
+        assert await backend.delete_prefix("serx:a:org1:") == 2
+        assert await backend.get("serx:a:org1:y") is None
+        assert await backend.get("serx:a:org2:x") == b"3"
+
+        await backend.delete("serx:a:org2:x")
+        assert await backend.get("serx:a:org2:x") is None
+        await backend.close()
+
+    asyncio.run(scenario())
+
+
+def test_prefix_delete_treats_glob_characters_literally(backend_factory) -> None:
+    async def scenario() -> tuple[int, bytes | None]:
+        backend = backend_factory()
+        await backend.set("serx:a:org*:x", b"1", 60)
+        await backend.set("serx:a:org-other:x", b"2", 60)
+        deleted = await backend.delete_prefix("serx:a:org*:")
+        kept = await backend.get("serx:a:org-other:x")
+        await backend.close()
+        return deleted, kept
+
+    assert asyncio.run(scenario()) == (1, b"2")
+
+
+def test_memory_backend_expires_and_evicts() -> None:
+    async def scenario() -> None:
+        backend = MemoryBackend(max_entries=2)
+        with patch("app.cache.memory.time.monotonic", return_value=100.0):
+            await backend.set("a", b"1", 5)
+            await backend.set("b", b"2", 5)
+            await backend.get("a")  # "b" is now least recently used
+            await backend.set("c", b"3", 5)
+            assert await backend.get("b") is None
+            assert await backend.get("a") == b"1"
+        with patch("app.cache.memory.time.monotonic", return_value=105.0):
+            assert await backend.get("a") is None
+
+    asyncio.run(scenario())
+
+
+def test_get_or_load_single_flight_and_metrics(backend_factory) -> None:
+    calls = 0
+
+    async def loader() -> dict[str, int]:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"value": 42}
+
+    async def scenario() -> list[dict[str, int]]:
+        cache = Cache("test_single_flight", ttl=60, backend=backend_factory())
+        results = await asyncio.gather(
+            *(cache.get_or_load("k", loader, namespace="org1") for _ in range(10))
+        )
+        results.append(await cache.get_or_load("k", loader, namespace="org1"))
+        return results
+
+    misses = _lookups("test_single_flight", "miss")
+    hits = _lookups("test_single_flight", "hit")
+
+    results = asyncio.run(scenario())
+
+    assert calls == 1
+    assert results == [{"value": 42}] * 11
+    assert _lookups("test_single_flight", "miss") - misses == 10
+    assert _lookups("test_single_flight", "hit") - hits == 1
+
+
+def test_waiter_uses_value_published_by_other_process() -> None:
+    async def scenario() -> str:
+        backend = MemoryBackend()
+        cache = Cache("test_lock", ttl=60, backend=backend, lock_timeout=1)
+        # Another worker holds the load lock and publishes shortly after.
+        await backend.add(cache.key("k") + ":lock", b"1", 1)
+
+        async def publish() -> None:
+            await asyncio.sleep(0.1)
+            await cache.set("k", "from-other-worker")
+
+        async def loader() -> str:
+            raise AssertionError("should not load while another worker is loading")
+
+        _, value = await asyncio.gather(publish(), cache.get_or_load("k", loader))
+        return value
+
+    assert asyncio.run(scenario()) == "from-other-worker"
+
+
+def test_invalidation_during_load_is_not_overwritten(backend_factory) -> None:
+    versions = iter(["before-write", "after-write"])
+    loading = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_loader() -> str:
+        value = next(versions)
+        loading.set()
+        await release.wait()
+        return value
+
+    async def scenario() -> tuple[str, str, str, object]:
+        cache = Cache("test_inflight", ttl=60, backend=backend_factory())
+        stale = asyncio.create_task(cache.get_or_load("k", slow_loader, namespace="org1"))
+        await loading.wait()
+        await cache.invalidate_namespace("org1")
+        # Arrives after the write: must not join the load that started before it.
+        fresh = asyncio.create_task(cache.get_or_load("k", slow_loader, namespace="org1"))
+        await asyncio.sleep(0)
+        release.set()
+        first, second = await stale, await fresh
+        return first, second, await cache.get("k", namespace="org1"), await cache.get("k")
+
+    assert asyncio.run(scenario()) == ("before-write", "after-write", "after-write", None)
+
+
+def test_namespace_invalidation(backend_factory) -> None:
+    async def scenario() -> tuple[object, object, object]:
+        cache = Cache("test_ns", ttl=60, backend=backend_factory())
+        await cache.set("config", {"a": 1}, namespace="org1")
+        await cache.set("config", {"a": 2}, namespace="org2")
+        await cache.invalidate_namespace("org1")
+        first = await cache.get("config", namespace="org1")
+        second = await cache.get("config", namespace="org2")
+        await cache.invalidate_all()
+        return first, second, await cache.get("config", namespace="org2")
+
+    assert asyncio.run(scenario()) == (None, {"a": 2}, None)
+
+
+def test_get_many_returns_only_hits(backend_factory) -> None:
+    async def scenario() -> dict[str, object]:
+        cache = Cache("test_many", ttl=60, backend=backend_factory())
+        await cache.set_many({"a": {"n": 1}, "b": [2]}, namespace="org1")
+        await cache.set("c", 3, namespace="org2")
+        return await cache.get_many(["a", "c", "b"], namespace="org1")
+
+    assert asyncio.run(scenario()) == {"a": {"n": 1}, "b": [2]}
+
+
+def test_loader_errors_propagate_and_are_not_cached() -> None:
+    async def scenario() -> int:
+        cache = Cache("test_errors", ttl=60, backend=MemoryBackend())
+
+        async def failing() -> int:
+            raise RuntimeError("db down")
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_load("k", failing)
+
+        async def ok() -> int:
+            return 7
+
+        return await cache.get_or_load("k", ok)
+
+    assert asyncio.run(scenario()) == 7
+
+
+def test_redis_outage_degrades_to_misses() -> None:
+    async def scenario() -> int:
+        backend = RedisBackend("redis://127.0.0.1:1/0", socket_timeout=0.1)
+        cache = Cache("test_outage", ttl=60, backend=backend)
+
+        async def loader() -> int:
+            return 5
+
+        return await cache.get_or_load("k", loader)
+
+    assert asyncio.run(scenario()) == 5
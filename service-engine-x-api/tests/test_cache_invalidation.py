@@ -0,0 +1,186 @@
+"""Tests for change-driven cache invalidation.
+
+The end-to-end test needs a local Postgres: set ``SERX_TEST_DATABASE_URL``
+(e.g. ``postgresql://postgres@localhost/postgres``); it is skipped otherwise.
+"""
+
+import asyncio
+import os
+import uuid
+from collections import defaultdict
+from pathlib import Path
+
+import pytest
+
+from app.cache import Cache, MemoryBackend, invalidation
+from app.cache.invalidation import (
+    InvalidationListener,
+    RowChange,
+    apply_change,
+    invalidate_on_change,
+)
+
+MIGRATION = Path(__file__).parent.parent / "migrations" / "025_cache_invalidation_notify.sql"
+TEST_DSN = os.environ.get("SERX_TEST_DATABASE_URL", "")
+
+
+@pytest.fixture(autouse=True)
+def isolated_rules(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(invalidation, "_rules", defaultdict(list))
+
+
+class SharedMemoryBackend(MemoryBackend):
+    """Stands in for Redis: entries that other processes also see."""
+
+    shared = True
+
+
+async def _seed(cache: Cache) -> None:
+    await cache.set("catalog", ["a"], namespace="org-1")
+    await cache.set("catalog", ["b"], namespace="org-2")
+
+
+def test_org_change_drops_only_that_namespace() -> None:
+    async def scenario() -> tuple[object, object]:
+        cache = Cache("test_inv_ns", ttl=3600, backend=MemoryBackend())
+        invalidate_on_change(cache, "services")
+        await _seed(cache)
+        await apply_change(RowChange("services", "UPDATE", {"id": "s1", "org_id": "org-1"}))
+        return (
+            await cache.get("catalog", namespace="org-1"),
+            await cache.get("catalog", namespace="org-2"),
+        )
+
+    assert asyncio.run(scenario()) == (None, ["b"])
+
+
+def test_key_rule_and_truncate() -> None:
+    async def scenario() -> list[object]:
+        cache = Cache("test_inv_key", ttl=3600, backend=MemoryBackend())
+        invalidate_on_change(
+            cache, "invoice_items", namespace=lambda c: "public", key=lambda c: c.keys["invoice_id"]
+        )
+        await cache.set("p1", {"v": 1}, namespace="public")
+        await cache.set("p2", {"v": 2}, namespace="public")
+
+        await apply_change(RowChange("invoice_items", "INSERT", {"id": "i", "invoice_id": "p1"}))
+        after_row = [
+            await cache.get("p1", namespace="public"),
+            await cache.get("p2", namespace="public"),
+        ]
+        await apply_change(RowChange("invoice_items", "TRUNCATE"))
+        return [*after_row, await cache.get("p2", namespace="public")]
+
+    assert asyncio.run(scenario()) == [None, {"v": 2}, None]
+
+
+def test_unrelated_tables_and_bad_payloads_are_ignored() -> None:
+    async def scenario() -> object:
+        cache = Cache("test_inv_ignore", ttl=3600, backend=MemoryBackend())
+        invalidate_on_change(cache, "services")
+        await _seed(cache)
+        await apply_change(RowChange("orders", "UPDATE", {"id": "o1", "org_id": "org-1"}))
+        listener = InvalidationListener("postgresql://unused")
+        listener._on_notify(None, 0, invalidation.CHANNEL, "not json")
+        return await cache.get("catalog", namespace="org-1")
+
+    assert asyncio.run(scenario()) == ["a"]
+
+
+def test_only_the_leader_touches_shared_caches() -> None:
+    async def scenario() -> tuple[list[object], bool, list[object]]:
+        shared = Cache("test_inv_shared", ttl=3600, backend=SharedMemoryBackend())
+        local = Cache("test_inv_local", ttl=3600, backend=MemoryBackend())
+        invalidate_on_change(shared, "services")
+        invalidate_on_change(local, "services")
+        await _seed(shared)
+        await _seed(local)
+        before = shared.generation("org-1")
+
+        change = RowChange("services", "UPDATE", {"id": "s1", "org_id": "org-1"})
+        await apply_change(change, shared=False)
+        await invalidation.flush_all(shared=False)
+        follower = [
+            await shared.get("catalog", namespace="org-1"),
+            await shared.get("catalog", namespace="org-2"),
+            await local.get("catalog", namespace="org-2"),
+        ]
+
+        await apply_change(change)
+        leader = [
+            await shared.get("catalog", namespace="org-1"),
+            await shared.get("catalog", namespace="org-2"),
+        ]
+        return follower, shared.generation("org-1") != before, leader
+
+    assert asyncio.run(scenario()) == ([["a"], ["b"], None], True, [None, ["b"]])
+
+
+@pytest.mark.skipif(not TEST_DSN, reason="SERX_TEST_DATABASE_URL not set")
+def test_postgres_notifications_invalidate_caches() -> None:
+    asyncpg = pytest.importorskip("asyncpg")
+    schema = f"serx_test_{uuid.uuid4().hex[:8]}"
+
+    async def wait_for_miss(cache: Cache, namespace: str) -> None:
+        for _ in range(100):
+            if await cache.get("catalog", namespace=namespace) is None:
+                return
+            await asyncio.sleep(0.02)
+        raise AssertionError(f"{namespace} was not invalidated")
+
+    async def scenario() -> None:
+        conn = await asyncpg.connect(TEST_DSN)
+        await conn.execute(f"CREATE SCHEMA {schema}; SET search_path TO {schema};")
+        await conn.execute("CREATE TABLE services (id TEXT PRIMARY KEY, org_id TEXT, name TEXT)")
+        await conn.execute(MIGRATION.read_text())
+
+        cache = Cache("test_inv_pg", ttl=3600, backend=MemoryBackend())
+        invalidate_on_change(cache, "services")
+        listener = InvalidationListener(TEST_DSN)
+        listener.start()
+        try:
+            await asyncio.wait_for(listener.connected.wait(), 10)
+            await _seed(cache)
+
+            await conn.execute("INSERT INTO services VALUES ('s1', 'org-1', 'Audit')")
+            await wait_for_miss(cache, "org-1")
+            assert await cache.get("catalog", namespace="org-2") == ["b"]
+
+            # Moving a row between orgs invalidates both.
+            await _seed(cache)
+            await conn.execute("UPDATE services SET org_id = 'org-2' WHERE id = 's1'")
+            await wait_for_miss(cache, "org-1")
+            await wait_for_miss(cache, "org-2")
+        finally:
+            await listener.stop()
+            await conn.execute(f"DROP SCHEMA {schema} CASCADE")
+            await conn.close()
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.skipif(not TEST_DSN, reason="SERX_TEST_DATABASE_URL not set")
+def test_one_listener_leads_per_database() -> None:
+    async def scenario() -> list[bool]:
+        listeners = [InvalidationListener(TEST_DSN, heartbeat=0.1) for _ in range(3)]
+        for listener in listeners:
+            listener.start()
+        try:
+            for listener in listeners:
+                await asyncio.wait_for(listener.connected.wait(), 10)
+            leaders = [listener.leader for listener in listeners]
+            # The leader goes away; another listener takes over on its heartbeat.
+            await listeners[leaders.index(True)].stop()
+            followers = [listener for listener, lead in zip(listeners, leaders) if not lead]
+            for _ in range(100):
+                if any(listener.leader for listener in followers):
+                    break
+                await asyncio.sleep(0.05)
+            return [*leaders, any(listener.leader for listener in followers)]
+        finally:
+            for listener in listeners:
+                await listener.stop()
+
+    results = asyncio.run(scenario())
+    assert sum(results[:3]) == 1
+    assert results[3] is True
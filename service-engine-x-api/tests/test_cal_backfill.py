@@ -0,0 +1,67 @@
+"""Tests for the bulk Cal.com normalization pipeline."""
+
+from unittest.mock import MagicMock
+
+from app.services.cal_backfill import normalize_raw_event, write_normalized
+
+
+def _booking_row(raw_id: str, uid: str, emails: list[str]) -> dict:
+    return {
+        "id": raw_id,
+        "created_at": "2026-01-01T00:00:00+00:00",
+        "trigger_event": "BOOKING_CREATED",
+        "payload": {
+            "triggerEvent": "BOOKING_CREATED",
+            "payload": {
+                "uid": uid,
+                "eventType": {"slug": "intro"},
+                "attendees": [{"email": email, "name": "A"} for email in emails],
+            },
+        },
+    }
+
+
+def test_normalize_raw_event_booking() -> None:
+    """Booking triggers produce a booking event keyed to the raw row plus attendees."""
+    normalized = normalize_raw_event(_booking_row("raw-1", "uid-1", ["A@x.com"]))
+
+    assert normalized.error is None
+    assert normalized.booking_event["cal_raw_event_id"] == "raw-1"
+    assert normalized.booking_event["cal_booking_uid"] == "uid-1"
+    # Non-integer event type shapes are dropped instead of failing the batch.
+    assert normalized.booking_event["cal_event_type_id"] is None
+    assert [a["email"] for a in normalized.attendees] == ["a@x.com"]
+
+
+def test_normalize_raw_event_recording_without_id_is_error() -> None:
+    """Recording payloads without an id are reported, not raised."""
+    normalized = normalize_raw_event(
+        {"id": "raw-2", "trigger_event": "RECORDING_READY", "payload": {"payload": {}}}
+    )
+
+    assert normalized.recording is None
+    assert normalized.error == "Recording payload missing id"
+
+
+def test_write_normalized_single_upsert_per_table() -> None:
+    """A page is written with one upsert per table and de-duplicated attendees."""
+    supabase = MagicMock()
+    supabase.table.return_value.upsert.return_value.execute.return_value = MagicMock(
+        data=[
+            {"id": "be-1", "cal_raw_event_id": "raw-1"},
+            {"id": "be-2", "cal_raw_event_id": "raw-2"},
+        ]
+    )
+    batch = [
+        normalize_raw_event(_booking_row("raw-1", "uid-1", ["a@x.com", "b@x.com"])),
+        normalize_raw_event(_booking_row("raw-2", "uid-1", ["a@x.com"])),
+    ]
+
+    bookings, attendees, recordings = write_normalized(supabase, batch)
+
+    assert (bookings, attendees, recordings) == (2, 2, 0)
+    tables = [call.args[0] for call in supabase.table.call_args_list]
+    assert tables == ["cal_booking_events", "cal_booking_attendees"]
+    attendee_rows = supabase.table.return_value.upsert.call_args_list[1].args[0]
+    by_email = {row["email"]: row["booking_event_id"] for row in attendee_rows}
+    assert by_email == {"a@x.com": "be-2", "b@x.com": "be-1"}
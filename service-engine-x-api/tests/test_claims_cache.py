@@ -0,0 +1,97 @@
+"""Tests for the verified-JWT claims cache."""
+
+import base64
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from aux_m2m_server.errors import TokenVerificationError
+
+from app.auth import dependencies
+from app.auth.claims_cache import ClaimsCache, token_key_id
+
+
+def _token(kid: str, sub: str) -> str:
+    header = base64.urlsafe_b64encode(json.dumps({"alg": "RS256", "kid": kid}).encode())
+    return f"{header.decode().rstrip('=')}.{sub}.signature"
+
+
+def _claims(sub: str, *, ttl: float = 600) -> dict:
+    return {"type": "m2m", "actor_type": "system_service", "sub": sub, "exp": time.time() + ttl}
+
+
+@pytest.fixture
+def verifier() -> MagicMock:
+    verifier = MagicMock()
+    dependencies._claims_cache.clear()
+    with patch("app.auth.dependencies.get_verifier", return_value=verifier):
+        yield verifier
+    dependencies._claims_cache.clear()
+
+
+def test_repeat_token_skips_signature_verification(verifier: MagicMock) -> None:
+    token = _token("k1", "svc")
+    verifier.verify.return_value = _claims("svc")
+
+    assert dependencies._verify(token)["sub"] == "svc"
+    assert dependencies._verify(token)["sub"] == "svc"
+    assert verifier.verify.call_count == 1
+
+
+def test_failures_are_not_cached(verifier: MagicMock) -> None:
+    verifier.verify.side_effect = TokenVerificationError("bad signature")
+    token = _token("k1", "svc")
+
+    assert dependencies._verify(token) is None
+    assert dependencies._verify(token) is None
+    assert verifier.verify.call_count == 2
+
+
+def test_entries_expire_at_token_exp() -> None:
+    cache = ClaimsCache(maxsize=10, max_ttl=300)
+    token = _token("k1", "svc")
+    cache.put(token, _claims("svc", ttl=0.05))
+    assert cache.get(token) is not None
+
+    time.sleep(0.06)
+    assert cache.get(token) is None
+
+
+def test_tokens_without_exp_are_not_cached() -> None:
+    cache = ClaimsCache(maxsize=10, max_ttl=300)
+    token = _token("k1", "svc")
+    cache.put(token, {"type": "session", "sub": "u1"})
+    assert cache.get(token) is None
+
+
+def test_new_signing_key_flushes_cache() -> None:
+    cache = ClaimsCache(maxsize=10, max_ttl=300)
+    old = _token("k1", "a")
+    cache.put(old, _claims("a"))
+    cache.put(_token("k1", "b"), _claims("b"))
+    assert len(cache) == 2
+
+    rotated = _token("k2", "c")
+    cache.put(rotated, _claims("c"))
+
+    assert cache.get(old) is None
+    assert cache.get(rotated)["sub"] == "c"
+
+
+def test_lru_is_bounded() -> None:
+    cache = ClaimsCache(maxsize=2, max_ttl=300)
+    tokens = [_token("k1", sub) for sub in ("a", "b", "c")]
+    cache.put(tokens[0], _claims("a"))
+    cache.put(tokens[1], _claims("b"))
+    cache.get(tokens[0])  # refresh a
+    cache.put(tokens[2], _claims("c"))
+
+    assert cache.get(tokens[1]) is None
+    assert cache.get(tokens[0]) is not None
+    assert len(cache) == 2
+
+
+def test_token_key_id_tolerates_garbage() -> None:
+    assert token_key_id(_token("k9", "x")) == "k9"
+    assert token_key_id("not-a-jwt") is None
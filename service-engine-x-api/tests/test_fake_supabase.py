@@ -0,0 +1,62 @@
+"""Tests for the benchmark PostgREST stand-in, driven by the real supabase client."""
+
+import pytest
+from postgrest.exceptions import APIError
+from supabase import create_client
+
+from benchmarks.fake_supabase import FakeStore, FakeSupabaseServer
+
+
+@pytest.fixture
+def fake_supabase():
+    store = FakeStore()
+    store.insert("organizations", [{"id": "org-1", "name": "Acme"}])
+    store.insert(
+        "proposals",
+        [
+            {
+                "id": f"p{i}", "org_id": "org-1", "status": i % 2, "total": 100 * i,
+                "deleted_at": None,
+            }
+            for i in range(5)
+        ],
+    )
+    store.insert("proposal_items", [{"proposal_id": "p1", "name": "Setup"}])
+    store.add_unique("tags", "tags_name_key", "name")
+    with FakeSupabaseServer(store) as server:
+        yield store, create_client(server.url, "test-key")
+
+
+def test_select_with_filters_order_count_and_embeds(fake_supabase) -> None:
+    store, supabase = fake_supabase
+
+    result = (
+        supabase.table("proposals")
+        .select("id, total, proposal_items (name), organizations:org_id (name)", count="exact")
+        .eq("status", 1)
+        .is_("deleted_at", "null")
+        .order("total", desc=True)
+        .range(0, 0)
+        .execute()
+    )
+
+    assert result.count == 2
+    assert result.data == [
+        {"id": "p3", "total": 300, "proposal_items": [], "organizations": {"name": "Acme"}}
+    ]
+    assert store.requests == 1
+
+
+def test_insert_update_and_unique_violation(fake_supabase) -> None:
+    store, supabase = fake_supabase
+
+    created = supabase.table("tags").insert({"name": "vip"}).execute()
+    assert created.data[0]["name"] == "vip" and created.data[0]["id"]
+
+    with pytest.raises(APIError) as exc_info:
+        supabase.table("tags").insert({"name": "vip"}).execute()
+    assert exc_info.value.code == "23505"
+
+    updated = supabase.table("proposals").update({"status": 2}).in_("id", ["p0", "p2"]).execute()
+    assert sorted(row["id"] for row in updated.data) == ["p0", "p2"]
+    assert [r["status"] for r in store.table("proposals")] == [2, 1, 2, 1, 0]
@@ -0,0 +1,97 @@
+"""Tests for the internal Cal.com raw-event lease endpoints."""
+
+from unittest.mock import MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+EVENT_A = "00000000-0000-0000-0000-00000000000a"
+EVENT_B = "00000000-0000-0000-0000-00000000000b"
+SYSTEM_CLAIMS = {"type": "m2m", "actor_type": "system_service", "sub": "service:serx-mcp"}
+AUTH = {"Authorization": "Bearer abc"}
+
+
+def _supabase_returning(rows: list[dict]) -> MagicMock:
+    supabase = MagicMock()
+    supabase.rpc.return_value.execute.return_value = MagicMock(data=rows)
+    return supabase
+
+
+def test_claim_raw_events_unauthorized(client: TestClient) -> None:
+    """Test that claiming raw events requires authentication."""
+    response = client.post("/api/internal/cal/events/raw/claim", json={"consumer": "w1"})
+    assert response.status_code == 401
+
+
+def test_ack_raw_events_unauthorized(client: TestClient) -> None:
+    """Test that acking raw events requires authentication."""
+    response = client.post(
+        "/api/internal/cal/events/raw/ack",
+        json={"consumer": "w1", "event_ids": [EVENT_A]},
+    )
+    assert response.status_code == 401
+
+
+def test_claim_raw_events_calls_rpc_with_lease(client: TestClient) -> None:
+    """Claim passes consumer, batch size and a bounded lease to the RPC."""
+    supabase = _supabase_returning([{"id": EVENT_A}])
+    with (
+        patch("app.auth.dependencies._verify", return_value=SYSTEM_CLAIMS),
+        patch("app.routers.internal_cal_events.get_supabase", return_value=supabase),
+    ):
+        response = client.post(
+            "/api/internal/cal/events/raw/claim",
+            headers=AUTH,
+            json={"consumer": "w1", "limit": 10, "visibility_timeout_seconds": 10**6},
+        )
+
+    assert response.status_code == 200
+    assert response.json() == [{"id": EVENT_A}]
+    name, params = supabase.rpc.call_args.args
+    assert name == "claim_cal_raw_events"
+    assert params["p_consumer"] == "w1"
+    assert params["p_limit"] == 10
+    assert params["p_lease_seconds"] == 3600
+    assert params["p_trigger_events"] is None
+
+
+def test_ack_raw_events_reports_lost_leases(client: TestClient) -> None:
+    """Events no longer leased by the consumer are reported as lost."""
+    supabase = _supabase_returning([{"id": EVENT_A}])
+    with (
+        patch("app.auth.dependencies._verify", return_value=SYSTEM_CLAIMS),
+        patch("app.routers.internal_cal_events.get_supabase", return_value=supabase),
+    ):
+        response = client.post(
+            "/api/internal/cal/events/raw/ack",
+            headers=AUTH,
+            json={"consumer": "w1", "event_ids": [EVENT_A, EVENT_B]},
+        )
+
+    assert response.status_code == 200
+    assert response.json() == {"acked": [EVENT_A], "lost": [EVENT_B]}
+
+
+def test_fail_raw_events_splits_retry_and_dead_letter(client: TestClient) -> None:
+    """Failed events are split into retrying and dead-lettered."""
+    supabase = _supabase_returning(
+        [
+            {"id": EVENT_A, "dead_lettered_at": None},
+            {"id": EVENT_B, "dead_lettered_at": "2026-01-01T00:00:00+00:00"},
+        ]
+    )
+    with (
+        patch("app.auth.dependencies._verify", return_value=SYSTEM_CLAIMS),
+        patch("app.routers.internal_cal_events.get_supabase", return_value=supabase),
+    ):
+        response = client.post(
+            "/api/internal/cal/events/raw/fail",
+            headers=AUTH,
+            json={"consumer": "w1", "event_ids": [EVENT_A, EVENT_B], "error": "boom"},
+        )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "retrying": [EVENT_A],
+        "dead_lettered": [EVENT_B],
+        "lost": [],
+    }
@@ -0,0 +1,138 @@
+"""Tests for internal meetings/deals endpoints."""
+
+import asyncio
+from typing import Any
+from unittest.mock import MagicMock
+
+from fastapi.testclient import TestClient
+
+from app.routers.internal_meetings_deals import MEETING_HISTORY_COLUMNS, _build_deal_context
+
+ORG_ID = "00000000-0000-0000-0000-000000000001"
+DEAL_ID = "00000000-0000-0000-0000-000000000002"
+
+
+def _cal_event(uid: str, *emails: str, **extra: Any) -> dict[str, Any]:
+    return {
+        "title": "Intro",
+        "start_time": "2026-01-01T10:00:00Z",
+        "end_time": "2026-01-01T10:30:00Z",
+        "cal_event_uid": uid,
+        "attendees": [{"name": "Pat Lee", "email": email} for email in emails],
+        **extra,
+    }
+
+
+def test_get_deal_unauthorized(client: TestClient) -> None:
+    """Test that deal context requires authentication."""
+    response = client.get(f"/api/internal/orgs/{ORG_ID}/deals/{DEAL_ID}")
+    assert response.status_code == 401
+
+
+def test_create_meeting_from_cal_event_unauthorized(client: TestClient) -> None:
+    """Test that meeting creation from Cal.com requires authentication."""
+    response = client.post(
+        f"/api/internal/orgs/{ORG_ID}/meetings/from-cal-event",
+        json={
+            "title": "Intro",
+            "start_time": "2026-01-01T10:00:00Z",
+            "end_time": "2026-01-01T10:30:00Z",
+        },
+    )
+    assert response.status_code == 401
+
+
+def test_build_deal_context_bounds_meeting_history() -> None:
+    """Meeting history is trimmed, capped at the limit and flags truncation."""
+    supabase = MagicMock()
+    query = supabase.table.return_value.select.return_value
+    query.eq.return_value = query
+    query.is_.return_value = query
+    query.order.return_value = query
+    query.limit.return_value = query
+    query.execute.return_value = MagicMock(data=[{"id": "m1"}, {"id": "m2"}, {"id": "m3"}])
+    deal = {"id": DEAL_ID, "account_id": "acct-1", "contact_id": None, "proposal_id": None}
+
+    context = asyncio.run(_build_deal_context(supabase, ORG_ID, deal, meetings_limit=2))
+
+    assert [m["id"] for m in context["meetings"]] == ["m1", "m2"]
+    assert context["meetings_has_more"] is True
+    assert context["account_meetings_has_more"] is True
+    assert context["contact"] is None
+    assert context["proposal"] is None
+    assert supabase.table.return_value.select.call_args_list.count(
+        ((MEETING_HISTORY_COLUMNS,),)
+    ) == 2
+    query.limit.assert_any_call(3)
+
+
+def test_create_meeting_resolves_new_and_existing_attendees(
+    client: TestClient, fake_supabase, system_auth_headers
+) -> None:
+    store, seeded = fake_supabase
+    existing = next(c for c in store.table("contacts") if c["email"] == "contact0@customer.test")
+    old = next(m for m in store.table("meetings") if m["cal_event_uid"] == "uid-1")
+    contacts_before = len(store.table("contacts"))
+
+    response = client.post(
+        f"/api/internal/orgs/{seeded.org_id}/meetings/from-cal-event",
+        json=_cal_event(
+            "uid-new", "Contact0@Customer.test", "pat@fresh.test", rescheduled_from_uid="uid-1"
+        ),
+        headers=system_auth_headers,
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] is True
+    assert [c["email"] for c in data["contacts"]] == ["contact0@customer.test", "pat@fresh.test"]
+    assert data["contacts"][0]["id"] == existing["id"]
+    assert data["contacts"][0]["account_id"] == existing["account_id"]
+    new_account = next(a for a in store.table("accounts") if a["domain"] == "fresh.test")
+    assert data["contacts"][1]["account_id"] == new_account["id"]
+    assert data["contacts"][1]["name_f"] == "Pat"
+    assert len(store.table("contacts")) == contacts_before + 1
+    # A rescheduled meeting keeps its predecessor's links.
+    assert data["meeting"]["contact_id"] == old["contact_id"]
+    assert old["status"] == "rescheduled"
+
+
+def test_create_meeting_ignores_soft_deleted_contacts(
+    client: TestClient, fake_supabase, system_auth_headers
+) -> None:
+    store, seeded = fake_supabase
+    deleted = next(c for c in store.table("contacts") if c["email"] == "contact1@customer.test")
+    deleted["deleted_at"] = "2026-01-01T00:00:00+00:00"
+
+    response = client.post(
+        f"/api/internal/orgs/{seeded.org_id}/meetings/from-cal-event",
+        json=_cal_event("uid-new", "contact1@customer.test"),
+        headers=system_auth_headers,
+    )
+
+    assert response.status_code == 200
+    [contact] = response.json()["contacts"]
+    assert contact["id"] != deleted["id"]
+    assert contact["deleted_at"] is None
+    assert response.json()["meeting"]["contact_id"] == contact["id"]
+    assert deleted["deleted_at"] == "2026-01-01T00:00:00+00:00"
+
+
+def test_create_meeting_contacts_failure_leaves_old_meeting(
+    client: TestClient, fake_supabase, system_auth_headers
+) -> None:
+    store, seeded = fake_supabase
+    store.register_rpc("upsert_cal_attendee_contacts", lambda store, args: [])
+    old = next(m for m in store.table("meetings") if m["cal_event_uid"] == "uid-1")
+    meetings_before = len(store.table("meetings"))
+
+    response = client.post(
+        f"/api/internal/orgs/{seeded.org_id}/meetings/from-cal-event",
+        json=_cal_event("uid-new", "pat@fresh.test", rescheduled_from_uid="uid-1"),
+        headers=system_auth_headers,
+    )
+
+    assert response.status_code == 500
+    assert response.json()["detail"] == "Failed to create contact"
+    assert old["status"] == "scheduled"
+    assert len(store.table("meetings")) == meetings_before
@@ -0,0 +1,41 @@
+"""Tests for the orjson-backed JSON codec."""
+
+import json
+import uuid
+from datetime import UTC, date, datetime
+from decimal import Decimal
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from app.models.meetings import AccountSummary
+from app.utils.json_codec import FastJSONResponse, JSONDecodeError, dumps, loads
+
+
+def test_dumps_matches_jsonable_encoder_for_common_types() -> None:
+    """Datetimes, UUIDs, Decimals and models encode like FastAPI's encoder."""
+    value = {
+        "id": uuid.UUID("00000000-0000-0000-0000-000000000001"),
+        "at": datetime(2026, 1, 2, 3, 4, 5, 678000, tzinfo=UTC),
+        "day": date(2026, 1, 2),
+        "whole": Decimal("10"),
+        "price": Decimal("12.50"),
+        "account": AccountSummary(id="a1", name="Acme"),
+        1: "int key",
+    }
+
+    assert json.loads(dumps(value)) == json.loads(json.dumps(jsonable_encoder(value)))
+
+
+def test_loads_raises_stdlib_compatible_error() -> None:
+    """Invalid bodies raise an error catchable as json.JSONDecodeError."""
+    with pytest.raises(json.JSONDecodeError):
+        loads(b"{not json")
+    assert issubclass(JSONDecodeError, json.JSONDecodeError)
+
+
+def test_fast_json_response_renders_bytes() -> None:
+    response = FastJSONResponse({"ok": True, "total": Decimal("1.5")})
+
+    assert response.body == b'{"ok":true,"total":1.5}'
+    assert response.media_type == "application/json"
@@ -0,0 +1,80 @@
+"""Tests for the event-loop watchdog and the blocking-I/O guard."""
+
+import asyncio
+import socket
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.observability.loop_watchdog import BlockingCallError, LoopWatchdog, forbid_blocking_io
+
+
+def _block_the_loop() -> None:
+    time.sleep(0.2)
+
+
+def test_watchdog_captures_stall_stack() -> None:
+    async def run() -> LoopWatchdog:
+        watchdog = LoopWatchdog(interval=0.02, stall_threshold=0.05)
+        watchdog.start()
+        await asyncio.sleep(0.05)
+        _block_the_loop()
+        await asyncio.sleep(0.05)
+        await watchdog.stop()
+        return watchdog
+
+    watchdog = asyncio.run(run())
+
+    [stall] = watchdog.stalls
+    assert stall.blocked_ms >= 50
+    assert any("_block_the_loop" in line for line in stall.stack)
+
+
+def test_blocking_socket_on_loop_raises(fake_supabase) -> None:
+    from app.config import settings
+
+    host, port = settings.SERVICE_ENGINE_X_SUPABASE_URL.removeprefix("http://").split(":")
+
+    def connect() -> None:
+        with socket.create_connection((host, int(port)), timeout=1):
+            pass
+
+    async def run() -> None:
+        with pytest.raises(BlockingCallError):
+            connect()
+        await asyncio.to_thread(connect)  # worker threads are fine
+
+    with forbid_blocking_io():
+        asyncio.run(run())
+    connect()  # guard removed
+
+
+def test_async_handler_with_sync_client_is_caught(
+    client: TestClient, fake_supabase, system_auth_headers, no_blocking_io
+) -> None:
+    _, seeded = fake_supabase
+    with pytest.raises(BlockingCallError):
+        client.get(
+            f"/api/meetings?org_id={seeded.org_id}&user_id={seeded.staff_user_id}",
+            headers=system_auth_headers,
+        )
+
+
+def test_normalize_batch_runs_off_the_loop(
+    client: TestClient, fake_supabase, system_auth_headers, no_blocking_io
+) -> None:
+    response = client.post(
+        "/api/internal/cal/normalize/batch",
+        json={"created_from": "2026-01-01T00:00:00Z", "limit": 10},
+        headers=system_auth_headers,
+    )
+
+    assert response.status_code == 200
+    assert response.json()["completed"] is True
+
+
+def test_loop_stalls_endpoint(client: TestClient, system_auth_headers) -> None:
+    response = client.get("/api/internal/debug/loop-stalls", headers=system_auth_headers)
+    assert response.status_code == 200
+    assert set(response.json()) == {"enabled", "stall_threshold_ms", "data"}
@@ -0,0 +1,75 @@
+"""Tests for the Prometheus metrics endpoint."""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.observability.metrics import record_scheduler_outcomes, render_metrics
+
+
+def test_metrics_requires_auth(client: TestClient) -> None:
+    response = client.get("/api/internal/metrics")
+    assert response.status_code == 401
+
+
+def test_metrics_exposes_route_table_and_webhook_series(
+    client: TestClient, fake_supabase, system_auth_headers, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _, seeded = fake_supabase
+    monkeypatch.setattr(settings, "CAL_WEBHOOK_SECRET", "")
+    client.get(
+        f"/api/meetings?org_id={seeded.org_id}&user_id={seeded.staff_user_id}&limit=5",
+        headers=system_auth_headers,
+    )
+    client.post(
+        "/api/webhooks/cal",
+        content=json.dumps({"triggerEvent": "MEETING_ENDED", "bookingId": 1}),
+        headers={"Content-Type": "application/json"},
+    )
+
+    response = client.get("/api/internal/metrics", headers=system_auth_headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert (
+        'serx_http_request_duration_seconds_count{method="GET",route="/api/meetings",status="200"}'
+        in body
+    )
+    assert 'serx_postgrest_call_duration_seconds_count{operation="select",table="meetings"}' in body
+    assert 'serx_webhook_events_total{source="cal",trigger="MEETING_ENDED"}' in body
+
+
+def test_webhook_triggers_are_allowlisted_and_recorded_after_verification(
+    client: TestClient, fake_supabase
+) -> None:
+    client.post(
+        "/api/webhooks/calcom",
+        content=json.dumps({"triggerEvent": "made-up-trigger-1"}),
+        headers={"Content-Type": "application/json"},
+    )
+    ignored = client.post(
+        "/api/webhooks/stripe",
+        content=json.dumps({"type": "made-up-trigger-2"}),
+        headers={"Content-Type": "application/json", "stripe-signature": "t=1,v1=bogus"},
+    )
+
+    body = render_metrics().decode()
+
+    assert ignored.json() == {"status": "ignored", "event": "made-up-trigger-2"}
+    assert 'serx_webhook_events_total{source="calcom_legacy",trigger="other"}' in body
+    assert "made-up-trigger" not in body
+    assert 'source="stripe"' not in body
+
+
+def test_scheduler_outcomes_skip_zero_counts() -> None:
+    record_scheduler_outcomes("test_event_due", dispatched=2, no_route=0, failed=1)
+
+    body = render_metrics().decode()
+
+    series = 'serx_scheduler_dispatch_total{event_name="test_event_due",outcome='
+    assert series + '"dispatched"} 2.0' in body
+    assert series + '"failed"} 1.0' in body
+    assert 'event_name="test_event_due",outcome="no_route"' not in body
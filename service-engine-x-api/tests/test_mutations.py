@@ -0,0 +1,107 @@
+"""Tests for single-round-trip conditional mutations."""
+
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app.database import get_supabase
+from app.utils.mutations import expected_version, update_owned
+from tests.query_budget import captured_query_stats
+
+
+def _live_order(store, org_id: str) -> dict:
+    return next(
+        o for o in store.table("orders")
+        if o["org_id"] == org_id and o.get("deleted_at") is None
+    )
+
+
+def test_delete_is_one_round_trip(
+    client: TestClient, fake_supabase, system_auth_headers, org_scope
+) -> None:
+    store, seeded = fake_supabase
+    order = _live_order(store, seeded.org_id)
+
+    url = f"/api/orders/{order['id']}?{org_scope}"
+
+    with captured_query_stats() as seen:
+        response = client.delete(url, headers=system_auth_headers)
+
+    assert response.status_code == 204
+    assert order["deleted_at"] is not None
+    [(_, stats)] = seen
+    assert stats.by_table() == {"orders": 1}
+
+    again = client.delete(url, headers=system_auth_headers)
+    assert again.status_code == 404
+
+
+def test_delete_of_other_orgs_row_is_404(
+    client: TestClient, fake_supabase, system_auth_headers, org_scope
+) -> None:
+    store, seeded = fake_supabase
+    order = dict(_live_order(store, seeded.org_id), id=str(uuid.uuid4()), org_id=str(uuid.uuid4()))
+    store.insert("orders", [order])
+    order = store.table("orders")[-1]
+
+    response = client.delete(f"/api/orders/{order['id']}?{org_scope}", headers=system_auth_headers)
+
+    assert response.status_code == 404
+    assert order.get("deleted_at") is None
+
+
+def test_update_with_stale_if_match_is_412(
+    client: TestClient, fake_supabase, system_auth_headers, org_scope
+) -> None:
+    store, seeded = fake_supabase
+    order = _live_order(store, seeded.org_id)
+    url = f"/api/orders/{order['id']}?{org_scope}"
+
+    stale = client.put(
+        url,
+        json={"note": "stale"},
+        headers={**system_auth_headers, "If-Match": '"1999-01-01T00:00:00+00:00"'},
+    )
+    assert stale.status_code == 412
+    assert order["note"] != "stale"
+
+    fresh = client.put(
+        url,
+        json={"note": "fresh"},
+        headers={**system_auth_headers, "If-Match": f'"{order["updated_at"]}"'},
+    )
+    assert fresh.status_code == 200
+    assert order["note"] == "fresh"
+
+
+def test_advance_phase_is_compare_and_set(
+    client: TestClient, fake_supabase, system_auth_headers, org_scope
+) -> None:
+    store, seeded = fake_supabase
+    now = datetime.now(UTC).isoformat()
+    [project] = store.insert("projects", [{
+        "id": str(uuid.uuid4()), "org_id": seeded.org_id, "engagement_id": str(uuid.uuid4()),
+        "name": "Rollout", "status": 1, "phase": 2, "created_at": now, "updated_at": now,
+    }])
+    phase = 2
+    url = f"/api/projects/{project['id']}/advance?{org_scope}"
+
+    assert client.post(url, headers=system_auth_headers).json()["phase_id"] == phase + 1
+
+    # A writer that read the old phase loses instead of skipping a phase.
+    with pytest.raises(HTTPException) as lost:
+        update_owned(
+            get_supabase(), "projects", project["id"], seeded.org_id,
+            {"phase": phase + 1}, match={"phase": phase},
+        )
+    assert lost.value.status_code == 409
+    assert project["phase"] == phase + 1
+
+
+def test_expected_version_parses_if_match() -> None:
+    assert expected_version('W/"2024-01-01T00:00:00Z"') == "2024-01-01T00:00:00Z"
+    assert expected_version("*") is None
+    assert expected_version(None) is None
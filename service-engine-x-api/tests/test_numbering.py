@@ -0,0 +1,53 @@
+"""Tests for block-reserved invoice and order numbers."""
+
+import asyncio
+from unittest.mock import patch
+
+from app.services import numbering
+from app.services.numbering import NumberAllocator, next_invoice_number, next_order_number
+
+
+def test_numbers_come_from_reserved_blocks(fake_supabase) -> None:
+    store, _ = fake_supabase
+
+    async def scenario() -> list[str]:
+        return [await next_invoice_number() for _ in range(25)]
+
+    with patch.object(numbering._invoices, "block_size", 10):
+        numbers = asyncio.run(scenario())
+
+    assert numbers[:2] == ["INV-00001", "INV-00002"]
+    assert len(set(numbers)) == 25
+    assert next(s for s in store.table("_sequences") if s["name"] == "invoice")["last_value"] == 30
+
+
+def test_concurrent_allocation_never_repeats(fake_supabase) -> None:
+    allocator = NumberAllocator("order", block_size=3)
+
+    async def scenario() -> list[int]:
+        return list(await asyncio.gather(*(allocator.next() for _ in range(50))))
+
+    numbers = asyncio.run(scenario())
+
+    assert sorted(numbers) == list(range(1, 51))
+
+
+def test_order_number_format(fake_supabase) -> None:
+    assert asyncio.run(next_order_number()) == "ORD-00000001"
+
+
+def test_caller_numbers_cannot_use_the_generated_prefix(
+    client, fake_supabase, system_auth_headers
+) -> None:
+    store, seeded = fake_supabase
+    client_id = next(u["id"] for u in store.table("users") if u["org_id"] == seeded.org_id)
+
+    response = client.post(
+        f"/api/orders?org_id={seeded.org_id}&user_id={seeded.staff_user_id}",
+        json={"user_id": client_id, "service": "Audit", "number": "ORD-00000001"},
+        headers=system_auth_headers,
+    )
+
+    assert response.status_code == 400
+    assert "number" in response.json()["errors"]
+    assert not any(o["number"] == "ORD-00000001" for o in store.table("orders"))
@@ -0,0 +1,93 @@
+"""Tests for the on-demand sampling profiler."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.observability.profiler import ProfilerRateLimitedError, SamplingProfiler
+from app.routers import internal_debug
+
+
+def _spin_until(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(i * i for i in range(1000))
+
+
+def test_profile_collects_busy_thread_and_loop_lag() -> None:
+    profiler = SamplingProfiler(cooldown=60)
+    stop = threading.Event()
+    worker = threading.Thread(target=_spin_until, args=(stop,), name="busy-worker")
+    worker.start()
+
+    async def run():
+        async def block_loop() -> None:
+            await asyncio.sleep(0.05)
+            time.sleep(0.1)  # holds the event loop
+
+        blocker = asyncio.create_task(block_loop())
+        result = await profiler.profile(0.3, interval=0.005)
+        await blocker
+        return result
+
+    try:
+        result = asyncio.run(run())
+    finally:
+        stop.set()
+        worker.join()
+
+    assert result.samples > 10
+    assert any(line.startswith("busy-worker;") for line in result.collapsed().splitlines())
+    assert "_spin_until (" in result.collapsed()
+    assert result.loop_lag_summary()["max_ms"] >= 50
+
+    with pytest.raises(ProfilerRateLimitedError):
+        asyncio.run(profiler.profile(0.01))
+
+
+@pytest.fixture
+def fresh_profiler(monkeypatch: pytest.MonkeyPatch) -> SamplingProfiler:
+    profiler = SamplingProfiler(cooldown=60)
+    monkeypatch.setattr(internal_debug, "profiler", profiler)
+    return profiler
+
+
+def test_profile_endpoint_is_rate_limited(
+    client: TestClient, system_auth_headers, fresh_profiler
+) -> None:
+    response = client.post(
+        "/api/internal/debug/profile",
+        params={"seconds": 0.1, "interval_ms": 5, "format": "collapsed"},
+        headers=system_auth_headers,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+
+    again = client.post(
+        "/api/internal/debug/profile", params={"seconds": 0.1}, headers=system_auth_headers
+    )
+    assert again.status_code == 429
+    assert int(again.headers["Retry-After"]) > 0
+
+
+def test_profile_endpoint_json_and_limits(
+    client: TestClient, system_auth_headers, fresh_profiler
+) -> None:
+    too_long = client.post(
+        "/api/internal/debug/profile", params={"seconds": 3600}, headers=system_auth_headers
+    )
+    assert too_long.status_code == 400
+
+    response = client.post(
+        "/api/internal/debug/profile", params={"seconds": 0.1}, headers=system_auth_headers
+    )
+    body = response.json()
+    assert response.status_code == 200
+    assert body["samples"] > 0
+    assert set(body["loop_lag"]) == {"samples", "max_ms", "p50_ms", "p99_ms"}
+
+
+def test_profile_requires_auth(client: TestClient) -> None:
+    assert client.post("/api/internal/debug/profile").status_code == 401
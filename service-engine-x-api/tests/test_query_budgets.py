@@ -0,0 +1,181 @@
+"""Supabase round-trip budgets for hot endpoints.
+
+Each test drives one endpoint against the seeded ``fake_supabase`` stand-in and
+declares the most PostgREST/Storage calls a single request may make. Budgets
+are ceilings for today's query shapes: tighten them when an endpoint gets
+cheaper, never raise one to make an N+1 regression pass.
+"""
+
+import json
+import time
+from collections.abc import Iterator
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.observability import instrument_http_client, track_queries
+from tests.query_budget import captured_query_stats
+
+PAGE = 20
+
+# list_orders / list_tickets: count + page, then one query per relation for the
+# whole page (clients, employee links, employee profiles, tag links, tag names).
+LIST_BUDGET = 7
+
+
+@pytest.mark.query_budget(LIST_BUDGET)
+def test_list_orders(client: TestClient, fake_supabase, system_auth_headers, org_scope) -> None:
+    response = client.get(f"/api/orders?{org_scope}&limit={PAGE}", headers=system_auth_headers)
+    assert response.status_code == 200
+    assert len(response.json()["data"]) == PAGE
+
+
+@pytest.mark.query_budget(6)
+def test_retrieve_order(client: TestClient, fake_supabase, system_auth_headers, org_scope) -> None:
+    store, _ = fake_supabase
+    order_id = store.table("orders")[0]["id"]
+    response = client.get(f"/api/orders/{order_id}?{org_scope}", headers=system_auth_headers)
+    assert response.status_code == 200
+
+
+@pytest.mark.query_budget(LIST_BUDGET)
+def test_list_tickets(client: TestClient, fake_supabase, system_auth_headers, org_scope) -> None:
+    response = client.get(f"/api/tickets?{org_scope}&limit={PAGE}", headers=system_auth_headers)
+    assert response.status_code == 200
+
+
+def test_list_pages_match_detail_views(
+    client: TestClient, fake_supabase, system_auth_headers, org_scope
+) -> None:
+    """Batch-loaded relations on list pages are the ones the detail views load."""
+    for resource in ("orders", "tickets"):
+        page = client.get(
+            f"/api/{resource}?{org_scope}&limit={PAGE}", headers=system_auth_headers
+        ).json()["data"]
+        for item in page:
+            detail = client.get(
+                f"/api/{resource}/{item['id']}?{org_scope}", headers=system_auth_headers
+            ).json()
+            for field in ("client", "employees"):
+                assert item[field] == detail[field]
+            assert sorted(item["tags"]) == sorted(detail["tags"])
+
+
+@pytest.mark.query_budget(2)
+def test_list_meetings(client: TestClient, fake_supabase, system_auth_headers, org_scope) -> None:
+    response = client.get(f"/api/meetings?{org_scope}&limit=100", headers=system_auth_headers)
+    assert response.status_code == 200
+
+
+@pytest.mark.query_budget(2)
+def test_public_proposal(client: TestClient, fake_supabase) -> None:
+    _, seeded = fake_supabase
+    response = client.get(f"/api/public/proposals/{seeded.sent_proposal_ids[0]}")
+    assert response.status_code == 200
+
+
+# Includes the order number block reservation (one reserve_numbers call per
+# NUMBER_BLOCK_SIZE orders; this is the first order of the worker).
+@pytest.mark.query_budget(22)
+def test_public_sign_proposal(client: TestClient, fake_supabase) -> None:
+    _, seeded = fake_supabase
+    body = {
+        "signed_html": "<html><body><p>Scope of work</p></body></html>",
+        "signature": "data:image/png;base64,AAAA",
+        "signer_name": "Pat Prospect",
+        "signer_email": "pat@prospect.test",
+    }
+    with patch("app.routers.proposals.generate_pdf_docraptor", return_value=b"%PDF-1.4 test"):
+        response = client.post(
+            f"/api/public/proposals/{seeded.sent_proposal_ids[0]}/sign", json=body
+        )
+    assert response.status_code == 200
+
+
+# Independent of the attendee count: meeting lookups, accounts for every
+# attendee domain (lookup + one bulk insert), one contacts upsert, the insert,
+# then account/deal context and marking the rescheduled meeting.
+@pytest.mark.query_budget(10)
+def test_create_meeting_from_cal_event(
+    client: TestClient, fake_supabase, system_auth_headers
+) -> None:
+    _, seeded = fake_supabase
+    body = {
+        "title": "Intro",
+        "start_time": "2026-01-01T10:00:00Z",
+        "end_time": "2026-01-01T10:30:00Z",
+        "cal_event_uid": "budget-meeting",
+        "rescheduled_from_uid": "uid-1",
+        "attendees": [
+            {"name": f"Guest {i}", "email": f"guest{i}@prospect{i % 3}.test"} for i in range(10)
+        ],
+    }
+    response = client.post(
+        f"/api/internal/orgs/{seeded.org_id}/meetings/from-cal-event",
+        json=body,
+        headers=system_auth_headers,
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.query_budget(2)
+def test_cal_webhook(
+    client: TestClient, fake_supabase, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "CAL_WEBHOOK_SECRET", "")
+    body = {
+        "triggerEvent": "BOOKING_CREATED",
+        "createdAt": "2026-01-01T09:00:00Z",
+        "payload": {
+            "uid": "budget-test",
+            "title": "Intro call",
+            "startTime": "2026-01-01T10:00:00Z",
+            "endTime": "2026-01-01T10:30:00Z",
+            "attendees": [{"email": "guest@prospect.test", "name": "Guest"}],
+        },
+    }
+    response = client.post(
+        "/api/webhooks/cal", content=json.dumps(body), headers={"Content-Type": "application/json"}
+    )
+    assert response.status_code == 200
+
+
+def test_round_trips_are_attributed_to_the_route(
+    client: TestClient, fake_supabase, system_auth_headers, org_scope
+) -> None:
+    """Observers get the route template and one record per PostgREST call."""
+    with captured_query_stats() as seen:
+        client.get(f"/api/meetings?{org_scope}&limit=5", headers=system_auth_headers)
+
+    [(endpoint, stats)] = seen
+    assert endpoint == "GET /api/meetings"
+    assert stats.count >= 1
+    assert stats.by_table()["meetings"] >= 1
+    assert all(record.status == 200 and record.elapsed_ms >= 0 for record in stats.records)
+
+
+def test_round_trip_time_includes_the_body() -> None:
+    """A slow page body counts towards the round trip, not just the headers."""
+
+    class SlowBody(httpx.SyncByteStream):
+        def __iter__(self) -> Iterator[bytes]:
+            for chunk in (b"[", b"]"):
+                time.sleep(0.05)
+                yield chunk
+
+    session = httpx.Client(
+        base_url="https://primary.test/rest/v1/",
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, stream=SlowBody())),
+    )
+    instrument_http_client(session)
+    instrument_http_client(session)  # idempotent
+
+    with track_queries() as stats:
+        assert session.get("orders").json() == []
+
+    [record] = stats.records
+    assert (record.table, record.status) == ("orders", 200)
+    assert record.elapsed_ms >= 100
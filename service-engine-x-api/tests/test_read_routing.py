@@ -0,0 +1,139 @@
+"""Tests for read-replica routing and the read-your-writes window."""
+
+import asyncio
+from collections.abc import Iterator
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.cache import Cache, MemoryBackend
+from app.config import settings
+from app.database import get_supabase
+from app.main import app
+from app.read_routing import (
+    ReadRoutingMiddleware,
+    RecentWriters,
+    read_routing,
+    route_reads_to_replica,
+)
+from benchmarks.fake_supabase import FakeStore, FakeSupabaseServer
+
+
+@pytest.fixture
+def replica(
+    fake_supabase, monkeypatch: pytest.MonkeyPatch
+) -> Iterator[tuple[FakeStore, FakeStore]]:
+    """A second server over the same rows, counting its own requests."""
+    primary, _ = fake_supabase
+    mirror = FakeStore(
+        tables=primary.tables,
+        unique=primary.unique,
+        relations=primary.relations,
+        rpcs=primary.rpcs,
+        lock=primary.lock,
+    )
+    with FakeSupabaseServer(mirror) as server:
+        monkeypatch.setattr(settings, "SERVICE_ENGINE_X_SUPABASE_READ_URL", server.url)
+        get_supabase.cache_clear()
+        primary.requests = 0
+        try:
+            yield primary, mirror
+        finally:
+            get_supabase.cache_clear()
+
+
+@pytest.fixture
+def routed_client() -> TestClient:
+    """The app behind the middleware ``app.main`` installs when a replica is configured."""
+    return TestClient(
+        ReadRoutingMiddleware(app, read_your_writes_seconds=settings.READ_YOUR_WRITES_SECONDS)
+    )
+
+
+def _sign(client: TestClient, proposal_id: str, headers: dict[str, str]) -> None:
+    body = {
+        "signed_html": "<html><body><p>Scope of work</p></body></html>",
+        "signature": "data:image/png;base64,AAAA",
+        "signer_name": "Pat Prospect",
+        "signer_email": "pat@prospect.test",
+    }
+    with patch("app.routers.proposals.generate_pdf_docraptor", return_value=b"%PDF-1.4 test"):
+        response = client.post(
+            f"/api/public/proposals/{proposal_id}/sign", json=body, headers=headers
+        )
+    assert response.status_code == 200
+
+
+def test_get_requests_read_from_replica(
+    routed_client: TestClient, fake_supabase, replica
+) -> None:
+    _, seeded = fake_supabase
+    primary, mirror = replica
+
+    response = routed_client.get(
+        f"/api/public/proposals/{seeded.sent_proposal_ids[0]}",
+        headers={"Authorization": "Bearer reader"},
+    )
+
+    assert response.status_code == 200
+    assert mirror.requests > 0
+    assert primary.requests == 0
+
+
+def test_mutations_use_primary_then_read_your_writes(
+    routed_client: TestClient, fake_supabase, replica
+) -> None:
+    client = routed_client
+    _, seeded = fake_supabase
+    primary, mirror = replica
+    proposal_id = seeded.sent_proposal_ids[0]
+    writer = {"Authorization": "Bearer writer"}
+
+    _sign(client, proposal_id, writer)
+    assert mirror.requests == 0
+
+    primary.requests = 0
+    client.get(f"/api/public/proposals/{proposal_id}", headers=writer)
+    assert primary.requests > 0 and mirror.requests == 0
+
+    client.get(f"/api/public/proposals/{proposal_id}", headers={"Authorization": "Bearer other"})
+    assert mirror.requests > 0
+
+
+def test_recent_writers_window_expires() -> None:
+    backend = MemoryBackend()
+    writers = RecentWriters(window=5, cache=Cache("test_writers", ttl=5, backend=backend))
+    # Another worker sharing the backend sees the same window.
+    other_worker = RecentWriters(window=5, cache=Cache("test_writers", ttl=5, backend=backend))
+    with patch("app.cache.memory.time.monotonic", return_value=100.0):
+        asyncio.run(writers.mark(b"caller"))
+        assert asyncio.run(other_worker.is_recent(b"caller"))
+        assert not asyncio.run(other_worker.is_recent(b"someone-else"))
+    with patch("app.cache.memory.time.monotonic", return_value=105.0):
+        assert not asyncio.run(other_worker.is_recent(b"caller"))
+
+
+def test_middleware_is_not_installed_without_a_replica() -> None:
+    assert not settings.SERVICE_ENGINE_X_SUPABASE_READ_URL
+    assert all(m.cls is not ReadRoutingMiddleware for m in app.user_middleware)
+
+
+def test_replica_path_replaces_the_primary_path() -> None:
+    seen: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(str(request.url))
+        return httpx.Response(200, json=[])
+
+    session = httpx.Client(
+        base_url="https://primary.test/rest/v1/", transport=httpx.MockTransport(handler)
+    )
+    route_reads_to_replica(
+        session, url="https://replica.test:8443/db", key="k", primary_url="https://primary.test"
+    )
+    with read_routing(replica_allowed=True):
+        session.get("orders", params={"select": "*"})
+
+    assert seen == ["https://replica.test:8443/db/rest/v1/orders?select=%2A"]
@@ -0,0 +1,98 @@
+"""Tests for the trusted-row list serialization path."""
+
+import json
+
+from fastapi.encoders import jsonable_encoder
+
+from app.models.invoices import InvoiceListItem
+from app.models.meetings import MeetingListResponse
+from app.routers.invoices import serialize_invoice_list_item
+from app.routers.meetings import _base_meeting_dict, serialize_meeting_list
+from app.utils.json_codec import dumps
+from app.utils.serialization import dump_trusted_list, trusted_page_response
+
+MEETING_ROW = {
+    "id": "00000000-0000-0000-0000-000000000010",
+    "org_id": "00000000-0000-0000-0000-000000000001",
+    "account_id": "00000000-0000-0000-0000-000000000020",
+    "contact_id": None,
+    "deal_id": None,
+    "cal_booking_id": 42,
+    "title": "Intro call",
+    "start_time": "2026-01-01T10:00:00+00:00",
+    "end_time": "2026-01-01T10:30:00+00:00",
+    "status": "scheduled",
+    "attendee_emails": ["guest@example.com"],
+    "account": [
+        {"id": "00000000-0000-0000-0000-000000000020", "name": "Acme", "lifecycle": "lead"}
+    ],
+    "contact": None,
+    "deal": {"id": "d1", "title": "Pilot", "status": "open", "value": 1200},
+    "created_at": "2025-12-30T09:00:00+00:00",
+    "updated_at": "2025-12-31T09:00:00+00:00",
+    "notes": "not part of the list payload",
+}
+
+INVOICE_ROW = {
+    "id": "inv-1",
+    "number": "INV-00001",
+    "status": 1,
+    "created_at": "2026-01-01T00:00:00+00:00",
+    "total": 250,
+    "subtotal": "250",
+    "recurring": None,
+    "users": {"id": "u1", "name_f": "Sam", "name_l": None, "email": "sam@example.com"},
+    "invoice_items": [
+        {
+            "id": "item-1",
+            "invoice_id": "inv-1",
+            "name": "Setup",
+            "quantity": 1,
+            "amount": 250,
+            "total": 250,
+        }
+    ],
+}
+
+
+def test_trusted_meeting_list_matches_validated_output() -> None:
+    """The trusted path renders the same JSON as validate + model_dump + encoder."""
+    model = MeetingListResponse(**_base_meeting_dict(MEETING_ROW))
+    validated = jsonable_encoder(model.model_dump())
+
+    trusted = json.loads(
+        dumps(dump_trusted_list(MeetingListResponse, [serialize_meeting_list(MEETING_ROW)]))
+    )
+
+    assert trusted == [validated]
+    assert "notes" not in trusted[0]
+
+
+def test_trusted_invoice_list_matches_response_model_output() -> None:
+    """Nested constructed models (client, items) serialize like validated ones."""
+    validated = InvoiceListItem.model_validate(
+        serialize_invoice_list_item(INVOICE_ROW).model_dump()
+    ).model_dump(mode="json")
+
+    trusted = json.loads(
+        dumps(dump_trusted_list(InvoiceListItem, [serialize_invoice_list_item(INVOICE_ROW)]))
+    )
+
+    assert trusted == [validated]
+
+
+def test_trusted_page_response_embeds_data_in_envelope() -> None:
+    response = trusted_page_response(
+        MeetingListResponse,
+        [serialize_meeting_list(MEETING_ROW)],
+        {"data": [], "meta": {"total": 1}},
+    )
+
+    body = json.loads(response.body)
+    assert list(body) == ["data", "meta"]
+    assert body["data"][0]["account"] == {
+        "id": "00000000-0000-0000-0000-000000000020",
+        "name": "Acme",
+        "lifecycle": "lead",
+    }
+    assert body["data"][0]["deal"]["amount"] == "1200.00"
@@ -0,0 +1,65 @@
+"""Tests for the production serve entrypoint."""
+
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+from app import serve
+from app.config import settings
+
+
+def test_available_cpus_honours_cgroup_quota(tmp_path: Path) -> None:
+    cpu_max = tmp_path / "cpu.max"
+
+    cpu_max.write_text("200000 100000\n")
+    with patch.object(serve.os, "sched_getaffinity", return_value=set(range(8))):
+        assert serve.available_cpus(str(cpu_max)) == 2
+
+        cpu_max.write_text("max 100000\n")
+        assert serve.available_cpus(str(cpu_max)) == 8
+
+        cpu_max.write_text("50000 100000\n")
+        assert serve.available_cpus(str(cpu_max)) == 1
+
+        assert serve.available_cpus(str(tmp_path / "missing")) == 8
+
+
+def test_worker_count_override() -> None:
+    with patch.object(settings, "SERVE_WORKERS", 3):
+        assert serve.worker_count() == 3
+    with (
+        patch.object(settings, "SERVE_WORKERS", 0),
+        patch.object(serve, "available_cpus", return_value=4),
+    ):
+        assert serve.worker_count() == 4
+
+
+def test_uvicorn_options_come_from_settings() -> None:
+    with patch.object(settings, "SERVE_MAX_REQUESTS", 0), patch.object(settings, "PORT", 9123):
+        options = serve.uvicorn_options(2)
+
+    assert options["workers"] == 2
+    assert options["port"] == 9123
+    assert options["loop"] == "uvloop"
+    assert options["http"] == "httptools"
+    assert options["limit_max_requests"] is None
+
+
+def test_multiprocess_metrics_dir_prepared_for_several_workers(tmp_path: Path, monkeypatch) -> None:
+    stale = tmp_path / "prom"
+    stale.mkdir()
+    (stale / "counter_1.db").write_text("old")
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(stale))
+
+    serve._prepare_multiprocess_metrics(2)
+
+    assert list(stale.iterdir()) == []
+
+
+def test_serve_does_not_import_the_app() -> None:
+    # Workers must build their clients themselves, after the supervisor starts them.
+    probe = "import sys, app.serve; print('app.main' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+
+    assert out.stdout.strip() == "False"
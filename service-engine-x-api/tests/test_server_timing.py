@@ -0,0 +1,83 @@
+"""Tests for the Server-Timing header and outbound call timing."""
+
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.observability import OutboundCall, QueryRecord, QueryStats, render_server_timing
+
+
+def test_render_server_timing() -> None:
+    stats = QueryStats(
+        records=[QueryRecord("GET", "orders", 200, 10.0), QueryRecord("GET", "users", 200, 5.0)],
+        outbound=[
+            OutboundCall("docraptor", 80.0),
+            OutboundCall("resend", 3.0),
+            OutboundCall("resend", 2.0),
+        ],
+    )
+
+    assert render_server_timing(stats, 120.0) == (
+        'db;dur=15.0;desc="2 calls", docraptor;dur=80.0, resend;dur=5.0;desc="2 calls", '
+        "app;dur=20.0, total;dur=120.0"
+    )
+
+
+def test_authenticated_request_gets_breakdown(
+    client: TestClient, fake_supabase, system_auth_headers
+) -> None:
+    _, seeded = fake_supabase
+    response = client.get(
+        f"/api/meetings?org_id={seeded.org_id}&user_id={seeded.staff_user_id}&limit=5",
+        headers=system_auth_headers,
+    )
+
+    assert response.status_code == 200
+    assert response.headers["Server-Timing"].startswith('db;dur=')
+    assert 'desc="2 calls"' in response.headers["Server-Timing"]
+
+
+def test_public_requests_are_sampled(client: TestClient, fake_supabase) -> None:
+    _, seeded = fake_supabase
+    url = f"/api/public/proposals/{seeded.sent_proposal_ids[0]}"
+
+    with patch("app.observability.server_timing.random.random", return_value=0.99):
+        assert "Server-Timing" not in client.get(url).headers
+    with patch("app.observability.server_timing.random.random", return_value=0.0):
+        assert "Server-Timing" in client.get(url).headers
+
+
+def test_unverified_authorization_is_sampled(client: TestClient, fake_supabase) -> None:
+    _, seeded = fake_supabase
+    url = f"/api/public/proposals/{seeded.sent_proposal_ids[0]}"
+
+    junk = {"Authorization": "Bearer junk"}
+
+    with patch("app.observability.server_timing.random.random", return_value=0.99):
+        assert "Server-Timing" not in client.get(url, headers=junk).headers
+        rejected = client.get("/api/internal/metrics", headers=junk)
+
+    assert rejected.status_code == 401
+    assert "Server-Timing" not in rejected.headers
+
+
+def test_outbound_calls_are_reported(client: TestClient, fake_supabase) -> None:
+    _, seeded = fake_supabase
+    body = {
+        "signed_html": "<html><body><p>Scope of work</p></body></html>",
+        "signature": "data:image/png;base64,AAAA",
+        "signer_name": "Pat Prospect",
+        "signer_email": "pat@prospect.test",
+    }
+    with (
+        patch("app.routers.proposals.settings.DOCRAPTOR_API_KEY", "test-key"),
+        patch("docraptor.DocApi") as doc_api,
+        patch("app.observability.server_timing.random.random", return_value=0.0),
+    ):
+        doc_api.return_value.create_doc.return_value = b"%PDF-1.4 test"
+        response = client.post(
+            f"/api/public/proposals/{seeded.sent_proposal_ids[0]}/sign", json=body
+        )
+
+    assert response.status_code == 200
+    assert "docraptor;dur=" in response.headers["Server-Timing"]
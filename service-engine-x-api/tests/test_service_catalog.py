@@ -0,0 +1,120 @@
+"""Tests for the per-org service catalog cache."""
+
+import asyncio
+from collections.abc import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services import service_catalog
+from tests.query_budget import captured_query_stats
+
+
+@pytest.fixture(autouse=True)
+def empty_catalog() -> Iterator[None]:
+    asyncio.run(service_catalog._catalog.invalidate_all())
+    yield
+    asyncio.run(service_catalog._catalog.invalidate_all())
+
+
+def _add_services(store, org_id: str, count: int, *, deleted: int = 0) -> list[dict]:
+    rows = [
+        {
+            "org_id": org_id,
+            "name": f"Service {i}",
+            "description": None,
+            "recurring": 0,
+            "price": 100 + i,
+            "currency": "USD",
+            "public": True,
+            "created_at": f"2025-01-{i + 1:02d}T00:00:00+00:00",
+            "deleted_at": "2025-02-01T00:00:00+00:00" if i < deleted else None,
+        }
+        for i in range(count)
+    ]
+    return store.insert("services", rows)
+
+
+def _service_queries(seen) -> list[int]:
+    """Number of ``services`` round trips made by each request, in order."""
+    return [stats.by_table()["services"] for _, stats in seen]
+
+
+def test_reads_and_validation_share_one_catalog_load(
+    client: TestClient, fake_supabase, system_auth_headers, org_scope
+) -> None:
+    store, seeded = fake_supabase
+    service = _add_services(store, seeded.org_id, 3)[0]
+
+    with captured_query_stats() as seen:
+        listed = client.get(f"/api/services?{org_scope}", headers=system_auth_headers)
+        retrieved = client.get(
+            f"/api/services/{service['id']}?{org_scope}", headers=system_auth_headers
+        )
+        internal = client.get(
+            f"/api/internal/orgs/{seeded.org_id}/services", headers=system_auth_headers
+        )
+
+    assert listed.status_code == 200
+    assert retrieved.status_code == 200
+    assert retrieved.json()["id"] == service["id"]
+    assert internal.status_code == 200
+    assert _service_queries(seen) == [1, 0, 0]
+
+
+def test_list_matches_database_order_and_pagination(
+    client: TestClient, fake_supabase, system_auth_headers, org_scope
+) -> None:
+    store, seeded = fake_supabase
+    live = _add_services(store, seeded.org_id, 5, deleted=1)[1:]
+    expected = sorted(live, key=lambda s: s["created_at"], reverse=True)[:2]
+
+    response = client.get(f"/api/services?{org_scope}&limit=2", headers=system_auth_headers)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [s["id"] for s in body["data"]] == [s["id"] for s in expected]
+    assert body["meta"]["total"] == len(live)
+
+
+def test_writes_invalidate_the_catalog(
+    client: TestClient, fake_supabase, system_auth_headers, org_scope
+) -> None:
+    url = f"/api/services?{org_scope}"
+
+    with captured_query_stats() as seen:
+        client.get(url, headers=system_auth_headers)
+        created = client.post(
+            url,
+            json={"name": "Fresh Audit", "recurring": 0, "currency": "usd"},
+            headers=system_auth_headers,
+        )
+        assert created.status_code == 201
+        service_id = created.json()["id"]
+
+        listed = client.get(f"{url}&limit=100", headers=system_auth_headers)
+        assert service_id in {s["id"] for s in listed.json()["data"]}
+
+        client.delete(f"/api/services/{service_id}?{org_scope}", headers=system_auth_headers)
+        gone = client.get(f"/api/services/{service_id}?{org_scope}", headers=system_auth_headers)
+        assert gone.status_code == 404
+
+    # The list after each write reloads the catalog exactly once.
+    assert _service_queries(seen)[2] == 1
+
+
+def test_order_validation_uses_catalog(
+    client: TestClient, fake_supabase, system_auth_headers, org_scope
+) -> None:
+    store, seeded = fake_supabase
+    other_org_id = next(o["id"] for o in store.table("organizations") if o["id"] != seeded.org_id)
+    other_org_service = _add_services(store, other_org_id, 1)[0]
+
+    response = client.post(
+        f"/api/orders?{org_scope}",
+        json={"service_id": other_org_service["id"], "user_id": seeded.staff_user_id},
+        headers=system_auth_headers,
+    )
+
+    assert response.status_code == 422
+    assert response.json()["errors"] == {"service_id": ["The specified service does not exist."]}
@@ -0,0 +1,91 @@
+"""Tests for the slow-request recorder and its internal API."""
+
+from collections.abc import Iterator
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.observability import OutboundCall, QueryRecord, QueryStats
+from app.observability.slow_requests import SlowRequestRecorder, get_slow_request_recorder
+
+
+def _stats(duration_ms: float, **params: str) -> QueryStats:
+    stats = QueryStats(started_at=100.0, route="/api/things/{thing_id}", params=params)
+    stats.records = [
+        QueryRecord("GET", "things", 200, 4.0, started_at=100.010),
+        QueryRecord("PATCH", "things", 200, 6.0, started_at=100.050),
+    ]
+    stats.outbound = [OutboundCall("stripe", 30.0, started_at=100.015)]
+    stats.status_code = 200
+    stats.duration_ms = duration_ms
+    return stats
+
+
+def test_keeps_slowest_per_route_with_ordered_call_graph() -> None:
+    recorder = SlowRequestRecorder(threshold_ms=100, per_route=2)
+    for duration in (50, 150, 300, 120, 200):
+        recorder.observe("GET /api/things/{thing_id}", _stats(duration, thing_id="t1", api_key="k"))
+
+    entries = recorder.entries()
+
+    assert [entry["duration_ms"] for entry in entries] == [300, 200]
+    assert entries[0]["params"] == {"thing_id": "t1", "api_key": "[redacted]"}
+    assert [(call["kind"], call["target"], call["offset_ms"]) for call in entries[0]["calls"]] == [
+        ("db", "things", 10.0),
+        ("outbound", "stripe", 15.0),
+        ("db", "things", 50.0),
+    ]
+
+
+def test_bounds_number_of_routes() -> None:
+    recorder = SlowRequestRecorder(threshold_ms=0, per_route=1, max_routes=2)
+    for name in ("a", "b", "c"):
+        recorder.observe(f"GET /api/{name}", _stats(10))
+
+    assert [entry["endpoint"] for entry in recorder.entries()] == ["GET /api/c", "GET /api/b"]
+
+
+@pytest.fixture
+def record_everything() -> Iterator[SlowRequestRecorder]:
+    recorder = get_slow_request_recorder()
+    assert recorder is not None
+    threshold = recorder.threshold_ms
+    recorder.threshold_ms = 0
+    recorder.clear()
+    yield recorder
+    recorder.threshold_ms = threshold
+    recorder.clear()
+
+
+def test_slow_requests_endpoint(
+    client: TestClient, fake_supabase, system_auth_headers, record_everything
+) -> None:
+    _, seeded = fake_supabase
+    body = {
+        "signed_html": "<html><body><p>Scope</p></body></html>",
+        "signature": "data:image/png;base64,AAAA",
+        "signer_name": "Pat Prospect",
+        "signer_email": "pat@prospect.test",
+    }
+    with patch("app.routers.proposals.generate_pdf_docraptor", return_value=b"%PDF-1.4 test"):
+        client.post(
+            f"/api/public/proposals/{seeded.sent_proposal_ids[0]}/sign?token=abc", json=body
+        )
+
+    response = client.get(
+        "/api/internal/debug/slow-requests",
+        params={"endpoint": "POST /api/public/proposals/{proposal_id}/sign"},
+        headers=system_auth_headers,
+    )
+
+    assert response.status_code == 200
+    [entry] = response.json()["data"]
+    assert entry["params"] == {"proposal_id": seeded.sent_proposal_ids[0], "token": "[redacted]"}
+    assert entry["calls"][0]["target"] == "proposals"
+    offsets = [call["offset_ms"] for call in entry["calls"]]
+    assert offsets == sorted(offsets)
+
+
+def test_slow_requests_requires_auth(client: TestClient) -> None:
+    assert client.get("/api/internal/debug/slow-requests").status_code == 401
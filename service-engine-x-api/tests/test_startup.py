@@ -0,0 +1,100 @@
+"""Tests for startup: lazy SDK imports, the prebuilt OpenAPI artifact and warmup."""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.config import settings
+from app.openapi_artifact import FINGERPRINT_KEY, load_openapi_artifact, route_fingerprint
+from app.warmup import warm_up
+
+
+def test_heavy_sdks_are_not_imported_at_startup() -> None:
+    probe = (
+        "import sys, app.main; "
+        "print([m for m in ('stripe', 'docraptor', 'resend') if m in sys.modules])"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", probe],
+        env=dict(os.environ),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert out.stdout.strip() == "[]"
+
+
+def _write_artifact(path: Path, fingerprint: str) -> None:
+    spec = {
+        "openapi": "3.1.0",
+        "info": {"title": "prebuilt", FINGERPRINT_KEY: fingerprint},
+        "paths": {},
+    }
+    path.write_text(json.dumps(spec))
+
+
+def test_artifact_requires_matching_fingerprint(tmp_path: Path) -> None:
+    path = tmp_path / "openapi.json"
+    _write_artifact(path, route_fingerprint(main.app.routes, settings.APP_VERSION))
+
+    assert load_openapi_artifact(str(path), main.app.routes, settings.APP_VERSION) is not None
+    assert load_openapi_artifact(str(path), main.app.routes, "other-version") is None
+    assert load_openapi_artifact(str(tmp_path / "missing.json"), main.app.routes, "1") is None
+    assert load_openapi_artifact("", main.app.routes, settings.APP_VERSION) is None
+
+
+def test_openapi_endpoint_serves_artifact(client: TestClient, tmp_path: Path, monkeypatch) -> None:
+    path = tmp_path / "openapi.json"
+    _write_artifact(path, route_fingerprint(main.app.routes, settings.APP_VERSION))
+    monkeypatch.setattr(settings, "OPENAPI_ARTIFACT_PATH", str(path))
+    main._openapi_artifact.cache_clear()
+    try:
+        response = client.get("/api/openapi.json")
+    finally:
+        main._openapi_artifact.cache_clear()
+
+    assert response.status_code == 200
+    assert response.json()["info"]["title"] == "prebuilt"
+
+
+def test_openapi_endpoint_falls_back_on_stale_artifact(
+    client: TestClient, tmp_path: Path, monkeypatch
+) -> None:
+    path = tmp_path / "openapi.json"
+    _write_artifact(path, "stale")
+    monkeypatch.setattr(settings, "OPENAPI_ARTIFACT_PATH", str(path))
+    main._openapi_artifact.cache_clear()
+    try:
+        response = client.get("/api/openapi.json")
+    finally:
+        main._openapi_artifact.cache_clear()
+
+    assert response.status_code == 200
+    assert response.json()["info"]["title"] == settings.APP_NAME
+
+
+def test_warmup_failures_do_not_block_startup() -> None:
+    with (
+        patch("app.warmup._warm_jwks", side_effect=RuntimeError("jwks down")),
+        patch("app.warmup._warm_supabase", side_effect=RuntimeError("db down")),
+        patch.object(settings, "OPEX_API_URL", ""),
+    ):
+        asyncio.run(warm_up(timeout=1))
+
+
+def test_warmup_is_bounded_by_timeout() -> None:
+    with (
+        patch("app.warmup._warm_jwks", side_effect=lambda: time.sleep(0.5)),
+        patch("app.warmup._warm_supabase"),
+        patch.object(settings, "OPEX_API_URL", ""),
+    ):
+        asyncio.run(warm_up(timeout=0.05))
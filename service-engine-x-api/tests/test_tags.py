@@ -0,0 +1,110 @@
+"""Tests for bulk tag find-or-create and link diffing."""
+
+import asyncio
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database import get_supabase
+from app.services import tags
+from app.services.tags import ORDER_TAGS, replace_tags, resolve_tag_ids
+from tests.query_budget import captured_query_stats
+
+
+@pytest.fixture(autouse=True)
+def empty_tag_cache() -> Iterator[None]:
+    asyncio.run(tags._tag_ids.invalidate_all())
+    yield
+    asyncio.run(tags._tag_ids.invalidate_all())
+
+
+def test_order_tags_cost_one_round_trip(
+    client: TestClient, fake_supabase, system_auth_headers, org_scope
+) -> None:
+    store, seeded = fake_supabase
+    order_id = next(o["id"] for o in store.table("orders") if o["org_id"] == seeded.org_id)
+    names = ["tag-1", "tag-2"] + [f"brand-new-{i}" for i in range(8)]
+    # Start from one kept link and one stale link.
+    tag_id = {t["name"]: t["id"] for t in store.table("tags") if t["org_id"] == seeded.org_id}
+    stale = next(name for name in tag_id if name not in names)
+    links = store.table("order_tags")
+    links[:] = [link for link in links if link["order_id"] != order_id]
+    store.insert(
+        "order_tags", [{"order_id": order_id, "tag_id": tag_id[n]} for n in ("tag-1", stale)]
+    )
+    kept = next(
+        link for link in links
+        if link["order_id"] == order_id and link["tag_id"] == tag_id["tag-1"]
+    )
+    with captured_query_stats() as seen:
+        response = client.put(
+            f"/api/orders/{order_id}?{org_scope}",
+            json={"tags": names},
+            headers=system_auth_headers,
+        )
+
+    assert response.status_code == 200
+    assert sorted(response.json()["tags"]) == sorted(names)
+    [(_, stats)] = seen
+    assert stats.by_table() == {"rpc/update_order_graph": 1}
+    order_links = [link for link in store.table("order_tags") if link["order_id"] == order_id]
+    assert len(order_links) == len(names)
+    assert any(link is kept for link in order_links)
+
+
+def test_concurrent_creates_share_one_tag(fake_supabase) -> None:
+    store, seeded = fake_supabase
+
+    def resolve() -> dict[str, str]:
+        return asyncio.run(resolve_tag_ids(get_supabase(), seeded.org_id, ["launch"]))
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda _: resolve(), range(8)))
+
+    assert len([t for t in store.table("tags") if t["name"] == "launch"]) == 1
+    assert len({r["launch"] for r in results}) == 1
+
+
+def test_each_org_has_its_own_tags(fake_supabase) -> None:
+    store, seeded = fake_supabase
+    other_org_id = "00000000-0000-4000-8000-000000000001"
+
+    async def scenario() -> tuple[dict[str, str], dict[str, str]]:
+        supabase = get_supabase()
+        mine = await resolve_tag_ids(supabase, seeded.org_id, ["tag-1", "launch"])
+        theirs = await resolve_tag_ids(supabase, other_org_id, ["tag-1", "launch"])
+        return mine, theirs
+
+    mine, theirs = asyncio.run(scenario())
+
+    assert set(mine.values()).isdisjoint(theirs.values())
+    rows = [t for t in store.table("tags") if t["name"] in ("tag-1", "launch")]
+    assert sorted((t["org_id"], t["name"]) for t in rows) == sorted(
+        (org, name) for org in (seeded.org_id, other_org_id) for name in ("tag-1", "launch")
+    )
+
+
+def test_replace_only_touches_changed_links(fake_supabase) -> None:
+    store, seeded = fake_supabase
+    order_id = store.table("orders")[0]["id"]
+
+    async def scenario() -> None:
+        supabase = get_supabase()
+        await replace_tags(supabase, ORDER_TAGS, seeded.org_id, order_id, ["keep", "drop"])
+        kept = next(
+            link for link in store.table("order_tags")
+            if link["order_id"] == order_id and link["tag_id"] == store_tag_id("keep")
+        )
+        await replace_tags(supabase, ORDER_TAGS, seeded.org_id, order_id, ["keep", "add", "add"])
+        links = [link for link in store.table("order_tags") if link["order_id"] == order_id]
+        assert sorted(link["tag_id"] for link in links) == sorted(
+            [store_tag_id("keep"), store_tag_id("add")]
+        )
+        assert any(link is kept for link in links)
+
+    def store_tag_id(name: str) -> str:
+        return next(t["id"] for t in store.table("tags") if t["name"] == name)
+
+    asyncio.run(scenario())
@@ -0,0 +1,116 @@
+"""Tests for shared employee validation and the user profile cache."""
+
+import asyncio
+import threading
+from collections.abc import Iterator
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services import user_profiles
+from tests.query_budget import captured_query_stats
+
+
+@pytest.fixture(autouse=True)
+def empty_profiles() -> Iterator[None]:
+    asyncio.run(user_profiles._profiles.invalidate_all())
+    yield
+    asyncio.run(user_profiles._profiles.invalidate_all())
+
+
+def _users(store, seeded, name_f_prefix: str) -> list[dict]:
+    return [
+        u for u in store.table("users")
+        if u["org_id"] == seeded.org_id and u["name_f"].startswith(name_f_prefix)
+    ]
+
+
+def _create_service(client: TestClient, org_scope: str, headers, employees: list[str]):
+    body = {"name": "Audit", "recurring": 0, "currency": "USD", "employees": employees}
+    return client.post(f"/api/services?{org_scope}", json=body, headers=headers)
+
+
+def test_employees_validated_in_one_query_then_cached(
+    client: TestClient, fake_supabase, system_auth_headers, org_scope
+) -> None:
+    store, seeded = fake_supabase
+    staff = [u["id"] for u in _users(store, seeded, "Staff")]
+
+    with captured_query_stats() as seen:
+        first = _create_service(client, org_scope, system_auth_headers, staff)
+        second = _create_service(client, org_scope, system_auth_headers, staff)
+
+    assert first.status_code == 201
+    assert second.status_code == 201
+    assert [stats.by_table()["users"] for _, stats in seen] == [1, 0]
+
+
+def test_clients_and_other_orgs_users_are_not_employees(
+    client: TestClient, fake_supabase, system_auth_headers, org_scope
+) -> None:
+    store, seeded = fake_supabase
+    staff_id = _users(store, seeded, "Staff")[0]["id"]
+    client_id = _users(store, seeded, "Client")[0]["id"]
+    staff_role = _users(store, seeded, "Staff")[0]["role_id"]
+    foreign_id = store.insert(
+        "users",
+        [{"org_id": "other-org", "name_f": "Staff", "name_l": "Elsewhere", "role_id": staff_role}],
+    )[0]["id"]
+
+    for bad_id in (client_id, foreign_id, "not-a-uuid"):
+        response = _create_service(client, org_scope, system_auth_headers, [staff_id, bad_id])
+        assert response.status_code == 422
+        assert response.json()["errors"] == {
+            "employees": [f"Employee with ID {bad_id} does not exist."]
+        }
+
+
+def test_client_delete_invalidates_profile(
+    client: TestClient, fake_supabase, system_auth_headers, org_scope
+) -> None:
+    store, seeded = fake_supabase
+    role_id = _users(store, seeded, "Client")[0]["role_id"]
+    client_id = store.insert(
+        "users",
+        [{"org_id": seeded.org_id, "name_f": "New", "name_l": "Client",
+          "email": "new@client.test", "role_id": role_id}],
+    )[0]["id"]
+
+    async def profile() -> dict | None:
+        return await user_profiles.get_user_profile(seeded.org_id, client_id)
+
+    assert asyncio.run(profile())["email"] == "new@client.test"
+    response = client.delete(f"/api/clients/{client_id}?{org_scope}", headers=system_auth_headers)
+
+    assert response.status_code == 204
+    assert asyncio.run(profile()) is None
+
+
+def test_invalidation_during_load_forces_a_reload(fake_supabase) -> None:
+    store, seeded = fake_supabase
+    user_id = _users(store, seeded, "Staff")[0]["id"]
+    loading, release = threading.Event(), threading.Event()
+    calls = 0
+    original = user_profiles._load
+
+    def slow_load(org_id: str, user_ids: list[str]) -> dict:
+        nonlocal calls
+        calls += 1
+        loading.set()
+        release.wait(5)
+        return original(org_id, user_ids)
+
+    async def scenario() -> None:
+        first = asyncio.create_task(user_profiles.get_user_profiles(seeded.org_id, [user_id]))
+        await asyncio.to_thread(loading.wait, 5)
+        # e.g. the user's role changed while the old row was being read
+        await user_profiles.invalidate_user_profiles(seeded.org_id, user_id)
+        release.set()
+        await first
+        await user_profiles.get_user_profiles(seeded.org_id, [user_id])
+
+    with patch.object(user_profiles, "_load", slow_load):
+        asyncio.run(scenario())
+
+    assert calls == 2
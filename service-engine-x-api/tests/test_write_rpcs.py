@@ -0,0 +1,379 @@
+"""Tests for the transactional create/update functions behind orders, tickets and invoices.
+
+The SQL test runs migrations 026b, 028 and 029 against a local Postgres: set
+``SERX_TEST_DATABASE_URL`` (e.g. ``postgresql://postgres@localhost/postgres``);
+it is skipped otherwise.
+"""
+
+import asyncio
+import json
+import os
+import uuid
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from tests.query_budget import captured_query_stats
+
+MIGRATIONS = Path(__file__).parent.parent / "migrations"
+TEST_DSN = os.environ.get("SERX_TEST_DATABASE_URL", "")
+
+# Just the columns the write functions read and write.
+SCHEMA = """
+CREATE TABLE roles (id UUID PRIMARY KEY, dashboard_access INT);
+CREATE TABLE addresses (
+    id UUID PRIMARY KEY, line_1 TEXT, line_2 TEXT, city TEXT, state TEXT, postcode TEXT,
+    country TEXT
+);
+CREATE TABLE users (
+    id UUID PRIMARY KEY, org_id UUID, name_f TEXT, name_l TEXT, email TEXT, company TEXT,
+    phone TEXT, tax_id TEXT, balance NUMERIC, address_id UUID, role_id UUID
+);
+CREATE TABLE services (id UUID PRIMARY KEY, org_id UUID, deleted_at TIMESTAMPTZ);
+CREATE TABLE orders (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(), org_id UUID, number TEXT, user_id UUID,
+    service_id UUID, service_name TEXT, price NUMERIC, currency TEXT, quantity INT, status INT,
+    note TEXT, form_data JSONB, metadata JSONB, created_at TIMESTAMPTZ, updated_at TIMESTAMPTZ,
+    date_started TIMESTAMPTZ, date_completed TIMESTAMPTZ, date_due TIMESTAMPTZ,
+    deleted_at TIMESTAMPTZ
+);
+CREATE TABLE tags (id UUID PRIMARY KEY DEFAULT gen_random_uuid(), org_id UUID, name TEXT);
+CREATE TABLE order_tags (order_id UUID, tag_id UUID);
+CREATE TABLE order_employees (order_id UUID, employee_id UUID);
+CREATE TABLE tickets (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(), org_id UUID, user_id UUID, subject TEXT,
+    status INT, order_id UUID, note TEXT, metadata JSONB, form_data JSONB, source TEXT,
+    deleted_at TIMESTAMPTZ
+);
+CREATE TABLE ticket_tags (ticket_id UUID, tag_id UUID);
+CREATE TABLE ticket_employees (ticket_id UUID, employee_id UUID);
+CREATE TABLE coupons (id UUID PRIMARY KEY);
+CREATE TABLE invoices (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(), org_id UUID, number TEXT,
+    number_prefix TEXT, user_id UUID, billing_address JSONB, status INT,
+    created_at TIMESTAMPTZ, updated_at TIMESTAMPTZ, date_due TIMESTAMPTZ,
+    date_paid TIMESTAMPTZ, credit NUMERIC, tax NUMERIC, tax_name TEXT, tax_percent NUMERIC,
+    tax_type INT, currency TEXT, reason TEXT, note TEXT, ip_address TEXT, loc_confirm BOOLEAN,
+    recurring JSONB, coupon_id UUID, transaction_id TEXT, paysys TEXT, subtotal NUMERIC,
+    total NUMERIC, employee_id UUID, deleted_at TIMESTAMPTZ
+);
+CREATE TABLE invoice_items (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(), invoice_id UUID, name TEXT,
+    description TEXT, quantity INT, amount NUMERIC, discount NUMERIC, discount2 NUMERIC,
+    total NUMERIC, service_id UUID, order_id UUID, options JSONB
+);
+"""
+
+
+def _people(store, org_id: str) -> tuple[str, str]:
+    """A client id and a staff id in ``org_id``."""
+    users = [u for u in store.table("users") if u["org_id"] == org_id]
+    client_id = next(u["id"] for u in users if u["name_f"].startswith("Client"))
+    staff_id = next(u["id"] for u in users if u["name_f"].startswith("Staff"))
+    return client_id, staff_id
+
+
+def test_create_order_is_one_round_trip(
+    client: TestClient, fake_supabase, system_auth_headers, org_scope
+) -> None:
+    store, seeded = fake_supabase
+    client_id, staff_id = _people(store, seeded.org_id)
+    body = {
+        "user_id": client_id,
+        "service": "Audit",
+        "number": "RPC-1",
+        "employees": [staff_id],
+        "tags": ["tag-1", "rpc-new"],
+    }
+
+    with captured_query_stats() as seen:
+        response = client.post(f"/api/orders?{org_scope}", json=body, headers=system_auth_headers)
+
+    assert response.status_code == 201
+    data = response.json()
+    assert data["client"]["id"] == client_id
+    assert [e["id"] for e in data["employees"]] == [staff_id]
+    assert data["tags"] == ["rpc-new", "tag-1"]
+    [(_, stats)] = seen
+    assert stats.by_table() == {"rpc/create_order_graph": 1}
+
+
+def test_rejected_order_writes_nothing(
+    client: TestClient, fake_supabase, system_auth_headers, org_scope
+) -> None:
+    store, seeded = fake_supabase
+    client_id, _ = _people(store, seeded.org_id)
+    before = {
+        name: len(store.table(name))
+        for name in ("orders", "order_employees", "order_tags", "tags")
+    }
+
+    response = client.post(
+        f"/api/orders?{org_scope}",
+        json={
+            "user_id": client_id, "service": "Audit", "employees": [client_id], "tags": ["never"]
+        },
+        headers=system_auth_headers,
+    )
+
+    assert response.status_code == 422
+    assert response.json() == {
+        "message": "The given data was invalid.",
+        "errors": {"employees": [f"Employee with ID {client_id} does not exist."]},
+    }
+    assert {name: len(store.table(name)) for name in before} == before
+
+    taken = store.table("orders")[0]["number"]
+    duplicate = client.post(
+        f"/api/orders?{org_scope}",
+        json={"user_id": client_id, "service": "Audit", "number": taken},
+        headers=system_auth_headers,
+    )
+    assert duplicate.status_code == 400
+    assert duplicate.json()["errors"] == {"number": ["The order number has already been taken."]}
+
+
+def test_update_order_is_one_transaction(
+    client: TestClient, fake_supabase, system_auth_headers, org_scope
+) -> None:
+    store, seeded = fake_supabase
+    client_id, staff_id = _people(store, seeded.org_id)
+    order = next(o for o in store.table("orders") if o["org_id"] == seeded.org_id)
+    url = f"/api/orders/{order['id']}?{org_scope}"
+    body = {"note": "Rescoped", "employees": [staff_id], "tags": ["tag-1", "rpc-new"]}
+
+    with captured_query_stats() as seen:
+        response = client.put(url, json=body, headers=system_auth_headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["client"]["id"] == order["user_id"]
+    assert [e["id"] for e in data["employees"]] == [staff_id]
+    assert data["tags"] == ["rpc-new", "tag-1"]
+    assert order["note"] == "Rescoped"
+    [(_, stats)] = seen
+    assert stats.by_table() == {"rpc/update_order_graph": 1}
+
+    def links() -> dict[str, list[str]]:
+        return {
+            name: sorted(link[column] for link in store.table(name)
+                         if link["order_id"] == order["id"])
+            for name, column in (("order_employees", "employee_id"), ("order_tags", "tag_id"))
+        }
+
+    before, tag_count = links(), len(store.table("tags"))
+    refused = client.put(
+        url,
+        json={"note": "Lost", "employees": [client_id], "tags": ["never"]},
+        headers=system_auth_headers,
+    )
+    assert refused.status_code == 422
+    assert refused.json()["errors"] == {
+        "employees": [f"Employee with ID {client_id} does not exist."]
+    }
+    assert order["note"] == "Rescoped"
+    assert links() == before
+    assert len(store.table("tags")) == tag_count
+
+    untouched = client.put(url, json={"status": 1}, headers=system_auth_headers)
+    assert [e["id"] for e in untouched.json()["employees"]] == [staff_id]
+    assert untouched.json()["tags"] == ["rpc-new", "tag-1"]
+
+    gone = client.put(
+        f"/api/orders/00000000-0000-4000-8000-000000000000?{org_scope}",
+        json=body,
+        headers=system_auth_headers,
+    )
+    assert gone.status_code == 404
+
+
+def test_create_ticket_returns_the_graph(
+    client: TestClient, fake_supabase, system_auth_headers, org_scope
+) -> None:
+    store, seeded = fake_supabase
+    client_id, staff_id = _people(store, seeded.org_id)
+    order = next(o for o in store.table("orders") if o["org_id"] == seeded.org_id)
+    body = {
+        "user_id": client_id,
+        "subject": "Broken link",
+        "order_id": order["id"],
+        "employees": [staff_id],
+        "tags": ["support"],
+    }
+
+    with captured_query_stats() as seen:
+        response = client.post(f"/api/tickets?{org_scope}", json=body, headers=system_auth_headers)
+
+    assert response.status_code == 201
+    data = response.json()
+    assert data["order"]["id"] == order["id"]
+    assert data["tags"] == ["support"]
+    assert [e["id"] for e in data["employees"]] == [staff_id]
+    assert data["messages"] == []
+    [(_, stats)] = seen
+    assert stats.by_table() == {"rpc/create_ticket_graph": 1}
+
+    missing = client.post(
+        f"/api/tickets?{org_scope}",
+        json={**body, "order_id": "00000000-0000-4000-8000-000000000000"},
+        headers=system_auth_headers,
+    )
+    assert missing.status_code == 422
+    assert missing.json()["detail"]["errors"] == {
+        "order_id": ["The specified order does not exist."]
+    }
+
+
+def test_invoice_create_and_update(
+    client: TestClient, fake_supabase, system_auth_headers, org_scope
+) -> None:
+    store, seeded = fake_supabase
+    client_id, _ = _people(store, seeded.org_id)
+    body = {
+        "user_id": client_id, "items": [{"name": "Setup", "quantity": 2, "amount": 50}], "tax": 10
+    }
+
+    created = client.post(f"/api/invoices?{org_scope}", json=body, headers=system_auth_headers)
+
+    assert created.status_code == 201
+    invoice = created.json()
+    assert invoice["total"] == "110.00"
+    assert invoice["billing_address"]["city"] == "Austin"
+    assert [item["name"] for item in invoice["items"]] == ["Setup"]
+    url = f"/api/invoices/{invoice['id']}?{org_scope}"
+
+    update = {"items": [{"name": "Retainer", "quantity": 1, "amount": 30}], "status": 0}
+    with captured_query_stats() as seen:
+        updated = client.put(url, json=update, headers=system_auth_headers)
+    assert updated.status_code == 200
+    assert updated.json()["total"] == "40.00"
+    assert [item["name"] for item in updated.json()["items"]] == ["Retainer"]
+    [(_, stats)] = seen
+    assert stats.by_table() == {"rpc/update_invoice_graph": 1}
+
+    refused = client.put(url, json={**update, "status": 3}, headers=system_auth_headers)
+    assert refused.status_code == 400
+    assert refused.json()["detail"]["errors"] == {
+        "status": ["Cannot transition from Draft to Paid."]
+    }
+    items = [i for i in store.table("invoice_items") if i["invoice_id"] == invoice["id"]]
+    assert [i["name"] for i in items] == ["Retainer"]
+
+    gone = client.put(
+        f"/api/invoices/00000000-0000-4000-8000-000000000000?{org_scope}",
+        json=update,
+        headers=system_auth_headers,
+    )
+    assert gone.status_code == 404
+
+
+@pytest.mark.skipif(not TEST_DSN, reason="SERX_TEST_DATABASE_URL not set")
+def test_write_functions_in_postgres() -> None:
+    asyncpg = pytest.importorskip("asyncpg")
+    schema = f"serx_test_{uuid.uuid4().hex[:8]}"
+    org_id, other_org_id, client_id, staff_id = (str(uuid.uuid4()) for _ in range(4))
+    staff_role, client_role = str(uuid.uuid4()), str(uuid.uuid4())
+
+    async def counts(conn) -> dict[str, int]:
+        tables = ("orders", "order_employees", "order_tags", "tags", "invoices", "invoice_items")
+        return {t: await conn.fetchval(f"SELECT COUNT(*) FROM {t}") for t in tables}
+
+    async def rejected(conn, query: str, *args: object) -> tuple[str, str, str]:
+        with pytest.raises(asyncpg.PostgresError) as exc:
+            await conn.fetchval(query, *args)
+        return exc.value.sqlstate, exc.value.hint, exc.value.message
+
+    async def scenario() -> None:
+        conn = await asyncpg.connect(TEST_DSN)
+        await conn.execute(f"CREATE SCHEMA {schema}; SET search_path TO {schema};")
+        try:
+            await conn.execute(SCHEMA)
+            # A duplicate tag name left by the old select-then-insert, and
+            # another org's tag of the same name, which must survive the merge.
+            await conn.execute(
+                "INSERT INTO tags (org_id, name) VALUES ($1, 'vip'), ($1, 'vip'), ($2, 'vip')",
+                org_id, other_org_id,
+            )
+            await conn.execute((MIGRATIONS / "026b_tags_unique_name.sql").read_text())
+            await conn.execute((MIGRATIONS / "028_write_graph_rpcs.sql").read_text())
+            await conn.execute((MIGRATIONS / "029_update_order_graph.sql").read_text())
+            await conn.execute("INSERT INTO roles VALUES ($1, 1), ($2, 0)", staff_role, client_role)
+            await conn.execute(
+                "INSERT INTO users (id, org_id, name_f, role_id)"
+                " VALUES ($1, $3, 'Client', $4), ($2, $3, 'Staff', $5)",
+                client_id, staff_id, org_id, client_role, staff_role,
+            )
+
+            order_sql = "SELECT create_order_graph($1, $2::jsonb, $3::uuid[], $4)"
+            order = {"number": "A-1", "user_id": client_id, "status": 0}
+            tags = ["vip", "new"]
+            graph = json.loads(
+                await conn.fetchval(order_sql, org_id, json.dumps(order), [staff_id], tags)
+            )
+            assert graph["order"]["number"] == "A-1"
+            assert graph["client"]["id"] == client_id
+            assert [e["id"] for e in graph["employees"]] == [staff_id]
+            assert graph["tags"] == ["new", "vip"]
+
+            before = await counts(conn)
+            assert before["tags"] == 3
+            assert await rejected(
+                conn, order_sql, org_id, json.dumps(order), [staff_id], ["other"]
+            ) == ("PT400", "number", "The order number has already been taken.")
+            assert await rejected(
+                conn, order_sql, org_id, json.dumps({**order, "number": "A-2"}), [client_id], []
+            ) == ("PT422", "employees", f"Employee with ID {client_id} does not exist.")
+            assert await counts(conn) == before
+
+            update_order_sql = (
+                "SELECT update_order_graph($1, $2, $3::jsonb, $4::uuid[], $5, $6::timestamptz)"
+            )
+            order_id = graph["order"]["id"]
+            updated = json.loads(await conn.fetchval(
+                update_order_sql, org_id, order_id, json.dumps({"note": "Rescoped"}),
+                None, ["vip", "later"], None,
+            ))
+            assert updated["order"]["note"] == "Rescoped"
+            assert [e["id"] for e in updated["employees"]] == [staff_id]
+            assert updated["tags"] == ["later", "vip"]
+            version = await conn.fetchval("SELECT updated_at FROM orders WHERE id = $1", order_id)
+            before = await counts(conn)
+            assert await rejected(
+                conn, update_order_sql, org_id, order_id, json.dumps({"note": "Lost"}),
+                [client_id], ["never"], version,
+            ) == ("PT422", "employees", f"Employee with ID {client_id} does not exist.")
+            assert (await rejected(
+                conn, update_order_sql, org_id, order_id, json.dumps({"note": "Lost"}),
+                None, None, datetime(1999, 1, 1, tzinfo=UTC),
+            ))[0] == "PT412"
+            assert await counts(conn) == before
+            assert await conn.fetchval("SELECT note FROM orders") == "Rescoped"
+
+            invoice = json.loads(await conn.fetchval(
+                "SELECT create_invoice_graph($1, $2::jsonb, $3::jsonb)",
+                org_id,
+                json.dumps({"user_id": client_id, "status": 0, "subtotal": 10, "total": 10}),
+                json.dumps([{"name": "Setup", "quantity": 1, "amount": 10}]),
+            ))
+            update_sql = "SELECT update_invoice_graph($1, $2, $3::jsonb, $4::jsonb, $5)"
+            replaced = json.dumps([{"name": "Retainer", "quantity": 1, "amount": 5}])
+            assert await rejected(
+                conn, update_sql, org_id, invoice["id"],
+                json.dumps({"status": 3, "subtotal": 5}), replaced, [1],
+            ) == ("PT400", "status", "Cannot transition from status 0.")
+            names = await conn.fetch("SELECT name FROM invoice_items")
+            assert [r["name"] for r in names] == ["Setup"]
+
+            updated = json.loads(await conn.fetchval(
+                update_sql, org_id, invoice["id"], json.dumps({"status": 1, "subtotal": 5}),
+                replaced, [0],
+            ))
+            assert updated["status"] == 1
+            assert [i["name"] for i in updated["invoice_items"]] == ["Retainer"]
+        finally:
+            await conn.execute(f"DROP SCHEMA {schema} CASCADE")
+            await conn.close()
+
+    asyncio.run(scenario())